@@ -0,0 +1,440 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import json
+import os
+import re
+from typing import Any
+from typing import Callable
+from typing import Mapping
+from urllib.parse import quote
+
+import httpx
+
+from agentic_layer.runtime.output_stream import BoundedCapture
+
+
+OutputSink = Callable[[int, bytes], None]
+
+# A bare image ID (`sha256:<hex>` or a hex prefix); only digest references name registry content.
+_IMAGE_ID_PATTERN = re.compile(r"(sha256:)?[0-9a-f]{12,64}")
+
+DEFAULT_SOCKET_PATH = "/var/run/docker.sock"
+DEFAULT_API_VERSION = "v1.43"
+
+MANAGED_LABEL = "deplai.managed"
+SCAN_ID_LABEL = "deplai.scan_id"
+POOL_LABEL = "deplai.pool"
+# The worker pool that created a pooled volume; its liveness is shared through the scan database.
+POOL_ID_LABEL = "deplai.pool_id"
+# Service-owned containers (pool scrubs, image warm-up) that belong to no scan.
+INFRA_LABEL = "deplai.infra"
+
+
+def docker_labels(
+    scan_id: str | None = None,
+    *,
+    pool: bool = False,
+    pool_id: str | None = None,
+    infra: bool = False,
+) -> dict[str, str]:
+    # Every container/volume DEPLAI creates carries these so the reaper can find it in one listing.
+    labels = {MANAGED_LABEL: "true"}
+    if scan_id:
+        labels[SCAN_ID_LABEL] = scan_id
+    if pool:
+        labels[POOL_LABEL] = "true"
+    if pool_id:
+        labels[POOL_ID_LABEL] = pool_id
+    if infra:
+        labels[INFRA_LABEL] = "true"
+    return labels
+
+
+class DockerEngineError(RuntimeError):
+    def __init__(self, status_code: int, message: str) -> None:
+        super().__init__(f"Docker engine error {status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+
+
+@dataclass(frozen=True)
+class ContainerRunResult:
+    exit_code: int
+    stdout: str
+    stderr: str
+    timed_out: bool = False
+
+
+def _resolve_endpoint() -> tuple[str | None, str]:
+    # Returns (unix socket path or None, base URL). Honours DOCKER_HOST like the CLI does.
+    socket_path = os.getenv("DEPLAI_DOCKER_SOCKET", "").strip()
+    if socket_path:
+        return socket_path, "http://docker"
+
+    docker_host = os.getenv("DOCKER_HOST", "").strip()
+    if docker_host.startswith("unix://"):
+        return docker_host[len("unix://"):], "http://docker"
+    if docker_host.startswith("tcp://"):
+        return None, "http://" + docker_host[len("tcp://"):]
+    return DEFAULT_SOCKET_PATH, "http://docker"
+
+
+class _FrameDemuxer:
+    # Non-TTY containers multiplex stdout/stderr as [stream, 0, 0, 0, size(4 bytes BE)] + payload
+    # frames. Payload bytes are handed on as they arrive, so one huge frame is never buffered whole.
+
+    def __init__(self) -> None:
+        self._header = bytearray()
+        self._stream = 1
+        self._remaining = 0
+
+    def feed(self, chunk: bytes) -> list[tuple[int, bytes]]:
+        pieces: list[tuple[int, bytes]] = []
+        offset = 0
+        while offset < len(chunk):
+            if self._remaining == 0:
+                needed = 8 - len(self._header)
+                self._header.extend(chunk[offset : offset + needed])
+                offset += needed
+                if len(self._header) < 8:
+                    break
+                self._stream = self._header[0]
+                self._remaining = int.from_bytes(self._header[4:8], "big")
+                self._header = bytearray()
+                continue
+            piece = chunk[offset : offset + self._remaining]
+            offset += len(piece)
+            self._remaining -= len(piece)
+            pieces.append((self._stream, piece))
+        return pieces
+
+
+class DockerEngineClient:
+    # Async Docker Engine API client. One keep-alive connection pool over the daemon
+    # socket replaces a `docker` CLI fork + fresh socket connection per operation.
+
+    def __init__(self, api_version: str | None = None, timeout_seconds: float = 30.0) -> None:
+        self.api_version = api_version or os.getenv("DEPLAI_DOCKER_API_VERSION", DEFAULT_API_VERSION)
+        self.timeout_seconds = timeout_seconds
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        self._pinned_images: dict[str, str] = {}
+        self._local_images: set[str] = set()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._discard_client()
+            socket_path, base_url = _resolve_endpoint()
+            transport = httpx.AsyncHTTPTransport(uds=socket_path) if socket_path else httpx.AsyncHTTPTransport()
+            self._client = httpx.AsyncClient(
+                transport=transport,
+                base_url=f"{base_url}/{self.api_version}",
+                timeout=httpx.Timeout(self.timeout_seconds),
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60.0),
+            )
+            self._client_loop = loop
+        return self._client
+
+    def _discard_client(self) -> None:
+        # Pooled sockets are closed on the loop that owns them; a loop already shut down took them with it.
+        previous, previous_loop = self._client, self._client_loop
+        self._client = None
+        self._client_loop = None
+        if previous is None or previous.is_closed:
+            return
+        if previous_loop is not None and previous_loop.is_running() and not previous_loop.is_closed():
+            asyncio.run_coroutine_threadsafe(previous.aclose(), previous_loop)
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Mapping[str, Any] | None = None,
+        json_body: Any = None,
+        timeout: float | None | object = httpx.USE_CLIENT_DEFAULT,
+        ok_statuses: frozenset[int] = frozenset({200, 201, 204}),
+    ) -> httpx.Response:
+        try:
+            response = await self._get_client().request(
+                method,
+                path,
+                params=params,
+                json=json_body,
+                timeout=timeout,
+            )
+        except (httpx.TransportError, FileNotFoundError) as exc:
+            # Timeouts and dropped connections included: callers only ever handle DockerEngineError.
+            raise DockerEngineError(503, f"Docker engine unavailable: {exc!r}") from exc
+        if response.status_code not in ok_statuses:
+            try:
+                message = str(response.json().get("message") or response.text)
+            except ValueError:
+                message = response.text
+            raise DockerEngineError(response.status_code, message.strip())
+        return response
+
+    async def ping(self) -> bool:
+        try:
+            await self._request("GET", "/_ping")
+        except DockerEngineError:
+            return False
+        return True
+
+    # Volumes
+
+    async def create_volume(self, name: str, labels: Mapping[str, str] | None = None) -> str:
+        response = await self._request(
+            "POST",
+            "/volumes/create",
+            json_body={"Name": name, "Labels": dict(labels or {})},
+        )
+        return str(response.json().get("Name") or name)
+
+    async def remove_volume(self, name: str, force: bool = True) -> bool:
+        # True when the volume is gone afterwards, including when it never existed.
+        try:
+            await self._request("DELETE", f"/volumes/{quote(name, safe='')}", params={"force": str(force).lower()})
+        except DockerEngineError as exc:
+            if exc.status_code == 404:
+                return True
+            raise
+        return True
+
+    async def list_volumes(self, labels: Mapping[str, str] | None = None) -> list[dict[str, Any]]:
+        params = {"filters": json.dumps({"label": [f"{key}={value}" for key, value in (labels or {}).items()]})}
+        response = await self._request("GET", "/volumes", params=params)
+        return list(response.json().get("Volumes") or [])
+
+    # Images
+
+    async def pull_image(self, image: str) -> None:
+        if "@" in image:
+            params = {"fromImage": image}
+        else:
+            name, sep, tag = image.rpartition(":")
+            if not sep or "/" in tag:
+                name, tag = image, "latest"
+            params = {"fromImage": name, "tag": tag}
+        # Pull progress is streamed; reading it to the end is what waits for completion.
+        async with self._get_client().stream("POST", "/images/create", params=params, timeout=None) as response:
+            if response.status_code != 200:
+                body = (await response.aread()).decode("utf-8", errors="ignore")
+                raise DockerEngineError(response.status_code, body.strip())
+            async for line in response.aiter_lines():
+                if '"error"' in line:
+                    try:
+                        message = str(json.loads(line).get("error") or line)
+                    except ValueError:
+                        message = line
+                    raise DockerEngineError(500, message)
+
+    def pin_image(self, image: str, pinned_ref: str) -> None:
+        # Containers created from `image` use `pinned_ref` (an image ID) from now on, so a
+        # tag moved by a later pull or rebuild cannot change what a running deployment executes.
+        self._pinned_images[image] = pinned_ref
+
+    def pinned_image(self, image: str) -> str:
+        return self._pinned_images.get(image, image)
+
+    def mark_local_image(self, image: str) -> None:
+        # Built on this host (the scanner bundle); no registry has it, so it is never pulled.
+        self._local_images.add(image)
+
+    def pullable(self, image: str) -> bool:
+        return image not in self._local_images and _IMAGE_ID_PATTERN.fullmatch(image) is None
+
+    async def inspect_image(self, image: str) -> dict[str, Any] | None:
+        try:
+            response = await self._request("GET", f"/images/{quote(image, safe='')}/json")
+        except DockerEngineError as exc:
+            if exc.status_code == 404:
+                return None
+            raise
+        return response.json()
+
+    # Containers
+
+    async def create_container(
+        self,
+        image: str,
+        command: list[str],
+        *,
+        name: str | None = None,
+        entrypoint: list[str] | None = None,
+        env: Mapping[str, str] | None = None,
+        labels: Mapping[str, str] | None = None,
+        binds: list[str] | None = None,
+        workdir: str | None = None,
+        network_disabled: bool = True,
+        host_config: Mapping[str, Any] | None = None,
+    ) -> str:
+        requested_image = image
+        image = self.pinned_image(image)
+        body: dict[str, Any] = {
+            "Image": image,
+            "Cmd": command,
+            "Env": [f"{key}={value}" for key, value in (env or {}).items()],
+            "Labels": dict(labels or {}),
+            "AttachStdout": False,
+            "AttachStderr": False,
+            "Tty": False,
+            "HostConfig": {
+                "Binds": list(binds or []),
+                "NetworkMode": "none" if network_disabled else "bridge",
+                **dict(host_config or {}),
+            },
+        }
+        if entrypoint is not None:
+            body["Entrypoint"] = entrypoint
+        if workdir:
+            body["WorkingDir"] = workdir
+
+        params = {"name": name} if name else None
+        try:
+            response = await self._request("POST", "/containers/create", params=params, json_body=body)
+        except DockerEngineError as exc:
+            # A pinned image ID or a locally built image cannot be pulled; its 404 is the real error.
+            if exc.status_code != 404 or not self.pullable(image) or not self.pullable(requested_image):
+                raise
+            # Image not present locally: pull once, as `docker run` would.
+            await self.pull_image(image)
+            response = await self._request("POST", "/containers/create", params=params, json_body=body)
+        return str(response.json()["Id"])
+
+    async def start_container(self, container_id: str) -> None:
+        await self._request("POST", f"/containers/{container_id}/start", ok_statuses=frozenset({204, 304}))
+
+    async def wait_container(self, container_id: str) -> int:
+        response = await self._request("POST", f"/containers/{container_id}/wait", timeout=None)
+        return int(response.json().get("StatusCode", 1))
+
+    async def stream_logs(self, container_id: str, on_output: OutputSink) -> None:
+        # Follows the container's output until it exits, feeding (stream, bytes) pieces to on_output.
+        params = {"stdout": "true", "stderr": "true", "follow": "true"}
+        async with self._get_client().stream(
+            "GET",
+            f"/containers/{container_id}/logs",
+            params=params,
+            timeout=httpx.Timeout(self.timeout_seconds, read=None),
+        ) as response:
+            if response.status_code != 200:
+                body = (await response.aread()).decode("utf-8", errors="ignore")
+                raise DockerEngineError(response.status_code, body.strip())
+            demuxer = _FrameDemuxer()
+            async for chunk in response.aiter_bytes():
+                for stream, piece in demuxer.feed(chunk):
+                    on_output(stream, piece)
+
+    async def kill_container(self, container_id: str) -> None:
+        try:
+            await self._request("POST", f"/containers/{container_id}/kill")
+        except DockerEngineError as exc:
+            if exc.status_code not in {404, 409}:
+                raise
+
+    async def remove_container(self, container_id: str, force: bool = True) -> bool:
+        try:
+            await self._request(
+                "DELETE",
+                f"/containers/{container_id}",
+                params={"force": str(force).lower(), "v": "false"},
+            )
+        except DockerEngineError as exc:
+            if exc.status_code == 404:
+                return True
+            raise
+        return True
+
+    async def list_containers(self, labels: Mapping[str, str] | None = None) -> list[dict[str, Any]]:
+        params = {
+            "all": "true",
+            "filters": json.dumps({"label": [f"{key}={value}" for key, value in (labels or {}).items()]}),
+        }
+        response = await self._request("GET", "/containers/json", params=params)
+        return list(response.json() or [])
+
+    async def run_container_streamed(
+        self,
+        image: str,
+        command: list[str],
+        *,
+        timeout_seconds: float,
+        on_output: OutputSink,
+        name: str | None = None,
+        entrypoint: list[str] | None = None,
+        env: Mapping[str, str] | None = None,
+        labels: Mapping[str, str] | None = None,
+        binds: list[str] | None = None,
+        workdir: str | None = None,
+        network_disabled: bool = True,
+        host_config: Mapping[str, Any] | None = None,
+    ) -> int | None:
+        # create -> start -> follow logs -> wait -> remove; the equivalent of `docker run --rm`.
+        # Returns the exit code, or None when the container was killed at the timeout.
+        container_id = await self.create_container(
+            image,
+            command,
+            name=name,
+            entrypoint=entrypoint,
+            env=env,
+            labels=labels,
+            binds=binds,
+            workdir=workdir,
+            network_disabled=network_disabled,
+            host_config=host_config,
+        )
+
+        async def _follow_and_wait() -> int:
+            await self.stream_logs(container_id, on_output)
+            return await self.wait_container(container_id)
+
+        try:
+            await self.start_container(container_id)
+            try:
+                return await asyncio.wait_for(_follow_and_wait(), timeout=timeout_seconds)
+            except asyncio.TimeoutError:
+                await self.kill_container(container_id)
+                return None
+        finally:
+            try:
+                await asyncio.shield(self.remove_container(container_id, force=True))
+            except DockerEngineError:
+                pass
+
+    async def run_container(
+        self,
+        image: str,
+        command: list[str],
+        *,
+        timeout_seconds: float,
+        max_capture_bytes: int = 1024 * 1024,
+        **options: Any,
+    ) -> ContainerRunResult:
+        # Plain-text variant for short-output containers; each stream is capped at max_capture_bytes.
+        capture = BoundedCapture(max_bytes=max_capture_bytes)
+        exit_code = await self.run_container_streamed(
+            image,
+            command,
+            timeout_seconds=timeout_seconds,
+            on_output=capture.feed,
+            **options,
+        )
+        return ContainerRunResult(
+            exit_code=124 if exit_code is None else exit_code,
+            stdout=capture.stdout,
+            stderr=capture.stderr,
+            timed_out=exit_code is None,
+        )
+
+
+docker_engine = DockerEngineClient()
@@ -0,0 +1,526 @@
+from __future__ import annotations
+
+from abc import ABC
+from abc import abstractmethod
+import asyncio
+from dataclasses import dataclass
+import os
+from pathlib import Path
+import re
+import shutil
+import signal
+import sys
+import tempfile
+import time
+from typing import Any
+from typing import Mapping
+from uuid import uuid4
+
+from agentic_layer.runtime.docker_engine import ContainerRunResult
+from agentic_layer.runtime.docker_engine import DockerEngineError
+from agentic_layer.runtime.docker_engine import OutputSink
+from agentic_layer.runtime.docker_engine import docker_engine
+from agentic_layer.runtime.docker_engine import docker_labels
+from agentic_layer.runtime.image_warmup import image_warmup
+from agentic_layer.runtime.local_source import release_local_source
+from agentic_layer.runtime.output_stream import BoundedCapture
+from agentic_layer.runtime.output_stream import NdjsonCollector
+from agentic_layer.runtime.resource_budget import ResourceRequest
+from agentic_layer.runtime.resource_budget import SCANNER_RESOURCES
+from agentic_layer.runtime.resource_budget import resource_budget
+from agentic_layer.runtime.resource_reaper import resource_reaper
+from agentic_layer.runtime.scanner_image import SCANNER_CACHE_PATH
+from agentic_layer.runtime.scanner_image import SCANNER_CACHE_VOLUME
+from agentic_layer.runtime.scanner_image import scanner_cache_enabled
+from agentic_layer.runtime.scanner_image import scanner_command
+from agentic_layer.runtime.scanner_image import scanner_image
+from agentic_layer.runtime.scanner_image import scanner_image_is_local
+from agentic_layer.runtime.volume_pool import volume_pool
+from agentic_layer.scan_graph.logger import log_agent
+
+
+BACKEND_DOCKER = "docker"
+BACKEND_LOCAL = "local"
+
+# Scanner containers only read the mounted workspace; CPU/memory/pids limits come
+# from the resource budget admission.
+SCANNER_SANDBOX_CONFIG = {
+    "ReadonlyRootfs": True,
+    "Tmpfs": {"/tmp": "rw,noexec,nosuid,size=64m"},
+}
+
+CODE_MOUNT_PATH = "/workspace/code"
+# Beside the workspaces, never inside one, so workspace removal cannot touch it.
+LOCAL_SCANNER_CACHE_DIR = ".scanner-cache"
+
+
+class ScannerTimeout(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class Workspace:
+    # `ref` is what the graph stores in docker_volumes["code"]: a volume name or a host directory.
+    ref: str
+    repo_path: str
+    pooled: bool = False
+
+
+@dataclass(frozen=True)
+class ScannerRun:
+    exit_code: int | None
+    queue_wait_ms: int = 0
+
+
+@dataclass(frozen=True)
+class ExecutionResult:
+    exit_code: int
+    stdout: str
+    stderr: str
+    queue_wait_ms: int = 0
+
+
+class ExecutionBackend(ABC):
+    # Where scan workspaces live and how scanner/clone commands execute against them.
+    name = "base"
+    isolated = True
+
+    async def start(self) -> None:
+        return None
+
+    async def stop(self) -> None:
+        return None
+
+    async def wait_until_ready(self) -> bool:
+        return True
+
+    def readiness(self) -> dict[str, Any]:
+        return {"state": "ready"}
+
+    @abstractmethod
+    async def create_workspace(self, scan_id: str) -> Workspace:
+        ...
+
+    @abstractmethod
+    def attach_host_path(self, path: str) -> Workspace:
+        # An existing host directory (an uploaded project) used as the workspace as-is.
+        ...
+
+    @abstractmethod
+    async def release_workspace(self, ref: str, scan_id: str, component: str) -> dict[str, bool]:
+        # Returns extra cleanup_status flags; raises if the workspace could not be released.
+        ...
+
+    @abstractmethod
+    async def run_scanner(
+        self,
+        scan_id: str,
+        tool: str,
+        workspace: str,
+        *,
+        mount_path: str,
+        timeout_seconds: float,
+        on_output: OutputSink,
+        resources: ResourceRequest,
+        component: str,
+        start_offset: int = 0,
+        files: list[str] | None = None,
+        shard: str | None = None,
+    ) -> ScannerRun:
+        # exit_code None means the scanner timed out and was killed.
+        ...
+
+    @abstractmethod
+    async def run_shell(
+        self,
+        scan_id: str,
+        script: str,
+        workspace: str,
+        *,
+        image: str,
+        env: Mapping[str, str],
+        timeout_seconds: float,
+        resources: ResourceRequest,
+        component: str,
+        name: str | None = None,
+        network: bool = False,
+    ) -> ContainerRunResult:
+        # Runs `script` with $CODE_DIR pointing at the workspace (the clone step).
+        ...
+
+
+class DockerBackend(ExecutionBackend):
+    name = BACKEND_DOCKER
+    isolated = True
+
+    async def start(self) -> None:
+        if scanner_image_is_local():
+            docker_engine.mark_local_image(scanner_image())
+        await image_warmup.start()
+        await volume_pool.start()
+        await resource_reaper.start()
+
+    async def stop(self) -> None:
+        await resource_reaper.stop()
+        await image_warmup.stop()
+        await volume_pool.stop()
+        await docker_engine.aclose()
+
+    async def wait_until_ready(self) -> bool:
+        return await image_warmup.wait_until_ready()
+
+    def readiness(self) -> dict[str, Any]:
+        return image_warmup.snapshot()
+
+    async def create_workspace(self, scan_id: str) -> Workspace:
+        pooled_volume = volume_pool.lease(scan_id)
+        if pooled_volume is not None:
+            return Workspace(ref=pooled_volume, repo_path=CODE_MOUNT_PATH, pooled=True)
+        volume_name = _build_code_volume_name(scan_id)
+        created_name = await docker_engine.create_volume(volume_name, labels=docker_labels(scan_id))
+        return Workspace(ref=created_name or volume_name, repo_path=CODE_MOUNT_PATH)
+
+    def attach_host_path(self, path: str) -> Workspace:
+        # Binds accept absolute host paths wherever they accept volume names; scanner
+        # mounts are always read-only.
+        return Workspace(ref=path, repo_path=CODE_MOUNT_PATH)
+
+    async def release_workspace(self, ref: str, scan_id: str, component: str) -> dict[str, bool]:
+        if os.path.isabs(ref):
+            return await release_local_source(ref, scan_id, component)
+        if volume_pool.release(ref):
+            # Pooled volumes are scrubbed in the background and reused, not removed.
+            log_agent(scan_id, component, f"Returned volume {ref} to pool")
+            return {"volume_recycled": True}
+        if resource_reaper.schedule_volume_removal(ref, scan_id):
+            log_agent(scan_id, component, f"Handed volume {ref} to background reaper")
+            return {"volume_removal_deferred": True}
+        await docker_engine.remove_volume(ref, force=True)
+        log_agent(scan_id, component, f"Removed volume {ref}")
+        return {}
+
+    async def run_scanner(
+        self,
+        scan_id: str,
+        tool: str,
+        workspace: str,
+        *,
+        mount_path: str,
+        timeout_seconds: float,
+        on_output: OutputSink,
+        resources: ResourceRequest,
+        component: str,
+        start_offset: int = 0,
+        files: list[str] | None = None,
+        shard: str | None = None,
+    ) -> ScannerRun:
+        image = scanner_image()
+        binds = [f"{workspace}:{mount_path}:ro"]
+        cache_dir = None
+        if scanner_cache_enabled():
+            # The only writable mount: Docker creates the volume on first use, owned by the
+            # image's unprivileged user, and keeps it across scans.
+            binds.append(f"{SCANNER_CACHE_VOLUME}:{SCANNER_CACHE_PATH}")
+            cache_dir = SCANNER_CACHE_PATH
+        async with resource_budget.reserve(scan_id, resources, component=component) as admission:
+            log_agent(scan_id, component, f"Starting container command image={image} tool={tool}")
+            exit_code = await docker_engine.run_container_streamed(
+                image,
+                scanner_command(tool, mount_path, cache_dir, start_offset, files, shard),
+                timeout_seconds=timeout_seconds,
+                on_output=on_output,
+                labels=docker_labels(scan_id),
+                binds=binds,
+                workdir=mount_path,
+                network_disabled=True,
+                host_config={**SCANNER_SANDBOX_CONFIG, **admission.host_config()},
+            )
+        return ScannerRun(exit_code=exit_code, queue_wait_ms=admission.queue_wait_ms)
+
+    async def run_shell(
+        self,
+        scan_id: str,
+        script: str,
+        workspace: str,
+        *,
+        image: str,
+        env: Mapping[str, str],
+        timeout_seconds: float,
+        resources: ResourceRequest,
+        component: str,
+        name: str | None = None,
+        network: bool = False,
+    ) -> ContainerRunResult:
+        async with resource_budget.reserve(scan_id, resources, component=component) as admission:
+            return await docker_engine.run_container(
+                image,
+                ["-lc", script],
+                timeout_seconds=timeout_seconds,
+                name=name,
+                entrypoint=["sh"],
+                env={**env, "CODE_DIR": CODE_MOUNT_PATH},
+                labels=docker_labels(scan_id),
+                binds=[f"{workspace}:{CODE_MOUNT_PATH}"],
+                workdir="/workspace",
+                network_disabled=not network,
+                host_config=admission.host_config(),
+            )
+
+
+class LocalBackend(ExecutionBackend):
+    # Runs the same scanner bundle as host subprocesses against host directories: no
+    # daemon, no images, no isolation. Meant for development, CI and load tests on
+    # trusted repositories only.
+    name = BACKEND_LOCAL
+    isolated = False
+
+    def __init__(self, workspace_root: str | None = None, concurrency: int | None = None) -> None:
+        root = workspace_root or os.getenv("DEPLAI_LOCAL_WORKSPACE_ROOT", "").strip()
+        self.workspace_root = Path(root or os.path.join(tempfile.gettempdir(), "deplai-workspaces")).resolve()
+        raw = os.getenv("DEPLAI_LOCAL_CONCURRENCY", "").strip()
+        self.concurrency = concurrency or (int(raw) if raw.isdigit() and int(raw) > 0 else (os.cpu_count() or 2))
+        self._slots: asyncio.Semaphore | None = None
+        self._slots_loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.concurrency)
+            self._slots_loop = loop
+        return self._slots
+
+    async def start(self) -> None:
+        self.workspace_root.mkdir(parents=True, exist_ok=True)
+        log_agent(
+            "-",
+            "ExecutionBackend",
+            f"Local execution backend at {self.workspace_root} concurrency={self.concurrency}; scanners are not sandboxed",
+        )
+
+    def readiness(self) -> dict[str, Any]:
+        return {"state": "ready", "backend": self.name, "workspace_root": str(self.workspace_root)}
+
+    def _owns(self, ref: str) -> bool:
+        try:
+            return Path(ref).resolve().parent == self.workspace_root
+        except OSError:
+            return False
+
+    async def create_workspace(self, scan_id: str) -> Workspace:
+        self.workspace_root.mkdir(parents=True, exist_ok=True)
+        path = self.workspace_root / f"{_build_code_volume_name(scan_id)}_{uuid4().hex[:8]}"
+        path.mkdir()
+        return Workspace(ref=str(path), repo_path=str(path))
+
+    def attach_host_path(self, path: str) -> Workspace:
+        return Workspace(ref=path, repo_path=path)
+
+    async def release_workspace(self, ref: str, scan_id: str, component: str) -> dict[str, bool]:
+        # Only directories this backend created are ever deleted here.
+        if not self._owns(ref):
+            return await release_local_source(ref, scan_id, component)
+        await asyncio.to_thread(shutil.rmtree, ref, True)
+        log_agent(scan_id, component, f"Removed workspace {ref}")
+        return {}
+
+    async def run_scanner(
+        self,
+        scan_id: str,
+        tool: str,
+        workspace: str,
+        *,
+        mount_path: str,
+        timeout_seconds: float,
+        on_output: OutputSink,
+        resources: ResourceRequest,
+        component: str,
+        start_offset: int = 0,
+        files: list[str] | None = None,
+        shard: str | None = None,
+    ) -> ScannerRun:
+        package_root = str(Path(__file__).resolve().parents[2])
+        cache_dir = str(self.workspace_root / LOCAL_SCANNER_CACHE_DIR) if scanner_cache_enabled() else None
+        env = {
+            **_base_env(),
+            "PYTHONPATH": package_root,
+            "PYTHONDONTWRITEBYTECODE": "1",
+            # No cgroup here; the scanner sizes its worker pool from this instead.
+            "DEPLAI_SCANNER_CPUS": str(resources.cpus),
+        }
+        enqueued_at = time.monotonic()
+        async with self._get_slots():
+            queue_wait_ms = int((time.monotonic() - enqueued_at) * 1000)
+            log_agent(scan_id, component, f"Starting local scanner tool={tool}")
+            exit_code = await _run_process(
+                [
+                    sys.executable,
+                    "-m",
+                    "agentic_layer.scanners",
+                    *scanner_command(tool, workspace, cache_dir, start_offset, files, shard),
+                ],
+                env=env,
+                cwd=workspace,
+                timeout_seconds=timeout_seconds,
+                on_output=on_output,
+            )
+        return ScannerRun(exit_code=exit_code, queue_wait_ms=queue_wait_ms)
+
+    async def run_shell(
+        self,
+        scan_id: str,
+        script: str,
+        workspace: str,
+        *,
+        image: str,
+        env: Mapping[str, str],
+        timeout_seconds: float,
+        resources: ResourceRequest,
+        component: str,
+        name: str | None = None,
+        network: bool = False,
+    ) -> ContainerRunResult:
+        capture = BoundedCapture()
+        with tempfile.TemporaryDirectory(prefix="deplai-shell-") as scratch:
+            async with self._get_slots():
+                exit_code = await _run_process(
+                    ["sh", "-c", script],
+                    env={**_base_env(), **env, "CODE_DIR": workspace, "TMPDIR": scratch},
+                    cwd=str(Path(workspace).parent),
+                    timeout_seconds=timeout_seconds,
+                    on_output=capture.feed,
+                )
+        return ContainerRunResult(
+            exit_code=124 if exit_code is None else exit_code,
+            stdout=capture.stdout,
+            stderr=capture.stderr,
+            timed_out=exit_code is None,
+        )
+
+
+def _build_code_volume_name(scan_id: str) -> str:
+    normalized = re.sub(r"[^a-zA-Z0-9_.-]", "_", scan_id).lower()
+    if not normalized:
+        normalized = "unknown"
+    return f"deplai_code_{normalized}"
+
+
+def _base_env() -> dict[str, str]:
+    # Child processes get a minimal environment, not the API process's secrets.
+    env = {"PATH": os.environ.get("PATH", "/usr/local/bin:/usr/bin:/bin"), "LANG": "C.UTF-8"}
+    if os.environ.get("HOME"):
+        env["HOME"] = os.environ["HOME"]
+    return env
+
+
+async def _run_process(
+    argv: list[str],
+    *,
+    env: Mapping[str, str],
+    cwd: str,
+    timeout_seconds: float,
+    on_output: OutputSink,
+) -> int | None:
+    process = await asyncio.create_subprocess_exec(
+        *argv,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        env=dict(env),
+        cwd=cwd,
+        start_new_session=True,
+    )
+
+    async def _pump(stream: asyncio.StreamReader | None, stream_id: int) -> None:
+        if stream is None:
+            return
+        while True:
+            chunk = await stream.read(64 * 1024)
+            if not chunk:
+                return
+            on_output(stream_id, chunk)
+
+    pumps = asyncio.gather(_pump(process.stdout, 1), _pump(process.stderr, 2), process.wait())
+    try:
+        await asyncio.wait_for(pumps, timeout=timeout_seconds)
+    except asyncio.TimeoutError:
+        _kill_process_group(process)
+        await process.wait()
+        return None
+    except BaseException:
+        _kill_process_group(process)
+        raise
+    return int(process.returncode if process.returncode is not None else 1)
+
+
+def _kill_process_group(process: asyncio.subprocess.Process) -> None:
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def build_execution_backend(name: str | None = None) -> ExecutionBackend:
+    selected = (name or os.getenv("DEPLAI_EXECUTION_BACKEND", BACKEND_DOCKER)).strip().lower()
+    if selected == BACKEND_LOCAL:
+        return LocalBackend()
+    return DockerBackend()
+
+
+execution_backend = build_execution_backend()
+
+
+async def run_scanner(
+    *,
+    scan_id: str,
+    tool: str,
+    workspace: str,
+    collector: NdjsonCollector,
+    component: str,
+    timeout_seconds: int = 120,
+    mount_path: str = "/workspace",
+    resources: ResourceRequest = SCANNER_RESOURCES,
+    start_offset: int = 0,
+    files: list[str] | None = None,
+    shard: str | None = None,
+) -> ExecutionResult:
+    # Node-facing helper: runs one bundled scanner on the active backend, feeding its
+    # NDJSON output to `collector`. Raises ScannerTimeout on timeout (the collector keeps
+    # what was streamed until then) and RuntimeError on other failures.
+    try:
+        run = await execution_backend.run_scanner(
+            scan_id,
+            tool,
+            workspace,
+            mount_path=mount_path,
+            timeout_seconds=timeout_seconds,
+            on_output=collector.feed,
+            resources=resources,
+            component=component,
+            start_offset=start_offset,
+            files=files,
+            shard=shard,
+        )
+    except DockerEngineError as exc:
+        raise RuntimeError(f"Container command failed: {exc.message}") from exc
+    except OSError as exc:
+        raise RuntimeError(f"Scanner process failed to start: {exc}") from exc
+
+    collector.close()
+    stdout, stderr = collector.stdout_preview, collector.stderr_tail
+    if collector.stats.truncated:
+        log_agent(scan_id, component, f"Scanner output capped: {collector.stats.as_dict()}")
+
+    if run.exit_code is None:
+        raise ScannerTimeout(f"Container command timed out after {timeout_seconds}s")
+
+    if run.exit_code != 0:
+        details = (stderr or stdout or "scanner command failed").strip()
+        raise RuntimeError(f"Container command failed (exit_code={run.exit_code}): {details}")
+
+    log_agent(scan_id, component, f"Scanner completed tool={tool} backend={execution_backend.name}")
+    return ExecutionResult(
+        exit_code=int(run.exit_code),
+        stdout=stdout,
+        stderr=stderr,
+        queue_wait_ms=run.queue_wait_ms,
+    )
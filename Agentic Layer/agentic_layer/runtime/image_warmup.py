@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict
+from dataclasses import dataclass
+import os
+import time
+from typing import Any
+
+from agentic_layer.runtime.docker_engine import DockerEngineError
+from agentic_layer.runtime.docker_engine import docker_engine
+from agentic_layer.runtime.docker_engine import docker_labels
+from agentic_layer.runtime.resource_budget import MAINTENANCE_RESOURCES
+from agentic_layer.runtime.resource_budget import resource_budget
+from agentic_layer.runtime.scanner_image import CLONE_IMAGE
+from agentic_layer.runtime.scanner_image import MAINTENANCE_IMAGE
+from agentic_layer.runtime.scanner_image import scanner_image
+from agentic_layer.runtime.scanner_image import scanner_image_is_local
+from agentic_layer.scan_graph.logger import log_agent
+
+
+WARMUP_COMPONENT = "ImageWarmup"
+
+PULL_POLICY_MISSING = "missing"
+PULL_POLICY_ALWAYS = "always"
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name, "").strip()
+    try:
+        value = float(raw) if raw else default
+    except ValueError:
+        return default
+    return value if value >= 0 else default
+
+
+@dataclass(frozen=True)
+class RequiredImage:
+    ref: str
+    role: str
+    # Trivial command run once per image; it pages the image's layers and the
+    # interpreter into the host page cache before the first scan needs them.
+    warmup_command: tuple[str, ...]
+    # Built on the host and in no registry: never pulled, whatever the pull policy.
+    local_build: bool = False
+
+
+@dataclass
+class ImageStatus:
+    ref: str
+    role: str
+    state: str = "pending"
+    image_id: str | None = None
+    digest: str | None = None
+    pulled: bool = False
+    pull_ms: int = 0
+    warmup_ms: int = 0
+    error: str | None = None
+
+
+def required_images() -> list[RequiredImage]:
+    return [
+        RequiredImage(
+            ref=scanner_image(),
+            role="scanner",
+            warmup_command=("--version",),
+            local_build=scanner_image_is_local(),
+        ),
+        # alpine/git's entrypoint is git.
+        RequiredImage(ref=CLONE_IMAGE, role="clone", warmup_command=("--version",)),
+        RequiredImage(ref=MAINTENANCE_IMAGE, role="maintenance", warmup_command=("true",)),
+    ]
+
+
+class ImageWarmup:
+    # Pulls every image the scan graph uses concurrently at startup, pins each tag to
+    # the image ID it resolved to, and runs one throwaway container per image, so the
+    # first scan after a deploy does not pay pull latency inside its node timeouts.
+
+    def __init__(
+        self,
+        pull_policy: str | None = None,
+        timeout_seconds: float | None = None,
+        admission_wait_seconds: float | None = None,
+    ) -> None:
+        policy = (pull_policy or os.getenv("DEPLAI_IMAGE_PULL_POLICY", PULL_POLICY_MISSING)).strip().lower()
+        self.pull_policy = policy if policy in {PULL_POLICY_MISSING, PULL_POLICY_ALWAYS} else PULL_POLICY_MISSING
+        self.timeout_seconds = (
+            timeout_seconds if timeout_seconds is not None else _env_float("DEPLAI_WARMUP_TIMEOUT_SECONDS", 600.0)
+        )
+        self.admission_wait_seconds = (
+            admission_wait_seconds
+            if admission_wait_seconds is not None
+            else _env_float("DEPLAI_WARMUP_ADMISSION_WAIT_SECONDS", 120.0)
+        )
+        self._statuses: dict[str, ImageStatus] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._done: asyncio.Event | None = None
+        self._started_at: float | None = None
+        self._finished_at: float | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None
+
+    @property
+    def finished(self) -> bool:
+        return self._done is not None and self._done.is_set()
+
+    @property
+    def ready(self) -> bool:
+        return self.finished and bool(self._statuses) and all(
+            status.state == "ready" for status in self._statuses.values()
+        )
+
+    def state(self) -> str:
+        if not self.started:
+            return "not_started"
+        if not self.finished:
+            return "warming"
+        return "ready" if self.ready else "degraded"
+
+    async def start(self) -> None:
+        # Runs in the background: the API comes up immediately and /health reports progress.
+        if self._task is not None:
+            return
+        self._done = asyncio.Event()
+        self._started_at = time.monotonic()
+        self._statuses = {image.ref: ImageStatus(ref=image.ref, role=image.role) for image in required_images()}
+        self._task = asyncio.create_task(self._warm_all(required_images()))
+        log_agent("-", WARMUP_COMPONENT, f"Warming {len(self._statuses)} images pull_policy={self.pull_policy}")
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def wait_until_ready(self, timeout_seconds: float | None = None) -> bool:
+        # Scans queue here until warm-up finishes; past the wait they run cold rather than fail.
+        if self._done is None:
+            return False
+        if not self._done.is_set():
+            wait = self.admission_wait_seconds if timeout_seconds is None else timeout_seconds
+            try:
+                await asyncio.wait_for(asyncio.shield(self._done.wait()), timeout=wait)
+            except asyncio.TimeoutError:
+                return False
+        return self.ready
+
+    def snapshot(self) -> dict[str, Any]:
+        elapsed_ms = None
+        if self._started_at is not None:
+            end = self._finished_at if self._finished_at is not None else time.monotonic()
+            elapsed_ms = int((end - self._started_at) * 1000)
+        return {
+            "state": self.state(),
+            "pull_policy": self.pull_policy,
+            "elapsed_ms": elapsed_ms,
+            "images": [asdict(status) for status in self._statuses.values()],
+        }
+
+    async def _warm_all(self, images: list[RequiredImage]) -> None:
+        try:
+            await asyncio.gather(*(self._warm_one(image) for image in images))
+        finally:
+            self._finished_at = time.monotonic()
+            assert self._done is not None
+            self._done.set()
+            log_agent("-", WARMUP_COMPONENT, f"Warm-up finished state={self.state()}")
+
+    async def _warm_one(self, image: RequiredImage) -> None:
+        status = self._statuses[image.ref]
+        status.state = "warming"
+        try:
+            await asyncio.wait_for(self._prepare(image, status), timeout=self.timeout_seconds)
+            status.state = "ready"
+        except asyncio.TimeoutError:
+            status.state = "failed"
+            status.error = f"Warm-up timed out after {self.timeout_seconds}s"
+        except DockerEngineError as exc:
+            status.state = "failed"
+            status.error = exc.message[:500]
+        except Exception as exc:  # noqa: BLE001
+            status.state = "failed"
+            status.error = str(exc)[:500]
+        if status.error:
+            log_agent("-", WARMUP_COMPONENT, f"Image {image.ref} not warmed: {status.error}")
+
+    async def _prepare(self, image: RequiredImage, status: ImageStatus) -> None:
+        details = await docker_engine.inspect_image(image.ref)
+        if details is None and image.local_build:
+            raise RuntimeError(
+                f"Image {image.ref} is built locally and missing; build it from docker/scanners.Dockerfile"
+            )
+        if not image.local_build and (details is None or self.pull_policy == PULL_POLICY_ALWAYS):
+            started_at = time.monotonic()
+            await docker_engine.pull_image(image.ref)
+            status.pulled = True
+            status.pull_ms = int((time.monotonic() - started_at) * 1000)
+            details = await docker_engine.inspect_image(image.ref)
+        if details is None:
+            raise RuntimeError(f"Image {image.ref} is not available after pull")
+
+        status.image_id = str(details.get("Id") or "") or None
+        repo_digests = [str(item) for item in details.get("RepoDigests") or []]
+        # Locally built images (the scanner bundle) have no registry digest; the image ID
+        # is content-addressed either way and is what containers get pinned to.
+        status.digest = repo_digests[0] if repo_digests else status.image_id
+        if status.image_id:
+            docker_engine.pin_image(image.ref, status.image_id)
+
+        started_at = time.monotonic()
+        async with resource_budget.reserve("-", MAINTENANCE_RESOURCES, component=WARMUP_COMPONENT) as admission:
+            run = await docker_engine.run_container(
+                image.ref,
+                list(image.warmup_command),
+                timeout_seconds=60,
+                labels=docker_labels(infra=True),
+                network_disabled=True,
+                host_config=admission.host_config(),
+            )
+        status.warmup_ms = int((time.monotonic() - started_at) * 1000)
+        if run.timed_out or run.exit_code != 0:
+            details_text = (run.stderr or run.stdout or "").strip()[:300]
+            raise RuntimeError(f"Warm-up container exited with {run.exit_code}: {details_text}")
+
+
+image_warmup = ImageWarmup()
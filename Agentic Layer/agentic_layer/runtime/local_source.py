@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import os
+from pathlib import Path
+import re
+import shutil
+from urllib.parse import urlparse
+
+from agentic_layer.scan_graph.logger import log_agent
+
+
+# Uploaded projects are addressed as local://<user_id>/<project_id> and resolved under
+# DEPLAI_LOCAL_PROJECTS_ROOT, the Connector's tmp/local-projects directory. Clients never
+# pass host paths, so a scan cannot be pointed outside that root.
+LOCAL_SOURCE_SCHEME = "local"
+DEFAULT_LOCAL_PROJECTS_ROOT = os.path.join("..", "Connector", "tmp", "local-projects")
+SNAPSHOT_DIR_NAME = ".deplai-snapshots"
+
+SOURCE_MODE_BIND = "bind"
+SOURCE_MODE_HARDLINK = "hardlink"
+
+_SEGMENT = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def local_projects_root() -> Path:
+    configured = os.getenv("DEPLAI_LOCAL_PROJECTS_ROOT", "").strip()
+    return Path(configured or DEFAULT_LOCAL_PROJECTS_ROOT).resolve()
+
+
+def local_source_url(user_id: str, project_id: str) -> str:
+    return f"{LOCAL_SOURCE_SCHEME}://{user_id}/{project_id}"
+
+
+def is_local_source(repo_url: str) -> bool:
+    return urlparse(repo_url or "").scheme == LOCAL_SOURCE_SCHEME
+
+
+def resolve_local_source(repo_url: str) -> Path | None:
+    # Returns the project directory, or None if the URL is malformed or escapes the root.
+    parsed = urlparse(repo_url or "")
+    if parsed.scheme != LOCAL_SOURCE_SCHEME:
+        return None
+    segments = [parsed.netloc, *[part for part in parsed.path.split("/") if part]]
+    if len(segments) != 2 or not all(_SEGMENT.match(part) and part not in {".", ".."} for part in segments):
+        return None
+    root = local_projects_root()
+    candidate = root.joinpath(*segments).resolve()
+    if candidate.parent.parent != root or not candidate.is_dir():
+        return None
+    return candidate
+
+
+def resolve_source_mode() -> str:
+    mode = os.getenv("DEPLAI_LOCAL_SOURCE_MODE", SOURCE_MODE_BIND).strip().lower()
+    return mode if mode in {SOURCE_MODE_BIND, SOURCE_MODE_HARDLINK} else SOURCE_MODE_BIND
+
+
+@dataclass(frozen=True)
+class StagedSource:
+    path: str
+    mode: str
+    files: int = 0
+    copied_files: int = 0
+
+
+def _snapshot_root() -> Path:
+    return local_projects_root() / SNAPSHOT_DIR_NAME
+
+
+def _hardlink_tree(source: Path, target: Path) -> tuple[int, int]:
+    # Hardlinks share data blocks, so the snapshot costs one inode per file, and a
+    # re-upload (new files, new inodes) cannot change what the scan reads. Files on
+    # another filesystem fall back to a copy.
+    files = copied = 0
+    for dirpath, dirnames, filenames in os.walk(source):
+        relative = Path(dirpath).relative_to(source)
+        (target / relative).mkdir(parents=True, exist_ok=True)
+        dirnames[:] = [name for name in dirnames if not os.path.islink(os.path.join(dirpath, name))]
+        for filename in filenames:
+            origin = Path(dirpath, filename)
+            if origin.is_symlink() or not origin.is_file():
+                continue
+            destination = target / relative / filename
+            try:
+                os.link(origin, destination)
+            except OSError:
+                shutil.copy2(origin, destination)
+                copied += 1
+            files += 1
+    return files, copied
+
+
+async def stage_local_source(scan_id: str, source: Path, mode: str) -> StagedSource:
+    if mode != SOURCE_MODE_HARDLINK:
+        return StagedSource(path=str(source), mode=SOURCE_MODE_BIND)
+
+    safe_scan_id = re.sub(r"[^a-zA-Z0-9_.-]", "_", scan_id).lower() or "unknown"
+    target = _snapshot_root() / safe_scan_id
+    await asyncio.to_thread(shutil.rmtree, target, True)
+    files, copied = await asyncio.to_thread(_hardlink_tree, source, target)
+    return StagedSource(path=str(target), mode=SOURCE_MODE_HARDLINK, files=files, copied_files=copied)
+
+
+def is_snapshot(path: str) -> bool:
+    try:
+        return Path(path).resolve().parent == _snapshot_root()
+    except OSError:
+        return False
+
+
+async def release_local_source(path: str, scan_id: str, component: str) -> dict[str, bool]:
+    # Only snapshots this module created are deleted; a bind-attached project directory
+    # belongs to the user and is always left in place.
+    if is_snapshot(path):
+        await asyncio.to_thread(shutil.rmtree, path, True)
+        log_agent(scan_id, component, f"Removed local source snapshot {path}")
+        return {"local_snapshot_removed": True}
+    log_agent(scan_id, component, f"Local source {path} left in place")
+    return {"local_source_detached": True}
@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+import json
+import os
+import re
+from typing import Any
+from typing import Callable
+
+
+# Scanner output protocol: one JSON object per stdout line.
+#   {"event": "finding", "finding": {...}}
+#   {"event": "summary", "summary": {...}}
+#   {"event": "progress" | "checkpoint" | "error" | "file_skipped", ...}
+# A single legacy {"findings": [...], "summary": {...}} document is still accepted
+# as long as it fits within the line cap.
+EVENT_FINDING = "finding"
+EVENT_SUMMARY = "summary"
+EVENT_CHECKPOINT = "checkpoint"
+
+REDACTION_PATTERNS = [
+    re.compile(r"gh[pousr]_[A-Za-z0-9_]+"),
+    re.compile(r"lsv2_[A-Za-z0-9_]+"),
+    re.compile(r"(?i)(authorization\s*:\s*bearer\s+)[^\s]+"),
+    re.compile(r"(?i)(api[_-]?key\s*[=:]\s*)[^\s\"']+"),
+    re.compile(r"(?i)(token\s*[=:]\s*)[^\s\"']+"),
+]
+
+
+def redact_text(text: str) -> str:
+    if not text:
+        return ""
+    for pattern in REDACTION_PATTERNS:
+        text = pattern.sub("[REDACTED]", text)
+    return text
+
+
+def _redact_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return redact_text(value)
+    if isinstance(value, dict):
+        return {key: _redact_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_redact_value(item) for item in value]
+    return value
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, "").strip()
+    return int(raw) if raw.isdigit() and int(raw) > 0 else default
+
+
+@dataclass(frozen=True)
+class StreamCaps:
+    max_findings: int
+    max_bytes: int
+    max_line_bytes: int
+    preview_chars: int = 8000
+    stderr_tail_chars: int = 8000
+
+    @classmethod
+    def from_env(cls) -> "StreamCaps":
+        return cls(
+            max_findings=_env_int("DEPLAI_STREAM_MAX_FINDINGS", 5000),
+            max_bytes=_env_int("DEPLAI_STREAM_MAX_BYTES", 64 * 1024 * 1024),
+            max_line_bytes=_env_int("DEPLAI_STREAM_MAX_LINE_BYTES", 1024 * 1024),
+        )
+
+
+@dataclass
+class StreamStats:
+    bytes_read: int = 0
+    bytes_dropped: int = 0
+    lines: int = 0
+    findings_seen: int = 0
+    findings_dropped: int = 0
+    oversized_lines: int = 0
+    malformed_lines: int = 0
+    events: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def truncated(self) -> bool:
+        return bool(self.bytes_dropped or self.findings_dropped or self.oversized_lines)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "truncated": self.truncated}
+
+
+class NdjsonCollector:
+    # Incremental consumer for container stdout/stderr. Holds at most one partial
+    # line (bounded by max_line_bytes), the capped findings list, a short redacted
+    # stdout preview and a redacted stderr tail -- never the whole stream.
+
+    def __init__(
+        self,
+        caps: StreamCaps | None = None,
+        normalize: Callable[[dict[str, Any]], dict[str, Any] | None] | None = None,
+        max_events_kept: int = 100,
+    ) -> None:
+        self.caps = caps or StreamCaps.from_env()
+        self.normalize = normalize
+        self.max_events_kept = max_events_kept
+        self.findings: list[dict[str, Any]] = []
+        self.summary: dict[str, Any] = {}
+        self.events: list[dict[str, Any]] = []
+        self.stats = StreamStats()
+        self.summary_received = False
+        # The latest checkpoint, with how many collected findings preceded it.
+        self.checkpoint: dict[str, Any] | None = None
+        self._line = bytearray()
+        self._discarding_line = False
+        # Past max_bytes, lines are only scanned for the summary, which comes last.
+        self._over_cap = False
+        self._preview: list[str] = []
+        self._preview_len = 0
+        self._stderr_line = bytearray()
+        self._stderr_tail = ""
+
+    # Input
+
+    def feed(self, stream: int, chunk: bytes) -> None:
+        # Docker stream ids: 1 = stdout, 2 = stderr.
+        if stream == 2:
+            self.feed_stderr(chunk)
+        else:
+            self.feed_stdout(chunk)
+
+    def feed_stdout(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+        remaining = max(0, self.caps.max_bytes - self.stats.bytes_read)
+        head, tail = chunk[:remaining], chunk[remaining:]
+        self.stats.bytes_read += len(head)
+        self._split_lines(head)
+        if tail:
+            # Dropped bytes still pass through the line splitter (one bounded line at a
+            # time), so a stream over the cap keeps its trailing summary.
+            self.stats.bytes_dropped += len(tail)
+            self._over_cap = True
+            self._split_lines(tail)
+
+    def feed_stderr(self, chunk: bytes) -> None:
+        self._stderr_line.extend(chunk)
+        head, newline, rest = bytes(self._stderr_line).rpartition(b"\n")
+        if newline:
+            text = redact_text(head.decode("utf-8", errors="ignore"))
+            self._stderr_tail = (self._stderr_tail + text + "\n")[-self.caps.stderr_tail_chars :]
+            self._stderr_line = bytearray(rest)
+        # An unterminated stderr line only ever contributes its tail.
+        overflow = len(self._stderr_line) - self.caps.stderr_tail_chars
+        if overflow > 0:
+            del self._stderr_line[:overflow]
+
+    def close(self) -> None:
+        if self._line or self._discarding_line:
+            self._finish_line()
+        if self._stderr_line:
+            text = redact_text(bytes(self._stderr_line).decode("utf-8", errors="ignore"))
+            self._stderr_tail = (self._stderr_tail + text)[-self.caps.stderr_tail_chars :]
+            self._stderr_line = bytearray()
+
+    # Output
+
+    @property
+    def stdout_preview(self) -> str:
+        return "".join(self._preview)
+
+    @property
+    def stderr_tail(self) -> str:
+        return self._stderr_tail.strip()
+
+    @property
+    def has_protocol_output(self) -> bool:
+        # A stream cut at max_bytes is a truncated result (stats.truncated), not an invalid one.
+        return self.summary_received or self.stats.findings_seen > 0 or self.stats.bytes_dropped > 0
+
+    @property
+    def checkpointed_findings(self) -> list[dict[str, Any]]:
+        # Findings of the files completed by the last checkpoint: what a run resumed from
+        # that checkpoint will not report again.
+        if self.checkpoint is None:
+            return []
+        return self.findings[: self.checkpoint["findings_kept"]]
+
+    # Internals
+
+    def _split_lines(self, chunk: bytes) -> None:
+        start = 0
+        while True:
+            newline = chunk.find(b"\n", start)
+            if newline < 0:
+                self._append_partial(chunk[start:])
+                return
+            self._append_partial(chunk[start:newline])
+            self._finish_line()
+            start = newline + 1
+
+    def _append_partial(self, piece: bytes) -> None:
+        if self._discarding_line or not piece:
+            return
+        if len(self._line) + len(piece) > self.caps.max_line_bytes:
+            self._line = bytearray()
+            self._discarding_line = True
+            return
+        self._line.extend(piece)
+
+    def _finish_line(self) -> None:
+        self.stats.lines += 1
+        if self._discarding_line:
+            self.stats.oversized_lines += 1
+            self._discarding_line = False
+            self._line = bytearray()
+            return
+
+        raw = bytes(self._line).strip()
+        self._line = bytearray()
+        if not raw:
+            return
+        if self._over_cap:
+            self._handle_dropped_line(raw)
+            return
+        text = raw.decode("utf-8", errors="ignore")
+        self._remember_preview(text)
+
+        try:
+            payload = json.loads(text)
+        except json.JSONDecodeError:
+            self.stats.malformed_lines += 1
+            return
+        if not isinstance(payload, dict):
+            self.stats.malformed_lines += 1
+            return
+        self._handle_event(payload)
+
+    def _handle_dropped_line(self, raw: bytes) -> None:
+        # Findings and checkpoints past the cap are dropped: a checkpoint would claim
+        # findings that were never kept.
+        if b'"summary"' not in raw:
+            return
+        try:
+            payload = json.loads(raw)
+        except json.JSONDecodeError:
+            return
+        if isinstance(payload, dict) and payload.get("event") == EVENT_SUMMARY:
+            self._handle_event(payload)
+
+    def _handle_event(self, payload: dict[str, Any]) -> None:
+        event = payload.get("event")
+        if event is None and isinstance(payload.get("findings"), list):
+            for item in payload["findings"]:
+                self._add_finding(item)
+            if isinstance(payload.get("summary"), dict):
+                self.summary.update(_redact_value(payload["summary"]))
+            self.summary_received = True
+            return
+
+        event_name = str(event or "unknown")
+        self.stats.events[event_name] = self.stats.events.get(event_name, 0) + 1
+        if event_name == EVENT_FINDING:
+            self._add_finding(payload.get("finding"))
+        elif event_name == EVENT_SUMMARY:
+            summary = payload.get("summary")
+            if isinstance(summary, dict):
+                self.summary.update(_redact_value(summary))
+            self.summary_received = True
+        elif event_name == EVENT_CHECKPOINT:
+            fields = {key: value for key, value in payload.items() if key != "event"}
+            self.checkpoint = {**_redact_value(fields), "findings_kept": len(self.findings)}
+        elif len(self.events) < self.max_events_kept:
+            self.events.append(_redact_value(payload))
+
+    def _add_finding(self, item: Any) -> None:
+        if not isinstance(item, dict):
+            self.stats.malformed_lines += 1
+            return
+        self.stats.findings_seen += 1
+        if len(self.findings) >= self.caps.max_findings:
+            self.stats.findings_dropped += 1
+            return
+        finding = _redact_value(item)
+        if self.normalize is not None:
+            finding = self.normalize(finding)
+            if finding is None:
+                return
+        self.findings.append(finding)
+
+    def _remember_preview(self, text: str) -> None:
+        room = self.caps.preview_chars - self._preview_len
+        if room <= 0:
+            return
+        piece = redact_text(text)[:room] + "\n"
+        self._preview.append(piece)
+        self._preview_len += len(piece)
+
+
+class BoundedCapture:
+    # Plain-text capture for non-protocol containers (clone, stats): keeps the head
+    # of each stream up to a byte cap and counts the rest.
+
+    def __init__(self, max_bytes: int = 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self._stdout = bytearray()
+        self._stderr = bytearray()
+        self.bytes_dropped = 0
+
+    def feed(self, stream: int, chunk: bytes) -> None:
+        target = self._stderr if stream == 2 else self._stdout
+        room = self.max_bytes - len(target)
+        if room > 0:
+            target.extend(chunk[:room])
+        self.bytes_dropped += max(0, len(chunk) - max(room, 0))
+
+    @property
+    def stdout(self) -> str:
+        return self._stdout.decode("utf-8", errors="ignore")
+
+    @property
+    def stderr(self) -> str:
+        return self._stderr.decode("utf-8", errors="ignore")
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import itertools
+import os
+import time
+from typing import Any
+from typing import AsyncIterator
+
+from agentic_layer.scan_graph.logger import log_agent
+
+
+MIB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ResourceRequest:
+    cpus: float
+    memory_bytes: int
+    pids: int
+
+    def clamp(self, capacity: "ResourceRequest") -> "ResourceRequest":
+        return ResourceRequest(
+            cpus=min(self.cpus, capacity.cpus),
+            memory_bytes=min(self.memory_bytes, capacity.memory_bytes),
+            pids=min(self.pids, capacity.pids),
+        )
+
+
+# Per-container reservations; also applied as the container's hard limits.
+TOOL_RESOURCES = ResourceRequest(cpus=1.0, memory_bytes=512 * MIB, pids=128)
+SCANNER_RESOURCES = ResourceRequest(cpus=1.0, memory_bytes=512 * MIB, pids=128)
+# The AST scanner parses across a process pool sized to its CPU quota.
+AST_SCANNER_RESOURCES = ResourceRequest(cpus=4.0, memory_bytes=1024 * MIB, pids=128)
+CLONE_RESOURCES = ResourceRequest(cpus=1.0, memory_bytes=512 * MIB, pids=256)
+MAINTENANCE_RESOURCES = ResourceRequest(cpus=0.5, memory_bytes=128 * MIB, pids=64)
+
+
+@dataclass(frozen=True)
+class Admission:
+    request: ResourceRequest
+    queue_wait_ms: int
+    cgroup_parent: str | None
+
+    def host_config(self) -> dict[str, Any]:
+        config: dict[str, Any] = {
+            "NanoCpus": int(self.request.cpus * 1_000_000_000),
+            "Memory": self.request.memory_bytes,
+            "PidsLimit": self.request.pids,
+        }
+        if self.cgroup_parent:
+            config["CgroupParent"] = self.cgroup_parent
+        return config
+
+
+def _env_number(name: str, default: float) -> float:
+    raw = os.getenv(name, "").strip()
+    try:
+        value = float(raw) if raw else default
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def _host_memory_bytes() -> int:
+    try:
+        with open("/proc/meminfo", encoding="utf-8") as handle:
+            for line in handle:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 4096 * MIB
+
+
+def _default_capacity() -> ResourceRequest:
+    # Leave a quarter of host memory to the daemon, the API process and the page cache.
+    return ResourceRequest(
+        cpus=_env_number("DEPLAI_BUDGET_CPUS", float(os.cpu_count() or 2)),
+        memory_bytes=int(_env_number("DEPLAI_BUDGET_MEMORY_MB", _host_memory_bytes() * 0.75 / MIB) * MIB),
+        pids=int(_env_number("DEPLAI_BUDGET_PIDS", 4096)),
+    )
+
+
+class ResourceBudget:
+    # Host-wide admission control for scan containers. Every container reserves
+    # CPU/memory/pids tokens before it is created and returns them when it exits;
+    # requests are admitted strictly in arrival order so large ones cannot starve.
+
+    def __init__(self, capacity: ResourceRequest | None = None, cgroup_parent: str | None = None) -> None:
+        self.capacity = capacity or _default_capacity()
+        # Opt-in (e.g. DEPLAI_CGROUP_PARENT=deplai.slice): a parent cgroup needs systemd
+        # cgroup delegation, and rootless daemons reject it, failing every container create.
+        parent = cgroup_parent if cgroup_parent is not None else os.getenv("DEPLAI_CGROUP_PARENT", "")
+        self.cgroup_parent = parent.strip() or None
+        self._in_use = ResourceRequest(cpus=0.0, memory_bytes=0, pids=0)
+        self._queue: deque[int] = deque()
+        self._tickets = itertools.count()
+        self._condition: asyncio.Condition | None = None
+        self._condition_loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._condition_loop is not loop:
+            self._condition = asyncio.Condition()
+            self._condition_loop = loop
+        return self._condition
+
+    def _fits(self, request: ResourceRequest) -> bool:
+        return (
+            self._in_use.cpus + request.cpus <= self.capacity.cpus + 1e-9
+            and self._in_use.memory_bytes + request.memory_bytes <= self.capacity.memory_bytes
+            and self._in_use.pids + request.pids <= self.capacity.pids
+        )
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "capacity": {
+                "cpus": self.capacity.cpus,
+                "memory_bytes": self.capacity.memory_bytes,
+                "pids": self.capacity.pids,
+            },
+            "in_use": {
+                "cpus": round(self._in_use.cpus, 3),
+                "memory_bytes": self._in_use.memory_bytes,
+                "pids": self._in_use.pids,
+            },
+            "queued": len(self._queue),
+            "cgroup_parent": self.cgroup_parent,
+        }
+
+    @asynccontextmanager
+    async def reserve(
+        self,
+        scan_id: str,
+        request: ResourceRequest,
+        component: str = "ResourceBudget",
+    ) -> AsyncIterator[Admission]:
+        # A request larger than the whole budget is clamped so it can still run alone.
+        request = request.clamp(self.capacity)
+        condition = self._get_condition()
+        ticket = next(self._tickets)
+        enqueued_at = time.monotonic()
+
+        async with condition:
+            self._queue.append(ticket)
+            try:
+                await condition.wait_for(lambda: self._queue[0] == ticket and self._fits(request))
+            except BaseException:
+                self._queue.remove(ticket)
+                condition.notify_all()
+                raise
+            self._queue.popleft()
+            self._in_use = ResourceRequest(
+                cpus=self._in_use.cpus + request.cpus,
+                memory_bytes=self._in_use.memory_bytes + request.memory_bytes,
+                pids=self._in_use.pids + request.pids,
+            )
+            # The next in line may fit in what is left.
+            condition.notify_all()
+
+        queue_wait_ms = int((time.monotonic() - enqueued_at) * 1000)
+        if queue_wait_ms >= 1000:
+            log_agent(scan_id, component, f"Container admitted after queue_wait_ms={queue_wait_ms}")
+        try:
+            yield Admission(request=request, queue_wait_ms=queue_wait_ms, cgroup_parent=self.cgroup_parent)
+        finally:
+            async with condition:
+                self._in_use = ResourceRequest(
+                    cpus=max(0.0, self._in_use.cpus - request.cpus),
+                    memory_bytes=max(0, self._in_use.memory_bytes - request.memory_bytes),
+                    pids=max(0, self._in_use.pids - request.pids),
+                )
+                condition.notify_all()
+
+
+resource_budget = ResourceBudget()
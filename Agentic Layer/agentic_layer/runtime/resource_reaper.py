@@ -0,0 +1,429 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from dataclasses import replace
+import os
+import sqlite3
+import time
+from typing import Callable
+from typing import Iterable
+
+from agentic_layer.runtime.docker_engine import DockerEngineError
+from agentic_layer.runtime.docker_engine import INFRA_LABEL
+from agentic_layer.runtime.docker_engine import MANAGED_LABEL
+from agentic_layer.runtime.docker_engine import POOL_ID_LABEL
+from agentic_layer.runtime.docker_engine import POOL_LABEL
+from agentic_layer.runtime.docker_engine import SCAN_ID_LABEL
+from agentic_layer.runtime.docker_engine import docker_engine
+from agentic_layer.runtime.volume_pool import drop_pool_leases
+from agentic_layer.runtime.volume_pool import live_pool_ids
+from agentic_layer.runtime.volume_pool import pool_lease_scan_ids
+from agentic_layer.runtime.volume_pool import volume_pool
+from agentic_layer.scan_graph.logger import log_agent
+from agentic_layer.scan_graph.nodes.cleanup.result_persister import _db_path
+
+
+REAPER_COMPONENT = "ResourceReaper"
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name, "").strip()
+    try:
+        value = float(raw) if raw else default
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+@dataclass(frozen=True)
+class ManagedResource:
+    kind: str
+    ref: str
+    scan_id: str
+    pooled: bool = False
+    pool_id: str = ""
+    # Service-owned container still running (pool scrub, image warm-up); not the reaper's.
+    infra_active: bool = False
+
+
+def _connect() -> sqlite3.Connection:
+    connection = sqlite3.connect(_db_path(), timeout=5.0)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS scan_heartbeats (scan_id TEXT PRIMARY KEY, heartbeat_at REAL NOT NULL)"
+    )
+    return connection
+
+
+def _write_heartbeats(scan_ids: Iterable[str]) -> None:
+    # Every API worker records its running scans here, so a reaper in any worker
+    # sees every worker's scans as live.
+    now = time.time()
+    rows = [(scan_id, now) for scan_id in sorted(set(scan_ids)) if scan_id]
+    if not rows:
+        return
+    connection = _connect()
+    try:
+        with connection:
+            connection.executemany(
+                "INSERT INTO scan_heartbeats (scan_id, heartbeat_at) VALUES (?, ?) "
+                "ON CONFLICT(scan_id) DO UPDATE SET heartbeat_at = excluded.heartbeat_at",
+                rows,
+            )
+    finally:
+        connection.close()
+
+
+def _drop_heartbeat(scan_id: str) -> None:
+    connection = _connect()
+    try:
+        with connection:
+            connection.execute("DELETE FROM scan_heartbeats WHERE scan_id = ?", (scan_id,))
+    finally:
+        connection.close()
+
+
+def _heartbeat_scan_ids(max_age_seconds: float) -> set[str]:
+    # Scans some worker reported within max_age_seconds; stale rows (a crashed worker) are dropped.
+    if not os.path.exists(_db_path()):
+        return set()
+    cutoff = time.time() - max_age_seconds
+    connection = _connect()
+    try:
+        with connection:
+            connection.execute("DELETE FROM scan_heartbeats WHERE heartbeat_at < ?", (cutoff,))
+            rows = connection.execute("SELECT scan_id FROM scan_heartbeats").fetchall()
+    finally:
+        connection.close()
+    return {str(row[0]) for row in rows}
+
+
+def _persisted_scan_ids(scan_ids: Iterable[str]) -> set[str]:
+    wanted = sorted({scan_id for scan_id in scan_ids if scan_id})
+    if not wanted or not os.path.exists(_db_path()):
+        return set()
+
+    placeholders = ", ".join("?" for _ in wanted)
+    connection = sqlite3.connect(_db_path())
+    try:
+        rows = connection.execute(
+            f"SELECT scan_id FROM scan_results WHERE scan_id IN ({placeholders})",
+            wanted,
+        ).fetchall()
+    except sqlite3.Error:
+        return set()
+    finally:
+        connection.close()
+    return {str(row[0]) for row in rows}
+
+
+class ResourceReaper:
+    # Periodically lists every deplai-labelled volume/container in one call per kind,
+    # and removes the ones whose scan is neither running nor pending.
+    #
+    # A scan is live while any API worker runs it: each worker heartbeats its own
+    # scans into the scan database, and a heartbeat younger than
+    # `heartbeat_ttl_seconds` counts as running. Finished scans (persisted) are reaped
+    # on the first sweep; unknown scans only after being seen orphaned on
+    # `grace_sweeps` consecutive sweeps. Running infra containers are never reaped.
+    #
+    # Pooled volumes belong to the pool named by their pool id label while that pool
+    # heartbeats; a volume of a pool that stopped beating is judged by the scan its
+    # recorded lease names, like any scan volume.
+
+    def __init__(
+        self,
+        interval_seconds: float | None = None,
+        grace_sweeps: int = 2,
+        concurrency: int | None = None,
+        removals_per_second: float | None = None,
+        heartbeat_seconds: float | None = None,
+    ) -> None:
+        self.interval_seconds = (
+            interval_seconds
+            if interval_seconds is not None
+            else _env_float("DEPLAI_REAPER_INTERVAL_SECONDS", 120.0)
+        )
+        self.heartbeat_seconds = (
+            heartbeat_seconds
+            if heartbeat_seconds is not None
+            else _env_float("DEPLAI_REAPER_HEARTBEAT_SECONDS", 30.0)
+        )
+        # A few missed beats (a busy event loop, a slow disk) do not make a scan an orphan.
+        self.heartbeat_ttl_seconds = self.heartbeat_seconds * 4
+        self.grace_sweeps = max(1, grace_sweeps)
+        self.concurrency = int(concurrency if concurrency is not None else _env_float("DEPLAI_REAPER_CONCURRENCY", 4))
+        self.removals_per_second = (
+            removals_per_second
+            if removals_per_second is not None
+            else _env_float("DEPLAI_REAPER_REMOVALS_PER_SECOND", 5.0)
+        )
+        self._live_scan_probes: list[Callable[[], Iterable[str]]] = []
+        self._active_workflows: dict[str, int] = {}
+        self._suspects: dict[tuple[str, str], int] = {}
+        self._handoff: asyncio.Queue[ManagedResource] | None = None
+        self._tasks: list[asyncio.Task[None]] = []
+        self._rate_lock = asyncio.Lock()
+        self._last_removal_at = 0.0
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def add_live_scan_probe(self, probe: Callable[[], Iterable[str]]) -> None:
+        self._live_scan_probes.append(probe)
+
+    def mark_workflow_started(self, scan_id: str) -> None:
+        self._active_workflows[scan_id] = self._active_workflows.get(scan_id, 0) + 1
+        try:
+            _write_heartbeats([scan_id])
+        except sqlite3.Error as exc:
+            log_agent(scan_id, REAPER_COMPONENT, f"Heartbeat write failed: {exc}")
+
+    def mark_workflow_finished(self, scan_id: str) -> None:
+        remaining = self._active_workflows.get(scan_id, 0) - 1
+        if remaining > 0:
+            self._active_workflows[scan_id] = remaining
+            return
+        self._active_workflows.pop(scan_id, None)
+        try:
+            _drop_heartbeat(scan_id)
+        except sqlite3.Error as exc:
+            log_agent(scan_id, REAPER_COMPONENT, f"Heartbeat removal failed: {exc}")
+
+    def local_scan_ids(self) -> set[str]:
+        # Scans running in this process.
+        live = set(self._active_workflows)
+        for probe in self._live_scan_probes:
+            try:
+                live.update(probe())
+            except Exception:  # noqa: BLE001
+                continue
+        return live
+
+    def _shared_scan_ids(self) -> set[str]:
+        # If the shared heartbeats cannot be read, the local set is all that is known,
+        # and the sweep's grace period covers the rest.
+        try:
+            return _heartbeat_scan_ids(self.heartbeat_ttl_seconds)
+        except sqlite3.Error as exc:
+            log_agent("-", REAPER_COMPONENT, f"Heartbeat read failed: {exc}")
+            return set()
+
+    def _shared_pool_state(self) -> tuple[set[str], dict[str, str]] | None:
+        # None when the pool tables cannot be read: no pooled volume is judged this sweep.
+        try:
+            return live_pool_ids(volume_pool.heartbeat_ttl_seconds), pool_lease_scan_ids()
+        except sqlite3.Error as exc:
+            log_agent("-", REAPER_COMPONENT, f"Pool state read failed: {exc}")
+            return None
+
+    def live_scan_ids(self) -> set[str]:
+        # Scans running in any worker.
+        return self.local_scan_ids() | self._shared_scan_ids()
+
+    def schedule_volume_removal(self, volume_name: str, scan_id: str) -> bool:
+        # Hand-off from cleanup nodes: the scan does not wait on `docker volume rm`.
+        if not self._running or self._handoff is None:
+            return False
+        self._handoff.put_nowait(ManagedResource(kind="volume", ref=volume_name, scan_id=scan_id))
+        log_agent(scan_id, REAPER_COMPONENT, f"Volume removal scheduled for {volume_name}")
+        return True
+
+    async def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._handoff = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._heartbeat_loop()),
+            asyncio.create_task(self._sweep_loop()),
+            *(asyncio.create_task(self._handoff_worker()) for _ in range(max(1, self.concurrency))),
+        ]
+        log_agent("-", REAPER_COMPONENT, f"Reaper started interval={self.interval_seconds}s")
+
+    async def stop(self) -> None:
+        self._running = False
+        pending: list[ManagedResource] = []
+        if self._handoff is not None:
+            while not self._handoff.empty():
+                pending.append(self._handoff.get_nowait())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._handoff = None
+        # Drain hand-offs synchronously so a clean shutdown leaves nothing for the next process.
+        if pending:
+            await self._remove_all(pending)
+
+    async def sweep(self) -> dict[str, int]:
+        resources = [*await self._list_volumes(), *await self._list_containers()]
+        live = self.local_scan_ids() | await asyncio.to_thread(self._shared_scan_ids)
+        pool_state = await asyncio.to_thread(self._shared_pool_state)
+        live_pools, pool_leases = pool_state if pool_state is not None else (set(), {})
+        # A pooled volume carries no scan label; its recorded lease names the scan holding it.
+        resources = [
+            replace(item, scan_id=pool_leases[item.ref]) if item.pooled and item.ref in pool_leases else item
+            for item in resources
+        ]
+        persisted = await asyncio.to_thread(_persisted_scan_ids, (item.scan_id for item in resources))
+
+        orphans: list[ManagedResource] = []
+        seen: set[tuple[str, str]] = set()
+        for resource in resources:
+            key = (resource.kind, resource.ref)
+            if resource.pooled and (
+                pool_state is None or volume_pool.owns(resource.ref) or resource.pool_id in live_pools
+            ):
+                continue
+            if resource.infra_active:
+                continue
+            if resource.scan_id and resource.scan_id in live:
+                continue
+
+            seen.add(key)
+            if resource.scan_id and resource.scan_id in persisted:
+                orphans.append(resource)
+                continue
+            sightings = self._suspects.get(key, 0) + 1
+            self._suspects[key] = sightings
+            if sightings >= self.grace_sweeps:
+                orphans.append(resource)
+
+        # Anything not seen this round (gone, or live again) starts its grace period over.
+        self._suspects = {key: count for key, count in self._suspects.items() if key in seen}
+
+        removed = await self._remove_all(orphans)
+        for resource in orphans:
+            self._suspects.pop((resource.kind, resource.ref), None)
+        pooled_orphans = [resource.ref for resource in orphans if resource.pooled]
+        if pooled_orphans:
+            try:
+                await asyncio.to_thread(drop_pool_leases, pooled_orphans)
+            except sqlite3.Error as exc:
+                log_agent("-", REAPER_COMPONENT, f"Pool lease removal failed: {exc}")
+
+        summary = {
+            "listed": len(resources),
+            "live_scans": len(live),
+            "orphans": len(orphans),
+            "removed": removed,
+        }
+        if orphans:
+            log_agent("-", REAPER_COMPONENT, f"Sweep complete {summary}")
+        return summary
+
+    async def _heartbeat_loop(self) -> None:
+        while self._running:
+            try:
+                await asyncio.to_thread(_write_heartbeats, self.local_scan_ids())
+            except sqlite3.Error as exc:
+                log_agent("-", REAPER_COMPONENT, f"Heartbeat write failed: {exc}")
+            await asyncio.sleep(self.heartbeat_seconds)
+
+    async def _sweep_loop(self) -> None:
+        while self._running:
+            try:
+                await self.sweep()
+            except Exception as exc:  # noqa: BLE001
+                log_agent("-", REAPER_COMPONENT, f"Sweep failed: {exc}")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def _handoff_worker(self) -> None:
+        assert self._handoff is not None
+        queue = self._handoff
+        while True:
+            resource = await queue.get()
+            try:
+                await self._remove(resource)
+            finally:
+                queue.task_done()
+
+    async def _list_volumes(self) -> list[ManagedResource]:
+        try:
+            volumes = await docker_engine.list_volumes(labels={MANAGED_LABEL: "true"})
+        except DockerEngineError:
+            return []
+        resources: list[ManagedResource] = []
+        for volume in volumes:
+            labels = volume.get("Labels") or {}
+            name = str(volume.get("Name") or "").strip()
+            if name:
+                resources.append(
+                    ManagedResource(
+                        kind="volume",
+                        ref=name,
+                        scan_id=str(labels.get(SCAN_ID_LABEL) or ""),
+                        pooled=labels.get(POOL_LABEL) == "true",
+                        pool_id=str(labels.get(POOL_ID_LABEL) or ""),
+                    )
+                )
+        return resources
+
+    async def _list_containers(self) -> list[ManagedResource]:
+        try:
+            containers = await docker_engine.list_containers(labels={MANAGED_LABEL: "true"})
+        except DockerEngineError:
+            return []
+        resources: list[ManagedResource] = []
+        for container in containers:
+            labels = container.get("Labels") or {}
+            container_id = str(container.get("Id") or "").strip()
+            if container_id:
+                resources.append(
+                    ManagedResource(
+                        kind="container",
+                        ref=container_id,
+                        scan_id=str(labels.get(SCAN_ID_LABEL) or ""),
+                        infra_active=labels.get(INFRA_LABEL) == "true" and container.get("State") == "running",
+                    )
+                )
+        return resources
+
+    async def _remove_all(self, resources: list[ManagedResource]) -> int:
+        if not resources:
+            return 0
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+
+        async def _bounded(resource: ManagedResource) -> bool:
+            async with semaphore:
+                return await self._remove(resource)
+
+        # Containers first: a volume cannot be removed while a container still mounts it.
+        containers = [item for item in resources if item.kind == "container"]
+        volumes = [item for item in resources if item.kind != "container"]
+        results = await asyncio.gather(*(_bounded(item) for item in containers))
+        results += await asyncio.gather(*(_bounded(item) for item in volumes))
+        return sum(1 for ok in results if ok)
+
+    async def _throttle(self) -> None:
+        if self.removals_per_second <= 0:
+            return
+        spacing = 1.0 / self.removals_per_second
+        async with self._rate_lock:
+            wait = self._last_removal_at + spacing - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_removal_at = time.monotonic()
+
+    async def _remove(self, resource: ManagedResource) -> bool:
+        await self._throttle()
+        try:
+            if resource.kind == "container":
+                await docker_engine.remove_container(resource.ref, force=True)
+            else:
+                await docker_engine.remove_volume(resource.ref, force=True)
+        except DockerEngineError as exc:
+            log_agent(
+                resource.scan_id or "-",
+                REAPER_COMPONENT,
+                f"Removing {resource.kind} {resource.ref} failed; will retry next sweep: {exc.message[:200]}",
+            )
+            return False
+        log_agent(resource.scan_id or "-", REAPER_COMPONENT, f"Removed {resource.kind} {resource.ref}")
+        return True
+
+
+resource_reaper = ResourceReaper()
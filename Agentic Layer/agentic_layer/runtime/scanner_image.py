@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import os
+
+from agentic_layer.scanners import SCANNER_VERSION
+
+
+# Every scanner (analysis nodes, planner, stats and ToolRuntime tools) runs from one
+# locally built image: docker/scanners.Dockerfile, tagged with SCANNER_VERSION so a
+# scanner change never silently reuses a stale image or cached result.
+SCANNER_IMAGE_REPOSITORY = "deplai-scanners"
+
+# Third-party images: git for the clone step, plain alpine for volume scrubbing.
+CLONE_IMAGE = "alpine/git"
+MAINTENANCE_IMAGE = "alpine"
+
+# Per-file scanner results (AST rule hits, taint summaries) keyed by content hash and
+# shared by every scan; entries are version-salted, so the volume never needs clearing.
+SCANNER_CACHE_VOLUME = "deplai-scanner-cache"
+SCANNER_CACHE_PATH = "/cache"
+
+
+def scanner_image() -> str:
+    configured = os.getenv("DEPLAI_SCANNER_IMAGE", "").strip()
+    return configured or f"{SCANNER_IMAGE_REPOSITORY}:{SCANNER_VERSION}"
+
+
+def scanner_image_is_local() -> bool:
+    # The default image is built on the host and exists in no registry; an image set
+    # through DEPLAI_SCANNER_IMAGE is assumed to be pushed somewhere it can be pulled from.
+    return not os.getenv("DEPLAI_SCANNER_IMAGE", "").strip()
+
+
+def scanner_cache_enabled() -> bool:
+    return os.getenv("DEPLAI_SCANNER_CACHE", "on").strip().lower() not in {"off", "0", "false", "no"}
+
+
+def scanner_command(
+    tool: str,
+    root: str = "/workspace",
+    cache_dir: str | None = None,
+    start_offset: int = 0,
+    files: list[str] | None = None,
+    shard: str | None = None,
+) -> list[str]:
+    # The image entrypoint is `python -m agentic_layer.scanners`.
+    command = [tool, "--root", root]
+    if cache_dir:
+        command += ["--cache-dir", cache_dir]
+    if start_offset:
+        command += ["--start-offset", str(start_offset)]
+    for file in files or []:
+        command += ["--file", file]
+    if shard:
+        command += ["--shard", shard]
+    return command
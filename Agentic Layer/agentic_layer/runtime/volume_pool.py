@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import os
+import sqlite3
+import time
+from typing import Callable
+from typing import Iterable
+from uuid import uuid4
+
+from agentic_layer.runtime.docker_engine import DockerEngineError
+from agentic_layer.runtime.docker_engine import docker_engine
+from agentic_layer.runtime.docker_engine import docker_labels
+from agentic_layer.runtime.resource_budget import MAINTENANCE_RESOURCES
+from agentic_layer.runtime.resource_budget import resource_budget
+from agentic_layer.runtime.scanner_image import MAINTENANCE_IMAGE
+from agentic_layer.scan_graph.logger import log_agent
+from agentic_layer.scan_graph.nodes.cleanup.result_persister import _db_path
+
+
+POOL_COMPONENT = "VolumePool"
+POOL_VOLUME_PREFIX = "deplai_code_pool_"
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, "").strip()
+    if raw.isdigit():
+        return int(raw)
+    return default
+
+
+def _connect() -> sqlite3.Connection:
+    connection = sqlite3.connect(_db_path(), timeout=5.0)
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS pool_heartbeats (pool_id TEXT PRIMARY KEY, heartbeat_at REAL NOT NULL)"
+    )
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS pool_leases "
+        "(volume_name TEXT PRIMARY KEY, pool_id TEXT NOT NULL, scan_id TEXT NOT NULL)"
+    )
+    return connection
+
+
+def _write_pool_heartbeat(pool_id: str) -> None:
+    # Pooled volumes carry their pool's id as a label; a reaper in any worker spares
+    # the volumes of every pool that heartbeats here.
+    connection = _connect()
+    try:
+        with connection:
+            connection.execute(
+                "INSERT INTO pool_heartbeats (pool_id, heartbeat_at) VALUES (?, ?) "
+                "ON CONFLICT(pool_id) DO UPDATE SET heartbeat_at = excluded.heartbeat_at",
+                (pool_id, time.time()),
+            )
+    finally:
+        connection.close()
+
+
+def _drop_pool_heartbeat(pool_id: str) -> None:
+    connection = _connect()
+    try:
+        with connection:
+            connection.execute("DELETE FROM pool_heartbeats WHERE pool_id = ?", (pool_id,))
+    finally:
+        connection.close()
+
+
+def _record_lease(volume_name: str, pool_id: str, scan_id: str) -> None:
+    connection = _connect()
+    try:
+        with connection:
+            connection.execute(
+                "INSERT INTO pool_leases (volume_name, pool_id, scan_id) VALUES (?, ?, ?) "
+                "ON CONFLICT(volume_name) DO UPDATE SET pool_id = excluded.pool_id, scan_id = excluded.scan_id",
+                (volume_name, pool_id, scan_id),
+            )
+    finally:
+        connection.close()
+
+
+def drop_pool_leases(volume_names: Iterable[str]) -> None:
+    rows = [(name,) for name in sorted(set(volume_names)) if name]
+    if not rows:
+        return
+    connection = _connect()
+    try:
+        with connection:
+            connection.executemany("DELETE FROM pool_leases WHERE volume_name = ?", rows)
+    finally:
+        connection.close()
+
+
+def live_pool_ids(max_age_seconds: float) -> set[str]:
+    # Pools some worker heartbeated within max_age_seconds; stale rows (a crashed worker) are dropped.
+    if not os.path.exists(_db_path()):
+        return set()
+    cutoff = time.time() - max_age_seconds
+    connection = _connect()
+    try:
+        with connection:
+            connection.execute("DELETE FROM pool_heartbeats WHERE heartbeat_at < ?", (cutoff,))
+            rows = connection.execute("SELECT pool_id FROM pool_heartbeats").fetchall()
+    finally:
+        connection.close()
+    return {str(row[0]) for row in rows}
+
+
+def pool_lease_scan_ids() -> dict[str, str]:
+    # Pooled volume name -> the scan leasing it, across every worker's pool.
+    if not os.path.exists(_db_path()):
+        return {}
+    connection = _connect()
+    try:
+        rows = connection.execute("SELECT volume_name, scan_id FROM pool_leases").fetchall()
+    finally:
+        connection.close()
+    return {str(row[0]): str(row[1]) for row in rows}
+
+
+@dataclass
+class VolumeLease:
+    volume_name: str
+    scan_id: str
+    leased_at: float
+
+
+class VolumePool:
+    # Keeps a few wiped code volumes ready so scans skip `docker volume create`
+    # at start and `docker volume rm` at the end. Returned volumes are scrubbed
+    # in the background before being handed out again.
+    #
+    # Volumes are labelled with this pool's id, and the pool heartbeats and records
+    # its leases in the scan database, so reapers in other workers can tell its
+    # volumes (and the scans holding them) from orphans.
+
+    def __init__(
+        self,
+        size: int | None = None,
+        scrub_image: str = MAINTENANCE_IMAGE,
+        lease_ttl_seconds: int | None = None,
+        maintenance_interval_seconds: float = 30.0,
+    ) -> None:
+        self.size = size if size is not None else _env_int("DEPLAI_VOLUME_POOL_SIZE", 2)
+        self.scrub_image = scrub_image
+        self.lease_ttl_seconds = (
+            lease_ttl_seconds
+            if lease_ttl_seconds is not None
+            else _env_int("DEPLAI_VOLUME_LEASE_TTL_SECONDS", 3600)
+        )
+        self.maintenance_interval_seconds = maintenance_interval_seconds
+        # A few missed beats (a slow refill, a busy event loop) do not orphan the pool's volumes.
+        self.heartbeat_ttl_seconds = maintenance_interval_seconds * 4
+        self.pool_id = uuid4().hex[:12]
+        self._ready: list[str] = []
+        self._leases: dict[str, VolumeLease] = {}
+        self._scrubbing: set[str] = set()
+        self._background: set[asyncio.Task[None]] = set()
+        self._maintenance_task: asyncio.Task[None] | None = None
+        self._refill_lock = asyncio.Lock()
+        self._live_scan_probes: list[Callable[[], Iterable[str]]] = []
+        self._running = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0 and self._running
+
+    def owns(self, volume_name: str) -> bool:
+        return volume_name in self._leases or volume_name in self._scrubbing or volume_name in self._ready
+
+    def add_live_scan_probe(self, probe: Callable[[], Iterable[str]]) -> None:
+        self._live_scan_probes.append(probe)
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "size": self.size,
+            "ready": len(self._ready),
+            "leased": len(self._leases),
+            "scrubbing": len(self._scrubbing),
+        }
+
+    async def start(self) -> None:
+        if self.size <= 0 or self._running:
+            return
+        self._running = True
+        await self._heartbeat()
+        await self._refill()
+        self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+        log_agent("-", POOL_COMPONENT, f"Volume pool started {self.snapshot()}")
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+            self._maintenance_task = None
+
+        idle = list(self._ready)
+        self._ready.clear()
+        await asyncio.gather(*(self._remove(name) for name in idle), return_exceptions=True)
+        # Volumes still leased stay protected by their scans' recorded leases.
+        try:
+            await asyncio.to_thread(_drop_pool_heartbeat, self.pool_id)
+        except sqlite3.Error as exc:
+            log_agent("-", POOL_COMPONENT, f"Pool heartbeat removal failed: {exc}")
+        log_agent("-", POOL_COMPONENT, f"Volume pool stopped; removed {len(idle)} idle volumes")
+
+    def lease(self, scan_id: str) -> str | None:
+        if not self.enabled or not self._ready:
+            return None
+        volume_name = self._ready.pop()
+        self._leases[volume_name] = VolumeLease(volume_name=volume_name, scan_id=scan_id, leased_at=time.monotonic())
+        try:
+            _record_lease(volume_name, self.pool_id, scan_id)
+        except sqlite3.Error as exc:
+            log_agent(scan_id, POOL_COMPONENT, f"Lease record failed for {volume_name}: {exc}")
+        log_agent(scan_id, POOL_COMPONENT, f"Leased pooled volume {volume_name}")
+        self._spawn(self._refill())
+        return volume_name
+
+    def release(self, volume_name: str) -> bool:
+        lease = self._leases.pop(volume_name, None)
+        if lease is None:
+            return False
+        try:
+            drop_pool_leases([volume_name])
+        except sqlite3.Error as exc:
+            log_agent(lease.scan_id, POOL_COMPONENT, f"Lease removal failed for {volume_name}: {exc}")
+        log_agent(lease.scan_id, POOL_COMPONENT, f"Returned pooled volume {volume_name} for scrubbing")
+        self._scrubbing.add(volume_name)
+        self._spawn(self._scrub_and_recycle(volume_name))
+        return True
+
+    def reclaim_scan(self, scan_id: str) -> int:
+        held = [name for name, lease in self._leases.items() if lease.scan_id == scan_id]
+        for volume_name in held:
+            self.release(volume_name)
+        return len(held)
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _maintenance_loop(self) -> None:
+        while self._running:
+            await asyncio.sleep(self.maintenance_interval_seconds)
+            await self._heartbeat()
+            self._detect_leaks()
+            await self._refill()
+
+    async def _heartbeat(self) -> None:
+        try:
+            await asyncio.to_thread(_write_pool_heartbeat, self.pool_id)
+        except sqlite3.Error as exc:
+            log_agent("-", POOL_COMPONENT, f"Pool heartbeat write failed: {exc}")
+
+    def _live_scan_ids(self) -> set[str] | None:
+        # None when a probe fails: liveness is unknown, so no lease counts as leaked.
+        live: set[str] = set()
+        for probe in self._live_scan_probes:
+            try:
+                live.update(probe())
+            except Exception:  # noqa: BLE001
+                return None
+        return live
+
+    def _detect_leaks(self) -> None:
+        # A lease past its TTL is only leaked once its scan is no longer running;
+        # long scans keep their workspace.
+        if self.lease_ttl_seconds <= 0:
+            return
+        now = time.monotonic()
+        expired = [
+            lease for lease in self._leases.values() if now - lease.leased_at > self.lease_ttl_seconds
+        ]
+        live = self._live_scan_ids() if expired else set()
+        if live is None:
+            return
+        leaked = [lease for lease in expired if lease.scan_id not in live]
+        for lease in leaked:
+            log_agent(
+                lease.scan_id,
+                POOL_COMPONENT,
+                f"Lease on {lease.volume_name} exceeded {self.lease_ttl_seconds}s; reclaiming leaked volume",
+            )
+            self.release(lease.volume_name)
+
+    async def _refill(self) -> None:
+        async with self._refill_lock:
+            missing = self.size - len(self._ready) - len(self._scrubbing)
+            if not self._running or missing <= 0:
+                return
+            created = await asyncio.gather(*(self._create() for _ in range(missing)))
+            self._ready.extend(name for name in created if name)
+
+    async def _create(self) -> str | None:
+        volume_name = f"{POOL_VOLUME_PREFIX}{uuid4().hex[:12]}"
+        try:
+            return await docker_engine.create_volume(volume_name, labels=docker_labels(pool=True, pool_id=self.pool_id))
+        except DockerEngineError as exc:
+            log_agent("-", POOL_COMPONENT, f"Pooled volume creation failed: {exc.message[:200]}")
+            return None
+
+    async def _scrub_and_recycle(self, volume_name: str) -> None:
+        try:
+            async with resource_budget.reserve("-", MAINTENANCE_RESOURCES, component=POOL_COMPONENT) as admission:
+                run = await docker_engine.run_container(
+                    self.scrub_image,
+                    ["find", "/workspace/code", "-mindepth", "1", "-delete"],
+                    timeout_seconds=300.0,
+                    labels=docker_labels(infra=True),
+                    binds=[f"{volume_name}:/workspace/code"],
+                    network_disabled=True,
+                    host_config=admission.host_config(),
+                )
+            scrubbed, details = run.exit_code == 0, (run.stderr or run.stdout)
+        except DockerEngineError as exc:
+            scrubbed, details = False, exc.message
+        self._scrubbing.discard(volume_name)
+        if not scrubbed or not self._running or len(self._ready) >= self.size:
+            if not scrubbed:
+                log_agent("-", POOL_COMPONENT, f"Scrub failed for {volume_name}; discarding: {details[:200]}")
+            await self._remove(volume_name)
+            return
+        self._ready.append(volume_name)
+
+    async def _remove(self, volume_name: str) -> None:
+        try:
+            await docker_engine.remove_volume(volume_name, force=True)
+        except DockerEngineError as exc:
+            log_agent("-", POOL_COMPONENT, f"Removing pooled volume {volume_name} failed: {exc.message[:200]}")
+
+
+volume_pool = VolumePool()
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import time
+
 from langgraph.graph import END
 from langgraph.graph import START
 from langgraph.graph import StateGraph
 
+from agentic_layer.runtime.execution_backend import execution_backend
+from agentic_layer.runtime.resource_reaper import resource_reaper
+from agentic_layer.runtime.volume_pool import volume_pool
+from agentic_layer.shared.github_client import github_client
 from agentic_layer.scan_graph.logger import log_agent
 from agentic_layer.scan_graph.nodes.cleanup.final_event_dispatcher import final_event_dispatcher_node
 from agentic_layer.scan_graph.observability import traceable_if_available
 from agentic_layer.scan_graph.nodes.error_handler import error_handler_node
+from agentic_layer.scan_graph.subgraphs.acquisition_subgraph import acquisition_subgraph
 from agentic_layer.scan_graph.subgraphs.analysis_subgraph import analysis_subgraph
 from agentic_layer.scan_graph.subgraphs.cleanup_subgraph import cleanup_subgraph
 from agentic_layer.scan_graph.subgraphs.correlation_subgraph import correlation_subgraph
@@ -60,6 +67,10 @@ def route_after_hitl_phase(state: ScanState) -> str:
         log_agent(state["scan_id"], "MasterOrchestrator", "HITL rejected scan continuation; routing to cleanup")
         return "cleanup"
 
+    if not state.get("repo_metadata", {}).get("acquisition", {}).get("completed"):
+        log_agent(state["scan_id"], "MasterOrchestrator", "HITL approved pre-clone; entering acquisition")
+        return "acquire"
+
     log_agent(state["scan_id"], "MasterOrchestrator", "HITL approved continuation; entering analysis pipeline")
     return "analysis"
 
@@ -121,6 +132,21 @@ async def run_hitl_phase_node(state: ScanState, config: dict[str, Any] | None =
     return append_timeline_event(completed_state, "hitl_phase", PhaseStatus.COMPLETED.value)
 
 
+@traceable_if_available(name="master.run_acquisition_phase", run_type="chain")
+async def run_acquisition_phase_node(state: ScanState, config: dict[str, Any] | None = None) -> ScanState:
+    # Deferred acquisition for scans whose pre-clone sizing required HITL approval.
+    log_agent(state["scan_id"], "MasterOrchestrator", "Delegating to AcquisitionSubgraph")
+    started_state = _set_phase_status(state, "acquisition_phase", PhaseStatus.RUNNING)
+    try:
+        next_state = await acquisition_subgraph.ainvoke(started_state, config=config)
+    except Exception as exc:  # noqa: BLE001
+        return _mark_phase_failed(started_state, "acquisition_phase", f"Acquisition phase failed: {exc}")
+
+    if next_state["phase"] == "error" or next_state["errors"]:
+        return _set_phase_status(next_state, "acquisition_phase", PhaseStatus.FAILED)
+    return _set_phase_status(next_state, "acquisition_phase", PhaseStatus.COMPLETED)
+
+
 @traceable_if_available(name="master.run_analysis_phase", run_type="chain")
 async def run_analysis_phase_node(state: ScanState, config: dict[str, Any] | None = None) -> ScanState:
     log_agent(state["scan_id"], "MasterOrchestrator", "Delegating to AnalysisSubgraph")
@@ -245,6 +271,7 @@ def build_master_orchestrator_graph():
     graph.add_node("run_correlation_decision_phase", run_correlation_decision_phase_node)
     graph.add_node("run_execution_phase", run_execution_phase_node)
     graph.add_node("run_hitl_phase", run_hitl_phase_node)
+    graph.add_node("run_acquisition_phase", run_acquisition_phase_node)
     graph.add_node("run_cleanup_phase", run_cleanup_phase_node)
     graph.add_node("run_observability_phase", run_observability_phase_node)
     graph.add_node("run_strategic_interface_phase", run_strategic_interface_phase_node)
@@ -276,12 +303,22 @@ def build_master_orchestrator_graph():
         "run_hitl_phase",
         route_after_hitl_phase,
         {
+            "acquire": "run_acquisition_phase",
             "analysis": "run_analysis_phase",
             "cleanup": "run_cleanup_phase",
             "error": "error_handler",
         },
     )
 
+    graph.add_conditional_edges(
+        "run_acquisition_phase",
+        route_if_error,
+        {
+            "ok": "run_analysis_phase",
+            "error": "error_handler",
+        },
+    )
+
     graph.add_conditional_edges(
         "run_analysis_phase",
         route_if_error,
@@ -343,7 +380,30 @@ async def execute_scan_workflow(state: ScanState, config: dict[str, Any] | None
     # Entry-point used by FastAPI route.
     started_state = append_timeline_event(state, "master_orchestrator", "started")
     log_agent(started_state["scan_id"], "MasterOrchestrator", "Workflow execution started")
-    final_state = await master_orchestrator_graph.ainvoke(started_state, config=config)
+    # Hold the scan until startup image warm-up is done; past the wait it runs cold.
+    waited_at = time.monotonic()
+    images_warm = await execution_backend.wait_until_ready()
+    warmup = {
+        "backend": execution_backend.name,
+        "warm": images_warm,
+        "state": execution_backend.readiness().get("state"),
+        "admission_wait_ms": int((time.monotonic() - waited_at) * 1000),
+    }
+    if not images_warm:
+        log_agent(started_state["scan_id"], "MasterOrchestrator", f"Starting cold: image warm-up {warmup['state']}")
+    started_state = merge_state(
+        started_state,
+        {"telemetry": {**started_state.get("telemetry", {}), "runtime_warmup": warmup}},
+    )
+    resource_reaper.mark_workflow_started(started_state["scan_id"])
+    try:
+        final_state = await master_orchestrator_graph.ainvoke(started_state, config=config)
+    finally:
+        resource_reaper.mark_workflow_finished(started_state["scan_id"])
+        github_client.release_scan(started_state["scan_id"])
+        # A scan that died before cleanup must not keep its pooled volume leased.
+        if volume_pool.reclaim_scan(started_state["scan_id"]):
+            log_agent(started_state["scan_id"], "MasterOrchestrator", "Reclaimed pooled volume left by workflow")
     final_state = append_timeline_event(final_state, "master_orchestrator", "completed")
     log_agent(
         final_state["scan_id"],
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-import json
-
-from agentic_layer.runtime.docker_execution import DockerExecutionHelper
+from agentic_layer.runtime.execution_backend import ScannerTimeout
+from agentic_layer.runtime.execution_backend import run_scanner
+from agentic_layer.runtime.output_stream import NdjsonCollector
+from agentic_layer.runtime.resource_budget import AST_SCANNER_RESOURCES
 from agentic_layer.scan_graph.logger import log_agent
+from agentic_layer.scan_graph.nodes.analysis.coverage import partial_output
+from agentic_layer.scan_graph.nodes.analysis.coverage import rescan_scope
 from agentic_layer.scan_graph.state import ScanState
 from agentic_layer.scan_graph.state import merge_state
 
@@ -18,8 +21,23 @@ def _validate_findings(findings: list[dict]) -> None:
             raise RuntimeError(f"AST scanner finding missing keys: {sorted(missing)}")
 
 
+def _is_ast_finding(finding: dict) -> bool:
+    return "ast" in finding.get("tools", ["ast"])
+
+
+def _tool_finding(finding: dict) -> dict:
+    # Shape ToolRuntime normalizes for the category tools.
+    return {
+        "title": finding.get("title"),
+        "evidence": f"{finding['file']}:{finding['line']}",
+        "severity": finding["severity"],
+        "rule": finding.get("rule"),
+        "reasoning": finding["message"],
+    }
+
+
 async def ast_scanner_node(state: ScanState) -> ScanState:
-    # Mock AST scanner for Python files. Flags risky calls and exec/eval patterns.
+    # Runs every registered AST rule over the Python files in one pass per file.
     log_agent(state["scan_id"], "ASTScanner", "Running AST scan")
 
     code_volume_name = str(state.get("docker_volumes", {}).get("code", "")).strip()
@@ -32,56 +50,46 @@ async def ast_scanner_node(state: ScanState) -> ScanState:
             },
         )
 
-    script = (
-        "import ast, json, pathlib\n"
-        "root = pathlib.Path('/workspace')\n"
-        "findings = []\n"
-        "for file_path in root.rglob('*.py'):\n"
-        "    try:\n"
-        "        source = file_path.read_text(encoding='utf-8', errors='ignore')\n"
-        "        tree = ast.parse(source)\n"
-        "    except Exception:\n"
-        "        continue\n"
-        "    for node in ast.walk(tree):\n"
-        "        if isinstance(node, ast.Call):\n"
-        "            func_name = ''\n"
-        "            if isinstance(node.func, ast.Name):\n"
-        "                func_name = node.func.id\n"
-        "            elif isinstance(node.func, ast.Attribute):\n"
-        "                func_name = node.func.attr\n"
-        "            if func_name in {'eval', 'exec'}:\n"
-        "                findings.append({\n"
-        "                    'scanner': 'ast',\n"
-        "                    'type': 'dynamic_execution',\n"
-        "                    'severity': 'high',\n"
-        "                    'file': str(file_path),\n"
-        "                    'line': int(getattr(node, 'lineno', 1)),\n"
-        "                    'message': f'Use of {func_name} detected',\n"
-        "                    'category_hint': 'injection',\n"
-        "                })\n"
-        "print(json.dumps({'findings': findings, 'summary': {'count': len(findings)}}))\n"
-    )
+    scope = rescan_scope(state, "ast_scanner")
+    if scope["start_offset"] or scope["files"]:
+        log_agent(
+            state["scan_id"],
+            "ASTScanner",
+            f"Scoped run: start_offset={scope['start_offset']} files={len(scope['files'] or []) or 'all'}",
+        )
 
+    collector = NdjsonCollector()
     try:
-        result = DockerExecutionHelper.run(
+        result = await run_scanner(
             scan_id=state["scan_id"],
-            image="python:3.12-alpine",
-            command=["python", "-c", script],
-            volume_name=code_volume_name,
-            mount_path="/workspace",
-            workdir="/workspace",
-            read_only=True,
-            network_none=True,
+            tool="ast",
+            workspace=code_volume_name,
             timeout_seconds=120,
             component="ASTScanner",
+            collector=collector,
+            start_offset=scope["start_offset"],
+            files=scope["files"],
+            resources=AST_SCANNER_RESOURCES,
         )
-        output_lines = (result.stdout or "").strip().splitlines()
-        payload = json.loads(output_lines[-1] if output_lines else "{}")
-        findings = payload.get("findings", [])
-        if not isinstance(findings, list):
+        if not collector.has_protocol_output:
             raise RuntimeError("AST scanner returned invalid findings payload")
-        _validate_findings(findings)
+        _validate_findings(collector.findings)
     except Exception as exc:  # noqa: BLE001
+        # A timed-out run keeps what its last checkpoint covers; the rescan resumes from there.
+        partial = None
+        if isinstance(exc, ScannerTimeout):
+            partial = partial_output("ast_scanner", collector, scope, str(exc), keep=_is_ast_finding)
+        if partial is not None:
+            log_agent(
+                state["scan_id"],
+                "ASTScanner",
+                f"AST scan timed out; kept {partial['summary']['count']} findings "
+                f"from {partial['checkpoint']['files_done']} files",
+            )
+            return merge_state(
+                state,
+                {"raw_tool_outputs": [*state["raw_tool_outputs"], partial], "analysis_stage": "ast_scanned"},
+            )
         return merge_state(
             state,
             {
@@ -90,14 +98,64 @@ async def ast_scanner_node(state: ScanState) -> ScanState:
             },
         )
 
+    # One pass evaluated the rules of the AST-based category tools too; their findings are
+    # kept for the execution layer, which serves those tools without another container.
+    summary = collector.summary
+    findings = [finding for finding in collector.findings if _is_ast_finding(finding)]
+    ast_rule_findings = {
+        tool: [_tool_finding(finding) for finding in collector.findings if tool in finding.get("tools", [])]
+        for tool in summary.get("rule_tools", [])
+        if tool != "ast"
+    }
+    if collector.stats.truncated or scope["start_offset"] or scope["files"]:
+        # A capped stream, or a run scoped to part of the tree, would under-report; let the
+        # tools run on their own instead.
+        ast_rule_findings = {}
+    # Unparseable and oversized files are reported rather than silently dropped.
+    skipped_files = [
+        {"file": event.get("file"), "reason": event.get("reason"), "detail": event.get("detail")}
+        for event in collector.events
+        if event.get("event") == "file_skipped"
+    ]
     raw_tool_outputs = [
         *state["raw_tool_outputs"],
         {
             "tool": "ast_scanner",
             "findings": findings,
-            "summary": {"count": len(findings)},
+            "summary": {
+                "count": len(findings),
+                "scanner_version": summary.get("scanner_version"),
+                "workers": summary.get("workers"),
+                "files_total": summary.get("files_total"),
+                "files_parsed": summary.get("files_parsed"),
+                "files_skipped": summary.get("files_skipped", {}),
+                "files_cached": summary.get("files_cached", 0),
+                "context_files": summary.get("context_files", {}),
+                "index": summary.get("index", {}),
+                "rules": summary.get("rules", []),
+                "parse_ms_total": summary.get("parse_ms_total"),
+                "slowest_files": summary.get("slowest_files", []),
+                "start_offset": summary.get("start_offset", 0),
+                "files_done": summary.get("files_done"),
+            },
+            "skipped_files": skipped_files,
+            "scope": scope,
+            "queue_wait_ms": result.queue_wait_ms,
+            "stream": collector.stats.as_dict(),
         },
     ]
 
-    log_agent(state["scan_id"], "ASTScanner", f"AST scan complete with {len(findings)} findings")
-    return merge_state(state, {"raw_tool_outputs": raw_tool_outputs, "analysis_stage": "ast_scanned"})
+    log_agent(
+        state["scan_id"],
+        "ASTScanner",
+        f"AST scan complete with {len(findings)} findings "
+        f"files={summary.get('files_parsed')}/{summary.get('files_total')} workers={summary.get('workers')}",
+    )
+    return merge_state(
+        state,
+        {
+            "raw_tool_outputs": raw_tool_outputs,
+            "ast_rule_findings": ast_rule_findings,
+            "analysis_stage": "ast_scanned",
+        },
+    )
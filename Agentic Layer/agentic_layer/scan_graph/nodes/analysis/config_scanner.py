@@ -1,15 +1,17 @@
 from __future__ import annotations
 
-import json
-
-from agentic_layer.runtime.docker_execution import DockerExecutionHelper
 from agentic_layer.scan_graph.logger import log_agent
+from agentic_layer.scan_graph.nodes.analysis.coverage import rescan_scope
+from agentic_layer.scan_graph.nodes.analysis.sharding import merge_shards
+from agentic_layer.scan_graph.nodes.analysis.sharding import run_shards
+from agentic_layer.scan_graph.nodes.analysis.sharding import shard_count
 from agentic_layer.scan_graph.state import ScanState
 from agentic_layer.scan_graph.state import merge_state
 
 
 async def config_scanner_node(state: ScanState) -> ScanState:
-    # Config scanner checks obvious insecure configuration signs.
+    # Parses every config file in the repository manifest once and checks its key paths
+    # against the indexed config rules.
     log_agent(state["scan_id"], "ConfigScanner", "Running config scan")
 
     code_volume_name = str(state.get("docker_volumes", {}).get("code", "")).strip()
@@ -22,64 +24,80 @@ async def config_scanner_node(state: ScanState) -> ScanState:
             },
         )
 
-    script = (
-        "import json, pathlib\n"
-        "targets = {'.env', 'config.yaml', 'config.yml', 'settings.json', 'docker-compose.yml'}\n"
-        "findings = []\n"
-        "for file_path in pathlib.Path('/workspace').rglob('*'):\n"
-        "    if not file_path.is_file():\n"
-        "        continue\n"
-        "    if file_path.name.lower() not in targets:\n"
-        "        continue\n"
-        "    content = file_path.read_text(encoding='utf-8', errors='ignore')\n"
-        "    if 'DEBUG=true' in content or 'debug: true' in content.lower():\n"
-        "        findings.append({\n"
-        "            'scanner': 'config',\n"
-        "            'type': 'debug_mode_enabled',\n"
-        "            'severity': 'medium',\n"
-        "            'file': str(file_path),\n"
-        "            'line': 1,\n"
-        "            'message': 'Debug mode appears enabled in configuration',\n"
-        "            'category_hint': 'security_misconfiguration',\n"
-        "        })\n"
-        "print(json.dumps({'findings': findings, 'summary': {'count': len(findings)}}))\n"
-    )
-
-    try:
-        result = DockerExecutionHelper.run(
-            scan_id=state["scan_id"],
-            image="python:3.12-alpine",
-            command=["python", "-c", script],
-            volume_name=code_volume_name,
-            mount_path="/workspace",
-            workdir="/workspace",
-            read_only=True,
-            network_none=True,
-            timeout_seconds=120,
-            component="ConfigScanner",
+    scope = rescan_scope(state, "config_scanner")
+    if scope["start_offset"] or scope["files"] or scope["shard"]:
+        log_agent(
+            state["scan_id"],
+            "ConfigScanner",
+            f"Scoped run: start_offset={scope['start_offset']} files={len(scope['files'] or []) or 'all'} "
+            f"shard={scope['shard'] or 'none'}",
         )
-        output_lines = (result.stdout or "").strip().splitlines()
-        payload = json.loads(output_lines[-1] if output_lines else "{}")
-        findings = payload.get("findings", [])
-        if not isinstance(findings, list):
-            raise RuntimeError("Config scanner returned invalid findings payload")
-    except Exception as exc:  # noqa: BLE001
+
+    # Whole-tree scans of large repositories run as parallel shards, merged in walk order.
+    runs = await run_shards(
+        scan_id=state["scan_id"],
+        tool="config",
+        workspace=code_volume_name,
+        component="ConfigScanner",
+        scope=scope,
+        count=shard_count(state),
+        timeout_seconds=120,
+        invalid_message="Config scanner returned invalid findings payload",
+    )
+    output = merge_shards(runs)
+    if output is None:
         return merge_state(
             state,
             {
                 "phase": "error",
-                "errors": [*state["errors"], f"Config scanner failed in container: {exc}"],
+                "errors": [*state["errors"], f"Config scanner failed in container: {runs[0].error}"],
             },
         )
+    if output.partial:
+        # Shards that timed out keep what their last checkpoint covers; the rescan resumes
+        # them from there and reruns the ones that failed.
+        log_agent(
+            state["scan_id"],
+            "ConfigScanner",
+            f"Config scan incomplete: {len(output.errors)}/{len(runs)} runs did not finish: {output.errors[0]}",
+        )
+    findings = output.findings
+    summary = output.summary
 
+    skipped_files = [
+        {"file": event.get("file"), "reason": event.get("reason"), "detail": event.get("detail")}
+        for event in output.events
+        if event.get("event") == "file_skipped"
+    ]
     raw_tool_outputs = [
         *state["raw_tool_outputs"],
         {
             "tool": "config_scanner",
             "findings": findings,
-            "summary": {"count": len(findings)},
+            "summary": {
+                "count": len(findings),
+                "scanner_version": summary.get("scanner_version"),
+                "workers": summary.get("workers"),
+                "files_total": summary.get("files_total"),
+                "files_by_kind": summary.get("files_by_kind", {}),
+                "files_skipped": summary.get("files_skipped", {}),
+                "entries": summary.get("entries"),
+                "parse_ms_total": summary.get("parse_ms_total"),
+                "start_offset": summary.get("start_offset", 0),
+                "files_done": summary.get("files_done"),
+            },
+            "skipped_files": skipped_files,
+            "scope": scope,
+            "shards": output.shards,
+            "partial": output.partial,
+            "queue_wait_ms": output.queue_wait_ms,
+            "stream": output.stats.as_dict(),
         },
     ]
 
-    log_agent(state["scan_id"], "ConfigScanner", f"Config scan complete with {len(findings)} findings")
+    log_agent(
+        state["scan_id"],
+        "ConfigScanner",
+        f"Config scan complete with {len(findings)} findings files={summary.get('files_total')}",
+    )
     return merge_state(state, {"raw_tool_outputs": raw_tool_outputs, "analysis_stage": "config_scanned"})
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from typing import Any
+from typing import Callable
+
+from agentic_layer.runtime.output_stream import NdjsonCollector
+from agentic_layer.scan_graph.state import ScanState
+
+
+# Scanner coverage and rescan targets. The reflector expresses each coverage gap as
+# (scanner, file subset) targets: the whole tree for a scanner without output, the files
+# after the last checkpoint of a run or shard that timed out (ast, regex and config stream
+# progress checkpoints), a shard that failed, and files a run failed to read. The targeted
+# rescan runs each target with that scope, so a rescan costs what the gap covers rather
+# than the whole repository.
+
+# Skip reasons worth a retry; parse errors and size limits would fail the same way again.
+RETRYABLE_SKIP_REASONS = frozenset({"unreadable"})
+# Files per subset target; each is passed on the scanner's command line.
+MAX_RESCAN_FILES = 200
+
+
+def full_scope() -> dict[str, Any]:
+    return {"start_offset": 0, "files": None, "shard": None}
+
+
+def _target(
+    gap: str,
+    tool: str,
+    start_offset: int = 0,
+    files: list[str] | None = None,
+    shard: str | None = None,
+) -> dict[str, Any]:
+    return {"gap": gap, "tool": tool, "start_offset": start_offset, "files": files, "shard": shard}
+
+
+def rescan_targets(outputs: list[dict[str, Any]], tool: str, gap: str) -> list[dict[str, Any]]:
+    # What of the tree `tool` has not covered, from its latest output.
+    runs = [output for output in outputs if output.get("tool") == tool]
+    if not runs:
+        return [_target(gap, tool)]
+    latest = runs[-1]
+    targets = []
+    # A sharded run lists its shards; an unfinished one resumes from its checkpoint, if any.
+    units = latest.get("shards") if isinstance(latest.get("shards"), list) else [latest]
+    for unit in units:
+        if not unit.get("partial"):
+            continue
+        scope = unit.get("scope") if isinstance(unit.get("scope"), dict) else full_scope()
+        checkpoint = unit.get("checkpoint") if isinstance(unit.get("checkpoint"), dict) else {}
+        targets.append(
+            _target(gap, tool, int(checkpoint.get("files_done") or 0), scope.get("files"), scope.get("shard"))
+        )
+    failed = sorted(
+        {
+            str(skipped["file"])
+            for skipped in latest.get("skipped_files", [])
+            if skipped.get("file") and skipped.get("reason") in RETRYABLE_SKIP_REASONS
+        }
+    )
+    for start in range(0, len(failed), MAX_RESCAN_FILES):
+        targets.append(_target(gap, tool, files=failed[start : start + MAX_RESCAN_FILES]))
+    return targets
+
+
+def rescan_scope(state: ScanState, tool: str) -> dict[str, Any]:
+    # Scope of the current run of `tool`: its rescan target's, or the whole tree.
+    for target in state.get("rescan_targets", []):
+        if target.get("tool") == tool:
+            return {
+                "start_offset": int(target.get("start_offset") or 0),
+                "files": target.get("files") or None,
+                "shard": target.get("shard") or None,
+            }
+    return full_scope()
+
+
+def partial_output(
+    tool: str,
+    collector: NdjsonCollector,
+    scope: dict[str, Any],
+    reason: str,
+    keep: Callable[[dict], bool] | None = None,
+) -> dict | None:
+    # raw_tool_outputs entry for a run that timed out after a checkpoint; None without one.
+    checkpoint = collector.checkpoint
+    if checkpoint is None:
+        return None
+    findings = [finding for finding in collector.checkpointed_findings if keep is None or keep(finding)]
+    return {
+        "tool": tool,
+        "findings": findings,
+        "summary": {
+            "count": len(findings),
+            "start_offset": scope["start_offset"],
+            "files_done": checkpoint.get("files_done"),
+            "partial": True,
+        },
+        "scope": scope,
+        "partial": True,
+        "partial_reason": reason,
+        "checkpoint": {
+            "files_done": checkpoint.get("files_done"),
+            "last_file": checkpoint.get("last_file"),
+        },
+        "stream": collector.stats.as_dict(),
+    }
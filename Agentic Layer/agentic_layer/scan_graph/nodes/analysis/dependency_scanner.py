@@ -1,15 +1,15 @@
 from __future__ import annotations
 
-import json
-
-from agentic_layer.runtime.docker_execution import DockerExecutionHelper
+from agentic_layer.runtime.execution_backend import run_scanner
+from agentic_layer.runtime.output_stream import NdjsonCollector
 from agentic_layer.scan_graph.logger import log_agent
 from agentic_layer.scan_graph.state import ScanState
 from agentic_layer.scan_graph.state import merge_state
 
 
 async def dependency_scanner_node(state: ScanState) -> ScanState:
-    # Dependency scanner inspects requirements files and emits mock dependency risks.
+    # Matches pinned dependencies from every manifest and lockfile against the offline
+    # advisory database baked into the scanner image.
     log_agent(state["scan_id"], "DependencyScanner", "Running dependency scan")
 
     code_volume_name = str(state.get("docker_volumes", {}).get("code", "")).strip()
@@ -22,46 +22,20 @@ async def dependency_scanner_node(state: ScanState) -> ScanState:
             },
         )
 
-    script = (
-        "import json, pathlib\n"
-        "root = pathlib.Path('/workspace')\n"
-        "findings = []\n"
-        "for dep_file in ['requirements.txt', 'pyproject.toml']:\n"
-        "    candidate = root / dep_file\n"
-        "    if not candidate.exists() or not candidate.is_file():\n"
-        "        continue\n"
-        "    content = candidate.read_text(encoding='utf-8', errors='ignore')\n"
-        "    if 'django==1.' in content or 'flask==0.' in content:\n"
-        "        findings.append({\n"
-        "            'scanner': 'dependency',\n"
-        "            'type': 'outdated_dependency',\n"
-        "            'severity': 'high',\n"
-        "            'file': str(candidate),\n"
-        "            'line': 1,\n"
-        "            'message': 'Potentially outdated dependency version detected',\n"
-        "            'category_hint': 'vulnerable_components',\n"
-        "        })\n"
-        "print(json.dumps({'findings': findings, 'summary': {'count': len(findings)}}))\n"
-    )
-
+    collector = NdjsonCollector()
     try:
-        result = DockerExecutionHelper.run(
+        result = await run_scanner(
             scan_id=state["scan_id"],
-            image="python:3.12-alpine",
-            command=["python", "-c", script],
-            volume_name=code_volume_name,
-            mount_path="/workspace",
-            workdir="/workspace",
-            read_only=True,
-            network_none=True,
+            tool="dependency",
+            workspace=code_volume_name,
             timeout_seconds=120,
             component="DependencyScanner",
+            collector=collector,
         )
-        output_lines = (result.stdout or "").strip().splitlines()
-        payload = json.loads(output_lines[-1] if output_lines else "{}")
-        findings = payload.get("findings", [])
-        if not isinstance(findings, list):
+        if not collector.has_protocol_output:
             raise RuntimeError("Dependency scanner returned invalid findings payload")
+        findings = collector.findings
+        summary = collector.summary
     except Exception as exc:  # noqa: BLE001
         return merge_state(
             state,
@@ -76,9 +50,28 @@ async def dependency_scanner_node(state: ScanState) -> ScanState:
         {
             "tool": "dependency_scanner",
             "findings": findings,
-            "summary": {"count": len(findings)},
+            "summary": {
+                "count": len(findings),
+                "scanner_version": summary.get("scanner_version"),
+                "lockfiles": summary.get("lockfiles", {}),
+                "dependencies": summary.get("dependencies"),
+                "unique_dependencies": summary.get("unique_dependencies"),
+                "packages": summary.get("packages"),
+                "vulnerable_dependencies": summary.get("vulnerable_dependencies"),
+                "vulndb": summary.get("vulndb", {}),
+                "lookup_ms": summary.get("lookup_ms"),
+                "parse_ms": summary.get("parse_ms"),
+                "parse_mb_per_s": summary.get("parse_mb_per_s"),
+            },
+            "queue_wait_ms": result.queue_wait_ms,
+            "stream": collector.stats.as_dict(),
         },
     ]
 
-    log_agent(state["scan_id"], "DependencyScanner", f"Dependency scan complete with {len(findings)} findings")
+    log_agent(
+        state["scan_id"],
+        "DependencyScanner",
+        f"Dependency scan complete with {len(findings)} findings "
+        f"dependencies={summary.get('dependencies')} lockfiles={sum(summary.get('lockfiles', {}).values())}",
+    )
     return merge_state(state, {"raw_tool_outputs": raw_tool_outputs, "analysis_stage": "dependency_scanned"})
@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-import json
-
-from agentic_layer.runtime.docker_execution import DockerExecutionHelper
+from agentic_layer.runtime.execution_backend import run_scanner
+from agentic_layer.runtime.output_stream import NdjsonCollector
 from agentic_layer.scan_graph.logger import log_agent
 from agentic_layer.scan_graph.state import ScanState
 from agentic_layer.scan_graph.state import merge_state
@@ -22,30 +21,19 @@ async def analysis_planner_node(state: ScanState) -> ScanState:
             },
         )
 
-    script = (
-        "import json, pathlib\n"
-        "root = pathlib.Path('/workspace')\n"
-        "has_python = any(p.suffix.lower() == '.py' for p in root.rglob('*') if p.is_file())\n"
-        "has_requirements = any(p.name.lower() in {'requirements.txt', 'pyproject.toml', 'poetry.lock'} for p in root.rglob('*') if p.is_file())\n"
-        "has_config_files = any(p.name.lower() in {'.env', 'config.yml', 'config.yaml', 'settings.json'} for p in root.rglob('*') if p.is_file())\n"
-        "print(json.dumps({'has_python': has_python, 'has_requirements': has_requirements, 'has_config_files': has_config_files}))\n"
-    )
-
+    collector = NdjsonCollector()
     try:
-        result = DockerExecutionHelper.run(
+        await run_scanner(
             scan_id=state["scan_id"],
-            image="python:3.12-alpine",
-            command=["python", "-c", script],
-            volume_name=code_volume_name,
-            mount_path="/workspace",
-            workdir="/workspace",
-            read_only=True,
-            network_none=True,
+            tool="plan",
+            workspace=code_volume_name,
             timeout_seconds=60,
             component="AnalysisPlanner",
+            collector=collector,
         )
-        output = (result.stdout or "").strip().splitlines()
-        payload = json.loads(output[-1] if output else "{}")
+        if not collector.summary_received:
+            raise RuntimeError("Analysis planner returned no summary")
+        payload = collector.summary
         has_python = bool(payload.get("has_python", False))
         has_requirements = bool(payload.get("has_requirements", False))
         has_config_files = bool(payload.get("has_config_files", False))
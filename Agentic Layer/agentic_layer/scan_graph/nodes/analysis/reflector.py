@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from agentic_layer.scan_graph.logger import log_agent
+from agentic_layer.scan_graph.nodes.analysis.coverage import rescan_targets
 from agentic_layer.scan_graph.state import ScanState
 from agentic_layer.scan_graph.state import merge_state
 
@@ -9,9 +10,6 @@ async def reflector_node(state: ScanState) -> ScanState:
     # Reflector estimates coverage quality and decides if targeted rescan is needed.
     log_agent(state["scan_id"], "Reflector", "Evaluating coverage gaps")
 
-    scanners_seen = {output.get("tool", "") for output in state["raw_tool_outputs"]}
-    gaps: list[str] = []
-
     required_scanners = {
         "ast_scanner": "ast",
         "regex_scanner": "regex",
@@ -19,24 +17,30 @@ async def reflector_node(state: ScanState) -> ScanState:
         "config_scanner": "config",
     }
 
+    # Each gap is a set of (scanner, file subset) targets: a scanner that produced no output
+    # misses the whole tree, one that timed out the files after its last checkpoint, and one
+    # that could not read some files just those.
+    targets: list[dict] = []
     for scanner_tool, gap_name in required_scanners.items():
-        if scanner_tool not in scanners_seen:
-            gaps.append(gap_name)
+        targets.extend(rescan_targets(state["raw_tool_outputs"], scanner_tool, gap_name))
+    gaps = list(dict.fromkeys(target["gap"] for target in targets))
 
     # Safe loop guard: once a targeted rescan has already run, we stop asking for another pass.
     if state["rescans_triggered"]:
         gaps = []
+        targets = []
 
     log_agent(
         state["scan_id"],
         "Reflector",
-        f"Coverage reflection complete: gaps={gaps if gaps else 'none'}",
+        f"Coverage reflection complete: gaps={gaps if gaps else 'none'} targets={len(targets)}",
     )
 
     return merge_state(
         state,
         {
             "coverage_gaps": gaps,
+            "rescan_targets": targets,
             "analysis_stage": "reflected",
         },
     )
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-import json
-
-from agentic_layer.runtime.docker_execution import DockerExecutionHelper
 from agentic_layer.scan_graph.logger import log_agent
+from agentic_layer.scan_graph.nodes.analysis.coverage import rescan_scope
+from agentic_layer.scan_graph.nodes.analysis.sharding import merge_shards
+from agentic_layer.scan_graph.nodes.analysis.sharding import run_shards
+from agentic_layer.scan_graph.nodes.analysis.sharding import shard_count
 from agentic_layer.scan_graph.state import ScanState
 from agentic_layer.scan_graph.state import merge_state
 
@@ -22,70 +23,72 @@ async def regex_scanner_node(state: ScanState) -> ScanState:
             },
         )
 
-    script = (
-        "import json, pathlib, re\n"
-        "patterns = [\n"
-        "    (re.compile(r'AKIA[0-9A-Z]{16}'), 'potential_aws_key', 'high', 'security_misconfiguration'),\n"
-        "    (re.compile(r\"password\\s*=\\s*['\\\"][^'\\\"]+['\\\"]\", re.IGNORECASE), 'hardcoded_password', 'high', 'broken_access_control'),\n"
-        "    (re.compile(r'http://', re.IGNORECASE), 'insecure_transport', 'medium', 'cryptographic_failures'),\n"
-        "]\n"
-        "findings = []\n"
-        "for file_path in pathlib.Path('/workspace').rglob('*'):\n"
-        "    if not file_path.is_file():\n"
-        "        continue\n"
-        "    try:\n"
-        "        content = file_path.read_text(encoding='utf-8', errors='ignore')\n"
-        "    except Exception:\n"
-        "        continue\n"
-        "    for pattern, finding_type, severity, hint in patterns:\n"
-        "        for match in pattern.finditer(content):\n"
-        "            line = content.count('\\n', 0, match.start()) + 1\n"
-        "            findings.append({\n"
-        "                'scanner': 'regex',\n"
-        "                'type': finding_type,\n"
-        "                'severity': severity,\n"
-        "                'file': str(file_path),\n"
-        "                'line': int(line),\n"
-        "                'message': f'Pattern matched: {finding_type}',\n"
-        "                'evidence': match.group(0)[:120],\n"
-        "                'category_hint': hint,\n"
-        "            })\n"
-        "print(json.dumps({'findings': findings, 'summary': {'count': len(findings)}}))\n"
-    )
-
-    try:
-        result = DockerExecutionHelper.run(
-            scan_id=state["scan_id"],
-            image="python:3.12-alpine",
-            command=["python", "-c", script],
-            volume_name=code_volume_name,
-            mount_path="/workspace",
-            workdir="/workspace",
-            read_only=True,
-            network_none=True,
-            timeout_seconds=120,
-            component="RegexScanner",
+    scope = rescan_scope(state, "regex_scanner")
+    if scope["start_offset"] or scope["files"] or scope["shard"]:
+        log_agent(
+            state["scan_id"],
+            "RegexScanner",
+            f"Scoped run: start_offset={scope['start_offset']} files={len(scope['files'] or []) or 'all'} "
+            f"shard={scope['shard'] or 'none'}",
         )
-        output_lines = (result.stdout or "").strip().splitlines()
-        payload = json.loads(output_lines[-1] if output_lines else "{}")
-        findings = payload.get("findings", [])
-        if not isinstance(findings, list):
-            raise RuntimeError("Regex scanner returned invalid findings payload")
-    except Exception as exc:  # noqa: BLE001
+
+    # Whole-tree scans of large repositories run as parallel shards, merged in walk order.
+    runs = await run_shards(
+        scan_id=state["scan_id"],
+        tool="regex",
+        workspace=code_volume_name,
+        component="RegexScanner",
+        scope=scope,
+        count=shard_count(state),
+        timeout_seconds=120,
+        invalid_message="Regex scanner returned invalid findings payload",
+    )
+    output = merge_shards(runs)
+    if output is None:
         return merge_state(
             state,
             {
                 "phase": "error",
-                "errors": [*state["errors"], f"Regex scanner failed in container: {exc}"],
+                "errors": [*state["errors"], f"Regex scanner failed in container: {runs[0].error}"],
             },
         )
+    if output.partial:
+        # Shards that timed out keep what their last checkpoint covers; the rescan resumes
+        # them from there and reruns the ones that failed.
+        log_agent(
+            state["scan_id"],
+            "RegexScanner",
+            f"Regex scan incomplete: {len(output.errors)}/{len(runs)} runs did not finish: {output.errors[0]}",
+        )
+    findings = output.findings
 
+    budget_exceeded = [
+        {"file": event.get("file"), "rules": event.get("rules")}
+        for event in output.events
+        if event.get("event") == "budget_exceeded"
+    ]
     raw_tool_outputs = [
         *state["raw_tool_outputs"],
         {
             "tool": "regex_scanner",
             "findings": findings,
-            "summary": {"count": len(findings)},
+            "summary": {
+                "count": len(findings),
+                "scanner_version": output.summary.get("scanner_version"),
+                "files_read": output.summary.get("files_read"),
+                "content_index": output.summary.get("content_index"),
+                "files_minified": output.summary.get("files_minified"),
+                "rules_timed_out": output.summary.get("rules_timed_out", {}),
+                "partial": output.summary.get("partial", False),
+                "start_offset": output.summary.get("start_offset", 0),
+                "files_done": output.summary.get("files_done"),
+            },
+            "budget_exceeded": budget_exceeded,
+            "scope": scope,
+            "shards": output.shards,
+            "partial": output.partial,
+            "queue_wait_ms": output.queue_wait_ms,
+            "stream": output.stats.as_dict(),
         },
     ]
 
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import fields
+from math import ceil
+from pathlib import PurePosixPath
+from typing import Any
+
+from agentic_layer.runtime.execution_backend import run_scanner
+from agentic_layer.runtime.output_stream import NdjsonCollector
+from agentic_layer.runtime.output_stream import StreamStats
+from agentic_layer.runtime.resource_budget import SCANNER_RESOURCES
+from agentic_layer.runtime.resource_budget import ResourceRequest
+from agentic_layer.runtime.resource_budget import resource_budget
+from agentic_layer.scan_graph.logger import log_agent
+from agentic_layer.scan_graph.nodes.analysis.coverage import full_scope
+from agentic_layer.scan_graph.state import ScanState
+
+
+# Sharded scanning for large trees. A per-file scanner (regex, config) runs as several
+# containers in parallel, each over one shard of the files balanced by size (the scanner
+# computes the partition from `--shard I/N`), and the shard outputs are merged into the
+# output of one run, in the order a single container would have produced it.
+
+SHARD_TARGET_FILES = 25_000
+SHARD_TARGET_BYTES = 512 * 1024 * 1024
+MAX_SHARDS = 8
+
+# Summary fields every shard reports alike; other fields are summed (numbers), or-ed
+# (flags) or merged (dicts).
+_SHARED_SUMMARY_FIELDS = frozenset({"tool", "scanner_version", "rules"})
+
+
+def shard_count(state: ScanState, resources: ResourceRequest = SCANNER_RESOURCES) -> int:
+    # From the codebase stats; more shards than the resource budget admits at once
+    # would only queue.
+    stats = state["repo_metadata"].get("stats") or {}
+    wanted = max(
+        ceil(int(stats.get("total_files") or 0) / SHARD_TARGET_FILES),
+        ceil(int(stats.get("total_size_bytes") or 0) / SHARD_TARGET_BYTES),
+        1,
+    )
+    fits = max(1, int(resource_budget.capacity.cpus // resources.cpus))
+    return min(wanted, fits, MAX_SHARDS)
+
+
+def walk_order(path: str) -> tuple[tuple[int, str], ...]:
+    # Sort key of the scanners' walk order: sorted names, a directory's files before
+    # its subdirectories.
+    parts = PurePosixPath(path).parts
+    if not parts:
+        return ()
+    return (*((1, part) for part in parts[:-1]), (0, parts[-1]))
+
+
+@dataclass
+class ShardRun:
+    scope: dict[str, Any]
+    collector: NdjsonCollector
+    queue_wait_ms: int = 0
+    error: str | None = None
+
+    @property
+    def usable(self) -> bool:
+        # Completed, or stopped (timed out, mostly) after a checkpoint.
+        return self.error is None or self.collector.checkpoint is not None
+
+    @property
+    def findings(self) -> list[dict[str, Any]]:
+        return self.collector.findings if self.error is None else self.collector.checkpointed_findings
+
+    def as_dict(self) -> dict[str, Any]:
+        checkpoint = self.collector.checkpoint
+        return {
+            "scope": self.scope,
+            "partial": self.error is not None,
+            "checkpoint": (
+                {"files_done": checkpoint.get("files_done"), "last_file": checkpoint.get("last_file")}
+                if self.error is not None and checkpoint is not None
+                else None
+            ),
+            "error": self.error,
+        }
+
+
+@dataclass
+class ShardedOutput:
+    findings: list[dict[str, Any]]
+    events: list[dict[str, Any]]
+    summary: dict[str, Any]
+    stats: StreamStats
+    shards: list[dict[str, Any]]
+    queue_wait_ms: int = 0
+    partial: bool = False
+    errors: list[str] = field(default_factory=list)
+
+
+def _merge_summaries(summaries: list[dict[str, Any]]) -> dict[str, Any]:
+    merged: dict[str, Any] = {}
+    for summary in summaries:
+        for name, value in summary.items():
+            current = merged.get(name)
+            if name not in merged or name in _SHARED_SUMMARY_FIELDS:
+                merged.setdefault(name, value)
+            elif isinstance(value, bool) or isinstance(current, bool):
+                merged[name] = bool(current) or bool(value)
+            elif isinstance(value, (int, float)) and isinstance(current, (int, float)):
+                merged[name] = current + value
+            elif isinstance(value, dict) and isinstance(current, dict):
+                merged[name] = _merge_summaries([current, value])
+    return merged
+
+
+def _merge_stats(runs: list[ShardRun]) -> StreamStats:
+    merged = StreamStats()
+    for run in runs:
+        for stat in fields(StreamStats):
+            value = getattr(run.collector.stats, stat.name)
+            if isinstance(value, dict):
+                events = getattr(merged, stat.name)
+                for name, count in value.items():
+                    events[name] = events.get(name, 0) + count
+            else:
+                setattr(merged, stat.name, getattr(merged, stat.name) + value)
+    return merged
+
+
+def merge_shards(runs: list[ShardRun]) -> ShardedOutput | None:
+    # None when no shard produced usable output. Deterministic: findings and events are
+    # ordered by file in walk order, and a file's are all from one shard, in its order.
+    usable = [run for run in runs if run.usable]
+    if not usable:
+        return None
+    findings = [finding for run in usable for finding in run.findings]
+    findings.sort(key=lambda finding: walk_order(str(finding.get("file") or "")))
+    events = [event for run in usable for event in run.collector.events]
+    events.sort(key=lambda event: walk_order(str(event.get("file") or "")))
+    return ShardedOutput(
+        findings=findings,
+        events=events,
+        summary=_merge_summaries([run.collector.summary for run in usable]),
+        stats=_merge_stats(runs),
+        shards=[run.as_dict() for run in runs],
+        queue_wait_ms=max(run.queue_wait_ms for run in runs),
+        partial=any(run.error is not None for run in runs),
+        errors=[run.error for run in runs if run.error is not None],
+    )
+
+
+def shard_scopes(scope: dict[str, Any], count: int) -> list[dict[str, Any]]:
+    # Only whole-tree runs are sharded; a rescan target is already a slice of the tree.
+    if count <= 1 or scope != full_scope():
+        return [scope]
+    return [{**scope, "shard": f"{index}/{count}"} for index in range(count)]
+
+
+async def run_shards(
+    *,
+    scan_id: str,
+    tool: str,
+    workspace: str,
+    component: str,
+    scope: dict[str, Any],
+    count: int,
+    timeout_seconds: int,
+    invalid_message: str,
+    resources: ResourceRequest = SCANNER_RESOURCES,
+) -> list[ShardRun]:
+    # One container per shard, all admitted through the resource budget; never raises.
+    async def _run(shard_scope: dict[str, Any]) -> ShardRun:
+        run = ShardRun(scope=shard_scope, collector=NdjsonCollector())
+        try:
+            result = await run_scanner(
+                scan_id=scan_id,
+                tool=tool,
+                workspace=workspace,
+                timeout_seconds=timeout_seconds,
+                component=component,
+                collector=run.collector,
+                resources=resources,
+                start_offset=shard_scope["start_offset"],
+                files=shard_scope["files"],
+                shard=shard_scope["shard"],
+            )
+            run.queue_wait_ms = result.queue_wait_ms
+            if not run.collector.has_protocol_output:
+                raise RuntimeError(invalid_message)
+        except Exception as exc:  # noqa: BLE001
+            run.error = str(exc)
+        return run
+
+    scopes = shard_scopes(scope, count)
+    if len(scopes) > 1:
+        log_agent(scan_id, component, f"Scanning in {len(scopes)} shards")
+    return list(await asyncio.gather(*map(_run, scopes)))
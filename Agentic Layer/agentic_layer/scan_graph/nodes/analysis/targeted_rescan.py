@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Awaitable
 from typing import Callable
 
 from agentic_layer.scan_graph.nodes.analysis.ast_scanner import ast_scanner_node
 from agentic_layer.scan_graph.nodes.analysis.config_scanner import config_scanner_node
+from agentic_layer.scan_graph.nodes.analysis.coverage import full_scope
 from agentic_layer.scan_graph.nodes.analysis.dependency_scanner import dependency_scanner_node
 from agentic_layer.scan_graph.nodes.analysis.regex_scanner import regex_scanner_node
 from agentic_layer.scan_graph.logger import log_agent
@@ -76,18 +78,31 @@ async def targeted_rescan_node(state: ScanState) -> ScanState:
             {
                 "rescans_triggered": True,
                 "coverage_gaps": [],
+                "rescan_targets": [],
                 "analysis_stage": "rescanned",
             },
         )
 
-    starting_outputs_count = len(state["raw_tool_outputs"])
-    rescanned_state = state
+    # One scanner run per (scanner, file subset) target, all in parallel; gaps without
+    # targets from the reflector cover the whole tree.
+    targets = [target for target in state.get("rescan_targets", []) if target.get("gap") in runnable]
     for gap in runnable:
-        tool_name, scanner_node = SCANNER_BY_GAP[gap]
-        log_agent(state["scan_id"], "TargetedRescan", f"Re-running {tool_name} for gap={gap}")
-        rescanned_state = await scanner_node(rescanned_state)
+        if not any(target.get("gap") == gap for target in targets):
+            targets.append({"gap": gap, "tool": SCANNER_BY_GAP[gap][0], **full_scope()})
+
+    async def _rescan(target: dict) -> list[dict]:
+        tool_name, scanner_node = SCANNER_BY_GAP[target["gap"]]
+        log_agent(
+            state["scan_id"],
+            "TargetedRescan",
+            f"Re-running {tool_name} for gap={target['gap']} start_offset={target.get('start_offset') or 0} "
+            f"files={len(target.get('files') or []) or 'all'}",
+        )
+        # Scanner nodes read their scope from the target; the base state is shared read-only.
+        rescanned_state = await scanner_node(merge_state(state, {"rescan_targets": [target]}))
+        return list(rescanned_state["raw_tool_outputs"][len(state["raw_tool_outputs"]) :])
 
-    new_outputs = list(rescanned_state["raw_tool_outputs"][starting_outputs_count:])
+    new_outputs = [output for outputs in await asyncio.gather(*map(_rescan, targets)) for output in outputs]
     normalized_outputs: list[dict] = []
     normalized_finding_count = 0
     for output in new_outputs:
@@ -122,6 +137,7 @@ async def targeted_rescan_node(state: ScanState) -> ScanState:
             {
                 "rescans_triggered": True,
                 "coverage_gaps": [],
+                "rescan_targets": [],
                 "analysis_stage": "rescanned",
             },
         )
@@ -133,6 +149,7 @@ async def targeted_rescan_node(state: ScanState) -> ScanState:
             "raw_tool_outputs": [*state["raw_tool_outputs"], *normalized_outputs],
             "rescans_triggered": True,
             "coverage_gaps": [],
+            "rescan_targets": [],
             "analysis_stage": "rescanned",
         },
     )
@@ -3,14 +3,16 @@ from __future__ import annotations
 import asyncio
 from collections.abc import Mapping
 import json
+import os
 import re
-import subprocess
 import time
 from typing import Any
 from urllib.parse import urlparse
 
-import httpx
-
+from agentic_layer.runtime.execution_backend import execution_backend
+from agentic_layer.runtime.resource_budget import CLONE_RESOURCES
+from agentic_layer.runtime.scanner_image import CLONE_IMAGE
+from agentic_layer.shared.github_client import github_client
 from agentic_layer.scan_graph.logger import log_agent
 from agentic_layer.scan_graph.state import ScanState
 from agentic_layer.scan_graph.state import merge_state
@@ -28,113 +30,195 @@ def _token_from_config(config: dict[str, Any] | None) -> str | None:
     return None
 
 
-def _run_clone_in_volume(
+CLONE_MODE_FULL = "full"
+CLONE_MODE_PARTIAL = "partial"
+DEFAULT_BLOB_LIMIT_BYTES = 1024 * 1024
+
+# Nothing in the analysis scanners reads these (AST: *.py, regex: text files,
+# dependency: manifests and lockfiles, config: YAML/JSON/TOML/.env/Dockerfile),
+# so partial clones leave them out of the sparse checkout.
+ACQUISITION_EXCLUDED_DIRS = (
+    "node_modules",
+    "vendor",
+    "third_party",
+    "bower_components",
+    ".venv",
+    "venv",
+    "__pycache__",
+)
+ACQUISITION_EXCLUDED_SUFFIXES = (
+    "png", "jpg", "jpeg", "gif", "bmp", "ico", "webp", "tiff", "psd", "svgz",
+    "mp3", "mp4", "mov", "avi", "mkv", "wav", "ogg", "webm", "flac",
+    "zip", "tar", "gz", "tgz", "bz2", "xz", "7z", "rar", "jar", "war", "whl", "nupkg",
+    "so", "dll", "dylib", "exe", "bin", "o", "a", "class", "pyc",
+    "pdf", "woff", "woff2", "ttf", "otf", "eot",
+    "sqlite", "db", "parquet", "pkl", "pt", "onnx", "h5",
+)
+
+# CODE_DIR is set by the execution backend: the volume mount point in Docker, the
+# workspace directory on the local backend. Scratch files go to $TMPDIR.
+_RESET_WORKSPACE = (
+    ": \"${CODE_DIR:?}\"; T=\"${TMPDIR:-/tmp}\"; "
+    "rm -rf \"$CODE_DIR\"/* \"$CODE_DIR\"/.[!.]* \"$CODE_DIR\"/..?* 2>/dev/null || true; "
+    "mkdir -p \"$CODE_DIR\"; "
+)
+
+_AUTH_GIT_FUNCTION = (
+    "if [ -n \"${GITHUB_TOKEN:-}\" ]; then "
+    "g() { git -c http.extraheader=\"Authorization: Bearer ${GITHUB_TOKEN}\" \"$@\"; }; "
+    "else g() { git \"$@\"; }; fi; "
+)
+
+# Blobs over BLOB_LIMIT stay on the server (--filter) and are excluded from the sparse
+# checkout so `git checkout` never lazily fetches them. The last stdout line reports
+# what was skipped.
+_PARTIAL_CLONE_SCRIPT = r"""
+g clone --depth 1 --single-branch --no-tags --recurse-submodules=no --filter=blob:limit="$BLOB_LIMIT" --no-checkout "$REPO_URL" "$CODE_DIR"
+cd "$CODE_DIR"
+git -c core.quotePath=false ls-tree -r --full-tree HEAD > "$T"/deplai_tree
+git rev-list --objects --missing=print HEAD | sed -n 's/^?//p' > "$T"/deplai_missing
+awk 'NR == FNR { missing[$1] = 1; next } { split($1, meta, " "); if (meta[2] == "blob" && !(meta[3] in missing)) print meta[3] }' "$T"/deplai_missing FS='\t' "$T"/deplai_tree | git cat-file --batch-check > "$T"/deplai_sizes
+{
+  echo '/*'
+  printf '%s\n' "$SPARSE_EXCLUDES"
+  git show HEAD:.gitattributes 2>/dev/null | awk '/filter=lfs/ && $1 !~ /^#/ { print "!" $1 }' || true
+  awk 'NR == FNR { missing[$1] = 1; next } { split($1, meta, " "); if (meta[3] in missing) { path = $2; gsub(/[][*?\\]/, "\\\\&", path); print "!/" path } }' "$T"/deplai_missing FS='\t' "$T"/deplai_tree
+} > "$T"/deplai_sparse
+git sparse-checkout set --no-cone --stdin < "$T"/deplai_sparse
+g checkout -q
+git ls-files -t > "$T"/deplai_files
+awk '
+  FILENAME == ARGV[1] { missing[$1] = 1; next }
+  FILENAME == ARGV[2] { size[$1] = $3; next }
+  FILENAME == ARGV[3] { if (substr($0, 1, 2) == "S ") skipped[substr($0, 3)] = 1; next }
+  {
+    split($1, meta, " ")
+    if (meta[2] != "blob" || !($2 in skipped)) next
+    count++
+    if (meta[3] in missing) oversize++; else bytes += size[meta[3]]
+    if (count <= 50) { p = $2; gsub(/\\/, "\\\\", p); gsub(/"/, "\\\"", p); sample = sample (count > 1 ? "," : "") "\"" p "\"" }
+  }
+  END { printf "DEPLAI_ACQUISITION {\"skipped_paths\":%d,\"skipped_bytes\":%.0f,\"skipped_oversize_blobs\":%d,\"skipped_paths_sample\":[%s]}\n", count, bytes, oversize, sample }
+' "$T"/deplai_missing "$T"/deplai_sizes "$T"/deplai_files FS='\t' "$T"/deplai_tree
+"""
+
+_FULL_CLONE_SCRIPT = (
+    "g clone --depth 1 --single-branch --no-tags --recurse-submodules=no \"$REPO_URL\" \"$CODE_DIR\""
+)
+
+
+def _resolve_clone_mode() -> str:
+    mode = os.getenv("DEPLAI_CLONE_MODE", CLONE_MODE_PARTIAL).strip().lower()
+    return mode if mode in {CLONE_MODE_FULL, CLONE_MODE_PARTIAL} else CLONE_MODE_PARTIAL
+
+
+def _resolve_blob_limit_bytes() -> int:
+    raw = os.getenv("DEPLAI_CLONE_BLOB_LIMIT_BYTES", "").strip()
+    if raw.isdigit() and int(raw) > 0:
+        return int(raw)
+    return DEFAULT_BLOB_LIMIT_BYTES
+
+
+def _sparse_exclude_patterns() -> list[str]:
+    patterns = [f"!{directory}/" for directory in ACQUISITION_EXCLUDED_DIRS]
+    patterns.extend(f"!*.{suffix}" for suffix in ACQUISITION_EXCLUDED_SUFFIXES)
+    return patterns
+
+
+def _build_clone_script(mode: str) -> str:
+    body = _PARTIAL_CLONE_SCRIPT if mode == CLONE_MODE_PARTIAL else _FULL_CLONE_SCRIPT
+    return "set -eu; " + _RESET_WORKSPACE + _AUTH_GIT_FUNCTION + body
+
+
+def _parse_acquisition_report(stdout: str) -> dict[str, Any]:
+    for line in reversed(stdout.splitlines()):
+        if line.startswith("DEPLAI_ACQUISITION "):
+            try:
+                report = json.loads(line[len("DEPLAI_ACQUISITION "):])
+            except json.JSONDecodeError:
+                return {}
+            return report if isinstance(report, dict) else {}
+    return {}
+
+
+async def _run_clone_in_volume(
     scan_id: str,
     repo_url: str,
     volume_name: str,
     token: str | None,
     use_auth_header: bool,
     timeout_seconds: int,
+    mode: str = CLONE_MODE_FULL,
+    blob_limit_bytes: int = DEFAULT_BLOB_LIMIT_BYTES,
 ) -> dict[str, Any]:
-    clone_script = (
-        "set -eu; "
-        "rm -rf /workspace/code/* /workspace/code/.[!.]* /workspace/code/..?* 2>/dev/null || true; "
-        "mkdir -p /workspace/code; "
-        "git clone --depth 1 --single-branch --no-tags --recurse-submodules=no \"$REPO_URL\" /workspace/code"
-    )
+    clone_script = _build_clone_script(mode)
     env = {
         "REPO_URL": repo_url,
         "GIT_TERMINAL_PROMPT": "0",
         "GIT_ASKPASS": "echo",
     }
+    if mode == CLONE_MODE_PARTIAL:
+        env["BLOB_LIMIT"] = str(blob_limit_bytes)
+        env["SPARSE_EXCLUDES"] = "\n".join(_sparse_exclude_patterns())
 
     if use_auth_header and token:
-        clone_script = (
-            "set -eu; "
-            "rm -rf /workspace/code/* /workspace/code/.[!.]* /workspace/code/..?* 2>/dev/null || true; "
-            "mkdir -p /workspace/code; "
-            "git -c http.extraheader=\"Authorization: Bearer ${GITHUB_TOKEN}\" "
-            "clone --depth 1 --single-branch --no-tags --recurse-submodules=no \"$REPO_URL\" /workspace/code"
-        )
         env["GITHUB_TOKEN"] = token
 
     container_name = f"deplai_clone_{re.sub(r'[^a-zA-Z0-9_.-]', '_', scan_id).lower()}_{int(time.time())}"
-    docker_cmd = [
-        "docker",
-        "run",
-        "--name",
-        container_name,
-        "--rm",
-        "--entrypoint",
-        "sh",
-        "-v",
-        f"{volume_name}:/workspace/code",
-        "-w",
-        "/workspace",
-    ]
-    for key, value in env.items():
-        docker_cmd.extend(["-e", f"{key}={value}"])
-    docker_cmd.extend(["alpine/git", "-lc", clone_script])
-
-    log_agent(scan_id, "Cloner", "Starting container command image=alpine/git")
-    log_agent(
-        scan_id,
-        "Cloner",
-        "Clone command: git clone --depth 1 --single-branch --no-tags --recurse-submodules=no <repo_url> /workspace/code",
-    )
+
+    log_agent(scan_id, "Cloner", f"Starting clone image={CLONE_IMAGE} backend={execution_backend.name}")
+    clone_flags = "--depth 1 --single-branch --no-tags --recurse-submodules=no"
+    if mode == CLONE_MODE_PARTIAL:
+        clone_flags += f" --filter=blob:limit={blob_limit_bytes} --no-checkout (sparse)"
+    log_agent(scan_id, "Cloner", f"Clone command: git clone {clone_flags} <repo_url> <code_dir>")
     try:
-        completed = subprocess.run(
-            docker_cmd,
-            check=False,
-            capture_output=True,
-            text=True,
-            timeout=timeout_seconds,
+        run = await execution_backend.run_shell(
+            scan_id,
+            clone_script,
+            volume_name,
+            image=CLONE_IMAGE,
+            env=env,
+            timeout_seconds=timeout_seconds,
+            resources=CLONE_RESOURCES,
+            component="Cloner",
+            name=container_name,
+            network=True,
         )
-        stdout = completed.stdout or ""
-        stderr = completed.stderr or ""
-        if stdout.strip():
-            log_agent(scan_id, "Cloner", f"Clone stdout: {_sanitize_text(stdout)[:1200]}")
-        if stderr.strip():
-            log_agent(scan_id, "Cloner", f"Clone stderr: {_sanitize_text(stderr)[:1200]}")
-
-        if completed.returncode != 0:
-            return {
-                "success": False,
-                "exit_code": int(completed.returncode),
-                "stdout": _sanitize_text(stdout),
-                "stderr": _sanitize_text(stderr),
-                "reason": "git_clone_failed",
-            }
-    except subprocess.TimeoutExpired as exc:
-        try:
-            subprocess.run(
-                ["docker", "rm", "-f", container_name],
-                check=False,
-                capture_output=True,
-                text=True,
-                timeout=15,
-            )
-        except Exception:  # noqa: BLE001
-            pass
-        timeout_stdout = _sanitize_text((exc.stdout or "").decode("utf-8", errors="ignore") if isinstance(exc.stdout, bytes) else (exc.stdout or ""))
-        timeout_stderr = _sanitize_text((exc.stderr or "").decode("utf-8", errors="ignore") if isinstance(exc.stderr, bytes) else (exc.stderr or ""))
-        if timeout_stdout:
-            log_agent(scan_id, "Cloner", f"Clone timeout stdout: {timeout_stdout[:1200]}")
-        if timeout_stderr:
-            log_agent(scan_id, "Cloner", f"Clone timeout stderr: {timeout_stderr[:1200]}")
+    except Exception as exc:  # noqa: BLE001
+        return {
+            "success": False,
+            "exit_code": 1,
+            "stdout": "",
+            "stderr": _sanitize_text(str(exc)),
+            "reason": "git_clone_failed",
+        }
+
+    stdout = _sanitize_text(run.stdout or "")
+    stderr = _sanitize_text(run.stderr or "")
+    if run.timed_out:
+        if stdout:
+            log_agent(scan_id, "Cloner", f"Clone timeout stdout: {stdout[:1200]}")
+        if stderr:
+            log_agent(scan_id, "Cloner", f"Clone timeout stderr: {stderr[:1200]}")
         return {
             "success": False,
             "exit_code": 124,
-            "stdout": timeout_stdout,
-            "stderr": timeout_stderr or f"Container command timed out after {timeout_seconds}s",
+            "stdout": stdout,
+            "stderr": stderr or f"Container command timed out after {timeout_seconds}s",
             "reason": "git_clone_timeout",
         }
-    except Exception as exc:  # noqa: BLE001
+
+    if stdout.strip():
+        log_agent(scan_id, "Cloner", f"Clone stdout: {stdout[:1200]}")
+    if stderr.strip():
+        log_agent(scan_id, "Cloner", f"Clone stderr: {stderr[:1200]}")
+
+    if run.exit_code != 0:
         return {
             "success": False,
-            "exit_code": 1,
-            "stdout": "",
-            "stderr": str(exc),
+            "exit_code": int(run.exit_code),
+            "stdout": stdout,
+            "stderr": stderr,
             "reason": "git_clone_failed",
         }
 
@@ -144,37 +228,44 @@ def _run_clone_in_volume(
         "stdout": "clone succeeded",
         "stderr": "",
         "reason": "clone_succeeded",
+        "acquisition": _parse_acquisition_report(stdout),
     }
 
 
-def _clone_volume_with_optional_auth(
+async def _clone_volume_with_optional_auth(
     scan_id: str,
     repo_url: str,
     volume_name: str,
     token: str | None,
     timeout_seconds: int,
-) -> None:
-    result = _run_clone_in_volume(
+    mode: str = CLONE_MODE_FULL,
+    blob_limit_bytes: int = DEFAULT_BLOB_LIMIT_BYTES,
+) -> dict[str, Any]:
+    result = await _run_clone_in_volume(
         scan_id=scan_id,
         repo_url=repo_url,
         volume_name=volume_name,
         token=token,
         use_auth_header=bool(token),
         timeout_seconds=timeout_seconds,
+        mode=mode,
+        blob_limit_bytes=blob_limit_bytes,
     )
     if result.get("success"):
-        return
+        return dict(result.get("acquisition") or {})
 
-    retry_result = _run_clone_in_volume(
+    retry_result = await _run_clone_in_volume(
         scan_id=scan_id,
         repo_url=repo_url,
         volume_name=volume_name,
         token=None,
         use_auth_header=False,
         timeout_seconds=timeout_seconds,
+        mode=mode,
+        blob_limit_bytes=blob_limit_bytes,
     )
     if retry_result.get("success"):
-        return
+        return dict(retry_result.get("acquisition") or {})
 
     raise RuntimeError(str(result.get("stderr") or result.get("stdout") or "clone failed"))
 
@@ -202,24 +293,29 @@ def _compute_dynamic_timeout(repo_size_kb: int, base_timeout: int = 120, max_tim
     return max(base_timeout, min(max_timeout, dynamic_timeout))
 
 
-async def _resolve_clone_timeout_seconds(scan_id: str, repo_url: str, token: str | None) -> int:
+async def _resolve_clone_timeout_seconds(
+    scan_id: str,
+    repo_url: str,
+    token: str | None,
+    known_size_kb: int | None = None,
+) -> int:
     base_timeout = 120
+    if known_size_kb is not None:
+        timeout_seconds = _compute_dynamic_timeout(repo_size_kb=known_size_kb, base_timeout=base_timeout, max_timeout=600)
+        log_agent(
+            scan_id,
+            "Cloner",
+            f"Repo size reused from pre-clone sizing repo_size_kb={known_size_kb} timeout_seconds={timeout_seconds}",
+        )
+        return timeout_seconds
+
     owner, repo = _extract_owner_repo(repo_url)
     if not owner or not repo:
         log_agent(scan_id, "Cloner", "Unable to parse owner/repo for timeout sizing; using base timeout=120s")
         return base_timeout
 
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28",
-        "User-Agent": "deplai-agent/1.0",
-    }
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
-
     try:
-        async with httpx.AsyncClient(timeout=httpx.Timeout(10.0)) as client:
-            response = await client.get(f"https://api.github.com/repos/{owner}/{repo}", headers=headers)
+        response = await github_client.get_repo(owner, repo, token=token, scan_id=scan_id)
         if response.status_code != 200:
             log_agent(
                 scan_id,
@@ -228,7 +324,7 @@ async def _resolve_clone_timeout_seconds(scan_id: str, repo_url: str, token: str
             )
             return base_timeout
 
-        payload = response.json() if isinstance(response.json(), dict) else {}
+        payload = response.payload if isinstance(response.payload, dict) else {}
         repo_size_kb = int(payload.get("size") or 0)
         timeout_seconds = _compute_dynamic_timeout(repo_size_kb=repo_size_kb, base_timeout=base_timeout, max_timeout=600)
         log_agent(
@@ -274,19 +370,30 @@ async def cloner_node(state: ScanState, config: dict[str, Any] | None = None) ->
 
     repo_url = state["repo_url"]
     token = _token_from_config(config)
-    timeout_seconds = await _resolve_clone_timeout_seconds(state["scan_id"], repo_url, token)
+    presize = state.get("repo_metadata", {}).get("presize", {})
+    known_size_kb = presize.get("repo_size_kb") if isinstance(presize, dict) else None
+    timeout_seconds = await _resolve_clone_timeout_seconds(
+        state["scan_id"],
+        repo_url,
+        token,
+        known_size_kb=known_size_kb if isinstance(known_size_kb, int) else None,
+    )
+
+    clone_mode = _resolve_clone_mode()
+    blob_limit_bytes = _resolve_blob_limit_bytes()
 
     # Clone directly into Docker named volume.
     try:
-        log_agent(state["scan_id"], "Cloner", "Cloning repository into Docker code volume")
-        await asyncio.wait_for(
-            asyncio.to_thread(
-                _clone_volume_with_optional_auth,
+        log_agent(state["scan_id"], "Cloner", f"Cloning repository into Docker code volume mode={clone_mode}")
+        clone_report = await asyncio.wait_for(
+            _clone_volume_with_optional_auth(
                 state["scan_id"],
                 repo_url,
                 code_volume_name,
                 token,
                 timeout_seconds,
+                clone_mode,
+                blob_limit_bytes,
             ),
             timeout=max(timeout_seconds + 10, 130),
         )
@@ -339,11 +446,37 @@ async def cloner_node(state: ScanState, config: dict[str, Any] | None = None) ->
             },
         )
 
+    acquisition: dict[str, Any] = {
+        "mode": "clone",
+        "clone_mode": clone_mode,
+        "completed": True,
+    }
+    if clone_mode == CLONE_MODE_PARTIAL:
+        acquisition.update(
+            {
+                "blob_limit_bytes": blob_limit_bytes,
+                "skipped_paths": int(clone_report.get("skipped_paths") or 0),
+                "skipped_bytes": int(clone_report.get("skipped_bytes") or 0),
+                "skipped_oversize_blobs": int(clone_report.get("skipped_oversize_blobs") or 0),
+                "skipped_paths_sample": list(clone_report.get("skipped_paths_sample") or []),
+            }
+        )
+        log_agent(
+            state["scan_id"],
+            "Cloner",
+            f"Partial clone skipped paths={acquisition['skipped_paths']} "
+            f"bytes={acquisition['skipped_bytes']} oversize_blobs={acquisition['skipped_oversize_blobs']}",
+        )
+
     log_agent(state["scan_id"], "Cloner", "Code successfully loaded into volume")
 
     return merge_state(
         state,
         {
             "phase": "code_acquired",
+            "repo_metadata": {
+                **state["repo_metadata"],
+                "acquisition": acquisition,
+            },
         },
     )
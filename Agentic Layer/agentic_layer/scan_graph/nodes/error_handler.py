@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-import subprocess
-
+from agentic_layer.runtime.docker_engine import DockerEngineError
+from agentic_layer.runtime.execution_backend import execution_backend
 from agentic_layer.scan_graph.logger import log_agent
 from agentic_layer.scan_graph.state import ScanState
 from agentic_layer.scan_graph.state import merge_state
@@ -21,19 +21,12 @@ async def error_handler_node(state: ScanState) -> ScanState:
         volume_name = str(state.get("docker_volumes", {}).get("code", "")).strip()
         if volume_name:
             try:
-                completed = subprocess.run(
-                    ["docker", "volume", "rm", "-f", volume_name],
-                    check=False,
-                    capture_output=True,
-                    text=True,
-                    timeout=20,
+                cleanup_status.update(
+                    await execution_backend.release_workspace(volume_name, state["scan_id"], "ErrorHandler")
                 )
-                output = f"{completed.stdout}\n{completed.stderr}".strip()
-                if completed.returncode == 0 or "No such volume" in output:
-                    cleanup_status["volume_removed"] = True
-                    log_agent(state["scan_id"], "ErrorHandler", f"Forced cleanup removed volume {volume_name}")
-                else:
-                    errors.append(f"Forced cleanup failed for volume {volume_name}: {output[:240]}")
+                cleanup_status["volume_removed"] = True
+            except DockerEngineError as exc:
+                errors.append(f"Forced cleanup failed for volume {volume_name}: {exc.message[:240]}")
             except Exception as exc:  # noqa: BLE001
                 errors.append(f"Forced cleanup raised exception for volume {volume_name}: {exc}")
 
@@ -5,6 +5,9 @@ from typing import Any
 
 import httpx
 
+from agentic_layer.shared.github_client import github_client
+from agentic_layer.shared.token_validation_cache import TokenValidation
+from agentic_layer.shared.token_validation_cache import token_validation_cache
 from agentic_layer.scan_graph.logger import log_agent
 from agentic_layer.scan_graph.state import SecurityError
 from agentic_layer.scan_graph.state import ScanState
@@ -45,71 +48,93 @@ async def github_auth_node(state: ScanState, config: dict[str, Any] | None = Non
     repo_access = False
     authenticated_login: str | None = None
     token_type: str = "none"
+    repo_size_kb: int | None = None
+    cache_hit = False
 
     owner, repo = _extract_owner_repo(state["repo_url"])
+    cached = (
+        token_validation_cache.get(token_value, owner, repo)
+        if token_value and owner is not None and repo is not None
+        else None
+    )
 
     if not token_present:
         errors.append("GitHub token is required")
     elif owner is None or repo is None:
         errors.append("Repository URL is not a valid GitHub repository path")
+    elif cached is not None:
+        cache_hit = True
+        token_valid = cached.token_valid
+        repo_access = cached.repo_access
+        token_type = cached.token_type
+        authenticated_login = cached.authenticated_login
+        repo_size_kb = cached.repo_size_kb
+        log_agent(state["scan_id"], "GitHubAuth", "Token validation served from cache")
     else:
-        headers = {
-            "Accept": "application/vnd.github+json",
-            "X-GitHub-Api-Version": "2022-11-28",
-            "User-Agent": "deplai-agent/1.0",
-        }
-        if token_value:
-            headers["Authorization"] = f"Bearer {token_value}"
-
         try:
-            async with httpx.AsyncClient(timeout=httpx.Timeout(10.0)) as client:
-                user_status: int | None = None
-                repo_status: int | None = None
-                if token_present:
-                    user_response = await client.get("https://api.github.com/user", headers=headers)
-                    user_status = int(user_response.status_code)
-                    if user_response.status_code == 200:
-                        token_valid = True
-                        token_type = "user"
-                        user_payload = user_response.json()
-                        authenticated_login = user_payload.get("login")
-                    else:
-                        token_valid = False
-
-                repo_response = await client.get(
-                    f"https://api.github.com/repos/{owner}/{repo}",
-                    headers=headers,
-                )
-                repo_status = int(repo_response.status_code)
-                if repo_response.status_code == 200:
-                    repo_access = True
-                    if token_present and not token_valid:
-                        token_valid = True
-                        token_type = "installation"
-                elif repo_response.status_code in {401, 403}:
-                    errors.append("GitHub token is invalid or lacks required scopes")
-                elif repo_response.status_code == 404:
-                    errors.append("Target repository not found or inaccessible")
+            user_status: int | None = None
+            repo_status: int | None = None
+            if token_present:
+                user_response = await github_client.get_user(token=token_value, scan_id=state["scan_id"])
+                user_status = user_response.status_code
+                if user_response.status_code == 200:
+                    token_valid = True
+                    token_type = "user"
+                    user_payload = user_response.payload if isinstance(user_response.payload, dict) else {}
+                    authenticated_login = user_payload.get("login")
                 else:
-                    errors.append("Repository access validation failed")
-
-                log_agent(
-                    state["scan_id"],
-                    "GitHubAuth",
-                    f"GitHub API status: user={user_status}, repo={repo_status}, token_config_present={token_present}",
-                )
+                    token_valid = False
+
+            repo_response = await github_client.get_repo(owner, repo, token=token_value, scan_id=state["scan_id"])
+            repo_status = repo_response.status_code
+            if repo_response.status_code == 200:
+                repo_access = True
+                repo_payload = repo_response.payload if isinstance(repo_response.payload, dict) else {}
+                if isinstance(repo_payload.get("size"), int):
+                    repo_size_kb = repo_payload["size"]
+                if token_present and not token_valid:
+                    token_valid = True
+                    token_type = "installation"
+            elif repo_response.status_code in {401, 403}:
+                errors.append("GitHub token is invalid or lacks required scopes")
+            elif repo_response.status_code == 404:
+                errors.append("Target repository not found or inaccessible")
+            else:
+                errors.append("Repository access validation failed")
+
+            log_agent(
+                state["scan_id"],
+                "GitHubAuth",
+                f"GitHub API status: user={user_status}, repo={repo_status}, token_config_present={token_present}",
+            )
         except httpx.RequestError:
             errors.append("Unable to reach GitHub API for authentication")
 
     if token_valid and not repo_access:
         token_valid = False
 
+    if token_value and owner is not None and repo is not None and not cache_hit:
+        token_validation_cache.put(
+            token_value,
+            owner,
+            repo,
+            TokenValidation(
+                token_valid=token_valid,
+                repo_access=repo_access,
+                token_type=token_type,
+                authenticated_login=authenticated_login,
+                repo_size_kb=repo_size_kb,
+            ),
+        )
+
     repo_metadata["github_auth"] = {
         "token_present": token_present,
         "token_valid": token_valid,
         "repo_access": repo_access,
         "token_type": token_type,
         "authenticated_login": authenticated_login,
+        "repo_size_kb": repo_size_kb,
+        "cached": cache_hit,
     }
 
     log_agent(
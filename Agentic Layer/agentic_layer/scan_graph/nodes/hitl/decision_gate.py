@@ -113,6 +113,12 @@ def _state_embedded_decision(state: ScanState) -> dict[str, Any] | None:
 async def hitl_prompt_node(state: ScanState, config: dict[str, Any] | None = None) -> ScanState:
     timeout_seconds = _resolve_timeout_seconds(state, config)
     default_decision = _resolve_default_decision(state, config)
+    acquired = bool(state.get("repo_metadata", {}).get("acquisition", {}).get("completed"))
+    question = (
+        "Repository size exceeds threshold. Approve full scan?"
+        if acquired
+        else "Estimated repository size exceeds threshold. Approve clone and full scan?"
+    )
 
     hitl_metadata = {
         **state.get("repo_metadata", {}).get("hitl", {}),
@@ -120,7 +126,7 @@ async def hitl_prompt_node(state: ScanState, config: dict[str, Any] | None = Non
         "requested_at": _utc_now_iso(),
         "timeout_seconds": timeout_seconds,
         "default_decision": default_decision,
-        "question": "Repository size exceeds threshold. Approve full scan?",
+        "question": question,
         "options": ["approve", "reject"],
     }
 
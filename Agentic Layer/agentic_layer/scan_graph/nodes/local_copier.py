@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import time
+
+from agentic_layer.runtime.execution_backend import execution_backend
+from agentic_layer.runtime.local_source import resolve_local_source
+from agentic_layer.runtime.local_source import resolve_source_mode
+from agentic_layer.runtime.local_source import stage_local_source
+from agentic_layer.scan_graph.logger import log_agent
+from agentic_layer.scan_graph.state import ScanState
+from agentic_layer.scan_graph.state import merge_state
+
+
+async def local_copier_node(state: ScanState) -> ScanState:
+    # Setup/acquisition step for uploaded projects: no volume, no clone, no network.
+    # The project directory (or a hardlink snapshot of it) becomes the read-only workspace.
+    log_agent(state["scan_id"], "LocalCopier", "Attaching uploaded project")
+    source = resolve_local_source(state["repo_url"])
+    if source is None:
+        log_agent(state["scan_id"], "LocalCopier", "Local project directory not found")
+        return merge_state(
+            state,
+            {
+                "phase": "error",
+                "errors": [*state["errors"], "Local project directory not found"],
+            },
+        )
+
+    started_at = time.monotonic()
+    mode = resolve_source_mode()
+    try:
+        staged = await stage_local_source(state["scan_id"], source, mode)
+    except OSError as exc:
+        log_agent(state["scan_id"], "LocalCopier", "Local project snapshot failed")
+        return merge_state(
+            state,
+            {
+                "phase": "error",
+                "errors": [*state["errors"], f"Local project snapshot failed: {exc}"],
+            },
+        )
+
+    workspace = execution_backend.attach_host_path(staged.path)
+    elapsed_ms = int((time.monotonic() - started_at) * 1000)
+    repo_metadata = dict(state["repo_metadata"])
+    repo_metadata["acquisition"] = {
+        "mode": "local",
+        "source_mode": staged.mode,
+        "files_linked": staged.files,
+        "files_copied": staged.copied_files,
+        "elapsed_ms": elapsed_ms,
+        "completed": True,
+    }
+    log_agent(
+        state["scan_id"],
+        "LocalCopier",
+        f"Local project attached mode={staged.mode} files={staged.files} elapsed_ms={elapsed_ms}",
+    )
+
+    return merge_state(
+        state,
+        {
+            "phase": "code_acquired",
+            "docker_volumes": {"code": workspace.ref},
+            "repo_path": workspace.repo_path,
+            "repo_metadata": repo_metadata,
+        },
+    )
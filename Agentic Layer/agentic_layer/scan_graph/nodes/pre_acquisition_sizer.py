@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import os
+from typing import Any
+
+from agentic_layer.shared.github_client import github_client
+from agentic_layer.scan_graph.logger import log_agent
+from agentic_layer.scan_graph.nodes.cloner import _extract_owner_repo
+from agentic_layer.scan_graph.nodes.cloner import _token_from_config
+from agentic_layer.scan_graph.nodes.size_checker import SIZE_THRESHOLD_BYTES
+from agentic_layer.scan_graph.state import ScanState
+from agentic_layer.scan_graph.state import merge_state
+
+
+# GitHub reports `size` as packed repository KB; a checked-out tree is usually larger.
+DEFAULT_SIZE_RATIO = 1.5
+
+
+def _resolve_size_ratio() -> float:
+    raw = os.getenv("DEPLAI_PRESIZE_RATIO", "").strip()
+    try:
+        ratio = float(raw) if raw else DEFAULT_SIZE_RATIO
+    except ValueError:
+        return DEFAULT_SIZE_RATIO
+    return ratio if ratio > 0 else DEFAULT_SIZE_RATIO
+
+
+async def _fetch_repo_size_kb(scan_id: str, repo_url: str, token: str | None) -> int | None:
+    owner, repo = _extract_owner_repo(repo_url)
+    if not owner or not repo:
+        log_agent(scan_id, "PreAcquisitionSizer", "Unable to parse owner/repo for pre-clone sizing")
+        return None
+
+    try:
+        response = await github_client.get_repo(owner, repo, token=token, scan_id=scan_id)
+    except Exception as exc:  # noqa: BLE001
+        log_agent(scan_id, "PreAcquisitionSizer", f"Repo size lookup failed ({exc})")
+        return None
+
+    if response.status_code != 200:
+        log_agent(scan_id, "PreAcquisitionSizer", f"Repo size lookup failed status={response.status_code}")
+        return None
+
+    payload = response.payload
+    if not isinstance(payload, dict) or payload.get("size") is None:
+        return None
+    return int(payload.get("size") or 0)
+
+
+async def pre_acquisition_sizer_node(state: ScanState, config: dict[str, Any] | None = None) -> ScanState:
+    # Runs the size-threshold decision from GitHub metadata before any bytes are cloned.
+    log_agent(state["scan_id"], "PreAcquisitionSizer", "Estimating repository size before acquisition")
+    repo_metadata = dict(state["repo_metadata"])
+
+    # GitHubAuth already read the repository (or served it from its validation cache).
+    repo_size_kb = repo_metadata.get("github_auth", {}).get("repo_size_kb")
+    if not isinstance(repo_size_kb, int):
+        token = _token_from_config(config)
+        repo_size_kb = await _fetch_repo_size_kb(state["scan_id"], state["repo_url"], token)
+    size_ratio = _resolve_size_ratio()
+
+    if repo_size_kb is None:
+        repo_metadata["presize"] = {
+            "source": "unavailable",
+            "threshold_bytes": SIZE_THRESHOLD_BYTES,
+            "requires_hitl": False,
+        }
+        log_agent(
+            state["scan_id"],
+            "PreAcquisitionSizer",
+            "Repository size unknown; deferring threshold check to post-clone size checker",
+        )
+        return merge_state(
+            state,
+            {
+                "phase": "presized",
+                "requires_hitl": False,
+                "repo_metadata": repo_metadata,
+            },
+        )
+
+    estimated_size_bytes = int(repo_size_kb * 1024 * size_ratio)
+    requires_hitl = estimated_size_bytes > SIZE_THRESHOLD_BYTES
+
+    repo_metadata["presize"] = {
+        "source": "github_api",
+        "repo_size_kb": repo_size_kb,
+        "size_ratio": size_ratio,
+        "estimated_size_bytes": estimated_size_bytes,
+        "threshold_bytes": SIZE_THRESHOLD_BYTES,
+        "requires_hitl": requires_hitl,
+    }
+    log_agent(
+        state["scan_id"],
+        "PreAcquisitionSizer",
+        f"Pre-clone size check complete: repo_size_kb={repo_size_kb}, "
+        f"estimated_bytes={estimated_size_bytes}, requires_hitl={requires_hitl}",
+    )
+
+    return merge_state(
+        state,
+        {
+            "phase": "presized",
+            "requires_hitl": requires_hitl,
+            "repo_metadata": repo_metadata,
+        },
+    )
+
+
+def route_after_pre_acquisition_sizer(state: ScanState) -> str:
+    if state["requires_hitl"]:
+        log_agent(state["scan_id"], "PreAcquisitionSizer", "Routing to HITL before acquisition")
+        return "hitl"
+    log_agent(state["scan_id"], "PreAcquisitionSizer", "Routing to acquisition")
+    return "acquire"
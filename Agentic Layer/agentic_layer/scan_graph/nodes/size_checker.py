@@ -15,13 +15,21 @@ async def size_checker_node(state: ScanState) -> ScanState:
     stats = repo_metadata.get("stats", {})
     total_size_bytes = int(stats.get("total_size_bytes", 0))
 
-    requires_hitl = total_size_bytes > SIZE_THRESHOLD_BYTES
+    # A pre-clone HITL approval already covers this repository; do not ask twice.
+    hitl_decision = str(repo_metadata.get("hitl", {}).get("decision", "")).strip().lower()
+    requires_hitl = total_size_bytes > SIZE_THRESHOLD_BYTES and hitl_decision != "approve"
 
     repo_metadata["size_check"] = {
         "threshold_bytes": SIZE_THRESHOLD_BYTES,
         "total_size_bytes": total_size_bytes,
         "requires_hitl": requires_hitl,
     }
+
+    # Observed checkout/API size ratio, used to calibrate DEPLAI_PRESIZE_RATIO.
+    presize = repo_metadata.get("presize", {})
+    repo_size_kb = int(presize.get("repo_size_kb") or 0) if isinstance(presize, dict) else 0
+    if repo_size_kb > 0:
+        repo_metadata["size_check"]["observed_size_ratio"] = round(total_size_bytes / (repo_size_kb * 1024), 3)
     log_agent(
         state["scan_id"],
         "SizeChecker",
@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-import json
-
-from agentic_layer.runtime.docker_execution import DockerExecutionHelper
+from agentic_layer.runtime.execution_backend import run_scanner
+from agentic_layer.runtime.output_stream import NdjsonCollector
 from agentic_layer.scan_graph.logger import log_agent
 from agentic_layer.scan_graph.state import ScanState
 from agentic_layer.scan_graph.state import merge_state
@@ -34,27 +33,19 @@ async def codebase_stats_node(state: ScanState) -> ScanState:
             },
         )
 
+    collector = NdjsonCollector()
     try:
-        result = DockerExecutionHelper.run(
+        await run_scanner(
             scan_id=state["scan_id"],
-            image="alpine",
-            command=[
-                "sh",
-                "-lc",
-                "files=$(find /workspace -type f | wc -l); "
-                "size_kb=$(du -sk /workspace | awk '{print $1}'); "
-                "printf '{\"total_files\":%s,\"total_size_bytes\":%s}\n' \"$files\" \"$((size_kb*1024))\"",
-            ],
-            volume_name=code_volume_name,
-            mount_path="/workspace",
-            workdir="/workspace",
-            read_only=True,
-            network_none=True,
+            tool="stats",
+            workspace=code_volume_name,
             timeout_seconds=60,
             component="CodebaseStats",
+            collector=collector,
         )
-        output = (result.stdout or "").strip().splitlines()
-        payload = json.loads(output[-1] if output else "{}")
+        if not collector.summary_received:
+            raise RuntimeError("Codebase stats returned no summary")
+        payload = collector.summary
         total_files = int(payload.get("total_files", 0))
         total_size_bytes = int(payload.get("total_size_bytes", 0))
     except Exception as exc:  # noqa: BLE001
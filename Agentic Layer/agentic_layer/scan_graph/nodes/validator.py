@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from urllib.parse import urlparse
 
+from agentic_layer.runtime.local_source import is_local_source
+from agentic_layer.runtime.local_source import resolve_local_source
 from agentic_layer.scan_graph.logger import log_agent
 from agentic_layer.scan_graph.state import ScanState
 from agentic_layer.scan_graph.state import merge_state
@@ -11,22 +13,32 @@ async def request_validator_node(state: ScanState) -> ScanState:
     # A node is a unit of work in StateGraph.
     # This validator checks repository URL shape and basic scan prerequisites.
     log_agent(state["scan_id"], "RequestValidator", "Starting request validation")
-    parsed = urlparse(state["repo_url"])
-    is_repo_url = parsed.scheme in {"http", "https"} and bool(parsed.netloc)
-
     errors = list(state["errors"])
     repo_metadata = dict(state["repo_metadata"])
 
-    if not is_repo_url:
-        errors.append("Repository URL is invalid")
+    if is_local_source(state["repo_url"]):
+        # Uploaded projects: the Connector authenticated the owner; the URL can only
+        # name a directory under the local projects root.
+        source = "local"
+        is_repo_url = resolve_local_source(state["repo_url"]) is not None
+        has_permission = is_repo_url
+        if not is_repo_url:
+            errors.append("Local project is invalid or missing")
+    else:
+        source = "github"
+        parsed = urlparse(state["repo_url"])
+        is_repo_url = parsed.scheme in {"http", "https"} and bool(parsed.netloc)
+        if not is_repo_url:
+            errors.append("Repository URL is invalid")
 
-    has_permission = "github.com" in state["repo_url"]
-    if not has_permission:
-        errors.append("User does not have permission for this repository source")
+        has_permission = "github.com" in state["repo_url"]
+        if not has_permission:
+            errors.append("User does not have permission for this repository source")
 
     prerequisites_ok = is_repo_url and has_permission
 
     repo_metadata["validation"] = {
+        "source": source,
         "repo_url_valid": is_repo_url,
         "has_permission": has_permission,
         "prerequisites_ok": prerequisites_ok,
@@ -53,5 +65,8 @@ def route_after_validation(state: ScanState) -> str:
     if state["errors"]:
         log_agent(state["scan_id"], "RequestValidator", "Routing to error handler")
         return "error"
+    if is_local_source(state["repo_url"]):
+        log_agent(state["scan_id"], "RequestValidator", "Local project; skipping GitHub auth")
+        return "local"
     log_agent(state["scan_id"], "RequestValidator", "Routing to GitHub auth")
     return "ok"
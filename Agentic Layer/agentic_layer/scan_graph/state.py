@@ -49,10 +49,13 @@ class ScanState(TypedDict):
     # Analysis phase fields.
     setup_phase: str
     hitl_phase: str
+    acquisition_phase: str
     findings: list[dict[str, Any]]
     raw_tool_outputs: list[dict[str, Any]]
+    ast_rule_findings: dict[str, list[dict[str, Any]]]
     owasp_mapped: dict[str, list[dict[str, Any]]]
     coverage_gaps: list[str]
+    rescan_targets: list[dict[str, Any]]
     rescans_triggered: bool
     analysis_phase: str
     analysis_stage: str
@@ -122,10 +125,13 @@ def build_initial_state(repo_url: str) -> ScanState:
         "phase": "master_orchestrator",
         "setup_phase": PhaseStatus.NOT_STARTED.value,
         "hitl_phase": PhaseStatus.NOT_STARTED.value,
+        "acquisition_phase": PhaseStatus.NOT_STARTED.value,
         "findings": [],
         "raw_tool_outputs": [],
+        "ast_rule_findings": {},
         "owasp_mapped": {},
         "coverage_gaps": [],
+        "rescan_targets": [],
         "rescans_triggered": False,
         "analysis_phase": PhaseStatus.NOT_STARTED.value,
         "analysis_stage": "not_started",
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from langgraph.graph import END
+from langgraph.graph import START
+from langgraph.graph import StateGraph
+
+from agentic_layer.runtime.local_source import is_local_source
+from agentic_layer.scan_graph.nodes.cloner import cloner_node
+from agentic_layer.scan_graph.nodes.local_copier import local_copier_node
+from agentic_layer.scan_graph.nodes.memory_loader import memory_loader_node
+from agentic_layer.scan_graph.nodes.size_checker import size_checker_node
+from agentic_layer.scan_graph.nodes.stats import codebase_stats_node
+from agentic_layer.scan_graph.nodes.volume_creator import volume_creator_node
+from agentic_layer.scan_graph.state import ScanState
+
+
+def route_by_source(state: ScanState) -> str:
+    return "local" if is_local_source(state["repo_url"]) else "remote"
+
+
+def route_after_cloner(state: ScanState) -> str:
+    if state["phase"] == "error" or state["errors"]:
+        return "failed"
+    return "ok"
+
+
+def build_acquisition_subgraph():
+    # Acquisition pulls code into a Docker volume; it only runs once sizing has cleared (or HITL approved).
+    # Uploaded projects skip both and are attached read-only by the local copier.
+    graph = StateGraph(ScanState)
+
+    graph.add_node("volume_creator", volume_creator_node)
+    graph.add_node("cloner", cloner_node)
+    graph.add_node("local_copier", local_copier_node)
+    graph.add_node("codebase_stats", codebase_stats_node)
+    graph.add_node("memory_loader", memory_loader_node)
+    graph.add_node("size_checker", size_checker_node)
+
+    graph.add_conditional_edges(
+        START,
+        route_by_source,
+        {
+            "remote": "volume_creator",
+            "local": "local_copier",
+        },
+    )
+    graph.add_edge("volume_creator", "cloner")
+    graph.add_conditional_edges(
+        "cloner",
+        route_after_cloner,
+        {
+            "ok": "codebase_stats",
+            "failed": END,
+        },
+    )
+    graph.add_conditional_edges(
+        "local_copier",
+        route_after_cloner,
+        {
+            "ok": "codebase_stats",
+            "failed": END,
+        },
+    )
+    graph.add_edge("codebase_stats", "memory_loader")
+    graph.add_edge("memory_loader", "size_checker")
+    graph.add_edge("size_checker", END)
+
+    return graph.compile()
+
+
+acquisition_subgraph = build_acquisition_subgraph()
@@ -16,7 +16,7 @@ from agentic_layer.scan_graph.subgraphs.smart_dedup_subgraph import smart_dedup_
 
 TOOL_CATALOG = {
     "A01:2021-Broken Access Control": ["access_path_scan", "policy_gap_scan"],
-    "A02:2021-Cryptographic Failures": ["crypto_key_scan", "config_entropy_check"],
+    "A02:2021-Cryptographic Failures": ["crypto_key_scan", "secret_scan", "config_entropy_check"],
     "A03:2021-Injection": ["ast_deep_scan", "regex_injection", "taint_sim"],
 }
 
@@ -25,6 +25,7 @@ TOOL_WEIGHT = {
     "ast_deep_scan": 90,
     "regex_injection": 80,
     "crypto_key_scan": 85,
+    "secret_scan": 88,
     "config_entropy_check": 70,
     "access_path_scan": 75,
     "policy_gap_scan": 65,
@@ -38,6 +39,7 @@ class CategoryExecutionState(TypedDict):
     code_volume: str | None
     category: str
     base_findings: list[dict[str, Any]]
+    precomputed_tool_findings: dict[str, list[dict[str, Any]]]
     category_execution_context: dict[str, Any]
     category_status: str
     selected_tools: list[str]
@@ -181,9 +183,14 @@ async def docker_executor_node(state: CategoryExecutionState) -> CategoryExecuti
             ],
         }
 
+    precomputed = state.get("precomputed_tool_findings") or {}
     for tool_name in state["ordered_tools"]:
         try:
-            result = runtime.run_tool(tool_name=tool_name, code_volume_name=code_volume)
+            if tool_name in precomputed:
+                # Already evaluated by the AST scanner's single pass over the repository.
+                result = runtime.precomputed_result(tool_name, precomputed[tool_name], source="ast_scanner")
+            else:
+                result = await runtime.run_tool(tool_name=tool_name, code_volume_name=code_volume)
         except Exception as exc:  # noqa: BLE001
             log_agent(
                 state["scan_id"],
@@ -210,6 +217,7 @@ async def docker_executor_node(state: CategoryExecutionState) -> CategoryExecuti
                 "tool_name": result["tool_name"],
                 "exit_code": result["exit_code"],
                 "execution_time_ms": result["execution_time_ms"],
+                "queue_wait_ms": int(result.get("queue_wait_ms", 0)),
                 "stdout": result["stdout"],
                 "stderr": result["stderr"],
                 "status": result.get("status", "failed"),
@@ -233,6 +241,7 @@ async def execution_recorder_node(state: CategoryExecutionState) -> CategoryExec
         {
             "tool_name": output["tool_name"],
             "execution_time": output["execution_time_ms"],
+            "queue_wait_ms": output.get("queue_wait_ms", 0),
             "status": output.get("status", "failed"),
             "confidence": output["confidence_score"],
             "finding_count": len(output["findings"]),
@@ -330,6 +339,7 @@ async def category_subgraph_runner_node(state: ScanState) -> ScanState:
             "code_volume": state.get("docker_volumes", {}).get("code"),
             "category": category,
             "base_findings": list(state["owasp_mapped"].get(category, [])),
+            "precomputed_tool_findings": dict(state.get("ast_rule_findings") or {}),
             "category_execution_context": {},
             "category_status": "pending",
             "selected_tools": [],
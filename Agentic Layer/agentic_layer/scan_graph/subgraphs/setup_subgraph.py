@@ -4,43 +4,43 @@ from langgraph.graph import END
 from langgraph.graph import START
 from langgraph.graph import StateGraph
 
-from agentic_layer.scan_graph.nodes.cloner import cloner_node
-from agentic_layer.scan_graph.nodes.memory_loader import memory_loader_node
-from agentic_layer.scan_graph.nodes.size_checker import size_checker_node
-from agentic_layer.scan_graph.nodes.stats import codebase_stats_node
-from agentic_layer.scan_graph.nodes.volume_creator import volume_creator_node
+from agentic_layer.runtime.local_source import is_local_source
+from agentic_layer.scan_graph.nodes.pre_acquisition_sizer import pre_acquisition_sizer_node
+from agentic_layer.scan_graph.nodes.pre_acquisition_sizer import route_after_pre_acquisition_sizer
+from agentic_layer.scan_graph.subgraphs.acquisition_subgraph import acquisition_subgraph
 from agentic_layer.scan_graph.state import ScanState
 
 
-def route_after_cloner(state: ScanState) -> str:
-    if state["phase"] == "error" or state["errors"]:
-        return "failed"
-    return "ok"
+def route_setup_start(state: ScanState) -> str:
+    # Uploaded projects have no GitHub metadata to size; the post-acquisition size checker covers them.
+    return "acquire" if is_local_source(state["repo_url"]) else "presize"
 
 
 def build_setup_subgraph():
     # Setup subgraph encapsulates Layer 3 (Setup & Acquisition) as one reusable phase.
+    # Sizing runs first so oversized repositories reach HITL before any clone traffic.
     graph = StateGraph(ScanState)
 
-    graph.add_node("volume_creator", volume_creator_node)
-    graph.add_node("cloner", cloner_node)
-    graph.add_node("codebase_stats", codebase_stats_node)
-    graph.add_node("memory_loader", memory_loader_node)
-    graph.add_node("size_checker", size_checker_node)
+    graph.add_node("pre_acquisition_sizer", pre_acquisition_sizer_node)
+    graph.add_node("acquisition", acquisition_subgraph)
 
-    graph.add_edge(START, "volume_creator")
-    graph.add_edge("volume_creator", "cloner")
     graph.add_conditional_edges(
-        "cloner",
-        route_after_cloner,
+        START,
+        route_setup_start,
         {
-            "ok": "codebase_stats",
-            "failed": END,
+            "presize": "pre_acquisition_sizer",
+            "acquire": "acquisition",
         },
     )
-    graph.add_edge("codebase_stats", "memory_loader")
-    graph.add_edge("memory_loader", "size_checker")
-    graph.add_edge("size_checker", END)
+    graph.add_conditional_edges(
+        "pre_acquisition_sizer",
+        route_after_pre_acquisition_sizer,
+        {
+            "acquire": "acquisition",
+            "hitl": END,
+        },
+    )
+    graph.add_edge("acquisition", END)
 
     return graph.compile()
 
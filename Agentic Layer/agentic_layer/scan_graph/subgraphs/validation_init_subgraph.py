@@ -35,6 +35,7 @@ def build_validation_init_subgraph():
         route_after_validation,
         {
             "ok": "github_auth",
+            "local": "state_initializer",
             "error": END,
         },
     )
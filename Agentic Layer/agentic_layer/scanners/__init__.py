@@ -0,0 +1,7 @@
+from __future__ import annotations
+
+# Bump on any change to scanner behaviour or output; it is the scanner image tag
+# and part of every result summary, so it doubles as a cache key.
+SCANNER_VERSION = "1.12.0"
+
+__all__ = ["SCANNER_VERSION"]
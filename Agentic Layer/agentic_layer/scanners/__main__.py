@@ -0,0 +1,6 @@
+from __future__ import annotations
+
+from agentic_layer.scanners.cli import main
+
+
+raise SystemExit(main())
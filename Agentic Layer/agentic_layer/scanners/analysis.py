@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import re
+import time
+from typing import Any
+
+from agentic_layer.scanners import content_index
+from agentic_layer.scanners.ast_rules import RULES
+from agentic_layer.scanners.budget import FileBudget
+from agentic_layer.scanners.budget import is_minified
+from agentic_layer.scanners.budget import literal_windows
+from agentic_layer.scanners.checkpoint import Progress
+from agentic_layer.scanners.ast_rules import AstRule
+from agentic_layer.scanners.ast_rules import analysis_finding
+from agentic_layer.scanners.ast_rules import rule_tools
+from agentic_layer.scanners.config_scan import scan_configs
+from agentic_layer.scanners.content_index import LiteralQuery
+from agentic_layer.scanners.content_index import register_query
+from agentic_layer.scanners.files import iter_files
+from agentic_layer.scanners.files import read_text
+from agentic_layer.scanners.lockfiles import Dependency
+from agentic_layer.scanners.lockfiles import iter_lockfiles
+from agentic_layer.scanners.lockfiles import parse_requirements
+from agentic_layer.scanners.lockfiles import parser_for
+from agentic_layer.scanners.manifest import kind_for_name
+from agentic_layer.scanners.protocol import Emitter
+from agentic_layer.scanners.python_ast import scan_tree
+from agentic_layer.scanners.versions import in_range
+from agentic_layer.scanners.versions import normalize_package
+from agentic_layer.scanners.versions import version_key
+from agentic_layer.scanners.vulndb import VulnDB
+
+
+REGEX_PATTERNS = [
+    (re.compile(r"AKIA[0-9A-Z]{16}"), "potential_aws_key", "high", "security_misconfiguration"),
+    (
+        re.compile(r"password\s*=\s*['\"][^'\"]+['\"]", re.IGNORECASE),
+        "hardcoded_password",
+        "high",
+        "broken_access_control",
+    ),
+    (re.compile(r"http://", re.IGNORECASE), "insecure_transport", "medium", "cryptographic_failures"),
+]
+
+# Literals each pattern requires, for the content index.
+REGEX_QUERIES = {
+    "potential_aws_key": register_query("regex:potential_aws_key", LiteralQuery.any_of("akia")),
+    "hardcoded_password": register_query("regex:hardcoded_password", LiteralQuery.any_of("password")),
+    "insecure_transport": register_query("regex:insecure_transport", LiteralQuery.any_of("http://")),
+}
+
+# The stats pass has a 60 s timeout; the index is skipped rather than risk it.
+STATS_INDEX_BUDGET_SECONDS = 30
+
+PLANNER_REQUIREMENT_FILES = {"requirements.txt", "pyproject.toml", "poetry.lock"}
+
+
+def run_ast(root: Path, emit: Emitter) -> dict[str, Any]:
+    # Evaluates every registered AST rule, including those backing the AST-based category
+    # tools, in one pass per file. Each finding lists the tools it belongs to, so the graph
+    # can serve those tools from this run instead of parsing the tree again.
+    def on_hit(rule: AstRule, file: str, hit: dict[str, Any]) -> None:
+        emit.finding(analysis_finding(rule, file, hit))
+
+    summary = scan_tree(root, emit, list(RULES.values()), on_hit)
+    return {**summary, "rule_tools": rule_tools()}
+
+
+def _regex_file(file_path: Path, patterns: list, emit: Emitter) -> tuple[bool, list[str]] | None:
+    # -> (minified, patterns that ran out of budget), or None if the file was not read.
+    content = read_text(file_path)
+    if content is None:
+        return None
+    minified = is_minified(file_path.name, content)
+    budget = FileBudget()
+    for pattern, finding_type, severity, hint in patterns:
+        windows = literal_windows(content, REGEX_QUERIES[finding_type].literals()) if minified else None
+        for match in budget.finditer(finding_type, pattern, content, windows):
+            emit.finding(
+                {
+                    "scanner": "regex",
+                    "type": finding_type,
+                    "severity": severity,
+                    "file": str(file_path),
+                    "line": content.count("\n", 0, match.start()) + 1,
+                    "message": f"Pattern matched: {finding_type}",
+                    "evidence": match.group(0)[:120],
+                    "category_hint": hint,
+                }
+            )
+    return minified, budget.timed_out
+
+
+def run_regex(root: Path, emit: Emitter) -> dict[str, Any]:
+    # With the scan's content index, a file is only read when some pattern's literal is in
+    # it, and only those patterns run on it. Each pattern runs under a time budget, and on
+    # minified files only around its literals; a budget running out keeps what was found.
+    # Resumable: files are taken in walk order from the checkpoint offset.
+    index = content_index.load(root)
+    progress = Progress(emit)
+    files_total = files_read = files_minified = 0
+    rules_timed_out: dict[str, int] = {}
+    for file_path in progress.resume(iter_files(root)):
+        files_total += 1
+        patterns = REGEX_PATTERNS
+        if index is not None:
+            file_id = index.file_ids.get(file_path.relative_to(root).as_posix())
+            if file_id is not None:
+                patterns = [entry for entry in REGEX_PATTERNS if index.may_match(file_id, REGEX_QUERIES[entry[1]])]
+        result = _regex_file(file_path, patterns, emit) if patterns else None
+        if result is None:
+            progress.advance(str(file_path))
+            continue
+        minified, timed_out = result
+        files_read += 1
+        files_minified += minified
+        if timed_out:
+            for finding_type in timed_out:
+                rules_timed_out[finding_type] = rules_timed_out.get(finding_type, 0) + 1
+            emit.event("budget_exceeded", file=str(file_path), rules=timed_out)
+        progress.advance(str(file_path))
+    return {
+        "files_total": files_total,
+        "files_read": files_read,
+        "content_index": index is not None,
+        "files_minified": files_minified,
+        "rules_timed_out": rules_timed_out,
+        "partial": bool(rules_timed_out),
+        **progress.as_dict(),
+    }
+
+
+def run_dependency(root: Path, emit: Emitter) -> dict[str, Any]:
+    # Every pinned dependency in the tree's manifests and lockfiles is matched against the
+    # offline advisory database, one batched lookup per ecosystem. Parsers stream, and a
+    # package version pinned by several lockfiles (or at several install paths) is checked
+    # and reported once, listing every lockfile it appears in.
+    pinned: dict[tuple[str, str, str], Dependency] = {}
+    locations: dict[tuple[str, str, str], dict[str, None]] = {}
+    lockfiles: dict[str, int] = {}
+    parse_stats: dict[str, dict[str, float]] = {}
+    for path in iter_lockfiles(root):
+        parser = parser_for(path)
+        assert parser is not None
+        kind = path.name.lower() if parser is not parse_requirements else "requirements.txt"
+        stats = parse_stats.setdefault(kind, {"files": 0, "bytes": 0, "dependencies": 0, "parse_ms": 0.0})
+        started_at = time.perf_counter()
+        try:
+            for dependency in parser(path):
+                stats["dependencies"] += 1
+                pin = (
+                    dependency.ecosystem,
+                    normalize_package(dependency.ecosystem, dependency.name),
+                    dependency.version,
+                )
+                pinned.setdefault(pin, dependency)
+                locations.setdefault(pin, {})[dependency.file] = None
+        except (OSError, ValueError) as exc:
+            # Malformed JSON/TOML; whatever was parsed before the error is kept.
+            emit.event("file_skipped", file=str(path), reason="parse_error", detail=str(exc)[:200])
+        stats["parse_ms"] += (time.perf_counter() - started_at) * 1000
+        stats["files"] += 1
+        try:
+            stats["bytes"] += path.stat().st_size
+        except OSError:
+            pass
+        lockfiles[kind] = lockfiles.get(kind, 0) + 1
+    dependencies = sum(int(stats["dependencies"]) for stats in parse_stats.values())
+    packages: dict[tuple[str, str], list[Dependency]] = {}
+    for (ecosystem, name, _), dependency in pinned.items():
+        packages.setdefault((ecosystem, name), []).append(dependency)
+
+    started_at = time.perf_counter()
+    database = VulnDB.open()
+    try:
+        by_ecosystem: dict[str, list[str]] = {}
+        for ecosystem, name in packages:
+            by_ecosystem.setdefault(ecosystem, []).append(name)
+        matches: list[tuple[Dependency, str, list[str]]] = []
+        unparsed_versions = 0
+        for ecosystem, names in sorted(by_ecosystem.items()):
+            ranges = database.ranges_for(ecosystem, names)
+            for name in sorted(ranges):
+                for dependency in packages[(ecosystem, name)]:
+                    key = version_key(ecosystem, dependency.version)
+                    if key is None:
+                        unparsed_versions += 1
+                        continue
+                    affected: dict[str, list[str]] = {}
+                    for affected_range in ranges[name]:
+                        if affected_range.exact is not None:
+                            hit = affected_range.exact == dependency.version
+                        else:
+                            hit = bool(
+                                in_range(
+                                    key,
+                                    ecosystem,
+                                    affected_range.introduced,
+                                    affected_range.fixed,
+                                    affected_range.last_affected,
+                                )
+                            )
+                        if hit:
+                            fixed_in = affected.setdefault(affected_range.advisory, [])
+                            if affected_range.fixed:
+                                fixed_in.append(affected_range.fixed)
+                    matches.extend((dependency, advisory, fixed_in) for advisory, fixed_in in affected.items())
+        advisories = database.advisories(advisory for _, advisory, _ in matches)
+        meta = database.meta
+    finally:
+        database.close()
+    lookup_ms = (time.perf_counter() - started_at) * 1000
+
+    matches.sort(key=lambda match: (match[0].file, match[0].line, match[0].name, match[1]))
+    vulnerable: set[tuple[str, str, str]] = set()
+    for dependency, advisory_id, fixed_in in matches:
+        advisory = advisories.get(advisory_id) or {"summary": "", "severity": "medium", "aliases": []}
+        pin = (dependency.ecosystem, normalize_package(dependency.ecosystem, dependency.name), dependency.version)
+        vulnerable.add(pin)
+        emit.finding(
+            {
+                "scanner": "dependency",
+                "type": "vulnerable_dependency",
+                "severity": advisory["severity"],
+                "file": dependency.file,
+                "line": dependency.line,
+                "message": f"{dependency.name} {dependency.version} is affected by {advisory_id}: {advisory['summary']}",
+                "category_hint": "vulnerable_components",
+                "ecosystem": dependency.ecosystem,
+                "package": dependency.name,
+                "version": dependency.version,
+                "advisory": advisory_id,
+                "aliases": advisory["aliases"],
+                "fixed_in": fixed_in,
+                "lockfiles": list(locations[pin]),
+            }
+        )
+    parse_ms = sum(stats["parse_ms"] for stats in parse_stats.values())
+    parse_bytes = sum(int(stats["bytes"]) for stats in parse_stats.values())
+    return {
+        "lockfiles": lockfiles,
+        "dependencies": dependencies,
+        "unique_dependencies": len(pinned),
+        "packages": len(packages),
+        "vulnerable_dependencies": len(vulnerable),
+        "advisory_matches": len(matches),
+        "unparsed_versions": unparsed_versions,
+        "vulndb": meta,
+        "lookup_ms": round(lookup_ms, 3),
+        "parse_ms": round(parse_ms, 3),
+        "parse_bytes": parse_bytes,
+        "parse_mb_per_s": round(parse_bytes / 1e6 / (parse_ms / 1000), 3) if parse_ms else None,
+        "parse": {
+            kind: {**stats, "parse_ms": round(stats["parse_ms"], 3)} for kind, stats in sorted(parse_stats.items())
+        },
+    }
+
+
+def run_config(root: Path, emit: Emitter) -> dict[str, Any]:
+    # Config files come from the repository manifest (YAML, JSON, TOML, .env, Dockerfiles,
+    # compose files, Kubernetes manifests); each is parsed once by its typed parser and
+    # its key paths checked against the indexed config rules.
+    return scan_configs(root, emit)
+
+
+def run_plan(root: Path, emit: Emitter) -> dict[str, Any]:
+    # One walk instead of one per question.
+    has_python = has_requirements = has_config_files = False
+    for file_path in iter_files(root):
+        name = file_path.name.lower()
+        has_python = has_python or file_path.suffix.lower() == ".py"
+        has_requirements = has_requirements or name in PLANNER_REQUIREMENT_FILES
+        has_config_files = has_config_files or kind_for_name(name) is not None
+        if has_python and has_requirements and has_config_files:
+            break
+    return {
+        "has_python": has_python,
+        "has_requirements": has_requirements,
+        "has_config_files": has_config_files,
+    }
+
+
+def run_stats(root: Path, emit: Emitter) -> dict[str, Any]:
+    # Mirrors `find -type f | wc -l` and `du -sk` (allocated blocks, directories included).
+    # Being the first pass over every scan's tree, it also builds the content index.
+    total_files = 0
+    allocated_bytes = 0
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in [*dirnames, *filenames]:
+            try:
+                info = os.lstat(os.path.join(dirpath, name))
+            except OSError:
+                continue
+            allocated_bytes += getattr(info, "st_blocks", 0) * 512
+        total_files += sum(1 for name in filenames if os.path.isfile(os.path.join(dirpath, name)))
+    index = content_index.build(root, budget_seconds=STATS_INDEX_BUDGET_SECONDS)
+    return {"total_files": total_files, "total_size_bytes": allocated_bytes, "content_index": index}
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import ast
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Iterable
+
+
+# Rules register handlers per AST node type; RuleVisitor walks each tree once and
+# dispatches every node to the handlers of every active rule, so adding a rule adds
+# handlers, not passes. A rule lists the scanner tools whose output it feeds: "ast" for
+# the analysis scanner, otherwise the ToolRuntime category tool names.
+
+Handler = Callable[[ast.AST, "FileContext"], None]
+
+SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+MODULE_SCOPE = "<module>"
+
+
+class FileContext:
+    def __init__(self, file: str) -> None:
+        self.file = file
+        self.hits: list[dict[str, Any]] = []
+        self._scopes: list[str] = []
+        self._class_depths: list[int] = []
+        # Per-rule scratch space for rules that decide in finish().
+        self.rule_state: dict[str, Any] = {}
+        # Per-file data rules hand to their cross-file finalize() step.
+        self.facts: dict[str, Any] = {}
+
+    @property
+    def scope(self) -> str:
+        return ".".join(self._scopes) or MODULE_SCOPE
+
+    @property
+    def in_class(self) -> bool:
+        return bool(self._class_depths) and self._class_depths[-1] == len(self._scopes)
+
+    def child_scope(self, name: str) -> str:
+        return ".".join([*self._scopes, name])
+
+    def enter_scope(self, name: str, is_class: bool = False) -> None:
+        self._scopes.append(name)
+        if is_class:
+            self._class_depths.append(len(self._scopes))
+
+    def exit_scope(self) -> None:
+        if self._class_depths and self._class_depths[-1] == len(self._scopes):
+            self._class_depths.pop()
+        self._scopes.pop()
+
+    def report(self, rule: "AstRule", line: int, message: str) -> None:
+        self.hits.append({"rule": rule.id, "line": int(line or 1), "message": message})
+
+    def publish(self, rule: "AstRule", value: Any) -> None:
+        self.facts[rule.id] = value
+
+
+class AstRule:
+    id = ""
+    type = ""
+    title = ""
+    severity = "medium"
+    category_hint = ""
+    tools: frozenset[str] = frozenset()
+    # finalize() reads the facts of every file, not only those of the files being reported.
+    cross_file = False
+
+    def handlers(self) -> dict[type[ast.AST], Handler]:
+        return {}
+
+    def finish(self, ctx: FileContext) -> None:
+        return None
+
+    def finalize(self, facts: dict[str, Any], root: Path) -> tuple[list[tuple[str, dict[str, Any]]], dict[str, Any]]:
+        # Cross-file step over every file's published facts (keyed by path), run once per
+        # scan after all files are visited. Returns (file, hit) pairs and summary stats.
+        return [], {}
+
+
+RULES: dict[str, AstRule] = {}
+
+
+def register(rule_cls: type[AstRule]) -> type[AstRule]:
+    rule = rule_cls()
+    if rule.id in RULES:
+        raise ValueError(f"Duplicate AST rule id: {rule.id}")
+    RULES[rule.id] = rule
+    return rule_cls
+
+
+def rules_for_tool(tool: str) -> list[AstRule]:
+    return [rule for rule in RULES.values() if tool in rule.tools]
+
+
+def rule_tools() -> list[str]:
+    return sorted({tool for rule in RULES.values() for tool in rule.tools})
+
+
+class RuleVisitor(ast.NodeVisitor):
+    def __init__(self, rules: Iterable[AstRule], ctx: FileContext) -> None:
+        self.rules = list(rules)
+        self.ctx = ctx
+        self._dispatch: dict[type[ast.AST], list[Handler]] = {}
+        for rule in self.rules:
+            for node_type, handler in rule.handlers().items():
+                self._dispatch.setdefault(node_type, []).append(handler)
+
+    def visit(self, node: ast.AST) -> None:
+        for handler in self._dispatch.get(type(node), ()):
+            handler(node, self.ctx)
+        if isinstance(node, SCOPE_NODES):
+            self.ctx.enter_scope(node.name, is_class=isinstance(node, ast.ClassDef))
+            self.generic_visit(node)
+            self.ctx.exit_scope()
+        else:
+            self.generic_visit(node)
+
+    def run(self, tree: ast.AST) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+        self.visit(tree)
+        for rule in self.rules:
+            rule.finish(self.ctx)
+        return sorted(self.ctx.hits, key=lambda hit: (hit["line"], hit["rule"])), self.ctx.facts
+
+
+def evaluate(tree: ast.AST, file: str, rule_ids: Iterable[str]) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    return RuleVisitor([RULES[rule_id] for rule_id in rule_ids], FileContext(file)).run(tree)
+
+
+def call_name(node: ast.Call) -> str:
+    # Dotted name of the callee as written: "eval", "os.system", "cursor.execute".
+    parts: list[str] = []
+    target = node.func
+    while isinstance(target, ast.Attribute):
+        parts.append(target.attr)
+        target = target.value
+    if isinstance(target, ast.Name):
+        parts.append(target.id)
+    elif parts:
+        parts.append("?")
+    return ".".join(reversed(parts))
+
+
+def analysis_finding(rule: AstRule, file: str, hit: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "scanner": "ast",
+        "rule": rule.id,
+        "tools": sorted(rule.tools),
+        "type": rule.type,
+        "title": rule.title,
+        "severity": rule.severity,
+        "file": file,
+        "line": hit["line"],
+        "message": hit["message"],
+        "category_hint": rule.category_hint,
+    }
+
+
+def tool_finding(rule: AstRule, file: str, hit: dict[str, Any]) -> dict[str, Any]:
+    # Shape consumed by ToolRuntime._normalize_finding.
+    return {
+        "title": rule.title,
+        "evidence": f"{file}:{hit['line']}",
+        "severity": rule.severity,
+        "rule": rule.id,
+        "reasoning": hit["message"],
+    }
+
+
+@register
+class DynamicExecutionRule(AstRule):
+    id = "dynamic_execution"
+    type = "dynamic_execution"
+    title = "Dynamic execution primitive"
+    severity = "high"
+    category_hint = "injection"
+    tools = frozenset({"ast", "ast_deep_scan"})
+
+    def handlers(self) -> dict[type[ast.AST], Handler]:
+        return {ast.Call: self.visit_call}
+
+    def visit_call(self, node: ast.AST, ctx: FileContext) -> None:
+        assert isinstance(node, ast.Call)
+        func_name = call_name(node).rsplit(".", 1)[-1]
+        if func_name in {"eval", "exec"}:
+            ctx.report(self, node.lineno, f"Use of {func_name} detected")
+
+
+@register
+class PermissiveAccessRule(AstRule):
+    id = "permissive_access"
+    type = "permissive_access"
+    title = "Overly permissive access pattern"
+    severity = "high"
+    category_hint = "broken_access_control"
+    tools = frozenset({"access_path_scan"})
+
+    # 0o777 and the common mistake of writing it as decimal 777.
+    WORLD_WRITABLE_MODES = {0o777, 777}
+
+    def handlers(self) -> dict[type[ast.AST], Handler]:
+        return {
+            ast.Call: self.visit_call,
+            ast.Name: self.visit_name,
+            ast.Attribute: self.visit_attribute,
+            ast.keyword: self.visit_keyword,
+        }
+
+    def visit_call(self, node: ast.AST, ctx: FileContext) -> None:
+        assert isinstance(node, ast.Call)
+        if call_name(node).rsplit(".", 1)[-1] not in {"chmod", "fchmod", "lchmod"}:
+            return
+        for argument in [*node.args, *(keyword.value for keyword in node.keywords)]:
+            if isinstance(argument, ast.Constant) and argument.value in self.WORLD_WRITABLE_MODES:
+                ctx.report(self, node.lineno, "World-writable permissions set via chmod")
+                return
+
+    def visit_name(self, node: ast.AST, ctx: FileContext) -> None:
+        assert isinstance(node, ast.Name)
+        if node.id.lower() == "allow_all":
+            ctx.report(self, node.lineno, "allow_all access rule referenced")
+
+    def visit_attribute(self, node: ast.AST, ctx: FileContext) -> None:
+        assert isinstance(node, ast.Attribute)
+        if node.attr.lower() == "allow_all":
+            ctx.report(self, node.lineno, "allow_all access rule referenced")
+
+    def visit_keyword(self, node: ast.AST, ctx: FileContext) -> None:
+        assert isinstance(node, ast.keyword)
+        if (node.arg or "").lower() == "allow_all":
+            line = getattr(node, "lineno", None) or getattr(node.value, "lineno", 1)
+            ctx.report(self, line, "allow_all access rule referenced")
+
+
+# Registers the interprocedural request_to_sink rule; imported last to avoid a cycle.
+from agentic_layer.scanners import taint  # noqa: E402,F401
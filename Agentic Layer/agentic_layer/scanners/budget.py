@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+import re
+import signal
+import threading
+import time
+from typing import Iterable
+from typing import Iterator
+
+
+# Time budgets for regex pattern scanning. A backtracking pattern on one long line can
+# run for minutes; each (file, rule) search gets a budget enforced by SIGALRM (the regex
+# engine checks for signals while matching), and each file a total across its rules, so a
+# pathological file costs seconds and the scan still completes with everything else.
+#
+# Minified and generated files, the usual source of such lines, skip whole-file matching:
+# patterns run only on short windows around occurrences of the literals they require.
+
+RULE_BUDGET_SECONDS = 2.0
+FILE_BUDGET_SECONDS = 5.0
+
+MINIFIED_AVG_LINE_CHARS = 300
+MINIFIED_MAX_LINE_CHARS = 5000
+MINIFIED_SUFFIXES = (".min.js", ".min.css", ".bundle.js", ".map")
+
+# A literal window spans this much around a literal occurrence; windows that touch are
+# merged up to WINDOW_MAX_CHARS, so a dense run of literals cannot rebuild the file.
+WINDOW_BEFORE_CHARS = 64
+WINDOW_AFTER_CHARS = 512
+WINDOW_MAX_CHARS = 4096
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+def _raise_budget_exceeded(signum, frame) -> None:
+    raise BudgetExceeded()
+
+
+def _can_interrupt() -> bool:
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+@contextmanager
+def time_limit(seconds: float) -> Iterator[None]:
+    # Raises BudgetExceeded in the block after `seconds`. Where SIGALRM is unavailable
+    # (not the main thread, no setitimer) the block runs unbounded; FileBudget still
+    # stops starting new searches once the file's budget is spent.
+    if not _can_interrupt():
+        yield
+        return
+    previous = signal.signal(signal.SIGALRM, _raise_budget_exceeded)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def is_minified(name: str, text: str) -> bool:
+    if name.lower().endswith(MINIFIED_SUFFIXES):
+        return True
+    if len(text) / (text.count("\n") + 1) > MINIFIED_AVG_LINE_CHARS:
+        return True
+    return max(map(len, text.splitlines()), default=0) > MINIFIED_MAX_LINE_CHARS
+
+
+def literal_windows(text: str, literals: Iterable[str]) -> list[tuple[int, int]]:
+    # Sorted, disjoint (start, end) spans of `text` around case-insensitive literal
+    # occurrences. A literal alternation matches in linear time, and occurrences already
+    # well inside the current window are skipped rather than visited one by one.
+    literals = sorted(set(literals))
+    if not literals:
+        return []
+    alternation = re.compile("|".join(re.escape(literal) for literal in literals), re.IGNORECASE)
+    windows: list[tuple[int, int]] = []
+    match = alternation.search(text)
+    while match is not None:
+        start = max(0, match.start() - WINDOW_BEFORE_CHARS)
+        end = min(len(text), match.start() + WINDOW_AFTER_CHARS)
+        if windows and start <= windows[-1][1] and end - windows[-1][0] <= WINDOW_MAX_CHARS:
+            windows[-1] = (windows[-1][0], end)
+        elif windows and start < windows[-1][1]:
+            windows.append((windows[-1][1], end))
+        else:
+            windows.append((start, end))
+        # The next occurrence that extends the window begins near its end.
+        match = alternation.search(text, max(match.start() + 1, end - WINDOW_BEFORE_CHARS))
+    return windows
+
+
+class FileBudget:
+    # Budget for the pattern searches over one file; records which rules ran out.
+    def __init__(
+        self,
+        file_seconds: float = FILE_BUDGET_SECONDS,
+        rule_seconds: float = RULE_BUDGET_SECONDS,
+    ) -> None:
+        self.deadline = time.monotonic() + file_seconds
+        self.rule_seconds = rule_seconds
+        self.timed_out: list[str] = []
+
+    def finditer(
+        self,
+        rule: str,
+        pattern: re.Pattern[str],
+        text: str,
+        windows: list[tuple[int, int]] | None = None,
+        *,
+        first_only: bool = False,
+    ) -> list[re.Match[str]]:
+        # Matches of `pattern` in `text` (or only within `windows`), in order. A search
+        # that runs out of budget returns the matches found so far.
+        found: list[re.Match[str]] = []
+        limit = min(self.rule_seconds, self.deadline - time.monotonic())
+        if limit <= 0:
+            self.timed_out.append(rule)
+            return found
+        try:
+            with time_limit(limit):
+                for start, end in windows if windows is not None else [(0, len(text))]:
+                    for match in pattern.finditer(text, start, end):
+                        found.append(match)
+                        if first_only:
+                            return found
+        except BudgetExceeded:
+            self.timed_out.append(rule)
+        return found
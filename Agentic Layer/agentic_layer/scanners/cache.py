@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any
+
+from agentic_layer.scanners import SCANNER_VERSION
+
+
+# Content-addressed store for per-file scan results, shared across scans through a
+# persistent volume. Keys hash the file bytes together with SCANNER_VERSION and the
+# caller's salt, so entries never need invalidating: a scanner change or an edited file
+# simply misses. Writes are atomic renames, so concurrent scanners can share the store.
+
+# Entries not hit for this long are dropped; each run sweeps one of the 256 shards.
+ENTRY_TTL_SECONDS = 30 * 24 * 3600
+
+_cache_dir: Path | None = None
+
+
+def configure(path: str | None) -> None:
+    global _cache_dir
+    _cache_dir = Path(path) if path else None
+
+
+def cache_dir() -> Path | None:
+    return _cache_dir
+
+
+def content_key(content: bytes, salt: str) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"{SCANNER_VERSION}\0{salt}\0".encode())
+    digest.update(content)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, root: Path | None, ttl_seconds: float = ENTRY_TTL_SECONDS) -> None:
+        self.root = root
+        self.ttl_seconds = ttl_seconds
+
+    def _path(self, key: str) -> Path:
+        assert self.root is not None
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        if self.root is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as handle:
+                value = json.load(handle)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return value if isinstance(value, dict) else None
+
+    def put(self, key: str, value: dict[str, Any]) -> None:
+        # Best effort: a read-only or full cache only costs the next scan a recompute.
+        if self.root is None:
+            return
+        path = self._path(key)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as handle:
+                json.dump(value, handle, separators=(",", ":"))
+            os.replace(temp_path, path)
+        except OSError:
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
+
+    def sweep(self, shard: str, now: float | None = None) -> int:
+        if self.root is None:
+            return 0
+        cutoff = (now if now is not None else time.time()) - self.ttl_seconds
+        removed = 0
+        try:
+            entries = list(os.scandir(self.root / shard))
+        except OSError:
+            return 0
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from itertools import islice
+import time
+from typing import Iterable
+from typing import Iterator
+from typing import TypeVar
+
+from agentic_layer.scanners.protocol import Emitter
+
+
+T = TypeVar("T")
+
+# Progress checkpoints and resume offsets. Resumable scanners walk files in a fixed
+# (sorted) order and, every few seconds, emit a checkpoint with the number of files fully
+# processed; every finding for those files precedes it in the stream. Run again with
+# --start-offset N, a scanner skips the first N files, so a scan killed by its timeout
+# continues from its last checkpoint instead of from the start.
+
+CHECKPOINT_INTERVAL_SECONDS = 2.0
+
+_start_offset = 0
+
+
+def configure(start_offset: int) -> None:
+    global _start_offset
+    _start_offset = max(0, start_offset)
+
+
+def start_offset() -> int:
+    return _start_offset
+
+
+class Progress:
+    def __init__(self, emit: Emitter, interval_seconds: float = CHECKPOINT_INTERVAL_SECONDS) -> None:
+        self.emit = emit
+        self.interval_seconds = interval_seconds
+        self.start_offset = _start_offset
+        self.files_done = _start_offset
+        self._last_checkpoint = time.monotonic()
+
+    def resume(self, items: Iterable[T]) -> Iterator[T]:
+        # The items left after the start offset.
+        return islice(items, self.start_offset, None)
+
+    def advance(self, file: str) -> None:
+        # Call once a file's findings have all been emitted.
+        self.files_done += 1
+        now = time.monotonic()
+        if now - self._last_checkpoint >= self.interval_seconds:
+            self._last_checkpoint = now
+            self.emit.checkpoint(files_done=self.files_done, last_file=file)
+
+    def as_dict(self) -> dict[str, int]:
+        return {"start_offset": self.start_offset, "files_done": self.files_done}
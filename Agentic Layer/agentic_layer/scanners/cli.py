@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Any
+from typing import Callable
+
+from agentic_layer.scanners import SCANNER_VERSION
+from agentic_layer.scanners import analysis
+from agentic_layer.scanners import cache
+from agentic_layer.scanners import checkpoint
+from agentic_layer.scanners import files
+from agentic_layer.scanners import tools
+from agentic_layer.scanners.protocol import Emitter
+
+
+ScannerFn = Callable[[Path, Emitter], dict[str, Any]]
+
+SCANNERS: dict[str, ScannerFn] = {
+    "ast": analysis.run_ast,
+    "regex": analysis.run_regex,
+    "dependency": analysis.run_dependency,
+    "config": analysis.run_config,
+    "plan": analysis.run_plan,
+    "stats": analysis.run_stats,
+    "access_path_scan": tools.run_access_path_scan,
+    "policy_gap_scan": tools.run_policy_gap_scan,
+    "crypto_key_scan": tools.run_crypto_key_scan,
+    "config_entropy_check": tools.run_config_entropy_check,
+    "secret_scan": tools.run_secret_scan,
+    "ast_deep_scan": tools.run_ast_deep_scan,
+    "regex_injection": tools.run_regex_injection,
+    "taint_sim": tools.run_taint_sim,
+    "generic_pattern_scan": tools.run_generic_pattern_scan,
+}
+
+# Scanners that emit checkpoints and honour --start-offset.
+RESUMABLE = frozenset({"ast", "regex", "config"})
+# Per-file scanners, whose shards (--shard) merge into the output of one run.
+SHARDABLE = frozenset({"regex", "config"})
+
+
+def _shard(value: str) -> tuple[int, int]:
+    index, _, count = value.partition("/")
+    try:
+        shard = (int(index), int(count))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected INDEX/COUNT, got {value!r}") from None
+    if not 0 <= shard[0] < shard[1]:
+        raise argparse.ArgumentTypeError(f"shard index out of range: {value!r}")
+    return shard
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="deplai-scanners", description="DEPLAI scanner bundle")
+    parser.add_argument("tool", choices=sorted(SCANNERS))
+    parser.add_argument("--root", default="/workspace", help="Directory to scan")
+    parser.add_argument("--cache-dir", default=None, help="Writable directory for the per-file result cache")
+    parser.add_argument(
+        "--start-offset",
+        type=int,
+        default=0,
+        help="Files to skip in walk order, resuming from a checkpoint (resumable scanners)",
+    )
+    parser.add_argument(
+        "--file",
+        action="append",
+        dest="files",
+        default=None,
+        help="Scan only this file, relative to --root or under it (repeatable)",
+    )
+    parser.add_argument(
+        "--shard",
+        type=_shard,
+        default=None,
+        metavar="INDEX/COUNT",
+        help="Scan only this shard of the tree, balanced by file size (shardable scanners)",
+    )
+    parser.add_argument("--version", action="version", version=SCANNER_VERSION)
+    args = parser.parse_args(argv)
+
+    root = Path(args.root)
+    if not root.is_dir():
+        parser.error(f"--root is not a directory: {root}")
+
+    if args.start_offset and args.tool not in RESUMABLE:
+        parser.error(f"{args.tool} cannot resume from an offset")
+    if args.shard and args.tool not in SHARDABLE:
+        parser.error(f"{args.tool} cannot be sharded")
+
+    try:
+        files.configure_scope(root, args.files)
+        if args.shard:
+            files.configure_shard(root, *args.shard)
+    except ValueError as exc:
+        parser.error(str(exc))
+    cache.configure(args.cache_dir)
+    checkpoint.configure(args.start_offset)
+    emitter = Emitter(args.tool)
+    summary = SCANNERS[args.tool](root, emitter)
+    emitter.summary(**summary)
+    return 0
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import re
+from typing import Any
+from typing import Callable
+from typing import Iterable
+
+from agentic_layer.scanners.configfiles import ITEM
+from agentic_layer.scanners.configfiles import ConfigEntry
+from agentic_layer.scanners.manifest import KIND_COMPOSE
+from agentic_layer.scanners.manifest import KIND_DOCKERFILE
+from agentic_layer.scanners.manifest import KIND_K8S
+
+
+# Key-path rules for parsed config entries. A rule's patterns are key-path suffixes
+# ("*" matches any one segment, including sequence items), compared case-insensitively
+# with "-" and "_" equated. Rules are indexed by the last literal segment of each pattern,
+# so an entry is only checked against the rules that name its key.
+
+
+@dataclass(frozen=True)
+class ConfigRule:
+    id: str
+    type: str
+    severity: str
+    category_hint: str
+    message: str
+    patterns: tuple[tuple[str, ...], ...]
+    test: Callable[[Any], bool]
+    # File kinds the rule applies to; None for all.
+    kinds: frozenset[str] | None = None
+    # Evidence would repeat a secret.
+    redact: bool = False
+
+
+def _normalize(segment: str) -> str:
+    return segment.lower().replace("-", "_")
+
+
+def _truthy(value: Any) -> bool:
+    return value is True or str(value).strip().lower() in ("true", "1", "yes", "on")
+
+
+def _falsy(value: Any) -> bool:
+    return value is False or str(value).strip().lower() in ("false", "0", "no", "off")
+
+
+def _wildcard(value: Any) -> bool:
+    return isinstance(value, str) and value.strip() == "*"
+
+
+_PLACEHOLDER = re.compile(r"^(\$\{?[A-Za-z_][A-Za-z0-9_]*(:-[^}]*)?\}?|\{\{.*\}\}|<[^>]*>|%\(.*\)s)$")
+
+
+def _literal_secret(value: Any) -> bool:
+    # A value written into the file, not a reference to the environment or a template.
+    return isinstance(value, str) and bool(value.strip()) and not _PLACEHOLDER.match(value.strip())
+
+
+def _remote_source(value: Any) -> bool:
+    return isinstance(value, str) and value.lstrip().lower().startswith(("http://", "https://"))
+
+
+def _root_user(value: Any) -> bool:
+    return str(value).strip().lower() in ("root", "0")
+
+
+CONFIG_RULES: tuple[ConfigRule, ...] = (
+    ConfigRule(
+        id="debug_enabled",
+        type="debug_mode_enabled",
+        severity="medium",
+        category_hint="security_misconfiguration",
+        message="Debug mode appears enabled in configuration",
+        patterns=(("debug",), ("flask_debug",), ("django_debug",), ("app_debug",)),
+        test=_truthy,
+    ),
+    ConfigRule(
+        id="tls_verify_disabled",
+        type="tls_verification_disabled",
+        severity="high",
+        category_hint="cryptographic_failures",
+        message="TLS certificate verification is disabled",
+        patterns=(("verify_ssl",), ("ssl_verify",), ("tls_verify",), ("verify_tls",), ("verify_certs",)),
+        test=_falsy,
+    ),
+    ConfigRule(
+        id="tls_skip_verify",
+        type="tls_verification_disabled",
+        severity="high",
+        category_hint="cryptographic_failures",
+        message="TLS certificate verification is skipped",
+        patterns=(("insecure_skip_verify",), ("insecureskipverify",), ("insecure_skip_tls_verify",)),
+        test=_truthy,
+    ),
+    ConfigRule(
+        id="cors_any_origin",
+        type="cors_wildcard_origin",
+        severity="medium",
+        category_hint="security_misconfiguration",
+        message="CORS allows any origin",
+        patterns=tuple(
+            pattern
+            for key in (
+                "allowed_origins",
+                "allow_origins",
+                "cors_origins",
+                "cors_allowed_origins",
+                "access_control_allow_origin",
+            )
+            for pattern in ((key,), (key, "*"))
+        ),
+        test=_wildcard,
+    ),
+    ConfigRule(
+        id="allowed_hosts_any",
+        type="allowed_hosts_wildcard",
+        severity="medium",
+        category_hint="security_misconfiguration",
+        message="ALLOWED_HOSTS accepts any host",
+        patterns=(("allowed_hosts",), ("allowed_hosts", "*")),
+        test=_wildcard,
+    ),
+    ConfigRule(
+        id="privileged_container",
+        type="privileged_container",
+        severity="high",
+        category_hint="security_misconfiguration",
+        message="Container runs privileged",
+        patterns=(("securitycontext", "privileged"), ("services", "*", "privileged")),
+        test=_truthy,
+        kinds=frozenset({KIND_K8S, KIND_COMPOSE}),
+    ),
+    ConfigRule(
+        id="privilege_escalation",
+        type="privilege_escalation_allowed",
+        severity="medium",
+        category_hint="security_misconfiguration",
+        message="Container allows privilege escalation",
+        patterns=(("securitycontext", "allowprivilegeescalation"),),
+        test=_truthy,
+        kinds=frozenset({KIND_K8S}),
+    ),
+    ConfigRule(
+        id="k8s_host_namespace",
+        type="host_namespace_shared",
+        severity="high",
+        category_hint="security_misconfiguration",
+        message="Pod shares a host namespace",
+        patterns=(("spec", "hostnetwork"), ("spec", "hostpid"), ("spec", "hostipc")),
+        test=_truthy,
+        kinds=frozenset({KIND_K8S}),
+    ),
+    ConfigRule(
+        id="compose_host_namespace",
+        type="host_namespace_shared",
+        severity="high",
+        category_hint="security_misconfiguration",
+        message="Service shares a host namespace",
+        patterns=(("services", "*", "network_mode"), ("services", "*", "pid"), ("services", "*", "ipc")),
+        test=lambda value: str(value).strip().lower() == "host",
+        kinds=frozenset({KIND_COMPOSE}),
+    ),
+    ConfigRule(
+        id="k8s_run_as_root",
+        type="container_runs_as_root",
+        severity="medium",
+        category_hint="security_misconfiguration",
+        message="Container runs as root (runAsUser: 0)",
+        patterns=(("securitycontext", "runasuser"),),
+        test=lambda value: value == 0 or str(value).strip() == "0",
+        kinds=frozenset({KIND_K8S}),
+    ),
+    ConfigRule(
+        id="dockerfile_root_user",
+        type="container_runs_as_root",
+        severity="medium",
+        category_hint="security_misconfiguration",
+        message="Final image stage runs as root",
+        patterns=(("final_stage", "user"),),
+        test=_root_user,
+        kinds=frozenset({KIND_DOCKERFILE}),
+    ),
+    ConfigRule(
+        id="dockerfile_remote_add",
+        type="remote_add_instruction",
+        severity="low",
+        category_hint="security_misconfiguration",
+        message="ADD fetches a remote URL without integrity checking",
+        patterns=(("add",),),
+        test=_remote_source,
+        kinds=frozenset({KIND_DOCKERFILE}),
+    ),
+    ConfigRule(
+        id="hardcoded_secret",
+        type="hardcoded_secret",
+        severity="high",
+        category_hint="broken_access_control",
+        message="Secret value hardcoded in configuration",
+        patterns=tuple(
+            (key,)
+            for key in (
+                "password",
+                "passwd",
+                "secret",
+                "secret_key",
+                "client_secret",
+                "api_key",
+                "apikey",
+                "access_token",
+                "auth_token",
+                "private_key",
+                "aws_secret_access_key",
+                "postgres_password",
+                "mysql_root_password",
+                "mysql_password",
+                "db_password",
+                "database_password",
+            )
+        ),
+        test=_literal_secret,
+        redact=True,
+    ),
+)
+
+
+def _build_index(rules: tuple[ConfigRule, ...]) -> dict[str, list[tuple[ConfigRule, tuple[str, ...]]]]:
+    index: dict[str, list[tuple[ConfigRule, tuple[str, ...]]]] = {}
+    for rule in rules:
+        for raw_pattern in rule.patterns:
+            pattern = tuple(_normalize(segment) for segment in raw_pattern)
+            literal = next(segment for segment in reversed(pattern) if segment != "*")
+            index.setdefault(literal, []).append((rule, pattern))
+    return index
+
+
+RULE_INDEX = _build_index(CONFIG_RULES)
+RULES_BY_ID = {rule.id: rule for rule in CONFIG_RULES}
+
+
+def _dispatch_key(path: tuple[str, ...]) -> str | None:
+    for segment in reversed(path):
+        if segment != ITEM:
+            return _normalize(segment)
+    return None
+
+
+def _suffix_matches(path: tuple[str, ...], pattern: tuple[str, ...]) -> bool:
+    if len(pattern) > len(path):
+        return False
+    tail = path[len(path) - len(pattern) :]
+    return all(want == "*" or _normalize(have) == want for have, want in zip(tail, pattern))
+
+
+def evaluate(entries: Iterable[ConfigEntry], kind: str) -> tuple[list[dict[str, Any]], int]:
+    # -> (hits, entries seen). Each hit carries the rule id, line, key path and evidence.
+    hits: list[dict[str, Any]] = []
+    seen: set[tuple[str, int, tuple[str, ...]]] = set()
+    count = 0
+    for entry in entries:
+        count += 1
+        key = _dispatch_key(entry.path)
+        candidates = RULE_INDEX.get(key) if key is not None else None
+        if not candidates:
+            continue
+        for rule, pattern in candidates:
+            if rule.kinds is not None and kind not in rule.kinds:
+                continue
+            if not _suffix_matches(entry.path, pattern) or not rule.test(entry.value):
+                continue
+            marker = (rule.id, entry.line, entry.path)
+            if marker in seen:
+                continue
+            seen.add(marker)
+            hits.append(_hit(rule, entry))
+    hits.sort(key=lambda hit: hit["line"])
+    return hits, count
+
+
+def _hit(rule: ConfigRule, entry: ConfigEntry) -> dict[str, Any]:
+    key_path = ".".join(entry.path)
+    evidence = f"{key_path} = ***" if rule.redact else f"{key_path} = {entry.value}"
+    return {"rule": rule.id, "line": entry.line, "key_path": key_path, "evidence": evidence[:200]}
+
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+import time
+from typing import Any
+
+from agentic_layer.scanners.checkpoint import Progress
+from agentic_layer.scanners.config_rules import RULES_BY_ID
+from agentic_layer.scanners.config_rules import evaluate
+from agentic_layer.scanners.configfiles import parse_config
+from agentic_layer.scanners.manifest import iter_config_files
+from agentic_layer.scanners.parallel import map_ordered
+from agentic_layer.scanners.parallel import worker_count
+from agentic_layer.scanners.protocol import Emitter
+
+
+# Configuration files bigger than this are generated data, not settings.
+MAX_CONFIG_BYTES = 1024 * 1024
+
+SKIP_TOO_LARGE = "too_large"
+SKIP_UNREADABLE = "unreadable"
+SKIP_PARSE_ERROR = "parse_error"
+
+
+@dataclass
+class ConfigFileResult:
+    file: str
+    kind: str
+    hits: list[dict[str, Any]] = field(default_factory=list)
+    entries: int = 0
+    parse_ms: float = 0.0
+    skipped: str | None = None
+    detail: str | None = None
+
+
+def scan_config_file(job: tuple[str, str, int]) -> ConfigFileResult:
+    # Runs in a pool worker: each file is parsed once and its entries streamed through the
+    # rule index. Never raises.
+    path, kind, size = job
+    if size > MAX_CONFIG_BYTES:
+        detail = f"{size} bytes > {MAX_CONFIG_BYTES}"
+        return ConfigFileResult(file=path, kind=kind, skipped=SKIP_TOO_LARGE, detail=detail)
+    started_at = time.perf_counter()
+    try:
+        hits, entries = evaluate(parse_config(Path(path), kind), kind)
+    except OSError as exc:
+        return ConfigFileResult(file=path, kind=kind, skipped=SKIP_UNREADABLE, detail=exc.strerror or str(exc))
+    except (ValueError, RecursionError) as exc:
+        return ConfigFileResult(
+            file=path,
+            kind=kind,
+            parse_ms=(time.perf_counter() - started_at) * 1000,
+            skipped=SKIP_PARSE_ERROR,
+            detail=str(exc)[:200] or type(exc).__name__,
+        )
+    return ConfigFileResult(
+        file=path,
+        kind=kind,
+        hits=hits,
+        entries=entries,
+        parse_ms=(time.perf_counter() - started_at) * 1000,
+    )
+
+
+def scan_configs(root: Path, emit: Emitter) -> dict[str, Any]:
+    # Resumable: manifest entries are taken in walk order from the checkpoint offset.
+    progress = Progress(emit)
+    jobs = [(entry.path, entry.kind, entry.size) for entry in progress.resume(iter_config_files(root))]
+    workers = worker_count(len(jobs))
+    kinds: dict[str, int] = {}
+    skipped: dict[str, int] = {}
+    entries = 0
+    parse_ms_total = 0.0
+    for result in map_ordered(scan_config_file, jobs, workers):
+        kinds[result.kind] = kinds.get(result.kind, 0) + 1
+        parse_ms_total += result.parse_ms
+        if result.skipped is not None:
+            skipped[result.skipped] = skipped.get(result.skipped, 0) + 1
+            emit.event("file_skipped", file=result.file, reason=result.skipped, detail=result.detail)
+            progress.advance(result.file)
+            continue
+        entries += result.entries
+        for hit in result.hits:
+            rule = RULES_BY_ID[hit["rule"]]
+            emit.finding(
+                {
+                    "scanner": "config",
+                    "type": rule.type,
+                    "severity": rule.severity,
+                    "file": result.file,
+                    "line": hit["line"],
+                    "message": rule.message,
+                    "category_hint": rule.category_hint,
+                    "rule": rule.id,
+                    "key_path": hit["key_path"],
+                    "evidence": hit["evidence"],
+                }
+            )
+        progress.advance(result.file)
+    return {
+        "workers": workers,
+        "files_total": len(jobs),
+        "files_by_kind": dict(sorted(kinds.items())),
+        "files_skipped": skipped,
+        "entries": entries,
+        "rules": len(RULES_BY_ID),
+        "parse_ms_total": round(parse_ms_total, 3),
+        **progress.as_dict(),
+    }
@@ -0,0 +1,429 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import re
+import tomllib
+from typing import Any
+from typing import Callable
+from typing import Iterator
+
+from agentic_layer.scanners.jsonstream import iter_events
+from agentic_layer.scanners.manifest import KIND_DOCKERFILE
+from agentic_layer.scanners.manifest import KIND_ENV
+from agentic_layer.scanners.manifest import KIND_JSON
+from agentic_layer.scanners.manifest import KIND_TOML
+from agentic_layer.scanners.manifest import YAML_KINDS
+
+
+# Typed config parsers. Each flattens a file into leaf entries: the key path from the
+# document root ("*" for a sequence item), the scalar value and the 1-based line it is
+# on. Rules match key paths, so they never see the file format. The image is stdlib
+# only, so YAML is handled by a line-oriented parser for the block/flow subset configs
+# use (no multi-line plain scalars, anchors are ignored, aliases read as null).
+
+ITEM = "*"
+
+Path_ = tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class ConfigEntry:
+    path: Path_
+    value: Any
+    line: int
+
+
+def _flatten(path: Path_, value: Any, line: int) -> Iterator[ConfigEntry]:
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield from _flatten((*path, str(key)), child, line)
+    elif isinstance(value, list):
+        for child in value:
+            yield from _flatten((*path, ITEM), child, line)
+    else:
+        yield ConfigEntry(path, value, line)
+
+
+# --- YAML -----------------------------------------------------------------------------
+
+_YAML_KEY = re.compile(
+    r"""^(?P<key>"(?:[^"\\]|\\.)*"|'(?:[^']|'')*'|[^\s'"#\-?:,\[\]{}&*!|>%@`][^#]*?|-[^\s#][^#]*?)"""
+    r"""\s*:(?:[ \t]+(?P<value>.*)|$)"""
+)
+_YAML_INT = re.compile(r"^[-+]?(?:0|[1-9][0-9_]*)$")
+_YAML_FLOAT = re.compile(r"^[-+]?(?:\d[\d_]*)?\.\d+(?:[eE][-+]?\d+)?$")
+_YAML_TRUE = frozenset({"true", "yes", "on", "y"})
+_YAML_FALSE = frozenset({"false", "no", "off", "n"})
+_YAML_NULL = frozenset({"", "~", "null"})
+_BLOCK_SCALAR = re.compile(r"^[|>][-+0-9]*$")
+
+
+def _strip_comment(text: str) -> str:
+    quote = None
+    for index, char in enumerate(text):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"" and (index == 0 or text[index - 1] in " \t:[{,"):
+            quote = char
+        elif char == "#" and (index == 0 or text[index - 1] in " \t"):
+            return text[:index].rstrip()
+    return text.rstrip()
+
+
+def _unquote(text: str) -> str:
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        try:
+            return str(json.loads(text))
+        except ValueError:
+            return text[1:-1]
+    if len(text) >= 2 and text[0] == text[-1] == "'":
+        return text[1:-1].replace("''", "'")
+    return text
+
+
+def _yaml_scalar(text: str) -> Any:
+    text = text.strip()
+    # Tags and anchors decorate the value; an alias has no inline value to report.
+    while text[:1] in ("!", "&"):
+        parts = text.split(None, 1)
+        text = parts[1] if len(parts) > 1 else ""
+    if text.startswith("*"):
+        return None
+    if text[:1] in ("'", '"'):
+        return _unquote(text)
+    lowered = text.lower()
+    if lowered in _YAML_NULL:
+        return None
+    if lowered in _YAML_TRUE:
+        return True
+    if lowered in _YAML_FALSE:
+        return False
+    if _YAML_INT.match(text):
+        return int(text.replace("_", ""))
+    if _YAML_FLOAT.match(text):
+        return float(text.replace("_", ""))
+    return text
+
+
+def _split_flow(text: str) -> list[str]:
+    # Top-level comma-separated parts of a flow collection body.
+    parts: list[str] = []
+    depth = 0
+    quote = None
+    start = 0
+    for index, char in enumerate(text):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in "[{":
+            depth += 1
+        elif char in "]}":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(text[start:index])
+            start = index + 1
+    parts.append(text[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _yaml_flow(text: str) -> Any:
+    text = text.strip()
+    if text.startswith("[") and text.endswith("]"):
+        return [_yaml_flow(part) for part in _split_flow(text[1:-1])]
+    if text.startswith("{") and text.endswith("}"):
+        mapping: dict[str, Any] = {}
+        for part in _split_flow(text[1:-1]):
+            match = _YAML_KEY.match(part)
+            if match is None:
+                mapping[_unquote(part)] = None
+            else:
+                mapping[_unquote(match.group("key").strip())] = _yaml_flow(match.group("value") or "")
+        return mapping
+    return _yaml_scalar(text)
+
+
+def _flow_balanced(text: str) -> bool:
+    depth = 0
+    quote = None
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in "[{":
+            depth += 1
+        elif char in "]}":
+            depth -= 1
+    return depth <= 0
+
+
+def _yaml_value(path: Path_, text: str, number: int) -> Iterator[ConfigEntry]:
+    if text.lstrip()[:1] in ("[", "{"):
+        yield from _flatten(path, _yaml_flow(text), number)
+    else:
+        yield ConfigEntry(path, _yaml_scalar(text), number)
+
+
+def _is_dash(text: str) -> bool:
+    return text == "-" or text.startswith("- ")
+
+
+def parse_yaml(lines: Iterator[str]) -> Iterator[ConfigEntry]:
+    # frames: (column of the container's entries, its path, is a sequence). `pending` is a
+    # key or dash with no inline value; its block starts on a later, deeper line (or, for
+    # a sequence under a key, at the key's own column).
+    frames: list[tuple[int, Path_, bool]] = [(0, (), False)]
+    pending: tuple[int, Path_, int] | None = None
+    block_indent: int | None = None
+    flow: tuple[Path_, str, int] | None = None
+    number = 0
+    for number, raw in enumerate(lines, start=1):
+        line = raw.rstrip("\r\n")
+        stripped = line.strip()
+        indent = len(line) - len(line.lstrip(" "))
+        if block_indent is not None:
+            # Body of a | or > block scalar.
+            if not stripped or indent > block_indent:
+                continue
+            block_indent = None
+        if flow is not None:
+            # A flow collection spanning lines is reported at its first line.
+            flow_path, flow_text, flow_line = flow
+            flow_text += " " + _strip_comment(stripped)
+            flow = (flow_path, flow_text, flow_line)
+            if _flow_balanced(flow_text):
+                yield from _flatten(flow_path, _yaml_flow(flow_text), flow_line)
+                flow = None
+            continue
+        if not stripped or stripped.startswith(("#", "%")):
+            continue
+        if indent == 0 and stripped[:3] in ("---", "...") and stripped[3:4] in ("", " "):
+            if pending is not None:
+                yield ConfigEntry(pending[1], None, pending[2])
+            frames = [(0, (), False)]
+            pending = None
+            continue
+
+        content = _strip_comment(line[indent:])
+        if pending is not None:
+            if indent > pending[0] or (indent == pending[0] and _is_dash(content)):
+                frames.append((indent, pending[1], _is_dash(content)))
+            else:
+                yield ConfigEntry(pending[1], None, pending[2])
+            pending = None
+        while len(frames) > 1 and (
+            frames[-1][0] > indent or (frames[-1][2] and frames[-1][0] == indent and not _is_dash(content))
+        ):
+            frames.pop()
+
+        column = indent
+        path = frames[-1][1]
+        if _is_dash(content) and frames[-1][0] == column and not frames[-1][2]:
+            # A document or block whose top level is a sequence.
+            frames[-1] = (column, path, True)
+        while True:
+            if _is_dash(content):
+                item_path = (*path, ITEM)
+                rest = content[1:].lstrip(" ")
+                if not rest:
+                    pending = (column, item_path, number)
+                    break
+                column += len(content) - len(rest)
+                content, path = rest, item_path
+                if _is_dash(rest):
+                    frames.append((column, item_path, True))
+                    continue
+                if rest[:1] not in ("[", "{") and _YAML_KEY.match(rest):
+                    frames.append((column, item_path, False))
+                    continue
+                if _BLOCK_SCALAR.match(rest):
+                    block_indent = indent
+                    yield ConfigEntry(item_path, "", number)
+                elif rest[:1] in ("[", "{") and not _flow_balanced(rest):
+                    flow = (item_path, rest, number)
+                else:
+                    yield from _yaml_value(item_path, rest, number)
+                break
+            match = _YAML_KEY.match(content)
+            if match is None:
+                # Continuation of a multi-line plain scalar.
+                break
+            key = _unquote(match.group("key").strip())
+            value_text = (match.group("value") or "").strip()
+            key_path = (*path, key)
+            if key == "<<":
+                pass
+            elif not value_text:
+                pending = (column, key_path, number)
+            elif _BLOCK_SCALAR.match(value_text):
+                block_indent = indent
+                yield ConfigEntry(key_path, "", number)
+            elif value_text[:1] in ("[", "{") and not _flow_balanced(value_text):
+                flow = (key_path, value_text, number)
+            else:
+                yield from _yaml_value(key_path, value_text, number)
+            break
+    if pending is not None:
+        yield ConfigEntry(pending[1], None, pending[2])
+
+
+# --- JSON, TOML, .env, Dockerfile -----------------------------------------------------
+
+
+def parse_json(path: Path) -> Iterator[ConfigEntry]:
+    # segments[i] is the key (or ITEM) under which open container i + 1 sits.
+    segments: list[str] = []
+    is_map: list[bool] = []
+    key = ITEM
+    with open(path, encoding="utf-8", errors="ignore") as handle:
+        for event, value, line in iter_events(handle):
+            if event == "map_key":
+                key = value
+            elif event in ("start_map", "start_array"):
+                if is_map:
+                    segments.append(key if is_map[-1] else ITEM)
+                is_map.append(event == "start_map")
+            elif event in ("end_map", "end_array"):
+                is_map.pop()
+                if segments and len(segments) >= len(is_map):
+                    segments.pop()
+            else:
+                yield ConfigEntry((*segments, key if is_map and is_map[-1] else ITEM), value, line)
+
+
+_TOML_TABLE = re.compile(r"^\[(\[)?\s*(?P<name>[^\]]+?)\s*\]\]?\s*(?:#.*)?$")
+_TOML_KEY = re.compile(r"""^(?P<key>(?:[A-Za-z0-9_-]+|"[^"]*"|'[^']*')(?:\s*\.\s*(?:[A-Za-z0-9_-]+|"[^"]*"|'[^']*'))*)\s*=\s*(?P<value>.*)$""")
+_TOML_KEY_PART = re.compile(r"""[A-Za-z0-9_-]+|"[^"]*"|'[^']*'""")
+# Lines a multi-line value may span before the file is treated as malformed.
+TOML_MAX_VALUE_LINES = 1000
+
+
+def _toml_key_path(text: str) -> Path_:
+    return tuple(_unquote(part) for part in _TOML_KEY_PART.findall(text))
+
+
+def parse_toml(path: Path) -> Iterator[ConfigEntry]:
+    # Line by line for positions; each value is handed to tomllib on its own, joined with
+    # following lines while it is an unterminated multi-line array, table or string.
+    table: Path_ = ()
+    with open(path, encoding="utf-8", errors="ignore") as handle:
+        lines = iter(enumerate(handle, start=1))
+        for number, raw in lines:
+            stripped = raw.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+            header = _TOML_TABLE.match(stripped)
+            if header is not None:
+                table = _toml_key_path(header.group("name"))
+                if header.group(1):
+                    table = (*table, ITEM)
+                continue
+            match = _TOML_KEY.match(stripped)
+            if match is None:
+                raise ValueError(f"invalid TOML at line {number}")
+            text = match.group("value")
+            for _ in range(TOML_MAX_VALUE_LINES):
+                try:
+                    value = tomllib.loads(f"v = {text}")["v"]
+                    break
+                except tomllib.TOMLDecodeError:
+                    continuation = next(lines, None)
+                    if continuation is None:
+                        raise ValueError(f"unterminated TOML value at line {number}") from None
+                    text += "\n" + continuation[1].rstrip("\r\n")
+            else:
+                raise ValueError(f"TOML value at line {number} is too long")
+            yield from _flatten((*table, *_toml_key_path(match.group("key"))), value, number)
+
+
+_ENV_LINE = re.compile(r"^(?:export\s+)?(?P<key>[A-Za-z_][A-Za-z0-9_.-]*)\s*=\s*(?P<value>.*)$")
+
+
+def parse_env(path: Path) -> Iterator[ConfigEntry]:
+    with open(path, encoding="utf-8", errors="ignore") as handle:
+        for number, raw in enumerate(handle, start=1):
+            match = _ENV_LINE.match(raw.strip())
+            if match is None:
+                continue
+            value = match.group("value").strip()
+            if value[:1] in ("'", '"'):
+                end = value.find(value[0], 1)
+                value = value[1:end] if end > 0 else value[1:]
+            else:
+                value = value.split(" #", 1)[0].strip()
+            yield ConfigEntry((match.group("key"),), value, number)
+
+
+_DOCKER_ENV_PAIR = re.compile(r"""(?P<key>[A-Za-z_][A-Za-z0-9_]*)=(?P<value>"(?:[^"\\]|\\.)*"|'[^']*'|\S*)""")
+
+
+def _dockerfile_instructions(path: Path) -> Iterator[tuple[str, str, int]]:
+    # Logical instructions with backslash continuations joined, at their first line.
+    with open(path, encoding="utf-8", errors="ignore") as handle:
+        text = ""
+        start = 0
+        for number, raw in enumerate(handle, start=1):
+            stripped = raw.strip()
+            if not text and (not stripped or stripped.startswith("#")):
+                continue
+            if text and stripped.startswith("#"):
+                continue
+            if not text:
+                start = number
+            if stripped.endswith("\\"):
+                text += stripped[:-1] + " "
+                continue
+            text += stripped
+            parts = text.split(None, 1)
+            yield parts[0].upper(), parts[1] if len(parts) > 1 else "", start
+            text = ""
+        if text:
+            parts = text.split(None, 1)
+            yield parts[0].upper(), parts[1] if len(parts) > 1 else "", start
+
+
+def parse_dockerfile(path: Path) -> Iterator[ConfigEntry]:
+    # Each instruction is an entry keyed by its name; ENV and ARG also yield one entry per
+    # variable. The parser adds ("final_stage", "user"): the user the last stage runs as,
+    # "root" by default, at its USER line or else its FROM line.
+    final_user: tuple[str, int] | None = None
+    for instruction, arguments, number in _dockerfile_instructions(path):
+        yield ConfigEntry((instruction,), arguments, number)
+        if instruction == "FROM":
+            final_user = ("root", number)
+        elif instruction == "USER":
+            final_user = (arguments.split(":", 1)[0].strip(), number)
+        elif instruction in ("ENV", "ARG"):
+            pairs = list(_DOCKER_ENV_PAIR.finditer(arguments))
+            if pairs:
+                for pair in pairs:
+                    yield ConfigEntry((instruction, pair.group("key")), _unquote(pair.group("value")), number)
+            elif instruction == "ENV" and len(arguments.split(None, 1)) == 2:
+                name, value = arguments.split(None, 1)
+                yield ConfigEntry((instruction, name), value.strip(), number)
+    if final_user is not None:
+        yield ConfigEntry(("final_stage", "user"), final_user[0], final_user[1])
+
+
+def _parse_yaml_file(path: Path) -> Iterator[ConfigEntry]:
+    with open(path, encoding="utf-8", errors="ignore") as handle:
+        yield from parse_yaml(handle)
+
+
+_KIND_PARSERS: dict[str, Callable[[Path], Iterator[ConfigEntry]]] = {
+    KIND_JSON: parse_json,
+    KIND_TOML: parse_toml,
+    KIND_ENV: parse_env,
+    KIND_DOCKERFILE: parse_dockerfile,
+    **{kind: _parse_yaml_file for kind in YAML_KINDS},
+}
+
+
+def parse_config(path: Path, kind: str) -> Iterator[ConfigEntry]:
+    return _KIND_PARSERS[kind](path)
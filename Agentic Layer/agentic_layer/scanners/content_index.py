@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import os
+from pathlib import Path
+import time
+from typing import Any
+from typing import Iterable
+
+from agentic_layer.scanners import SCANNER_VERSION
+from agentic_layer.scanners.cache import ResultCache
+from agentic_layer.scanners.cache import cache_dir
+from agentic_layer.scanners.files import has_scope
+from agentic_layer.scanners.files import iter_files
+from agentic_layer.scanners.files import sharded
+from agentic_layer.scanners.parallel import map_ordered
+from agentic_layer.scanners.parallel import worker_count
+
+
+# Literal-substring index over the scanned tree. Every pattern tool registers a query: the
+# literals a file must contain (case-insensitively) for its regex to possibly match. The
+# stats pass, which runs first in every scan, reads each file once and records which
+# registered literals it contains; the index is stored in the shared cache under a
+# fingerprint of the file listing (paths, sizes, mtimes), so each later scanner of the
+# same workspace loads it and only opens candidate files before verifying with its regex.
+# The workspace itself is mounted read-only.
+
+# Files above this are not indexed and always treated as candidates.
+INDEX_MAX_FILE_BYTES = 2 * 1024 * 1024
+# An index outlives its scan only as long as a scan can run.
+INDEX_TTL_SECONDS = 24 * 3600
+INDEX_CACHE_SUBDIR = "content-index"
+
+
+@dataclass(frozen=True)
+class LiteralQuery:
+    # Any group may match; every literal of a group must be present. Lowercase.
+    groups: tuple[tuple[str, ...], ...]
+
+    @classmethod
+    def any_of(cls, *literals: str) -> LiteralQuery:
+        return cls(tuple((literal.lower(),) for literal in literals))
+
+    def literals(self) -> set[str]:
+        return {literal for group in self.groups for literal in group}
+
+
+QUERIES: dict[str, LiteralQuery] = {}
+
+
+def register_query(name: str, query: LiteralQuery) -> LiteralQuery:
+    QUERIES[name] = query
+    return query
+
+
+def indexed_literals() -> tuple[str, ...]:
+    return tuple(sorted({literal for query in QUERIES.values() for literal in query.literals()}))
+
+
+def _listing(root: Path) -> list[tuple[str, int, int]]:
+    listing = []
+    # The whole tree: the index is shared by runs over any shard of it.
+    for path in iter_files(root, scoped=False):
+        try:
+            info = path.stat()
+        except OSError:
+            continue
+        listing.append((path.relative_to(root).as_posix(), info.st_size, info.st_mtime_ns))
+    return listing
+
+
+def _fingerprint(listing: list[tuple[str, int, int]], literals: tuple[str, ...]) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"{SCANNER_VERSION}\0{chr(1).join(literals)}\0".encode())
+    for relpath, size, mtime_ns in listing:
+        digest.update(f"{relpath}\0{size}\0{mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def _index_file(job: tuple[str, int, tuple[bytes, ...]]) -> list[int] | None:
+    # -> positions (in the literal list) of the literals the file contains; None when
+    # the file is not indexed.
+    path, size, literals = job
+    if size > INDEX_MAX_FILE_BYTES:
+        return None
+    try:
+        with open(path, "rb") as handle:
+            content = handle.read().lower()
+    except OSError:
+        return None
+    return [position for position, literal in enumerate(literals) if literal in content]
+
+
+class ContentIndex:
+    def __init__(self, files: list[str], postings: dict[str, list[int]], unindexed: list[int]) -> None:
+        self.file_ids = {relpath: file_id for file_id, relpath in enumerate(files)}
+        self.postings = {literal: set(ids) for literal, ids in postings.items()}
+        self.unindexed = set(unindexed)
+
+    def may_match(self, file_id: int, query: LiteralQuery) -> bool:
+        if file_id in self.unindexed:
+            return True
+        for group in query.groups:
+            # A literal the index was not built with cannot rule anything out.
+            if all(file_id in self.postings.get(literal, (file_id,)) for literal in group):
+                return True
+        return False
+
+    def candidates(self, root: Path, paths: Iterable[Path], query: LiteralQuery) -> list[Path]:
+        selected = []
+        for path in paths:
+            file_id = self.file_ids.get(path.relative_to(root).as_posix())
+            if file_id is None or self.may_match(file_id, query):
+                selected.append(path)
+        return selected
+
+
+def _store() -> ResultCache | None:
+    base = cache_dir()
+    if base is None:
+        return None
+    return ResultCache(base / INDEX_CACHE_SUBDIR, ttl_seconds=INDEX_TTL_SECONDS)
+
+
+def load(root: Path) -> ContentIndex | None:
+    # The index the stats pass stored for exactly this file listing, if any.
+    store = _store()
+    if store is None:
+        return None
+    if has_scope() and not sharded():
+        # A few files named with --file: reading them beats listing the tree.
+        return None
+    literals = indexed_literals()
+    entry = store.get(_fingerprint(_listing(root), literals))
+    if entry is None or entry.get("literals") != list(literals):
+        return None
+    return ContentIndex(entry["files"], entry["postings"], entry["unindexed"])
+
+
+def build(root: Path, budget_seconds: float | None = None) -> dict[str, Any]:
+    # Reads every file once; abandoned (and not stored) past `budget_seconds`, since the
+    # scanners work without it.
+    store = _store()
+    if store is None:
+        return {"built": False, "reason": "cache_disabled"}
+    started_at = time.perf_counter()
+    literals = indexed_literals()
+    listing = _listing(root)
+    fingerprint = _fingerprint(listing, literals)
+    store.sweep(os.urandom(1).hex())
+    if store.get(fingerprint) is not None:
+        return {"built": False, "reason": "exists", "files": len(listing)}
+
+    encoded = tuple(literal.encode() for literal in literals)
+    jobs = [(str(root / relpath), size, encoded) for relpath, size, _ in listing]
+    postings: dict[str, list[int]] = {literal: [] for literal in literals}
+    unindexed: list[int] = []
+    results = map_ordered(_index_file, jobs, worker_count(len(jobs)))
+    try:
+        for file_id, present in enumerate(results):
+            if present is None:
+                unindexed.append(file_id)
+            else:
+                for position in present:
+                    postings[literals[position]].append(file_id)
+            if budget_seconds is not None and time.perf_counter() - started_at > budget_seconds:
+                return {"built": False, "reason": "budget_exceeded", "files": len(listing)}
+    finally:
+        results.close()
+    store.put(
+        fingerprint,
+        {
+            "literals": list(literals),
+            "files": [relpath for relpath, _, _ in listing],
+            "postings": postings,
+            "unindexed": unindexed,
+        },
+    )
+    return {
+        "built": True,
+        "files": len(listing),
+        "unindexed": len(unindexed),
+        "literals": len(literals),
+        "build_ms": round((time.perf_counter() - started_at) * 1000, 3),
+    }
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from collections import Counter
+import math
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError:  # the scanner image ships NumPy; a bare host Python may not
+    np = None
+
+
+# Shannon entropy and character classes of many short byte strings at once. With NumPy,
+# a batch becomes one byte histogram per token (a single bincount) and every statistic is
+# a row reduction over it; without, the same values are computed token by token.
+
+HAS_DIGIT = 1
+HAS_LOWER = 2
+HAS_UPPER = 4
+# Any byte outside [0-9a-fA-F].
+NOT_HEX = 8
+
+BACKEND = "numpy" if np is not None else "python"
+BATCH_TOKENS = 8192
+
+_HEX_BYTES = frozenset(b"0123456789abcdefABCDEF")
+
+if np is not None:
+    _NOT_HEX_COLUMNS = np.ones(256, dtype=bool)
+    _NOT_HEX_COLUMNS[list(_HEX_BYTES)] = False
+
+
+def _classes_numpy(counts) -> list[int]:
+    flags = np.where(counts[:, 48:58].any(axis=1), HAS_DIGIT, 0)
+    flags |= np.where(counts[:, 97:123].any(axis=1), HAS_LOWER, 0)
+    flags |= np.where(counts[:, 65:91].any(axis=1), HAS_UPPER, 0)
+    flags |= np.where(counts[:, _NOT_HEX_COLUMNS].any(axis=1), NOT_HEX, 0)
+    return flags.tolist()
+
+
+def _analyze_numpy(tokens: Sequence[bytes]) -> tuple[list[float], list[int]]:
+    # H = log2(n) - sum(c * log2(c)) / n over the nonzero counts c of a token of length n.
+    lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+    data = np.frombuffer(b"".join(tokens), dtype=np.uint8)
+    rows = np.repeat(np.arange(len(tokens), dtype=np.int64), lengths)
+    counts = np.bincount(rows * 256 + data, minlength=len(tokens) * 256).reshape(len(tokens), 256)
+    token_rows, columns = counts.nonzero()
+    present = counts[token_rows, columns].astype(np.float64)
+    weighted = np.bincount(token_rows, weights=present * np.log2(present), minlength=len(tokens))
+    safe_lengths = np.maximum(lengths, 1)
+    entropies = np.log2(safe_lengths) - weighted / safe_lengths
+    return entropies.tolist(), _classes_numpy(counts)
+
+
+def _analyze_python(tokens: Sequence[bytes]) -> tuple[list[float], list[int]]:
+    entropies = []
+    classes = []
+    for token in tokens:
+        length = len(token)
+        counts = Counter(token)
+        entropies.append(-sum(count / length * math.log2(count / length) for count in counts.values()))
+        flags = 0
+        for byte in counts:
+            if 48 <= byte <= 57:
+                flags |= HAS_DIGIT
+            elif 97 <= byte <= 122:
+                flags |= HAS_LOWER
+            elif 65 <= byte <= 90:
+                flags |= HAS_UPPER
+            if byte not in _HEX_BYTES:
+                flags |= NOT_HEX
+        classes.append(flags)
+    return entropies, classes
+
+
+def analyze(tokens: Sequence[bytes]) -> tuple[list[float], list[int]]:
+    # -> (bits of entropy per byte, class flags) for each token.
+    if np is None:
+        return _analyze_python(tokens)
+    entropies: list[float] = []
+    classes: list[int] = []
+    # The histogram matrix is 2 KiB per token; batches bound it.
+    for start in range(0, len(tokens), BATCH_TOKENS):
+        batch_entropies, batch_classes = _analyze_numpy(tokens[start : start + BATCH_TOKENS])
+        entropies.extend(batch_entropies)
+        classes.extend(batch_classes)
+    return entropies, classes
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import heapq
+import os
+from pathlib import Path
+from typing import Iterable
+from typing import Iterator
+
+
+SKIPPED_DIRS = frozenset({".git"})
+
+# Vendored dependency trees: their manifests and configs describe third-party code, which
+# the root lockfile already pins.
+VENDORED_DIRS = frozenset({"node_modules", "vendor", ".venv", "venv", "site-packages", "target"})
+
+# Optional file scope (--file), for rescans of part of a tree: walks yield only the scoped
+# files and do not descend into directories that hold none of them. Relative POSIX paths.
+_scope: frozenset[str] | None = None
+_scope_dirs: frozenset[str] = frozenset()
+_sharded = False
+
+
+def configure_scope(root: Path, paths: Iterable[str] | None) -> None:
+    # `paths` are relative to root, or absolute under it as scanners report them.
+    global _scope, _scope_dirs
+    if not paths:
+        _scope, _scope_dirs = None, frozenset()
+        return
+    scope = set()
+    dirs = {""}
+    for path in paths:
+        relative = Path(os.path.relpath(path, root) if os.path.isabs(path) else path).as_posix()
+        if relative == ".." or relative.startswith("../"):
+            raise ValueError(f"{path} is outside {root}")
+        scope.add(relative)
+        parent = os.path.dirname(relative)
+        while parent and parent not in dirs:
+            dirs.add(parent)
+            parent = os.path.dirname(parent)
+    _scope, _scope_dirs = frozenset(scope), frozenset(dirs)
+
+
+def configure_shard(root: Path, index: int, count: int) -> None:
+    # Narrows the scope to shard `index` of `count`: files are balanced across shards by
+    # size (largest first, each to the lightest shard, ties to the lower index), so every
+    # container running one shard of the same tree computes the same partition.
+    global _scope, _scope_dirs, _sharded
+    if count <= 1:
+        return
+    sized = []
+    for path in iter_files(root):
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = 0
+        sized.append((-size, path.relative_to(root).as_posix()))
+    sized.sort()
+    loads = [(0, shard) for shard in range(count)]
+    mine = []
+    for negative_size, relative in sized:
+        load, shard = heapq.heappop(loads)
+        if shard == index:
+            mine.append(relative)
+        heapq.heappush(loads, (load - negative_size, shard))
+    _scope, _scope_dirs, _sharded = None, frozenset(), True
+    configure_scope(root, mine)
+    if _scope is None:
+        # An empty shard scans nothing rather than everything.
+        _scope = frozenset()
+        _scope_dirs = frozenset({""})
+
+
+def has_scope() -> bool:
+    return _scope is not None
+
+
+def sharded() -> bool:
+    return _sharded
+
+
+def in_scope(path: Path | str, root: Path) -> bool:
+    return _scope is None or Path(os.path.relpath(path, root)).as_posix() in _scope
+
+
+def iter_files(
+    root: Path,
+    *,
+    suffixes: Iterable[str] | None = None,
+    names: Iterable[str] | None = None,
+    name_prefix: str | None = None,
+    limit: int | None = None,
+    exclude_dirs: Iterable[str] = (),
+    scoped: bool = True,
+) -> Iterator[Path]:
+    # Deterministic (sorted) walk of regular files under root, skipping VCS metadata and,
+    # unless `scoped` is False, files outside the configured scope.
+    wanted_suffixes = {suffix.lower() for suffix in suffixes} if suffixes is not None else None
+    wanted_names = {name.lower() for name in names} if names is not None else None
+    skipped_dirs = SKIPPED_DIRS.union(exclude_dirs)
+    scope = _scope if scoped else None
+    yielded = 0
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name not in skipped_dirs)
+        if scope is not None:
+            relative_dir = Path(os.path.relpath(dirpath, root)).as_posix()
+            prefix = "" if relative_dir == "." else f"{relative_dir}/"
+            dirnames[:] = [name for name in dirnames if prefix + name in _scope_dirs]
+            filenames = [name for name in filenames if prefix + name in scope]
+        for filename in sorted(filenames):
+            lowered = filename.lower()
+            if wanted_suffixes is not None and os.path.splitext(lowered)[1] not in wanted_suffixes:
+                continue
+            if wanted_names is not None and lowered not in wanted_names:
+                continue
+            if name_prefix is not None and not filename.startswith(name_prefix):
+                continue
+            path = Path(dirpath, filename)
+            if not path.is_file():
+                continue
+            yield path
+            yielded += 1
+            if limit is not None and yielded >= limit:
+                return
+
+
+def read_text(path: Path) -> str | None:
+    try:
+        return path.read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return None
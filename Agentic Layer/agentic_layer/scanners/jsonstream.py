@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+from typing import Iterator
+from typing import TextIO
+
+
+# Incremental JSON tokenizer for documents too large to load: reads fixed-size chunks and
+# yields (event, value, line) tuples, ijson style, so memory stays bounded by the chunk
+# size plus the longest single token. Events: start_map, end_map, start_array, end_array,
+# map_key and scalar. Containers opening at `value_depth` (the root is depth 1) are
+# decoded whole by the C decoder and yielded as one "value" event instead: callers pick a
+# depth whose subtrees are small, and skip the per-token overhead inside them. It is a
+# tokenizer, not a validator: separators are not checked, only truncation and bad tokens.
+
+CHUNK_CHARS = 1 << 16
+
+_TOKEN = re.compile(
+    r'[ \t\r\n]*(?:(?P<punct>[{}\[\]:,])|"(?P<string>[^"\\]*(?:\\.[^"\\]*)*)"'
+    r"|(?P<number>-?\d[0-9.eE+-]*)|(?P<literal>true|false|null))"
+)
+_TRAILING_SPACE = re.compile(r"[ \t\r\n]*\Z")
+_DECODER = json.JSONDecoder()
+_LITERALS = {"true": True, "false": False, "null": None}
+_OPEN = {"{": "start_map", "[": "start_array"}
+_CLOSE = {"}": "end_map", "]": "end_array"}
+
+
+def _string(raw: str) -> str:
+    return json.loads(f'"{raw}"') if "\\" in raw else raw
+
+
+def _number(raw: str) -> Any:
+    try:
+        return int(raw)
+    except ValueError:
+        return float(raw)
+
+
+def iter_events(
+    handle: TextIO,
+    value_depth: int | None = None,
+    chunk_chars: int = CHUNK_CHARS,
+) -> Iterator[tuple[str, Any, int]]:
+    buffer = ""
+    pos = 0
+    line = 1
+    counted = 0
+    eof = False
+    # One entry per open container: is it a map, and is the next string in it a key.
+    containers: list[bool] = []
+    expect_key = False
+    while True:
+        match = _TOKEN.match(buffer, pos)
+        if not eof and (match is None or match.end() == len(buffer)):
+            # The token may continue in the next chunk.
+            line += buffer.count("\n", counted, pos)
+            chunk = handle.read(chunk_chars)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = counted = 0
+            continue
+        if match is None:
+            if _TRAILING_SPACE.match(buffer, pos):
+                break
+            raise ValueError(f"invalid JSON at line {line + buffer.count(chr(10), counted, pos)}")
+        start = match.end() - len(match.group(0).lstrip(" \t\r\n"))
+        line += buffer.count("\n", counted, start)
+        counted = start
+        pos = match.end()
+
+        punct = match.group("punct")
+        if punct is not None:
+            if punct in _OPEN and len(containers) + 1 == value_depth:
+                while True:
+                    try:
+                        value, end = _DECODER.raw_decode(buffer, start)
+                        break
+                    except ValueError:
+                        if eof:
+                            raise
+                    # Incomplete subtree: grow the buffer geometrically so one large
+                    # value is not re-decoded once per chunk.
+                    chunk = handle.read(max(chunk_chars, len(buffer) - start))
+                    eof = not chunk
+                    buffer += chunk
+                yield "value", value, line
+                line += buffer.count("\n", start, end)
+                pos = counted = end
+                expect_key = False
+            elif punct in _OPEN:
+                yield _OPEN[punct], None, line
+                containers.append(punct == "{")
+                expect_key = punct == "{"
+            elif punct in _CLOSE:
+                if not containers:
+                    raise ValueError(f"unbalanced {punct!r} at line {line}")
+                containers.pop()
+                yield _CLOSE[punct], None, line
+                expect_key = False
+            elif punct == ",":
+                expect_key = bool(containers) and containers[-1]
+            continue
+        raw = match.group("string")
+        if raw is not None:
+            if expect_key:
+                expect_key = False
+                yield "map_key", _string(raw), line
+            else:
+                yield "scalar", _string(raw), line
+            continue
+        number = match.group("number")
+        if number is not None:
+            yield "scalar", _number(number), line
+        else:
+            yield "scalar", _LITERALS[match.group("literal")], line
+    if containers:
+        raise ValueError("truncated JSON document")
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+import re
+import tomllib
+from typing import Any
+from typing import Callable
+from typing import Iterator
+
+from agentic_layer.scanners.files import VENDORED_DIRS
+from agentic_layer.scanners.files import iter_files
+from agentic_layer.scanners.jsonstream import iter_events
+from agentic_layer.scanners.versions import ECOSYSTEM_CARGO
+from agentic_layer.scanners.versions import ECOSYSTEM_GO
+from agentic_layer.scanners.versions import ECOSYSTEM_NPM
+from agentic_layer.scanners.versions import ECOSYSTEM_PYPI
+
+
+# Installed/pinned dependencies from the manifests and lockfiles found anywhere in the
+# tree. Only exact versions are yielded: a range constraint says nothing about what runs.
+# Every parser is a generator over a streamed read, so a lockfile is never held in memory.
+
+_TOML_STRING = re.compile(r'^(?P<key>name|version)\s*=\s*"(?P<value>[^"]*)"')
+_YARN_VERSION = re.compile(r'^\s+version:?\s+"?(?P<version>[^"\s]+)"?\s*$')
+_REQUIREMENT = re.compile(r"^(?P<name>[A-Za-z0-9][A-Za-z0-9._-]*)(?:\[[^\]]*\])?\s*===?\s*(?P<version>[^\s;,#]+)")
+
+
+@dataclass(frozen=True, slots=True)
+class Dependency:
+    ecosystem: str
+    name: str
+    version: str
+    file: str
+    line: int = 1
+
+
+def _requirement(ecosystem: str, text: str, file: str, line: int) -> Dependency | None:
+    match = _REQUIREMENT.match(text.strip())
+    if not match:
+        return None
+    return Dependency(ecosystem, match.group("name"), match.group("version"), file, line)
+
+
+def parse_requirements(path: Path) -> Iterator[Dependency]:
+    with open(path, encoding="utf-8", errors="ignore") as handle:
+        for number, raw in enumerate(handle, start=1):
+            line = raw.split(" #", 1)[0].strip()
+            if not line or line.startswith(("#", "-")):
+                continue
+            dependency = _requirement(ECOSYSTEM_PYPI, line, str(path), number)
+            if dependency is not None:
+                yield dependency
+
+
+def parse_pyproject(path: Path) -> Iterator[Dependency]:
+    with open(path, "rb") as handle:
+        data = tomllib.load(handle)
+    project = data.get("project") or {}
+    requirements = list(project.get("dependencies") or [])
+    for group in (project.get("optional-dependencies") or {}).values():
+        requirements.extend(group or [])
+    for requirement in requirements:
+        dependency = _requirement(ECOSYSTEM_PYPI, str(requirement), str(path), 1)
+        if dependency is not None:
+            yield dependency
+
+
+def _toml_packages(path: Path, ecosystem: str) -> Iterator[Dependency]:
+    # poetry.lock and Cargo.lock share the [[package]] name/version layout. Scanned line by
+    # line rather than loaded, since lockfiles of large projects run to tens of megabytes;
+    # only keys directly under a [[package]] header count, not its sub-tables.
+    file = str(path)
+    in_package = in_multiline = False
+    name = version = None
+    header_line = 0
+    with open(path, encoding="utf-8", errors="ignore") as handle:
+        for number, raw in enumerate(handle, start=1):
+            if raw.count('"""') % 2:
+                in_multiline = not in_multiline
+                continue
+            if in_multiline:
+                continue
+            line = raw.strip()
+            if line.startswith("["):
+                if in_package and name and version:
+                    yield Dependency(ecosystem, name, version, file, header_line)
+                in_package = line == "[[package]]"
+                name = version = None
+                header_line = number
+                continue
+            if not in_package:
+                continue
+            match = _TOML_STRING.match(line)
+            if match is None:
+                continue
+            if match.group("key") == "name":
+                name = match.group("value")
+            elif match.group("key") == "version":
+                version = match.group("value")
+    if in_package and name and version:
+        yield Dependency(ecosystem, name, version, file, header_line)
+
+
+def parse_poetry_lock(path: Path) -> Iterator[Dependency]:
+    return _toml_packages(path, ECOSYSTEM_PYPI)
+
+
+def parse_cargo_lock(path: Path) -> Iterator[Dependency]:
+    return _toml_packages(path, ECOSYSTEM_CARGO)
+
+
+def _npm_v1_dependencies(name: str, entry: Any, file: str, line: int) -> Iterator[Dependency]:
+    if not isinstance(entry, dict):
+        return
+    if isinstance(entry.get("version"), str):
+        yield Dependency(ECOSYSTEM_NPM, name, entry["version"], file, line)
+    for child_name, child in (entry.get("dependencies") or {}).items():
+        yield from _npm_v1_dependencies(child_name, child, file, line)
+
+
+def parse_package_lock(path: Path) -> Iterator[Dependency]:
+    # Streamed, so memory is bounded by the largest single entry rather than the lockfile.
+    # lockfileVersion 2/3 keeps a flat "packages" map keyed by install path ("" is the
+    # root project); version 1 nests "dependencies" inside each dependency. npm writes
+    # "packages" first, and the legacy tree a version 2 file repeats it in is skipped.
+    file = str(path)
+    depth = 0
+    key = section = None
+    has_packages = False
+    with open(path, encoding="utf-8", errors="ignore") as handle:
+        # Depth 3 values are the per-package entries (whole dependency subtrees in v1).
+        for event, value, line in iter_events(handle, value_depth=3):
+            if event == "map_key":
+                key = value
+            elif event in ("start_map", "start_array"):
+                depth += 1
+                if depth == 2:
+                    section = key if event == "start_map" else None
+                    has_packages = has_packages or section == "packages"
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+            elif event != "value" or depth != 2 or not isinstance(value, dict):
+                continue
+            elif section == "packages" and key and not value.get("link"):
+                if isinstance(value.get("version"), str):
+                    name = value.get("name") or key.rsplit("node_modules/", 1)[-1]
+                    yield Dependency(ECOSYSTEM_NPM, str(name), value["version"], file, line)
+            elif section == "dependencies" and not has_packages:
+                yield from _npm_v1_dependencies(str(key), value, file, line)
+
+
+def _yarn_name(spec: str) -> str | None:
+    # "@scope/name@^1.0.0" and berry's "name@npm:^1.0.0" -> package name.
+    spec = spec.strip().strip('"')
+    at = spec.find("@", 1)
+    return spec[:at] if at > 0 else None
+
+
+def parse_yarn_lock(path: Path) -> Iterator[Dependency]:
+    # Classic (`version "1.2.3"`) and berry (`version: 1.2.3`) entries: an unindented
+    # header listing the specs it resolves, then indented fields.
+    file = str(path)
+    name = None
+    header_line = 0
+    with open(path, encoding="utf-8", errors="ignore") as handle:
+        for number, raw in enumerate(handle, start=1):
+            if not raw.strip() or raw.lstrip().startswith("#"):
+                continue
+            if not raw[0].isspace():
+                header = raw.rstrip().rstrip(":")
+                first = header.split(",", 1)[0]
+                name = None if "@workspace:" in header or first == "__metadata" else _yarn_name(first)
+                header_line = number
+                continue
+            if name is None:
+                continue
+            match = _YARN_VERSION.match(raw)
+            if match is not None:
+                yield Dependency(ECOSYSTEM_NPM, name, match.group("version"), file, header_line)
+                name = None
+
+
+def parse_go_sum(path: Path) -> Iterator[Dependency]:
+    with open(path, encoding="utf-8", errors="ignore") as handle:
+        for number, raw in enumerate(handle, start=1):
+            parts = raw.split()
+            if len(parts) < 2:
+                continue
+            module, version = parts[0], parts[1]
+            # Every module has a "/go.mod" hash line as well; count the module once.
+            if version.endswith("/go.mod"):
+                continue
+            yield Dependency(ECOSYSTEM_GO, module, version, str(path), number)
+
+
+def _is_requirements(path: Path) -> bool:
+    name = path.name.lower()
+    if not name.endswith(".txt"):
+        return False
+    return name.startswith("requirements") or path.parent.name.lower() == "requirements"
+
+
+LOCKFILE_PARSERS: dict[str, Callable[[Path], Iterator[Dependency]]] = {
+    "poetry.lock": parse_poetry_lock,
+    "pyproject.toml": parse_pyproject,
+    "package-lock.json": parse_package_lock,
+    "yarn.lock": parse_yarn_lock,
+    "go.sum": parse_go_sum,
+    "cargo.lock": parse_cargo_lock,
+}
+
+
+def parser_for(path: Path) -> Callable[[Path], Iterator[Dependency]] | None:
+    parser = LOCKFILE_PARSERS.get(path.name.lower())
+    if parser is not None:
+        return parser
+    return parse_requirements if _is_requirements(path) else None
+
+
+def iter_lockfiles(root: Path) -> Iterator[Path]:
+    for path in iter_files(root, exclude_dirs=VENDORED_DIRS):
+        if parser_for(path) is not None:
+            yield path
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import os
+from pathlib import Path
+import re
+from typing import Iterator
+
+from agentic_layer.scanners.files import VENDORED_DIRS
+from agentic_layer.scanners.files import iter_files
+
+
+# Repository manifest: one walk that classifies every configuration file by the parser
+# it needs, so scanners ask for kinds instead of hardcoding filenames.
+
+KIND_YAML = "yaml"
+KIND_COMPOSE = "compose"
+KIND_K8S = "k8s"
+KIND_JSON = "json"
+KIND_TOML = "toml"
+KIND_ENV = "env"
+KIND_DOCKERFILE = "dockerfile"
+
+# Kinds parsed as YAML; compose and k8s only differ in which rules apply.
+YAML_KINDS = frozenset({KIND_YAML, KIND_COMPOSE, KIND_K8S})
+
+# Machine-written JSON that is large and never configuration.
+_IGNORED_JSON = frozenset({"package-lock.json", "npm-shrinkwrap.json", "composer.lock"})
+_COMPOSE_NAME = re.compile(r"^(docker-)?compose([.-][\w.-]+)?\.ya?ml$")
+# apiVersion and kind as top-level keys near the start of a document.
+_K8S_SNIFF = re.compile(rb"^apiVersion:.*?^kind:|^kind:.*?^apiVersion:", re.MULTILINE | re.DOTALL)
+K8S_SNIFF_BYTES = 4096
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    path: str
+    kind: str
+    size: int
+
+
+def kind_for_name(name: str) -> str | None:
+    lowered = name.lower()
+    if lowered == "dockerfile" or lowered.startswith("dockerfile.") or lowered.endswith(".dockerfile"):
+        return KIND_DOCKERFILE
+    if lowered == ".env" or lowered.startswith(".env.") or lowered.endswith(".env"):
+        return KIND_ENV
+    if _COMPOSE_NAME.match(lowered):
+        return KIND_COMPOSE
+    suffix = os.path.splitext(lowered)[1]
+    if suffix in (".yml", ".yaml"):
+        return KIND_YAML
+    if suffix == ".json" and lowered not in _IGNORED_JSON and not lowered.endswith(".min.json"):
+        return KIND_JSON
+    if suffix == ".toml":
+        return KIND_TOML
+    return None
+
+
+def _is_k8s(path: Path) -> bool:
+    try:
+        with open(path, "rb") as handle:
+            head = handle.read(K8S_SNIFF_BYTES)
+    except OSError:
+        return False
+    return _K8S_SNIFF.search(head) is not None
+
+
+def iter_config_files(root: Path) -> Iterator[ManifestEntry]:
+    for path in iter_files(root, exclude_dirs=VENDORED_DIRS):
+        kind = kind_for_name(path.name)
+        if kind is None:
+            continue
+        if kind == KIND_YAML and _is_k8s(path):
+            kind = KIND_K8S
+        try:
+            size = path.stat().st_size
+        except OSError:
+            continue
+        yield ManifestEntry(str(path), kind, size)
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import math
+import multiprocessing
+import os
+from typing import Callable
+from typing import Iterator
+from typing import Sequence
+from typing import TypeVar
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Below this many items, process start-up costs more than it saves.
+PARALLEL_MIN_ITEMS = 64
+
+
+def _read_first_line(path: str) -> str | None:
+    try:
+        with open(path, encoding="utf-8") as handle:
+            return handle.readline().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_quota() -> float | None:
+    # The container's CPU limit (Docker NanoCpus) as a number of CPUs, or None if unlimited.
+    cpu_max = _read_first_line("/sys/fs/cgroup/cpu.max")  # cgroup v2: "<quota|max> <period>"
+    if cpu_max:
+        parts = cpu_max.split()
+        if len(parts) == 2 and parts[0] != "max":
+            try:
+                return int(parts[0]) / int(parts[1])
+            except (ValueError, ZeroDivisionError):
+                return None
+        return None
+    quota = _read_first_line("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")  # cgroup v1
+    period = _read_first_line("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+    try:
+        if quota and period and int(quota) > 0:
+            return int(quota) / int(period)
+    except (ValueError, ZeroDivisionError):
+        pass
+    return None
+
+
+def _env_cpus() -> float | None:
+    # Set by the local backend, which has no cgroup to carry the scanner's CPU request.
+    raw = os.getenv("DEPLAI_SCANNER_CPUS", "").strip()
+    try:
+        value = float(raw) if raw else None
+    except ValueError:
+        return None
+    return value if value is not None and value > 0 else None
+
+
+def available_cpus() -> int:
+    # min(CPUs we may be scheduled on, CFS quota, requested CPUs); fractional limits round
+    # down so workers are not throttled mid-scan.
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cpus = os.cpu_count() or 1
+    for limit in (cgroup_cpu_quota(), _env_cpus()):
+        if limit is not None:
+            cpus = min(cpus, max(1, math.floor(limit)))
+    return max(1, cpus)
+
+
+def worker_count(items: int) -> int:
+    if items < PARALLEL_MIN_ITEMS:
+        return 1
+    return max(1, min(available_cpus(), items))
+
+
+def _mp_context():
+    # The scanner process is single-threaded when the pool starts, so fork is safe and
+    # avoids re-importing the bundle in every worker.
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def map_ordered(fn: Callable[[T], R], items: Sequence[T], workers: int) -> Iterator[R]:
+    # Results come back in input order whatever the worker count, so output is identical
+    # to a serial run. If the pool cannot start or a worker dies, the remaining items
+    # run in this process.
+    if workers <= 1 or len(items) <= 1:
+        yield from map(fn, items)
+        return
+    chunksize = max(1, min(64, len(items) // (workers * 8)))
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context()) as pool:
+            try:
+                for result in pool.map(fn, items, chunksize=chunksize):
+                    done += 1
+                    yield result
+            except GeneratorExit:
+                # The caller stopped early (a time budget): drop the queued chunks rather
+                # than finishing them on the way out.
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+    except (BrokenProcessPool, OSError):
+        yield from map(fn, items[done:])
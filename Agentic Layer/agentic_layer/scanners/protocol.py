@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+import sys
+from typing import Any
+from typing import TextIO
+
+from agentic_layer.scanners import SCANNER_VERSION
+
+
+class Emitter:
+    # Writes the NDJSON scanner protocol consumed by runtime.output_stream.NdjsonCollector.
+
+    def __init__(self, tool: str, stream: TextIO | None = None) -> None:
+        self.tool = tool
+        self.stream = stream or sys.stdout
+        self.count = 0
+
+    def _write(self, payload: dict[str, Any]) -> None:
+        self.stream.write(json.dumps(payload, separators=(",", ":"), default=str))
+        self.stream.write("\n")
+
+    def finding(self, finding: dict[str, Any]) -> None:
+        self.count += 1
+        self._write({"event": "finding", "finding": finding})
+
+    def event(self, name: str, **fields: Any) -> None:
+        self._write({"event": name, **fields})
+
+    def checkpoint(self, **fields: Any) -> None:
+        # Flushed, so a scanner killed later has delivered everything before this point.
+        self._write({"event": "checkpoint", "findings": self.count, **fields})
+        self.stream.flush()
+
+    def summary(self, **fields: Any) -> None:
+        self._write(
+            {
+                "event": "summary",
+                "summary": {
+                    "tool": self.tool,
+                    "scanner_version": SCANNER_VERSION,
+                    "count": self.count,
+                    **fields,
+                },
+            }
+        )
+        self.stream.flush()
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import ast
+from dataclasses import dataclass
+from dataclasses import field
+import heapq
+import os
+from pathlib import Path
+import time
+from typing import Any
+from typing import Callable
+
+from agentic_layer.scanners.ast_rules import AstRule
+from agentic_layer.scanners.ast_rules import evaluate
+from agentic_layer.scanners.cache import ResultCache
+from agentic_layer.scanners.cache import cache_dir
+from agentic_layer.scanners.cache import content_key
+from agentic_layer.scanners.checkpoint import Progress
+from agentic_layer.scanners.files import in_scope
+from agentic_layer.scanners.files import iter_files
+from agentic_layer.scanners.parallel import map_ordered
+from agentic_layer.scanners.parallel import worker_count
+from agentic_layer.scanners.protocol import Emitter
+
+
+# Larger .py files are almost always generated or vendored data, and one of them can
+# hold a worker for seconds; they are reported as skipped instead.
+MAX_FILE_BYTES = 2 * 1024 * 1024
+SLOWEST_FILES_REPORTED = 10
+
+SKIP_TOO_LARGE = "too_large"
+SKIP_UNREADABLE = "unreadable"
+SKIP_SYNTAX_ERROR = "syntax_error"
+SKIP_INVALID_SOURCE = "invalid_source"
+SKIP_PARSE_ERROR = "parse_error"
+# A context file whose facts are not in the cache; it is not parsed.
+SKIP_NOT_CACHED = "not_cached"
+
+
+@dataclass
+class FileResult:
+    # Plain data so it pickles cheaply back from pool workers.
+    file: str
+    hits: list[dict[str, Any]] = field(default_factory=list)
+    facts: dict[str, Any] = field(default_factory=dict)
+    parse_ms: float = 0.0
+    cached: bool = False
+    skipped: str | None = None
+    detail: str | None = None
+
+
+def scan_file(job: tuple[str, int, tuple[str, ...], str | None, bool]) -> FileResult:
+    # Runs in a pool worker: (path, size limit, rule ids, cache dir, cached only) in, rule
+    # hits, facts and timing out. Never raises, so one bad file cannot take down the pool.
+    path, limit, rule_ids, cache_root, cached_only = job
+    try:
+        size = os.path.getsize(path)
+        if size > limit:
+            return FileResult(file=path, skipped=SKIP_TOO_LARGE, detail=f"{size} bytes > {limit}")
+        with open(path, "rb") as handle:
+            content = handle.read()
+    except OSError as exc:
+        return FileResult(file=path, skipped=SKIP_UNREADABLE, detail=exc.strerror or str(exc))
+
+    # Hits and facts depend only on the bytes and the rule set, so an unchanged file is
+    # served from the shared cache without parsing.
+    result_cache = ResultCache(Path(cache_root) if cache_root else None)
+    key = content_key(content, ",".join(rule_ids))
+    entry = result_cache.get(key)
+    if entry is not None:
+        return FileResult(file=path, hits=entry["hits"], facts=entry["facts"], cached=True)
+    if cached_only:
+        return FileResult(file=path, skipped=SKIP_NOT_CACHED)
+
+    started_at = time.perf_counter()
+    try:
+        tree = ast.parse(content.decode("utf-8", errors="ignore"), filename=path)
+    except SyntaxError as exc:
+        return FileResult(
+            file=path,
+            parse_ms=(time.perf_counter() - started_at) * 1000,
+            skipped=SKIP_SYNTAX_ERROR,
+            detail=f"line {exc.lineno}: {exc.msg}",
+        )
+    except ValueError as exc:
+        # Source containing null bytes.
+        return FileResult(file=path, skipped=SKIP_INVALID_SOURCE, detail=str(exc)[:200])
+    except (RecursionError, MemoryError) as exc:
+        return FileResult(file=path, skipped=SKIP_PARSE_ERROR, detail=type(exc).__name__)
+    parse_ms = (time.perf_counter() - started_at) * 1000
+    try:
+        hits, facts = evaluate(tree, path, rule_ids)
+    except RecursionError:
+        return FileResult(file=path, parse_ms=parse_ms, skipped=SKIP_PARSE_ERROR, detail="RecursionError")
+    result_cache.put(key, {"hits": hits, "facts": facts})
+    return FileResult(file=path, hits=hits, facts=facts, parse_ms=parse_ms)
+
+
+def scan_tree(
+    root: Path,
+    emit: Emitter,
+    rules: list[AstRule],
+    on_hit: Callable[[AstRule, str, dict[str, Any]], None],
+) -> dict[str, Any]:
+    # Files are parsed across a process pool sized to the container's CPU quota and each
+    # tree is visited once for all `rules`; results are consumed in walk order, so output
+    # is exactly what a serial run emits.
+    rule_ids = tuple(rule.id for rule in rules)
+    by_id = {rule.id: rule for rule in rules}
+    cache_root = cache_dir()
+    if cache_root is not None:
+        ResultCache(cache_root).sweep(os.urandom(1).hex())
+    cache_arg = str(cache_root) if cache_root is not None else None
+    paths = [str(file_path) for file_path in iter_files(root, suffixes={".py"}, scoped=False)]
+
+    # Files before the checkpoint offset already delivered their hits, and files outside a
+    # file scope (--file) report none; offsets count the whole walk. Such context files
+    # matter only for the facts of cross-file rules, and those are taken from the cache
+    # alone: a resumed or scoped run never parses beyond its own files. Context files
+    # missing from the cache (edited since, or no cache) add no facts, so a flow through
+    # one of them is not reported by that run; the summary counts them.
+    progress = Progress(emit)
+    context = [
+        position < progress.start_offset or not in_scope(path, root) for position, path in enumerate(paths)
+    ]
+    cross_file = any(rule.cross_file for rule in rules)
+    load_context = cross_file and cache_arg is not None
+    jobs = [
+        (path, MAX_FILE_BYTES, rule_ids, cache_arg, is_context)
+        for path, is_context in zip(paths, context)
+        if load_context or not is_context
+    ]
+    workers = worker_count(len(jobs))
+
+    parsed = cached = 0
+    facts: dict[str, dict[str, Any]] = {rule_id: {} for rule_id in rule_ids}
+    skipped: dict[str, int] = {}
+    context_cached = 0
+    parse_ms_total = 0.0
+    slowest: list[tuple[float, str]] = []
+    results = map_ordered(scan_file, jobs, workers)
+    for position, (path, is_context) in enumerate(zip(paths, context)):
+        delivered = position < progress.start_offset
+        if is_context:
+            result = next(results) if load_context else None
+            if result is not None and result.skipped is None:
+                context_cached += 1
+                for rule_id, value in result.facts.items():
+                    facts[rule_id][path] = value
+            if not delivered:
+                progress.advance(path)
+            continue
+        result = next(results)
+        parse_ms_total += result.parse_ms
+        if result.skipped is not None:
+            skipped[result.skipped] = skipped.get(result.skipped, 0) + 1
+            emit.event("file_skipped", file=result.file, reason=result.skipped, detail=result.detail)
+            progress.advance(result.file)
+            continue
+        parsed += 1
+        cached += int(result.cached)
+        for rule_id, value in result.facts.items():
+            facts[rule_id][result.file] = value
+        heapq.heappush(slowest, (result.parse_ms, result.file))
+        if len(slowest) > SLOWEST_FILES_REPORTED:
+            heapq.heappop(slowest)
+        for hit in result.hits:
+            on_hit(by_id[hit["rule"]], result.file, hit)
+        progress.advance(result.file)
+
+    # Cross-file rules (the taint call graph) run once over every file's facts.
+    index: dict[str, Any] = {}
+    for rule in rules:
+        cross_file_hits, stats = rule.finalize(facts[rule.id], root)
+        for file, hit in cross_file_hits:
+            if in_scope(file, root):
+                on_hit(rule, file, hit)
+        if stats:
+            index[rule.id] = stats
+
+    return {
+        "rules": list(rule_ids),
+        "workers": workers,
+        "files_total": len(paths),
+        "files_parsed": parsed,
+        "files_skipped": skipped,
+        "files_cached": cached,
+        "context_files": {
+            "total": sum(context),
+            "facts_cached": context_cached,
+            "facts_missing": sum(context) - context_cached if cross_file else 0,
+        },
+        "cache_enabled": cache_root is not None,
+        "index": index,
+        "max_file_bytes": MAX_FILE_BYTES,
+        "parse_ms_total": round(parse_ms_total, 3),
+        **progress.as_dict(),
+        "slowest_files": [
+            {"file": file, "parse_ms": round(parse_ms, 3)} for parse_ms, file in sorted(slowest, reverse=True)
+        ],
+    }
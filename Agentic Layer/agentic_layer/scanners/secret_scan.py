@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import field
+import os
+from pathlib import Path
+import re
+import time
+from typing import Any
+
+from agentic_layer.scanners import entropy
+from agentic_layer.scanners.files import VENDORED_DIRS
+from agentic_layer.scanners.files import iter_files
+from agentic_layer.scanners.manifest import kind_for_name
+from agentic_layer.scanners.parallel import map_ordered
+from agentic_layer.scanners.parallel import worker_count
+from agentic_layer.scanners.protocol import Emitter
+
+
+# Secret detection over every text file. Three prefilters pick candidate tokens: known
+# credential formats, values assigned to secret-like keys, and long runs of the base64
+# alphabet. Candidates of a chunk of files are then scored together (entropy.analyze), and
+# a token is reported when its entropy and character classes clear its prefilter's bar.
+# Findings carry file and line, never the token.
+
+# Generated data, and files too large to be hand-written, hold hashes rather than secrets.
+MAX_SECRET_SCAN_BYTES = 2 * 1024 * 1024
+GENERATED_NAMES = frozenset(
+    {
+        "package-lock.json",
+        "npm-shrinkwrap.json",
+        "yarn.lock",
+        "pnpm-lock.yaml",
+        "poetry.lock",
+        "pipfile.lock",
+        "cargo.lock",
+        "composer.lock",
+        "go.sum",
+    }
+)
+GENERATED_SUFFIXES = (".min.js", ".min.css", ".map", ".svg")
+BINARY_SNIFF_BYTES = 8192
+
+# Files are scored in chunks so that one entropy batch covers many small files.
+CHUNK_BYTES = 4 * 1024 * 1024
+CHUNK_FILES = 256
+
+KEYWORD_MIN_ENTROPY = 3.0
+GENERIC_MIN_ENTROPY = 4.5
+FORMAT_MIN_ENTROPY = 3.0
+
+_FORMATS = re.compile(
+    rb"(?P<aws_access_key_id>\b(?:AKIA|ASIA)[0-9A-Z]{16}\b)"
+    rb"|(?P<github_token>\bgh[pousr]_[A-Za-z0-9]{36,255}\b)"
+    rb"|(?P<slack_token>\bxox[abposr]-[A-Za-z0-9-]{10,250}\b)"
+    rb"|(?P<stripe_secret_key>\b[rs]k_live_[A-Za-z0-9]{20,250}\b)"
+    rb"|(?P<google_api_key>\bAIza[0-9A-Za-z_-]{35}(?![0-9A-Za-z_-]))"
+    rb"|(?P<private_key>-----BEGIN (?:[A-Z]+ )?PRIVATE KEY-----)"
+)
+# Literals one of which every format contains; a file without any skips the format regex,
+# whose alternation is slow to scan.
+_FORMAT_LITERALS = (
+    b"AKIA",
+    b"ASIA",
+    b"ghp_",
+    b"gho_",
+    b"ghu_",
+    b"ghs_",
+    b"ghr_",
+    b"xox",
+    b"k_live_",
+    b"AIza",
+    b"PRIVATE KEY-----",
+)
+# A secret-like key, an assignment, then a quoted value, or an unquoted one running to the
+# end of the line. Matched against the lowercased file (much faster than an ignore-case
+# scan); the value is then taken from the original bytes.
+_ASSIGNED = re.compile(
+    rb"(?:key|secret|token|passw(?:or)?d|pwd|credential|auth)[\w.-]{0,24}?[\"']?[ \t]*(?::=|=>|[:=])[ \t]*"
+    rb"([\"']?)([a-z0-9+/_.~=-]{12,256})(?(1)\1|(?=[ \t]*(?:#|\r?$)))",
+    re.MULTILINE,
+)
+_GENERIC = re.compile(rb"(?<![A-Za-z0-9+/_-])[A-Za-z0-9+/_-]{32,256}={0,2}(?![A-Za-z0-9+/_=-])")
+# Certificates and public keys are base64 by design.
+_PEM_BLOCK = re.compile(rb"-----BEGIN [A-Z0-9 ]+-----.*?-----END [A-Z0-9 ]+-----", re.DOTALL)
+# Assigned values that are references, not literals: a.b.c, settings.SECRET_KEY.
+_DOTTED_NAME = re.compile(rb"^[A-Za-z_][\w-]*(?:\.[A-Za-z_][\w-]*)+$")
+# Besides manifest kinds, files where settings are written unquoted.
+_UNQUOTED_SUFFIXES = (".ini", ".cfg", ".conf", ".properties")
+
+RULE_KEYWORD = "secret_assignment"
+RULE_GENERIC = "high_entropy_string"
+
+RULES: dict[str, tuple[str, str]] = {
+    # rule -> (title, severity)
+    "aws_access_key_id": ("AWS access key ID", "high"),
+    "github_token": ("GitHub token", "high"),
+    "slack_token": ("Slack token", "high"),
+    "stripe_secret_key": ("Stripe secret key", "high"),
+    "google_api_key": ("Google API key", "high"),
+    "private_key": ("Private key block", "high"),
+    RULE_KEYWORD: ("Hardcoded secret", "high"),
+    RULE_GENERIC: ("High-entropy string", "medium"),
+}
+# Longest token any prefilter yields.
+MAX_TOKEN_BYTES = 256
+
+
+@dataclass(slots=True)
+class Candidate:
+    rule: str
+    token: bytes
+    line: int
+
+
+@dataclass
+class ChunkResult:
+    # hits: (file, line, rule, entropy) in file and line order.
+    hits: list[tuple[str, int, str, float]] = field(default_factory=list)
+    files_read: int = 0
+    bytes_read: int = 0
+    candidates: int = 0
+    skipped: list[tuple[str, str]] = field(default_factory=list)
+
+
+def _is_generated(path: Path) -> bool:
+    lowered = path.name.lower()
+    return lowered in GENERATED_NAMES or lowered.endswith(GENERATED_SUFFIXES)
+
+
+def _unquoted_values(path: str) -> bool:
+    name = os.path.basename(path)
+    return kind_for_name(name) is not None or name.lower().endswith(_UNQUOTED_SUFFIXES)
+
+
+def _candidates(content: bytes, unquoted_values: bool) -> list[Candidate]:
+    by_offset: dict[int, tuple[str, bytes]] = {}
+    for match in _GENERIC.finditer(content):
+        by_offset[match.start()] = (RULE_GENERIC, match.group())
+    if b"-----BEGIN " in content:
+        for block in _PEM_BLOCK.finditer(content):
+            for offset in [offset for offset in by_offset if block.start() <= offset < block.end()]:
+                del by_offset[offset]
+    for match in _ASSIGNED.finditer(content.lower()):
+        if not match.group(1) and not unquoted_values:
+            continue
+        start, end = match.span(2)
+        token = content[start:end].rstrip(b".")
+        if _DOTTED_NAME.match(token):
+            continue
+        by_offset[start] = (RULE_KEYWORD, token)
+    if any(literal in content for literal in _FORMAT_LITERALS):
+        for match in _FORMATS.finditer(content):
+            start = match.start()
+            # A known format overrides the generic or keyword reading of the run it sits in.
+            for offset in range(max(0, start - MAX_TOKEN_BYTES), start):
+                claimed = by_offset.get(offset)
+                if claimed is not None and offset + len(claimed[1]) > start:
+                    del by_offset[offset]
+            by_offset[start] = (match.lastgroup or RULE_GENERIC, match.group())
+
+    candidates = []
+    line = 1
+    previous = 0
+    for offset in sorted(by_offset):
+        line += content.count(b"\n", previous, offset)
+        previous = offset
+        rule, token = by_offset[offset]
+        candidates.append(Candidate(rule, token, line))
+    return candidates
+
+
+def _reported(candidate: Candidate, score: float, classes: int) -> bool:
+    if candidate.rule == RULE_GENERIC:
+        # Hex runs are digests far more often than secrets; identifiers lack digits.
+        return (
+            score >= GENERIC_MIN_ENTROPY
+            and bool(classes & entropy.NOT_HEX)
+            and bool(classes & entropy.HAS_DIGIT)
+            and bool(classes & (entropy.HAS_LOWER | entropy.HAS_UPPER))
+        )
+    if candidate.rule == RULE_KEYWORD:
+        # Words and names assigned to secret-like keys outnumber real secrets without digits.
+        return (
+            score >= KEYWORD_MIN_ENTROPY
+            and bool(classes & entropy.HAS_DIGIT)
+            and bool(classes & (entropy.HAS_LOWER | entropy.HAS_UPPER))
+        )
+    if candidate.rule == "private_key":
+        return True
+    return score >= FORMAT_MIN_ENTROPY
+
+
+def scan_chunk(paths: list[str]) -> ChunkResult:
+    # Runs in a pool worker. Never raises.
+    result = ChunkResult()
+    owners: list[str] = []
+    candidates: list[Candidate] = []
+    for path in paths:
+        try:
+            with open(path, "rb") as handle:
+                content = handle.read(MAX_SECRET_SCAN_BYTES + 1)
+        except OSError as exc:
+            result.skipped.append((path, exc.strerror or str(exc)))
+            continue
+        if len(content) > MAX_SECRET_SCAN_BYTES or b"\0" in content[:BINARY_SNIFF_BYTES]:
+            continue
+        result.files_read += 1
+        result.bytes_read += len(content)
+        found = _candidates(content, _unquoted_values(path))
+        owners.extend(path for _ in found)
+        candidates.extend(found)
+
+    result.candidates = len(candidates)
+    scores, classes = entropy.analyze([candidate.token for candidate in candidates])
+    for owner, candidate, score, flags in zip(owners, candidates, scores, classes):
+        if _reported(candidate, score, flags):
+            result.hits.append((owner, candidate.line, candidate.rule, score))
+    return result
+
+
+def _chunks(root: Path) -> tuple[list[list[str]], int]:
+    chunks: list[list[str]] = []
+    current: list[str] = []
+    current_bytes = 0
+    files = 0
+    for path in iter_files(root, exclude_dirs=VENDORED_DIRS):
+        if _is_generated(path):
+            continue
+        try:
+            size = path.stat().st_size
+        except OSError:
+            continue
+        if size > MAX_SECRET_SCAN_BYTES:
+            continue
+        files += 1
+        current.append(str(path))
+        current_bytes += size
+        if current_bytes >= CHUNK_BYTES or len(current) >= CHUNK_FILES:
+            chunks.append(current)
+            current = []
+            current_bytes = 0
+    if current:
+        chunks.append(current)
+    return chunks, files
+
+
+def scan_secrets(root: Path, emit: Emitter) -> dict[str, Any]:
+    started_at = time.perf_counter()
+    chunks, files = _chunks(root)
+    workers = worker_count(files)
+    files_read = bytes_read = candidates = 0
+    by_rule: dict[str, int] = {}
+    for result in map_ordered(scan_chunk, chunks, workers):
+        files_read += result.files_read
+        bytes_read += result.bytes_read
+        candidates += result.candidates
+        for file, detail in result.skipped:
+            emit.event("file_skipped", file=file, reason="unreadable", detail=detail)
+        for file, line, rule, score in result.hits:
+            title, severity = RULES[rule]
+            by_rule[rule] = by_rule.get(rule, 0) + 1
+            emit.finding(
+                {
+                    "title": title,
+                    "evidence": f"{file}:{line}",
+                    "severity": severity,
+                    "rule": rule,
+                    "reasoning": f"{title} ({score:.2f} bits of entropy per character); value withheld",
+                }
+            )
+    elapsed = time.perf_counter() - started_at
+    return {
+        "workers": workers,
+        "files_considered": files,
+        "files_read": files_read,
+        "bytes_read": bytes_read,
+        "candidates": candidates,
+        "findings_by_rule": dict(sorted(by_rule.items())),
+        "entropy_backend": entropy.BACKEND,
+        "scan_ms": round(elapsed * 1000, 3),
+        "scan_mb_per_s": round(bytes_read / 1024 / 1024 / elapsed, 3) if elapsed > 0 else None,
+    }
@@ -0,0 +1,401 @@
+from __future__ import annotations
+
+import ast
+from pathlib import Path
+from typing import Any
+
+from agentic_layer.scanners.ast_rules import MODULE_SCOPE
+from agentic_layer.scanners.ast_rules import AstRule
+from agentic_layer.scanners.ast_rules import FileContext
+from agentic_layer.scanners.ast_rules import Handler
+from agentic_layer.scanners.ast_rules import call_name
+from agentic_layer.scanners.ast_rules import register
+
+
+# Summary-based taint analysis. The per-file pass records, for every function, its
+# parameters, call sites, sink calls and returned values as sets of taint labels:
+#   "src"            request input read in this function
+#   "p:<i>"          the function's i-th parameter
+#   "call:<l>:<c>"   the result of the call at line l, column c
+# Summaries depend only on the file's bytes, so they are cached by content hash and
+# reused across scans. finalize() links them into a call graph and solves the labels to
+# a fixpoint, which answers source-to-sink queries across functions and files without
+# re-analysing any function body.
+
+SOURCE_OBJECT = "request"
+SOURCE_ATTRIBUTES = {
+    "args", "form", "values", "json", "data", "files", "cookies", "headers", "get_json", "GET", "POST", "body",
+}
+SUBPROCESS_SINKS = {"run", "call", "check_call", "check_output", "Popen", "getoutput", "getstatusoutput"}
+ANY_RECEIVER_SINKS = {"execute", "executemany", "executescript"}
+NAMED_SINKS = {"os.system", "os.popen", "eval", "exec"}
+MAX_ITERATIONS = 50
+
+
+def _is_sink(name: str) -> bool:
+    leaf = name.rsplit(".", 1)[-1]
+    if leaf in ANY_RECEIVER_SINKS or name in NAMED_SINKS:
+        return True
+    return name.startswith("subprocess.") and leaf in SUBPROCESS_SINKS
+
+
+def _call_label(node: ast.Call) -> str:
+    return f"call:{node.lineno}:{node.col_offset}"
+
+
+@register
+class TaintSummaryRule(AstRule):
+    id = "request_to_sink"
+    type = "request_to_sink"
+    title = "Potential source-to-sink dataflow"
+    severity = "high"
+    category_hint = "injection"
+    tools = frozenset({"taint_sim"})
+    cross_file = True
+
+    def handlers(self) -> dict[type[ast.AST], Handler]:
+        return {
+            ast.FunctionDef: self.visit_function,
+            ast.AsyncFunctionDef: self.visit_function,
+            ast.Import: self.visit_import,
+            ast.ImportFrom: self.visit_import_from,
+            ast.Assign: self.visit_assign,
+            ast.AugAssign: self.visit_assign,
+            ast.AnnAssign: self.visit_assign,
+            ast.For: self.visit_for,
+            ast.AsyncFor: self.visit_for,
+            ast.withitem: self.visit_withitem,
+            ast.Return: self.visit_return,
+            ast.Call: self.visit_call,
+        }
+
+    # Per-file state -----------------------------------------------------------------
+
+    def _state(self, ctx: FileContext) -> dict[str, Any]:
+        return ctx.rule_state.setdefault(self.id, {"imports": {}, "functions": {}, "vars": {}})
+
+    def _function(self, ctx: FileContext, qualname: str | None = None) -> dict[str, Any]:
+        state = self._state(ctx)
+        qualname = qualname or ctx.scope
+        if qualname not in state["functions"]:
+            state["functions"][qualname] = {
+                "line": 1,
+                "params": [],
+                "method": False,
+                "source": None,
+                "sinks": [],
+                "calls": [],
+                "returns": [],
+            }
+            state["vars"][qualname] = {}
+        return state["functions"][qualname]
+
+    def _labels(self, ctx: FileContext, expr: ast.AST | None) -> set[str]:
+        if expr is None:
+            return set()
+        function = self._function(ctx)
+        variables = self._state(ctx)["vars"][ctx.scope]
+        labels: set[str] = set()
+        for node in ast.walk(expr):
+            if isinstance(node, ast.Attribute):
+                if (
+                    isinstance(node.value, ast.Name)
+                    and node.value.id == SOURCE_OBJECT
+                    and node.attr in SOURCE_ATTRIBUTES
+                ):
+                    labels.add("src")
+                    if function["source"] is None:
+                        function["source"] = [node.lineno, f"{SOURCE_OBJECT}.{node.attr}"]
+            elif isinstance(node, ast.Name):
+                labels.update(variables.get(node.id, ()))
+            elif isinstance(node, ast.Call):
+                labels.add(_call_label(node))
+        return labels
+
+    def _bind(self, ctx: FileContext, target: ast.AST, labels: set[str]) -> None:
+        # Flow-insensitive: a name accumulates every label ever assigned to it.
+        variables = self._state(ctx)["vars"][ctx.scope]
+        for node in ast.walk(target):
+            if isinstance(node, ast.Name):
+                variables.setdefault(node.id, set()).update(labels)
+
+    # Handlers -------------------------------------------------------------------------
+
+    def visit_function(self, node: ast.AST, ctx: FileContext) -> None:
+        assert isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        qualname = ctx.child_scope(node.name)
+        function = self._function(ctx, qualname)
+        params = [arg.arg for arg in [*node.args.posonlyargs, *node.args.args, *node.args.kwonlyargs]]
+        function["line"] = node.lineno
+        function["params"] = params
+        function["method"] = ctx.in_class and bool(params) and params[0] in {"self", "cls"}
+        variables = self._state(ctx)["vars"][qualname]
+        for index, param in enumerate(params):
+            variables.setdefault(param, set()).add(f"p:{index}")
+
+    def visit_import(self, node: ast.AST, ctx: FileContext) -> None:
+        assert isinstance(node, ast.Import)
+        imports = self._state(ctx)["imports"]
+        for alias in node.names:
+            if alias.asname:
+                imports[alias.asname] = alias.name
+            else:
+                top = alias.name.split(".", 1)[0]
+                imports[top] = top
+
+    def visit_import_from(self, node: ast.AST, ctx: FileContext) -> None:
+        assert isinstance(node, ast.ImportFrom)
+        # Relative imports keep their leading dots; finalize() resolves them against the
+        # module path, which is not part of the cached, content-only summary.
+        base = "." * node.level + (node.module or "")
+        imports = self._state(ctx)["imports"]
+        for alias in node.names:
+            if alias.name == "*":
+                continue
+            separator = "" if base.endswith(".") or not base else "."
+            imports[alias.asname or alias.name] = f"{base}{separator}{alias.name}"
+
+    def visit_assign(self, node: ast.AST, ctx: FileContext) -> None:
+        assert isinstance(node, (ast.Assign, ast.AugAssign, ast.AnnAssign))
+        labels = self._labels(ctx, node.value)
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        for target in targets:
+            self._bind(ctx, target, labels)
+
+    def visit_for(self, node: ast.AST, ctx: FileContext) -> None:
+        assert isinstance(node, (ast.For, ast.AsyncFor))
+        self._bind(ctx, node.target, self._labels(ctx, node.iter))
+
+    def visit_withitem(self, node: ast.AST, ctx: FileContext) -> None:
+        assert isinstance(node, ast.withitem)
+        if node.optional_vars is not None:
+            self._bind(ctx, node.optional_vars, self._labels(ctx, node.context_expr))
+
+    def visit_return(self, node: ast.AST, ctx: FileContext) -> None:
+        assert isinstance(node, ast.Return)
+        function = self._function(ctx)
+        function["returns"] = sorted(set(function["returns"]) | self._labels(ctx, node.value))
+
+    def visit_call(self, node: ast.AST, ctx: FileContext) -> None:
+        assert isinstance(node, ast.Call)
+        name = call_name(node)
+        if not name:
+            return
+        function = self._function(ctx)
+        args = [sorted(self._labels(ctx, arg)) for arg in node.args]
+        kwargs = {keyword.arg: sorted(self._labels(ctx, keyword.value)) for keyword in node.keywords if keyword.arg}
+        head, _, rest = name.partition(".")
+        imported = self._state(ctx)["imports"].get(head)
+        resolved = f"{imported}.{rest}" if imported and rest else (imported or name)
+        if _is_sink(resolved):
+            labels = set().union(*args, *kwargs.values()) if (args or kwargs) else set()
+            function["sinks"].append({"sink": resolved, "line": node.lineno, "labels": sorted(labels)})
+            return
+        function["calls"].append(
+            {
+                "callee": name,
+                "at": _call_label(node),
+                "line": node.lineno,
+                "args": args,
+                "kwargs": kwargs,
+            }
+        )
+
+    def finish(self, ctx: FileContext) -> None:
+        state = self._state(ctx)
+        self._function(ctx, MODULE_SCOPE)
+        ctx.publish(self, {"imports": state["imports"], "functions": state["functions"]})
+
+    # Cross-file solve ----------------------------------------------------------------
+
+    def finalize(self, facts: dict[str, Any], root: Path) -> tuple[list[tuple[str, dict[str, Any]]], dict[str, Any]]:
+        graph = CallGraph(facts, root)
+        graph.solve()
+        hits = graph.findings(self)
+        return hits, graph.stats()
+
+
+def module_name(file: str, root: Path) -> str:
+    try:
+        relative = Path(file).relative_to(root)
+    except ValueError:
+        relative = Path(Path(file).name)
+    parts = list(relative.with_suffix("").parts)
+    if parts and parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts) or "__main__"
+
+
+def _resolve_import(target: str, module: str, is_package: bool) -> str:
+    if not target.startswith("."):
+        return target
+    level = len(target) - len(target.lstrip("."))
+    package = module.split(".") if is_package else module.split(".")[:-1]
+    if level > 1:
+        package = package[: len(package) - (level - 1)]
+    remainder = target[level:]
+    return ".".join([*package, remainder] if remainder else package)
+
+
+class CallGraph:
+    # Whole-program view over per-function summaries: resolves call sites to functions
+    # and propagates which parameters reach a sink and which returns carry request input.
+
+    def __init__(self, facts: dict[str, Any], root: Path) -> None:
+        self.functions: dict[str, dict[str, Any]] = {}
+        self.files: dict[str, str] = {}
+        self.edges: dict[str, dict[str, str]] = {}
+        modules: dict[str, tuple[str, dict[str, Any]]] = {}
+        for file in sorted(facts):
+            module = module_name(file, root)
+            modules[module] = (file, facts[file])
+            for qualname, function in facts[file]["functions"].items():
+                function_id = f"{module}.{qualname}"
+                self.functions[function_id] = function
+                self.files[function_id] = file
+        for module, (file, fact) in modules.items():
+            is_package = Path(file).name == "__init__.py"
+            imports = {alias: _resolve_import(target, module, is_package) for alias, target in fact["imports"].items()}
+            for qualname, function in fact["functions"].items():
+                function_id = f"{module}.{qualname}"
+                self.edges[function_id] = {}
+                for call in function["calls"]:
+                    callee = self._resolve(call["callee"], module, qualname, imports)
+                    if callee is not None:
+                        self.edges[function_id][call["at"]] = callee
+        self.returns_source: dict[str, bool] = {}
+        self.param_returns: dict[str, set[int]] = {}
+        self.param_sinks: dict[str, dict[int, dict[str, Any]]] = {}
+        self.iterations = 0
+
+    def _resolve(self, callee: str, module: str, caller: str, imports: dict[str, str]) -> str | None:
+        head, _, rest = callee.partition(".")
+        scope = caller.split(".") if caller != MODULE_SCOPE else []
+        candidates: list[str] = []
+        if head in {"self", "cls"} and rest and len(scope) >= 2:
+            candidates.append(".".join([module, *scope[:-1], rest]))
+        if head in imports:
+            base = imports[head]
+            candidates.append(f"{base}.{rest}" if rest else base)
+        # Nested functions, then module-level names, innermost scope first.
+        for depth in range(len(scope), -1, -1):
+            candidates.append(".".join([module, *scope[:depth], callee]))
+        for candidate in candidates:
+            if candidate in self.functions:
+                return candidate
+        return None
+
+    def _arg_for_param(self, call: dict[str, Any], callee_id: str, param_index: int) -> list[str]:
+        callee = self.functions[callee_id]
+        params = callee["params"]
+        if param_index >= len(params):
+            return []
+        offset = 1 if callee["method"] and "." in call["callee"] else 0
+        position = param_index - offset
+        if 0 <= position < len(call["args"]):
+            return call["args"][position]
+        return call["kwargs"].get(params[param_index], [])
+
+    def _expand(self, function_id: str, labels: list[str] | set[str], seen: frozenset[str] = frozenset()) -> set[str]:
+        # Rewrites call labels into what the callee's summary says its result carries.
+        calls = {call["at"]: call for call in self.functions[function_id]["calls"]}
+        expanded: set[str] = set()
+        for label in labels:
+            if not label.startswith("call:"):
+                expanded.add(label)
+                continue
+            callee_id = self.edges[function_id].get(label[5:])
+            if callee_id is None or label in seen:
+                continue
+            if self.returns_source.get(callee_id):
+                expanded.add("src")
+            for param_index in self.param_returns.get(callee_id, ()):
+                argument = self._arg_for_param(calls[label[5:]], callee_id, param_index)
+                expanded |= self._expand(function_id, argument, seen | {label})
+        return expanded
+
+    def solve(self) -> None:
+        for function_id in self.functions:
+            self.param_sinks[function_id] = {}
+        changed = True
+        while changed and self.iterations < MAX_ITERATIONS:
+            changed = False
+            self.iterations += 1
+            for function_id, function in self.functions.items():
+                returned = self._expand(function_id, function["returns"])
+                returns_source = "src" in returned
+                param_returns = {int(label[2:]) for label in returned if label.startswith("p:")}
+                if returns_source != self.returns_source.get(function_id, False):
+                    self.returns_source[function_id] = returns_source
+                    changed = True
+                if param_returns != self.param_returns.get(function_id, set()):
+                    self.param_returns[function_id] = param_returns
+                    changed = True
+
+                sinks = self.param_sinks[function_id]
+                for sink in function["sinks"]:
+                    for label in self._expand(function_id, sink["labels"]):
+                        if label.startswith("p:") and int(label[2:]) not in sinks:
+                            sinks[int(label[2:])] = {
+                                "sink": sink["sink"],
+                                "file": self.files[function_id],
+                                "line": sink["line"],
+                            }
+                            changed = True
+                for call in function["calls"]:
+                    callee_id = self.edges[function_id].get(call["at"])
+                    if callee_id is None:
+                        continue
+                    for param_index, reached in self.param_sinks.get(callee_id, {}).items():
+                        argument = self._expand(function_id, self._arg_for_param(call, callee_id, param_index))
+                        for label in argument:
+                            if label.startswith("p:") and int(label[2:]) not in sinks:
+                                sinks[int(label[2:])] = reached
+                                changed = True
+
+    def findings(self, rule: AstRule) -> list[tuple[str, dict[str, Any]]]:
+        hits: dict[tuple[str, int], dict[str, Any]] = {}
+        for function_id, function in self.functions.items():
+            file = self.files[function_id]
+            source = function["source"]
+            source_text = f"{source[1]} (line {source[0]})" if source else "request input"
+            for sink in function["sinks"]:
+                if "src" in self._expand(function_id, sink["labels"]):
+                    hits.setdefault(
+                        (file, sink["line"]),
+                        {
+                            "rule": rule.id,
+                            "line": sink["line"],
+                            "message": f"{source_text} reaches {sink['sink']} in {function_id}",
+                        },
+                    )
+            for call in function["calls"]:
+                callee_id = self.edges[function_id].get(call["at"])
+                if callee_id is None:
+                    continue
+                for param_index, reached in sorted(self.param_sinks.get(callee_id, {}).items()):
+                    argument = self._expand(function_id, self._arg_for_param(call, callee_id, param_index))
+                    if "src" in argument:
+                        hits.setdefault(
+                            (file, call["line"]),
+                            {
+                                "rule": rule.id,
+                                "line": call["line"],
+                                "message": (
+                                    f"{source_text} reaches {reached['sink']} via {callee_id} "
+                                    f"({reached['file']}:{reached['line']})"
+                                ),
+                            },
+                        )
+                        break
+        return [(file, hit) for (file, _), hit in sorted(hits.items())]
+
+    def stats(self) -> dict[str, Any]:
+        call_sites = sum(len(function["calls"]) for function in self.functions.values())
+        return {
+            "functions": len(self.functions),
+            "call_sites": call_sites,
+            "resolved_edges": sum(len(edges) for edges in self.edges.values()),
+            "sinks": sum(len(function["sinks"]) for function in self.functions.values()),
+            "iterations": self.iterations,
+        }
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from pathlib import Path
+import re
+from typing import Any
+
+from agentic_layer.scanners import content_index
+from agentic_layer.scanners.budget import FileBudget
+from agentic_layer.scanners.budget import is_minified
+from agentic_layer.scanners.budget import literal_windows
+from agentic_layer.scanners.ast_rules import AstRule
+from agentic_layer.scanners.ast_rules import rules_for_tool
+from agentic_layer.scanners.ast_rules import tool_finding
+from agentic_layer.scanners.content_index import LiteralQuery
+from agentic_layer.scanners.content_index import register_query
+from agentic_layer.scanners.files import iter_files
+from agentic_layer.scanners.files import read_text
+from agentic_layer.scanners.protocol import Emitter
+from agentic_layer.scanners.python_ast import scan_tree
+from agentic_layer.scanners.secret_scan import scan_secrets
+
+
+CRYPTO_KEY_PATTERN = re.compile(r"(AKIA[0-9A-Z]{16}|secret[_-]?key)", re.IGNORECASE)
+INJECTION_PATTERN = re.compile(r"(SELECT\s+.+\s+FROM|http://|password\s*=)", re.IGNORECASE)
+POLICY_GAP_PATTERN = re.compile(r"public: true|anonymous", re.IGNORECASE)
+CONFIG_ENTROPY_PATTERN = re.compile(r"password=|token=", re.IGNORECASE)
+
+# Literals each tool's check requires, for the content index.
+CRYPTO_KEY_QUERY = register_query("crypto_key_scan", LiteralQuery((("akia",), ("secret", "key"))))
+INJECTION_QUERY = register_query("regex_injection", LiteralQuery((("select", "from"), ("http://",), ("password",))))
+POLICY_GAP_QUERY = register_query("policy_gap_scan", LiteralQuery.any_of("public: true", "anonymous"))
+CONFIG_ENTROPY_QUERY = register_query("config_entropy_check", LiteralQuery.any_of("password=", "token="))
+
+
+def _scan_files(
+    root: Path,
+    emit: Emitter,
+    files: list[Path],
+    pattern: re.Pattern[str],
+    *,
+    query: LiteralQuery,
+    title: str,
+    severity: str,
+) -> dict[str, Any]:
+    # With the scan's content index, files that cannot match are never opened. Each search
+    # runs under a time budget; minified files are only searched around the query literals.
+    index = content_index.load(root)
+    candidates = index.candidates(root, files, query) if index is not None else files
+    minified = 0
+    budget_exceeded = 0
+    for path in candidates:
+        text = read_text(path)
+        if text is None:
+            continue
+        windows = None
+        if is_minified(path.name, text):
+            minified += 1
+            windows = literal_windows(text, query.literals())
+        budget = FileBudget()
+        if budget.finditer(emit.tool, pattern, text, windows, first_only=True):
+            emit.finding({"title": title, "evidence": str(path), "severity": severity})
+        if budget.timed_out:
+            budget_exceeded += 1
+            emit.event("budget_exceeded", file=str(path), rules=budget.timed_out)
+    return {
+        "files_considered": len(files),
+        "files_read": len(candidates),
+        "content_index": index is not None,
+        "files_minified": minified,
+        "files_budget_exceeded": budget_exceeded,
+        "partial": budget_exceeded > 0,
+    }
+
+
+def _scan_ast_rules(root: Path, emit: Emitter, tool: str) -> dict[str, Any]:
+    # Standalone run of an AST-based tool: one pass per file over that tool's rules. In a
+    # full scan these findings already come from the ast analysis scanner.
+    def on_hit(rule: AstRule, file: str, hit: dict[str, Any]) -> None:
+        emit.finding(tool_finding(rule, file, hit))
+
+    summary = scan_tree(root, emit, rules_for_tool(tool), on_hit)
+    return {**summary, "files_considered": summary["files_total"]}
+
+
+def run_access_path_scan(root: Path, emit: Emitter) -> dict[str, Any]:
+    return _scan_ast_rules(root, emit, "access_path_scan")
+
+
+def run_policy_gap_scan(root: Path, emit: Emitter) -> dict[str, Any]:
+    return _scan_files(
+        root,
+        emit,
+        list(iter_files(root, suffixes={".yml", ".yaml"}, limit=200)),
+        POLICY_GAP_PATTERN,
+        query=POLICY_GAP_QUERY,
+        title="Potential policy gap",
+        severity="medium",
+    )
+
+
+def run_crypto_key_scan(root: Path, emit: Emitter) -> dict[str, Any]:
+    return _scan_files(
+        root,
+        emit,
+        list(iter_files(root, limit=300)),
+        CRYPTO_KEY_PATTERN,
+        query=CRYPTO_KEY_QUERY,
+        title="Potential key material exposure",
+        severity="high",
+    )
+
+
+def run_config_entropy_check(root: Path, emit: Emitter) -> dict[str, Any]:
+    return _scan_files(
+        root,
+        emit,
+        list(iter_files(root, name_prefix=".env", limit=100)),
+        CONFIG_ENTROPY_PATTERN,
+        query=CONFIG_ENTROPY_QUERY,
+        title="Sensitive config value detected",
+        severity="medium",
+    )
+
+
+def run_secret_scan(root: Path, emit: Emitter) -> dict[str, Any]:
+    return scan_secrets(root, emit)
+
+
+def run_ast_deep_scan(root: Path, emit: Emitter) -> dict[str, Any]:
+    return _scan_ast_rules(root, emit, "ast_deep_scan")
+
+
+def run_regex_injection(root: Path, emit: Emitter) -> dict[str, Any]:
+    return _scan_files(
+        root,
+        emit,
+        list(iter_files(root, limit=250)),
+        INJECTION_PATTERN,
+        query=INJECTION_QUERY,
+        title="Injection-related pattern match",
+        severity="medium",
+    )
+
+
+def run_taint_sim(root: Path, emit: Emitter) -> dict[str, Any]:
+    return _scan_ast_rules(root, emit, "taint_sim")
+
+
+def run_generic_pattern_scan(root: Path, emit: Emitter) -> dict[str, Any]:
+    files = sum(1 for _ in iter_files(root))
+    emit.finding({"title": "Repository scanned", "evidence": f"files={files}", "severity": "low"})
+    return {"files_considered": files}
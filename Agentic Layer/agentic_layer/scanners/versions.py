@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from functools import lru_cache
+import re
+from typing import Any
+
+
+# Version ordering per ecosystem, reduced to plain tuples so range checks are tuple
+# comparisons. Unparseable versions map to None and are never reported as affected.
+
+ECOSYSTEM_PYPI = "PyPI"
+ECOSYSTEM_NPM = "npm"
+ECOSYSTEM_GO = "Go"
+ECOSYSTEM_CARGO = "crates.io"
+
+_PEP440 = re.compile(
+    r"^v?(?:(?P<epoch>\d+)!)?(?P<release>\d+(?:\.\d+)*)"
+    r"(?:[-_.]?(?P<pre_l>a|b|c|rc|alpha|beta|pre|preview)[-_.]?(?P<pre_n>\d*))?"
+    r"(?:-(?P<post_implicit>\d+)|[-_.]?(?:post|rev|r)[-_.]?(?P<post_n>\d*))?"
+    r"(?:[-_.]?dev[-_.]?(?P<dev_n>\d*))?"
+    r"(?:\+[a-z0-9.]+)?$",
+    re.IGNORECASE,
+)
+_PRE_RANK = {"a": 0, "alpha": 0, "b": 1, "beta": 1, "c": 2, "rc": 2, "pre": 2, "preview": 2}
+
+_SEMVER = re.compile(r"^v?(?P<release>\d+(?:\.\d+){0,2})(?:-(?P<pre>[0-9A-Za-z.-]+))?(?:\+[0-9A-Za-z.-]+)?$")
+
+
+def _pep440_key(version: str) -> tuple[Any, ...] | None:
+    match = _PEP440.match(version.strip())
+    if not match:
+        return None
+    release = [int(part) for part in match.group("release").split(".")]
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()
+    pre_label = (match.group("pre_l") or "").lower()
+    post = match.group("post_implicit") or match.group("post_n")
+    has_post = match.group("post_implicit") is not None or match.group("post_n") is not None
+    dev = match.group("dev_n")
+    has_dev = dev is not None
+    if pre_label:
+        pre_key: tuple[int, ...] = (0, _PRE_RANK[pre_label], int(match.group("pre_n") or 0))
+    elif has_dev and not has_post:
+        # 1.0.dev1 sorts before 1.0a1.
+        pre_key = (-1,)
+    else:
+        pre_key = (1,)
+    post_key = (int(post or 0),) if has_post else (-1,)
+    dev_key = (0, int(dev or 0)) if has_dev else (1,)
+    return (int(match.group("epoch") or 0), tuple(release), pre_key, post_key, dev_key)
+
+
+def _semver_key(version: str) -> tuple[Any, ...] | None:
+    match = _SEMVER.match(version.strip())
+    if not match:
+        return None
+    release = [int(part) for part in match.group("release").split(".")]
+    release += [0] * (3 - len(release))
+    pre = match.group("pre")
+    if pre is None:
+        return (tuple(release), (1,))
+    identifiers = tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in pre.split("."))
+    return (tuple(release), (0, identifiers))
+
+
+@lru_cache(maxsize=65536)
+def version_key(ecosystem: str, version: str) -> tuple[Any, ...] | None:
+    if not version:
+        return None
+    if ecosystem == ECOSYSTEM_PYPI:
+        return _pep440_key(version)
+    # npm, crates.io and Go modules (including +incompatible and pseudo-versions) are semver.
+    return _semver_key(version)
+
+
+def normalize_package(ecosystem: str, name: str) -> str:
+    name = name.strip()
+    if ecosystem == ECOSYSTEM_PYPI:
+        return re.sub(r"[-_.]+", "-", name).lower()
+    if ecosystem == ECOSYSTEM_CARGO:
+        return name.lower().replace("_", "-")
+    if ecosystem == ECOSYSTEM_NPM:
+        return name.lower()
+    return name
+
+
+def in_range(
+    key: tuple[Any, ...],
+    ecosystem: str,
+    introduced: str | None,
+    fixed: str | None,
+    last_affected: str | None,
+) -> bool | None:
+    # None when a bound itself cannot be parsed.
+    if introduced and introduced != "0":
+        lower = version_key(ecosystem, introduced)
+        if lower is None:
+            return None
+        if key < lower:
+            return False
+    if fixed:
+        upper = version_key(ecosystem, fixed)
+        if upper is None:
+            return None
+        if key >= upper:
+            return False
+    if last_affected:
+        upper = version_key(ecosystem, last_affected)
+        if upper is None:
+            return None
+        if key > upper:
+            return False
+    return True
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone
+import json
+import os
+from pathlib import Path
+import sqlite3
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+import zipfile
+
+from agentic_layer.scanners.versions import normalize_package
+
+
+# Offline advisory database. OSV records (a JSON list, a directory of records or an
+# osv.dev ecosystem zip) are compiled into SQLite with one row per affected version
+# interval, indexed by (ecosystem, package), so a scan is a handful of indexed batch
+# lookups instead of a pass over every advisory. The image compiles the shipped snapshot
+# at build time; without a compiled database the snapshot is compiled into memory.
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+SNAPSHOT_PATH = DATA_DIR / "osv_snapshot.json"
+COMPILED_PATH = DATA_DIR / "vulndb.sqlite"
+
+# Stays under SQLite's default host-parameter limit with room for the ecosystem.
+LOOKUP_BATCH_SIZE = 500
+
+_SEVERITY = {"CRITICAL": "high", "HIGH": "high", "MODERATE": "medium", "MEDIUM": "medium", "LOW": "low"}
+_RANGE_TYPES = {"ECOSYSTEM", "SEMVER"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS advisories (
+    id TEXT PRIMARY KEY,
+    summary TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    aliases TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ranges (
+    ecosystem TEXT NOT NULL,
+    package TEXT NOT NULL,
+    advisory TEXT NOT NULL,
+    introduced TEXT,
+    fixed TEXT,
+    last_affected TEXT,
+    exact TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_ranges_package ON ranges (ecosystem, package);
+"""
+
+
+@dataclass(frozen=True)
+class AffectedRange:
+    advisory: str
+    introduced: str | None
+    fixed: str | None
+    last_affected: str | None
+    exact: str | None
+
+
+def _iter_json_records(value: Any) -> Iterator[dict[str, Any]]:
+    if isinstance(value, list):
+        for item in value:
+            if isinstance(item, dict):
+                yield item
+    elif isinstance(value, dict):
+        yield value
+
+
+def iter_osv_records(source: Path) -> Iterator[dict[str, Any]]:
+    if source.is_dir():
+        for path in sorted(source.rglob("*.json")):
+            with open(path, "rb") as handle:
+                yield from _iter_json_records(json.load(handle))
+        return
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for name in sorted(archive.namelist()):
+                if name.endswith(".json"):
+                    yield from _iter_json_records(json.loads(archive.read(name)))
+        return
+    with open(source, "rb") as handle:
+        yield from _iter_json_records(json.load(handle))
+
+
+def _severity(record: dict[str, Any]) -> str:
+    label = str((record.get("database_specific") or {}).get("severity") or "").upper()
+    return _SEVERITY.get(label, "medium")
+
+
+def _intervals(events: list[dict[str, Any]]) -> Iterator[tuple[str | None, str | None, str | None]]:
+    # OSV events read as a sequence: "introduced" opens an interval, "fixed" or
+    # "last_affected" closes it. An interval left open affects every later version.
+    introduced: str | None = None
+    is_open = False
+    for event in events:
+        if "introduced" in event:
+            introduced = str(event["introduced"])
+            is_open = True
+        elif "fixed" in event and is_open:
+            yield introduced, str(event["fixed"]), None
+            is_open = False
+        elif "last_affected" in event and is_open:
+            yield introduced, None, str(event["last_affected"])
+            is_open = False
+    if is_open:
+        yield introduced, None, None
+
+
+def _range_rows(record: dict[str, Any]) -> Iterator[tuple[Any, ...]]:
+    advisory = str(record["id"])
+    for affected in record.get("affected") or []:
+        package = affected.get("package") or {}
+        ecosystem = str(package.get("ecosystem") or "").split(":", 1)[0]
+        name = package.get("name")
+        if not ecosystem or not name:
+            continue
+        name = normalize_package(ecosystem, str(name))
+        for affected_range in affected.get("ranges") or []:
+            if affected_range.get("type") not in _RANGE_TYPES:
+                continue
+            for introduced, fixed, last_affected in _intervals(affected_range.get("events") or []):
+                yield (ecosystem, name, advisory, introduced, fixed, last_affected, None)
+        for version in affected.get("versions") or []:
+            yield (ecosystem, name, advisory, None, None, None, str(version))
+
+
+def compile_records(connection: sqlite3.Connection, records: Iterable[dict[str, Any]], source: str) -> dict[str, str]:
+    connection.executescript(SCHEMA)
+    advisories = 0
+    for record in records:
+        if not record.get("id") or record.get("withdrawn"):
+            continue
+        connection.execute(
+            "INSERT OR REPLACE INTO advisories (id, summary, severity, aliases) VALUES (?, ?, ?, ?)",
+            (
+                str(record["id"]),
+                str(record.get("summary") or record.get("details") or "")[:300],
+                _severity(record),
+                json.dumps(record.get("aliases") or []),
+            ),
+        )
+        connection.executemany(
+            "INSERT INTO ranges (ecosystem, package, advisory, introduced, fixed, last_affected, exact) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            _range_rows(record),
+        )
+        advisories += 1
+    ranges = connection.execute("SELECT COUNT(*) FROM ranges").fetchone()[0]
+    meta = {
+        "source": source,
+        "advisories": str(advisories),
+        "ranges": str(ranges),
+        "compiled_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    connection.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", meta.items())
+    connection.commit()
+    return meta
+
+
+def build(sources: list[Path], output: Path) -> dict[str, str]:
+    # Written beside the target and renamed, so a reader never sees a partial database.
+    temp_path = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+    temp_path.unlink(missing_ok=True)
+    connection = sqlite3.connect(temp_path)
+    try:
+        records = (record for source in sources for record in iter_osv_records(source))
+        meta = compile_records(connection, records, ",".join(source.name for source in sources))
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+    os.replace(temp_path, output)
+    return meta
+
+
+class VulnDB:
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+        self.meta = dict(connection.execute("SELECT key, value FROM meta").fetchall())
+
+    @classmethod
+    def open(cls, path: Path | None = None) -> VulnDB:
+        path = path or COMPILED_PATH
+        if path.is_file():
+            return cls(sqlite3.connect(f"{path.as_uri()}?mode=ro&immutable=1", uri=True))
+        connection = sqlite3.connect(":memory:")
+        compile_records(connection, iter_osv_records(SNAPSHOT_PATH), SNAPSHOT_PATH.name)
+        return cls(connection)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def ranges_for(self, ecosystem: str, packages: Iterable[str]) -> dict[str, list[AffectedRange]]:
+        # `packages` are normalised names; absent packages are simply missing from the result.
+        names = sorted(set(packages))
+        found: dict[str, list[AffectedRange]] = {}
+        for start in range(0, len(names), LOOKUP_BATCH_SIZE):
+            batch = names[start : start + LOOKUP_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.connection.execute(
+                "SELECT package, advisory, introduced, fixed, last_affected, exact FROM ranges "
+                f"WHERE ecosystem = ? AND package IN ({placeholders}) ORDER BY package, advisory, rowid",
+                (ecosystem, *batch),
+            )
+            for package, *row in rows:
+                found.setdefault(package, []).append(AffectedRange(*row))
+        return found
+
+    def advisories(self, ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        wanted = sorted(set(ids))
+        found: dict[str, dict[str, Any]] = {}
+        for start in range(0, len(wanted), LOOKUP_BATCH_SIZE):
+            batch = wanted[start : start + LOOKUP_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.connection.execute(
+                f"SELECT id, summary, severity, aliases FROM advisories WHERE id IN ({placeholders})",
+                batch,
+            )
+            for advisory_id, summary, severity, aliases in rows:
+                found[advisory_id] = {"summary": summary, "severity": severity, "aliases": json.loads(aliases)}
+        return found
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="deplai-vulndb", description="Compile OSV advisories for offline lookup")
+    parser.add_argument(
+        "--source",
+        action="append",
+        type=Path,
+        help="OSV JSON file, directory or zip (repeatable; defaults to the shipped snapshot)",
+    )
+    parser.add_argument("--output", type=Path, default=COMPILED_PATH)
+    args = parser.parse_args(argv)
+    meta = build(args.source or [SNAPSHOT_PATH], args.output)
+    print(json.dumps(meta, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
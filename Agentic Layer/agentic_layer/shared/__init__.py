@@ -1,5 +1,21 @@
+from agentic_layer.shared.github_client import GitHubClient
+from agentic_layer.shared.github_client import GitHubResponse
+from agentic_layer.shared.github_client import github_client
 from agentic_layer.shared.owasp_mapper import get_owasp_id
 from agentic_layer.shared.owasp_mapper import map_category_hint
 from agentic_layer.shared.owasp_mapper import normalize_owasp_category
+from agentic_layer.shared.token_validation_cache import TokenValidation
+from agentic_layer.shared.token_validation_cache import TokenValidationCache
+from agentic_layer.shared.token_validation_cache import token_validation_cache
 
-__all__ = ["map_category_hint", "normalize_owasp_category", "get_owasp_id"]
+__all__ = [
+    "map_category_hint",
+    "normalize_owasp_category",
+    "get_owasp_id",
+    "GitHubClient",
+    "GitHubResponse",
+    "github_client",
+    "TokenValidation",
+    "TokenValidationCache",
+    "token_validation_cache",
+]
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import hmac
+import importlib.util
+import os
+import secrets
+import time
+from typing import Any
+from typing import Callable
+
+import httpx
+
+from agentic_layer.scan_graph.logger import log_agent
+
+
+DEFAULT_API_URL = "https://api.github.com"
+
+# Per-process salt: fingerprints are stable within one API process and useless outside it.
+_FINGERPRINT_SALT = secrets.token_bytes(32)
+
+
+def token_fingerprint(token: str | None) -> str:
+    if not token:
+        return "anonymous"
+    return hmac.new(_FINGERPRINT_SALT, token.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name, "").strip()
+    try:
+        return float(raw) if raw else default
+    except ValueError:
+        return default
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class GitHubResponse:
+    status_code: int
+    payload: Any
+    from_cache: bool = False
+
+
+@dataclass
+class _RateLimitWindow:
+    remaining: int | None = None
+    reset_at: float | None = None
+
+
+class GitHubClient:
+    # Process-wide GitHub REST client: one keep-alive connection pool, a per-scan
+    # response memo, ETag revalidation and rate-limit aware pacing.
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        timeout_seconds: float = 10.0,
+        rate_limit_floor: int | None = None,
+        max_backoff_seconds: float | None = None,
+        etag_cache_size: int = 512,
+    ) -> None:
+        self.base_url = (base_url or os.getenv("DEPLAI_GITHUB_API_URL") or DEFAULT_API_URL).rstrip("/")
+        self.timeout_seconds = timeout_seconds
+        self.rate_limit_floor = (
+            rate_limit_floor
+            if rate_limit_floor is not None
+            else int(_env_float("DEPLAI_GITHUB_RATE_LIMIT_FLOOR", 50))
+        )
+        self.max_backoff_seconds = (
+            max_backoff_seconds
+            if max_backoff_seconds is not None
+            else _env_float("DEPLAI_GITHUB_MAX_BACKOFF_SECONDS", 30.0)
+        )
+        self._etag_cache_size = etag_cache_size
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        self._scan_memo: dict[str, dict[tuple[str, str], GitHubResponse]] = {}
+        self._etag_cache: OrderedDict[tuple[str, str], tuple[str, Any]] = OrderedDict()
+        self._rate_limits: dict[str, _RateLimitWindow] = {}
+        self._auth_failure_listeners: list[Callable[[str], None]] = []
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._discard_client()
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=_http2_available(),
+                timeout=httpx.Timeout(self.timeout_seconds),
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0),
+                headers={
+                    "Accept": "application/vnd.github+json",
+                    "X-GitHub-Api-Version": "2022-11-28",
+                    "User-Agent": "deplai-agent/1.0",
+                },
+            )
+            self._client_loop = loop
+        return self._client
+
+    def _discard_client(self) -> None:
+        # The pooled sockets belong to the loop the client was created on, so they are closed
+        # there. A loop that has already shut down took its connections with it; drop the client.
+        previous, previous_loop = self._client, self._client_loop
+        self._client = None
+        self._client_loop = None
+        if previous is None or previous.is_closed:
+            return
+        if previous_loop is not None and previous_loop.is_running() and not previous_loop.is_closed():
+            asyncio.run_coroutine_threadsafe(previous.aclose(), previous_loop)
+
+    async def get(self, path: str, *, token: str | None, scan_id: str | None = None) -> GitHubResponse:
+        fingerprint = token_fingerprint(token)
+        key = (path, fingerprint)
+
+        if scan_id is not None:
+            memoized = self._scan_memo.get(scan_id, {}).get(key)
+            if memoized is not None:
+                log_agent(scan_id, "GitHubClient", f"Memo hit GET {path}")
+                return memoized
+
+        response = await self._request(path, token=token, fingerprint=fingerprint, scan_id=scan_id)
+        if response.status_code == 403 or response.status_code == 429:
+            retry_delay = self._retry_delay(response)
+            if retry_delay is not None:
+                log_agent(scan_id or "-", "GitHubClient", f"Rate limited on GET {path}; retrying in {retry_delay:.1f}s")
+                await asyncio.sleep(retry_delay)
+                response = await self._request(path, token=token, fingerprint=fingerprint, scan_id=scan_id)
+
+        result = self._to_result(key, response)
+        if result.status_code in {401, 403}:
+            self._notify_auth_failure(fingerprint)
+        if scan_id is not None and result.status_code < 500:
+            self._scan_memo.setdefault(scan_id, {})[key] = result
+        return result
+
+    async def get_repo(self, owner: str, repo: str, *, token: str | None, scan_id: str | None = None) -> GitHubResponse:
+        return await self.get(f"/repos/{owner}/{repo}", token=token, scan_id=scan_id)
+
+    async def get_user(self, *, token: str | None, scan_id: str | None = None) -> GitHubResponse:
+        return await self.get("/user", token=token, scan_id=scan_id)
+
+    def add_auth_failure_listener(self, listener: Callable[[str], None]) -> None:
+        self._auth_failure_listeners.append(listener)
+
+    def _notify_auth_failure(self, fingerprint: str) -> None:
+        for listener in self._auth_failure_listeners:
+            try:
+                listener(fingerprint)
+            except Exception:  # noqa: BLE001
+                continue
+
+    def release_scan(self, scan_id: str) -> None:
+        self._scan_memo.pop(scan_id, None)
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+
+    async def _request(
+        self,
+        path: str,
+        *,
+        token: str | None,
+        fingerprint: str,
+        scan_id: str | None,
+    ) -> httpx.Response:
+        await self._pace(fingerprint, scan_id)
+
+        headers: dict[str, str] = {}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        cached = self._etag_cache.get((path, fingerprint))
+        if cached is not None:
+            headers["If-None-Match"] = cached[0]
+
+        response = await self._get_client().get(path, headers=headers)
+        self._record_rate_limit(fingerprint, response)
+        return response
+
+    def _to_result(self, key: tuple[str, str], response: httpx.Response) -> GitHubResponse:
+        if response.status_code == 304:
+            cached = self._etag_cache.get(key)
+            if cached is not None:
+                self._etag_cache.move_to_end(key)
+                return GitHubResponse(status_code=200, payload=cached[1], from_cache=True)
+
+        try:
+            payload: Any = response.json()
+        except ValueError:
+            payload = None
+
+        etag = response.headers.get("etag")
+        if response.status_code == 200 and etag:
+            self._etag_cache[key] = (etag, payload)
+            self._etag_cache.move_to_end(key)
+            while len(self._etag_cache) > self._etag_cache_size:
+                self._etag_cache.popitem(last=False)
+        elif response.status_code in {401, 403, 404}:
+            self._etag_cache.pop(key, None)
+
+        return GitHubResponse(status_code=int(response.status_code), payload=payload)
+
+    def _record_rate_limit(self, fingerprint: str, response: httpx.Response) -> None:
+        remaining = response.headers.get("x-ratelimit-remaining")
+        reset = response.headers.get("x-ratelimit-reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            self._rate_limits[fingerprint] = _RateLimitWindow(remaining=int(remaining), reset_at=float(reset))
+        except ValueError:
+            return
+
+    async def _pace(self, fingerprint: str, scan_id: str | None) -> None:
+        # Spread the remaining budget over the window once it drops under the floor,
+        # instead of spending it and tripping GitHub's secondary limits.
+        window = self._rate_limits.get(fingerprint)
+        if window is None or window.remaining is None or window.reset_at is None:
+            return
+        if window.remaining > self.rate_limit_floor:
+            return
+
+        seconds_to_reset = max(0.0, window.reset_at - time.time())
+        if seconds_to_reset <= 0:
+            return
+        delay = min(self.max_backoff_seconds, seconds_to_reset / max(window.remaining, 1))
+        if delay <= 0:
+            return
+        log_agent(
+            scan_id or "-",
+            "GitHubClient",
+            f"Rate limit low remaining={window.remaining}; backing off {delay:.1f}s",
+        )
+        await asyncio.sleep(delay)
+
+    def _retry_delay(self, response: httpx.Response) -> float | None:
+        retry_after = response.headers.get("retry-after")
+        if retry_after is not None:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                return None
+            return delay if delay <= self.max_backoff_seconds else None
+
+        if response.headers.get("x-ratelimit-remaining") == "0":
+            reset = response.headers.get("x-ratelimit-reset")
+            try:
+                delay = max(0.0, float(reset or 0) - time.time())
+            except ValueError:
+                return None
+            return delay if delay <= self.max_backoff_seconds else None
+
+        return None
+
+
+github_client = GitHubClient()
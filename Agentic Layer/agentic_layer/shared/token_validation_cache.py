@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import hashlib
+import os
+import time
+
+from agentic_layer.shared.github_client import github_client
+from agentic_layer.shared.github_client import token_fingerprint
+
+
+def _env_seconds(name: str, default: float) -> float:
+    raw = os.getenv(name, "").strip()
+    try:
+        value = float(raw) if raw else default
+    except ValueError:
+        return default
+    return max(0.0, value)
+
+
+@dataclass(frozen=True)
+class TokenValidation:
+    token_valid: bool
+    repo_access: bool
+    token_type: str
+    authenticated_login: str | None
+    # GitHub's packed size of the repository, so a cache hit also spares the sizer's lookup.
+    repo_size_kb: int | None = None
+
+
+class TokenValidationCache:
+    # Short-lived memory of successful GitHub token checks, keyed by a salted
+    # fingerprint of token + repository. Raw tokens are never stored.
+
+    def __init__(
+        self,
+        user_ttl_seconds: float | None = None,
+        installation_ttl_seconds: float | None = None,
+        max_entries: int = 1024,
+    ) -> None:
+        self.user_ttl_seconds = (
+            user_ttl_seconds
+            if user_ttl_seconds is not None
+            else _env_seconds("DEPLAI_GITHUB_AUTH_CACHE_TTL_SECONDS", 300.0)
+        )
+        # Installation tokens live for an hour at most, so they get a shorter window.
+        self.installation_ttl_seconds = (
+            installation_ttl_seconds
+            if installation_ttl_seconds is not None
+            else _env_seconds("DEPLAI_GITHUB_AUTH_CACHE_INSTALLATION_TTL_SECONDS", 60.0)
+        )
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str, TokenValidation]] = OrderedDict()
+
+    @staticmethod
+    def _key(fingerprint: str, owner: str, repo: str) -> str:
+        return hashlib.sha256(f"{fingerprint}\0{owner.lower()}/{repo.lower()}".encode("utf-8")).hexdigest()
+
+    def get(self, token: str, owner: str, repo: str) -> TokenValidation | None:
+        key = self._key(token_fingerprint(token), owner, repo)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, _, validation = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return validation
+
+    def put(self, token: str, owner: str, repo: str, validation: TokenValidation) -> None:
+        if not (validation.token_valid and validation.repo_access):
+            return
+        ttl = self.installation_ttl_seconds if validation.token_type == "installation" else self.user_ttl_seconds
+        if ttl <= 0:
+            return
+
+        fingerprint = token_fingerprint(token)
+        key = self._key(fingerprint, owner, repo)
+        self._entries[key] = (time.monotonic() + ttl, fingerprint, validation)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_fingerprint(self, fingerprint: str) -> None:
+        stale = [key for key, (_, owner_fingerprint, _) in self._entries.items() if owner_fingerprint == fingerprint]
+        for key in stale:
+            self._entries.pop(key, None)
+
+    def invalidate_token(self, token: str) -> None:
+        self.invalidate_fingerprint(token_fingerprint(token))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+token_validation_cache = TokenValidationCache()
+
+# Any 401/403 seen by the shared client drops cached validations for that token.
+github_client.add_auth_failure_listener(token_validation_cache.invalidate_fingerprint)
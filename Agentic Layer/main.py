@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi import HTTPException
 from fastapi import Request
@@ -11,6 +13,11 @@ from models import ScanValidationResponse
 from agentic_layer.scan_graph.observability import configure_langsmith
 configure_langsmith()
 
+from agentic_layer.runtime.execution_backend import execution_backend
+from agentic_layer.runtime.local_source import local_source_url
+from agentic_layer.runtime.resource_reaper import resource_reaper
+from agentic_layer.runtime.volume_pool import volume_pool
+from agentic_layer.shared.github_client import github_client
 from agentic_layer.scan_graph.logger import log_agent
 from agentic_layer.scan_graph.graph import execute_scan_workflow
 from agentic_layer.scan_graph.state import build_initial_state
@@ -18,10 +25,26 @@ from agentic_layer.scan_graph.state import merge_state
 from scan_router import scan_router
 from scan_router import scan_service
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    resource_reaper.add_live_scan_probe(scan_service.active_scan_ids)
+    volume_pool.add_live_scan_probe(resource_reaper.live_scan_ids)
+    await execution_backend.start()
+    try:
+        yield
+    finally:
+        try:
+            await execution_backend.stop()
+        finally:
+            await github_client.aclose()
+
+
 app = FastAPI(
     title="DEPLAI Agentic Layer",
     description="Backend API for scan validation",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS configuration
@@ -82,7 +105,11 @@ async def validate_scan(request: ScanValidationRequest, http_request: Request):
         if request.project_type == "github":
             print(f"GitHub Token Present: {'yes' if bool(inbound_token) else 'no'}")
 
-        repo_url = request.repository_url or ""
+        if request.project_type == "local":
+            # Uploaded projects are resolved under the shared local projects root, never by client path.
+            repo_url = local_source_url(request.user_id, request.project_id)
+        else:
+            repo_url = request.repository_url or ""
         if not repo_url:
             raise HTTPException(status_code=400, detail="repository_url is required for scan start")
 
@@ -155,6 +182,7 @@ async def run_scan(request: ScanRequest):
         rescans_triggered=final_state["rescans_triggered"],
         setup_phase=final_state["setup_phase"],
         hitl_phase=final_state["hitl_phase"],
+        acquisition_phase=final_state["acquisition_phase"],
         analysis_phase=final_state["analysis_phase"],
         analysis_stage=final_state["analysis_stage"],
         base_scores=final_state["base_scores"],
@@ -184,8 +212,14 @@ async def run_scan(request: ScanRequest):
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy"}
+    """Health check endpoint. `ready` turns true once the execution backend is warm."""
+    warmup = execution_backend.readiness()
+    return {
+        "status": "healthy",
+        "backend": execution_backend.name,
+        "ready": warmup["state"] == "ready",
+        "warmup": warmup,
+    }
 
 
 app.include_router(scan_router)
@@ -54,6 +54,7 @@ class ScanResponse(BaseModel):
     rescans_triggered: bool = False
     setup_phase: str = "not_started"
     hitl_phase: str = "not_started"
+    acquisition_phase: str = "not_started"
     analysis_phase: str = "not_started"
     analysis_stage: str = "not_started"
     base_scores: dict[str, float] = {}
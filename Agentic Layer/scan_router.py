@@ -160,6 +160,10 @@ class ScanService:
                 self._hitl_decisions.pop(scan_id, None)
             log_agent(scan_id, "ScanService", "Background task cleaned up")
 
+    def active_scan_ids(self) -> set[str]:
+        # Used by the resource reaper; a scan owns its Docker resources until its task ends.
+        return {scan_id for scan_id, task in self._tasks.items() if not task.done()}
+
     def get_hitl_decision(self, scan_id: str) -> dict[str, str] | None:
         return self._hitl_decisions.get(scan_id)
 
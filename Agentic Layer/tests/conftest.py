@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+
+# The service is run from "Agentic Layer/" (uvicorn main:app); make the same imports work here.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def scanner_config(monkeypatch):
+    # The scanner CLI configures module-level scope, cache and resume offset once per
+    # process; restore them so each test starts from an unscoped, uncached run.
+    from agentic_layer.scanners import cache
+    from agentic_layer.scanners import checkpoint
+    from agentic_layer.scanners import files
+
+    monkeypatch.setattr(files, "_scope", None)
+    monkeypatch.setattr(files, "_scope_dirs", frozenset())
+    monkeypatch.setattr(files, "_sharded", False)
+    monkeypatch.setattr(cache, "_cache_dir", None)
+    monkeypatch.setattr(checkpoint, "_start_offset", 0)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import ast
+
+import pytest
+
+from agentic_layer.scanners import ast_rules
+from agentic_layer.scanners.ast_rules import AstRule
+from agentic_layer.scanners.ast_rules import FileContext
+from agentic_layer.scanners.ast_rules import RuleVisitor
+
+
+SOURCE = """\
+import os
+
+def handler(payload):
+    eval(payload)
+    os.chmod("/tmp/x", 0o777)
+
+policy = rules.allow_all
+configure(allow_all=True)
+exec("1")
+"""
+
+
+def test_one_pass_evaluates_every_rule():
+    hits, facts = ast_rules.evaluate(ast.parse(SOURCE), "app.py", ["dynamic_execution", "permissive_access"])
+
+    assert [(hit["line"], hit["rule"]) for hit in hits] == [
+        (4, "dynamic_execution"),
+        (5, "permissive_access"),
+        (7, "permissive_access"),
+        (8, "permissive_access"),
+        (9, "dynamic_execution"),
+    ]
+    assert facts == {}
+
+
+def test_only_requested_rules_run():
+    hits, _ = ast_rules.evaluate(ast.parse(SOURCE), "app.py", ["dynamic_execution"])
+    assert {hit["rule"] for hit in hits} == {"dynamic_execution"}
+
+
+def test_rules_are_grouped_by_tool():
+    assert "dynamic_execution" in {rule.id for rule in ast_rules.rules_for_tool("ast")}
+    assert {"ast", "ast_deep_scan", "access_path_scan"} <= set(ast_rules.rule_tools())
+
+
+def test_duplicate_rule_ids_are_rejected():
+    class Duplicate(AstRule):
+        id = "dynamic_execution"
+
+    with pytest.raises(ValueError):
+        ast_rules.register(Duplicate)
+
+
+def test_visitor_tracks_scopes_and_classes():
+    seen = []
+
+    class ScopeProbe(AstRule):
+        id = "scope_probe"
+
+        def handlers(self):
+            return {ast.Call: lambda node, ctx: seen.append((ctx.scope, ctx.in_class))}
+
+    source = "f()\nclass A:\n    g()\n    def m(self):\n        h()\n"
+    RuleVisitor([ScopeProbe()], FileContext("a.py")).run(ast.parse(source))
+
+    assert seen == [("<module>", False), ("A", True), ("A.m", False)]
+
+
+@pytest.mark.parametrize(
+    ("expression", "expected"),
+    [("eval(x)", "eval"), ("os.system(x)", "os.system"), ("a.b.c()", "a.b.c"), ("f()()", ""), ("x[0].run()", "?.run")],
+)
+def test_call_name(expression, expected):
+    assert ast_rules.call_name(ast.parse(expression, mode="eval").body) == expected
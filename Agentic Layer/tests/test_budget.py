@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+
+from agentic_layer.scanners import budget
+from agentic_layer.scanners.budget import FileBudget
+
+
+CATASTROPHIC = re.compile(r"(a+)+$")
+PATHOLOGICAL_TEXT = "a" * 40 + "b"
+
+
+def test_backtracking_search_is_stopped_by_its_rule_budget():
+    file_budget = FileBudget(file_seconds=5, rule_seconds=0.2)
+    started_at = time.monotonic()
+
+    found = file_budget.finditer("catastrophic", CATASTROPHIC, PATHOLOGICAL_TEXT)
+
+    assert found == []
+    assert file_budget.timed_out == ["catastrophic"]
+    assert time.monotonic() - started_at < 3
+
+
+def test_spent_file_budget_skips_remaining_rules():
+    file_budget = FileBudget(file_seconds=0, rule_seconds=1)
+
+    assert file_budget.finditer("any", re.compile("x"), "xxx") == []
+    assert file_budget.timed_out == ["any"]
+
+
+def test_matches_within_budget_and_windows():
+    file_budget = FileBudget()
+    text = "token=1 ........ token=2 ........ token=3"
+    pattern = re.compile(r"token=\d")
+
+    assert [match.group() for match in file_budget.finditer("t", pattern, text)] == ["token=1", "token=2", "token=3"]
+    assert [match.group() for match in file_budget.finditer("t", pattern, text, [(10, 30)])] == ["token=2"]
+    assert len(file_budget.finditer("t", pattern, text, first_only=True)) == 1
+    assert file_budget.timed_out == []
+
+
+def test_no_alarm_outside_the_main_thread():
+    outcome = {}
+
+    def run():
+        outcome["interruptible"] = budget._can_interrupt()
+        with budget.time_limit(0.01):
+            time.sleep(0.05)
+        outcome["finished"] = True
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+
+    assert outcome == {"interruptible": False, "finished": True}
+
+
+def test_minified_detection():
+    assert budget.is_minified("app.min.js", "x")
+    assert budget.is_minified("app.js", "x" * 1000)
+    assert budget.is_minified("app.js", "short\n" * 100 + "y" * 6000)
+    assert not budget.is_minified("app.js", "short line\n" * 100)
+
+
+def test_literal_windows_merge_and_stay_bounded():
+    text = "." * 1000 + "http://" + "." * 100 + "HTTP://" + "." * 5000 + "http://" + "." * 10
+
+    windows = budget.literal_windows(text, ["http://"])
+
+    # The second occurrence is well inside the first window, so it shares it; the
+    # distant one gets its own.
+    assert windows == [(936, 1512), (6050, len(text))]
+    assert budget.literal_windows(text, []) == []
+
+    dense = "k" * 20000
+    dense_windows = budget.literal_windows(dense, ["k"])
+    assert all(end - start <= budget.WINDOW_MAX_CHARS for start, end in dense_windows)
+    assert all(left[1] <= right[0] for left, right in zip(dense_windows, dense_windows[1:]))
+    assert dense_windows[0][0] == 0 and dense_windows[-1][1] == len(dense)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from agentic_layer.runtime.output_stream import NdjsonCollector
+from agentic_layer.runtime.output_stream import StreamCaps
+from agentic_layer.scan_graph.nodes.analysis.coverage import full_scope
+from agentic_layer.scan_graph.nodes.analysis.coverage import partial_output
+from agentic_layer.scan_graph.nodes.analysis.coverage import rescan_targets
+from agentic_layer.scanners import analysis
+from agentic_layer.scanners import checkpoint
+from agentic_layer.scanners.checkpoint import Progress
+from agentic_layer.scanners.protocol import Emitter
+
+
+pytestmark = pytest.mark.usefixtures("scanner_config")
+
+
+def _clock(monkeypatch, times):
+    ticks = iter(times)
+    monkeypatch.setattr(checkpoint, "time", SimpleNamespace(monotonic=lambda: next(ticks)))
+
+
+def _events(stream: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_checkpoints_are_throttled(monkeypatch):
+    # Created at t=0, then one tick per advance().
+    _clock(monkeypatch, [0, 1, 2, 2.5, 3, 6])
+    stream = io.StringIO()
+    progress = Progress(Emitter("regex", stream), interval_seconds=2)
+
+    for name in "abcde":
+        progress.advance(name)
+
+    assert [(event["files_done"], event["last_file"]) for event in _events(stream)] == [(2, "b"), (5, "e")]
+    assert progress.as_dict() == {"start_offset": 0, "files_done": 5}
+
+
+def test_resume_skips_the_checkpointed_files(monkeypatch):
+    checkpoint.configure(3)
+    _clock(monkeypatch, [0])
+    progress = Progress(Emitter("regex", io.StringIO()))
+
+    assert list(progress.resume(range(6))) == [3, 4, 5]
+    assert progress.as_dict() == {"start_offset": 3, "files_done": 3}
+    checkpoint.configure(-1)
+    assert checkpoint.start_offset() == 0
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for index in range(6):
+        lines = [f'password = "secret{index}"'] if index % 2 == 0 else ["nothing here"]
+        lines += [f"url = 'http://host{index}'"] if index % 3 == 0 else []
+        (tmp_path / f"file{index}.py").write_text("\n".join(lines) + "\n")
+    return tmp_path
+
+
+def _run_regex(root, monkeypatch, start_offset=0):
+    checkpoint.configure(start_offset)
+    # A checkpoint after every file.
+    monkeypatch.setattr(checkpoint, "time", SimpleNamespace(monotonic=iter(range(0, 10000, 10)).__next__))
+    stream = io.StringIO()
+    summary = analysis.run_regex(root, Emitter("regex", stream))
+    return stream.getvalue(), summary
+
+
+def test_killed_run_resumed_from_its_checkpoint_covers_the_full_run(tree, monkeypatch):
+    full_output, _ = _run_regex(tree, monkeypatch)
+    full_findings = [json.loads(line)["finding"] for line in full_output.splitlines() if '"finding"' in line]
+
+    # The run is killed part-way through file 4: everything after the third checkpoint
+    # is cut off, with the last line half-written.
+    lines = full_output.splitlines(keepends=True)
+    checkpoints = [index for index, line in enumerate(lines) if '"event":"checkpoint"' in line]
+    killed_at = checkpoints[2] + 1
+    collector = NdjsonCollector(StreamCaps(max_findings=100, max_bytes=1 << 20, max_line_bytes=4096))
+    collector.feed(1, "".join(lines[:killed_at]).encode() + lines[killed_at].encode()[:10])
+    collector.close()
+
+    output = partial_output("regex", collector, full_scope(), "timeout")
+    assert output["checkpoint"]["files_done"] == 3
+    [target] = rescan_targets([output], "regex", "timed_out")
+    assert target["start_offset"] == 3
+
+    resumed_output, summary = _run_regex(tree, monkeypatch, start_offset=target["start_offset"])
+    resumed = [json.loads(line)["finding"] for line in resumed_output.splitlines() if '"finding"' in line]
+
+    assert summary["start_offset"] == 3 and summary["files_done"] == 6
+    assert output["findings"] + resumed == full_findings
+
+
+def test_no_partial_output_without_a_checkpoint():
+    collector = NdjsonCollector(StreamCaps(max_findings=100, max_bytes=1 << 20, max_line_bytes=4096))
+    collector.feed(1, b'{"event":"finding","finding":{"file":"a"}}\n')
+    collector.close()
+
+    assert partial_output("regex", collector, full_scope(), "timeout") is None
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from agentic_layer.scan_graph.nodes import cloner
+
+
+def test_clone_mode_and_blob_limit_from_env(monkeypatch):
+    monkeypatch.setenv("DEPLAI_CLONE_MODE", "FULL")
+    monkeypatch.setenv("DEPLAI_CLONE_BLOB_LIMIT_BYTES", "2048")
+    assert cloner._resolve_clone_mode() == cloner.CLONE_MODE_FULL
+    assert cloner._resolve_blob_limit_bytes() == 2048
+
+    monkeypatch.setenv("DEPLAI_CLONE_MODE", "shallow")
+    monkeypatch.setenv("DEPLAI_CLONE_BLOB_LIMIT_BYTES", "-1")
+    assert cloner._resolve_clone_mode() == cloner.CLONE_MODE_PARTIAL
+    assert cloner._resolve_blob_limit_bytes() == cloner.DEFAULT_BLOB_LIMIT_BYTES
+
+
+def test_acquisition_report_is_read_from_the_last_marker_line():
+    stdout = 'cloning\nDEPLAI_ACQUISITION {"skipped_paths": 1}\nDEPLAI_ACQUISITION {"skipped_paths": 2}\n'
+    assert cloner._parse_acquisition_report(stdout) == {"skipped_paths": 2}
+    assert cloner._parse_acquisition_report("DEPLAI_ACQUISITION not-json") == {}
+    assert cloner._parse_acquisition_report("no report") == {}
+
+
+def test_dynamic_timeout_is_clamped():
+    assert cloner._compute_dynamic_timeout(0) == 120
+    assert cloner._compute_dynamic_timeout(5000) == 220
+    assert cloner._compute_dynamic_timeout(10_000_000) == 600
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+@pytest.mark.skipif(shutil.which("git") is None or shutil.which("bash") is None, reason="needs git and bash")
+def test_partial_clone_skips_excluded_and_oversized_blobs(tmp_path):
+    origin = tmp_path / "origin"
+    (origin / "src").mkdir(parents=True)
+    (origin / "node_modules" / "left").mkdir(parents=True)
+    (origin / "src" / "app.py").write_text("print('hi')\n")
+    (origin / "node_modules" / "left" / "index.js").write_text("module.exports = 1\n")
+    (origin / "logo.png").write_bytes(b"\x89PNG" + b"\0" * 64)
+    (origin / "dump.txt").write_bytes(os.urandom(8192))
+    _git(origin, "init", "-q")
+    _git(origin, "config", "uploadpack.allowFilter", "true")
+    _git(origin, "add", "-A")
+    _git(origin, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init")
+
+    workspace = tmp_path / "code"
+    env = {
+        **os.environ,
+        "CODE_DIR": str(workspace),
+        "TMPDIR": str(tmp_path),
+        "REPO_URL": f"file://{origin}",
+        "BLOB_LIMIT": "4096",
+        "SPARSE_EXCLUDES": "\n".join(cloner._sparse_exclude_patterns()),
+    }
+    result = subprocess.run(
+        ["bash", "-c", cloner._build_clone_script(cloner.CLONE_MODE_PARTIAL)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert (workspace / "src" / "app.py").exists()
+    assert not (workspace / "node_modules").exists()
+    assert not (workspace / "logo.png").exists()
+    assert not (workspace / "dump.txt").exists()
+    report = cloner._parse_acquisition_report(result.stdout)
+    assert report["skipped_paths"] == 3
+    assert report["skipped_oversize_blobs"] == 1
+    assert set(report["skipped_paths_sample"]) == {"node_modules/left/index.js", "logo.png", "dump.txt"}
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from agentic_layer.scanners import config_rules
+from agentic_layer.scanners import configfiles
+from agentic_layer.scanners.configfiles import ConfigEntry
+from agentic_layer.scanners.manifest import KIND_COMPOSE
+from agentic_layer.scanners.manifest import KIND_DOCKERFILE
+from agentic_layer.scanners.manifest import KIND_K8S
+
+
+def _entries(entries):
+    return [(".".join(entry.path), entry.value, entry.line) for entry in entries]
+
+
+K8S = """\
+apiVersion: v1   # comment
+kind: Pod
+metadata:
+  labels: {app: web, tier: "front # end"}
+spec:
+  hostNetwork: true
+  containers:
+    - name: web
+      image: nginx
+      args: [
+        "--a", --b
+      ]
+      securityContext:
+        privileged: yes
+        runAsUser: 0
+      command: |
+        not: parsed
+    - name: sidecar
+---
+kind: Other
+"""
+
+
+def test_yaml_block_flow_and_sequences():
+    entries = _entries(configfiles.parse_yaml(iter(K8S.splitlines(keepends=True))))
+
+    assert entries == [
+        ("apiVersion", "v1", 1),
+        ("kind", "Pod", 2),
+        ("metadata.labels.app", "web", 4),
+        ("metadata.labels.tier", "front # end", 4),
+        ("spec.hostNetwork", True, 6),
+        ("spec.containers.*.name", "web", 8),
+        ("spec.containers.*.image", "nginx", 9),
+        ("spec.containers.*.args.*", "--a", 10),
+        ("spec.containers.*.args.*", "--b", 10),
+        ("spec.containers.*.securityContext.privileged", True, 14),
+        ("spec.containers.*.securityContext.runAsUser", 0, 15),
+        ("spec.containers.*.command", "", 16),
+        ("spec.containers.*.name", "sidecar", 18),
+        ("kind", "Other", 20),
+    ]
+
+
+def test_json_paths_and_lines(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"cors": {"allowed_origins": ["*"]}, "debug": True, "list": [[1]]}, indent=1))
+
+    assert _entries(configfiles.parse_json(path)) == [
+        ("cors.allowed_origins.*", "*", 4),
+        ("debug", True, 7),
+        ("list.*.*", 1, 10),
+    ]
+
+
+def test_toml_tables_and_multiline_values(tmp_path):
+    path = tmp_path / "settings.toml"
+    path.write_text('debug = true\n[server]\nhosts = [\n  "a",\n  "b",\n]\n[[users]]\n"pass.word" = "x"\n')
+
+    assert _entries(configfiles.parse_toml(path)) == [
+        ("debug", True, 1),
+        ("server.hosts.*", "a", 3),
+        ("server.hosts.*", "b", 3),
+        ("users.*.pass.word", "x", 8),
+    ]
+
+
+def test_env_and_dockerfile(tmp_path):
+    env = tmp_path / ".env"
+    env.write_text('export DEBUG=1 # on\nPASSWORD="s3cret"\nnot a line\n')
+    assert _entries(configfiles.parse_env(env)) == [("DEBUG", "1", 1), ("PASSWORD", "s3cret", 2)]
+
+    dockerfile = tmp_path / "Dockerfile"
+    dockerfile.write_text("FROM alpine AS build\nUSER app\nFROM alpine\nENV A=1 \\\n    B=\"two\"\n")
+    entries = _entries(configfiles.parse_dockerfile(dockerfile))
+    assert ("ENV.B", "two", 4) in entries
+    assert entries[-1] == ("final_stage.user", "root", 3)
+
+
+def test_rules_match_key_suffixes_by_kind():
+    entries = list(configfiles.parse_yaml(iter(K8S.splitlines(keepends=True))))
+
+    hits, seen = config_rules.evaluate(entries, KIND_K8S)
+    assert seen == len(entries)
+    assert [(hit["rule"], hit["line"]) for hit in hits] == [
+        ("k8s_host_namespace", 6),
+        ("privileged_container", 14),
+        ("k8s_run_as_root", 15),
+    ]
+
+    # Kubernetes-only rules stay quiet on other file kinds.
+    hits, _ = config_rules.evaluate(entries, KIND_DOCKERFILE)
+    assert hits == []
+
+
+@pytest.mark.parametrize(
+    ("path", "value", "kind", "rule"),
+    [
+        (("Flask-Debug",), "True", KIND_COMPOSE, "debug_enabled"),
+        (("services", "web", "network_mode"), "host", KIND_COMPOSE, "compose_host_namespace"),
+        (("CORS_ALLOWED_ORIGINS", "*"), "*", KIND_COMPOSE, "cors_any_origin"),
+        (("db", "password"), "hunter2", KIND_COMPOSE, "hardcoded_secret"),
+        (("db", "password"), "${DB_PASSWORD}", KIND_COMPOSE, None),
+        (("db", "password"), "{{ vault.pw }}", KIND_COMPOSE, None),
+        (("final_stage", "user"), "root", KIND_DOCKERFILE, "dockerfile_root_user"),
+        (("ADD",), "https://example.com/x.tgz /x", KIND_DOCKERFILE, "dockerfile_remote_add"),
+    ],
+)
+def test_rule_values(path, value, kind, rule):
+    hits, _ = config_rules.evaluate([ConfigEntry(path, value, 3)], kind)
+    assert [hit["rule"] for hit in hits] == ([rule] if rule else [])
+
+
+def test_secret_evidence_is_redacted():
+    hits, _ = config_rules.evaluate([ConfigEntry(("password",), "hunter2", 1)], KIND_COMPOSE)
+    assert hits[0]["evidence"] == "password = ***"
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from agentic_layer.scan_graph.nodes.analysis.coverage import MAX_RESCAN_FILES
+from agentic_layer.scan_graph.nodes.analysis.coverage import full_scope
+from agentic_layer.scan_graph.nodes.analysis.coverage import rescan_scope
+from agentic_layer.scan_graph.nodes.analysis.coverage import rescan_targets
+
+
+def test_missing_output_rescans_the_whole_tree():
+    assert rescan_targets([{"tool": "regex"}], "ast", "no_output") == [
+        {"gap": "no_output", "tool": "ast", "start_offset": 0, "files": None, "shard": None}
+    ]
+
+
+def test_complete_output_needs_no_rescan():
+    assert rescan_targets([{"tool": "ast", "findings": []}], "ast", "gap") == []
+
+
+def test_partial_run_resumes_from_its_latest_checkpoint():
+    outputs = [
+        {"tool": "ast", "partial": True, "checkpoint": {"files_done": 5}},
+        {"tool": "ast", "partial": True, "checkpoint": {"files_done": 40}, "scope": {"files": ["a.py"], "shard": None}},
+    ]
+
+    assert rescan_targets(outputs, "ast", "timed_out") == [
+        {"gap": "timed_out", "tool": "ast", "start_offset": 40, "files": ["a.py"], "shard": None}
+    ]
+
+
+def test_sharded_run_rescans_only_unfinished_shards():
+    output = {
+        "tool": "regex",
+        "shards": [
+            {"scope": {"shard": "0/3"}},
+            {"partial": True, "scope": {"shard": "1/3"}, "checkpoint": {"files_done": 7}},
+            {"partial": True, "scope": {"shard": "2/3"}},
+        ],
+    }
+
+    targets = rescan_targets([output], "regex", "timed_out")
+
+    assert [(target["shard"], target["start_offset"]) for target in targets] == [("1/3", 7), ("2/3", 0)]
+
+
+def test_unreadable_files_are_retried_in_batches():
+    skipped = [{"file": f"f{index:03}.py", "reason": "unreadable"} for index in range(MAX_RESCAN_FILES + 1)]
+    skipped += [{"file": "big.py", "reason": "too_large"}, {"file": "f000.py", "reason": "unreadable"}]
+
+    targets = rescan_targets([{"tool": "ast", "skipped_files": skipped}], "ast", "skipped")
+
+    assert [len(target["files"]) for target in targets] == [MAX_RESCAN_FILES, 1]
+    assert "big.py" not in targets[0]["files"]
+
+
+def test_rescan_scope_follows_the_target_for_the_tool():
+    state = {"rescan_targets": [{"tool": "regex", "start_offset": 3, "files": ["a.py"], "shard": "1/2"}]}
+
+    assert rescan_scope(state, "regex") == {"start_offset": 3, "files": ["a.py"], "shard": "1/2"}
+    assert rescan_scope(state, "ast") == full_scope()
+    assert rescan_scope({}, "ast") == full_scope()
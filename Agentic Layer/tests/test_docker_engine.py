@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from agentic_layer.runtime.docker_engine import DockerEngineClient
+from agentic_layer.runtime.docker_engine import DockerEngineError
+from agentic_layer.runtime.docker_engine import _FrameDemuxer
+
+
+def _frame(stream: int, payload: bytes) -> bytes:
+    return bytes([stream, 0, 0, 0]) + len(payload).to_bytes(4, "big") + payload
+
+
+def test_demuxer_splits_frames_across_chunk_boundaries():
+    data = _frame(1, b"hello ") + _frame(2, b"oops") + _frame(1, b"world")
+    demuxer = _FrameDemuxer()
+
+    pieces = [piece for start in range(0, len(data), 3) for piece in demuxer.feed(data[start : start + 3])]
+
+    stdout = b"".join(payload for stream, payload in pieces if stream == 1)
+    stderr = b"".join(payload for stream, payload in pieces if stream == 2)
+    assert stdout == b"hello world"
+    assert stderr == b"oops"
+
+
+def _engine_with(handler) -> DockerEngineClient:
+    engine = DockerEngineClient()
+    engine._client = httpx.AsyncClient(base_url="http://docker/v1.43", transport=httpx.MockTransport(handler))
+    return engine
+
+
+class FakeDaemon:
+    # /containers/create answers 404 until the image has been pulled.
+    def __init__(self) -> None:
+        self.pulled: list[str] = []
+        self.created_images: list[str] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/images/create"):
+            self.pulled.append(request.url.params["fromImage"])
+            return httpx.Response(200, text='{"status":"done"}\n')
+        image = json.loads(request.content)["Image"]
+        if not self.pulled:
+            return httpx.Response(404, json={"message": f"No such image: {image}"})
+        self.created_images.append(image)
+        return httpx.Response(201, json={"Id": "abc123"})
+
+
+def _create(engine: DockerEngineClient, image: str) -> str:
+    async def run():
+        engine._client_loop = asyncio.get_running_loop()
+        try:
+            return await engine.create_container(image, ["true"])
+        finally:
+            await engine.aclose()
+
+    return asyncio.run(run())
+
+
+def test_missing_registry_image_is_pulled_once():
+    daemon = FakeDaemon()
+
+    assert _create(_engine_with(daemon), "alpine:3.20") == "abc123"
+    assert daemon.pulled == ["alpine"]
+    assert daemon.created_images == ["alpine:3.20"]
+
+
+@pytest.mark.parametrize("image", ["sha256:" + "a" * 64, "0123456789ab"])
+def test_missing_image_id_is_not_pulled(image):
+    daemon = FakeDaemon()
+
+    with pytest.raises(DockerEngineError) as raised:
+        _create(_engine_with(daemon), image)
+
+    assert raised.value.status_code == 404
+    assert daemon.pulled == []
+
+
+def test_missing_local_or_pinned_local_image_is_not_pulled():
+    daemon = FakeDaemon()
+    engine = _engine_with(daemon)
+    engine.mark_local_image("deplai-scanners:1.12.0")
+
+    with pytest.raises(DockerEngineError):
+        _create(engine, "deplai-scanners:1.12.0")
+
+    engine = _engine_with(daemon)
+    engine.mark_local_image("deplai-scanners:1.12.0")
+    engine.pin_image("deplai-scanners:1.12.0", "sha256:" + "b" * 64)
+    with pytest.raises(DockerEngineError):
+        _create(engine, "deplai-scanners:1.12.0")
+    assert daemon.pulled == []
+
+
+def test_digest_references_stay_pullable():
+    engine = DockerEngineClient()
+    assert engine.pullable("alpine@sha256:" + "c" * 64)
+    assert engine.pullable("alpine/git")
+
+
+def _run(engine: DockerEngineClient, call):
+    async def run():
+        engine._client_loop = asyncio.get_running_loop()
+        try:
+            return await call(engine)
+        finally:
+            await engine.aclose()
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("error", [httpx.ReadTimeout, httpx.RemoteProtocolError, httpx.ConnectError])
+def test_transport_errors_surface_as_engine_unavailable(error):
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise error("daemon went away", request=request)
+
+    with pytest.raises(DockerEngineError) as raised:
+        _run(_engine_with(handler), lambda engine: engine.create_volume("deplai-code-1"))
+
+    assert raised.value.status_code == 503
+    assert _run(_engine_with(handler), lambda engine: engine.ping()) is False
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import pytest
+
+from agentic_layer.runtime.execution_backend import DockerBackend
+from agentic_layer.runtime.execution_backend import ExecutionBackend
+from agentic_layer.runtime.execution_backend import LocalBackend
+
+
+def test_backend_missing_an_operation_cannot_be_instantiated():
+    class PartialBackend(ExecutionBackend):
+        async def create_workspace(self, scan_id):
+            raise AssertionError("unused")
+
+    with pytest.raises(TypeError, match="run_scanner"):
+        PartialBackend()
+
+
+def test_base_backend_is_abstract():
+    with pytest.raises(TypeError):
+        ExecutionBackend()
+
+
+def test_shipped_backends_implement_every_operation(tmp_path):
+    assert not DockerBackend.__abstractmethods__
+    assert not LocalBackend.__abstractmethods__
+    assert LocalBackend(workspace_root=str(tmp_path)).isolated is False
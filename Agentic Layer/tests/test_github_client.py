@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import httpx
+
+from agentic_layer.shared.github_client import GitHubClient
+from agentic_layer.shared.github_client import token_fingerprint
+
+
+def _run(client: GitHubClient, handler, scenario):
+    # Runs `scenario(client)` with the client's pool routed to an in-process handler.
+    async def main():
+        client._client = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
+        client._client_loop = asyncio.get_running_loop()
+        try:
+            return await scenario(client)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(main())
+
+
+def test_token_fingerprint_is_stable_and_opaque():
+    assert token_fingerprint(None) == "anonymous"
+    assert token_fingerprint("ghp_secret") == token_fingerprint("ghp_secret")
+    assert token_fingerprint("ghp_secret") != token_fingerprint("ghp_other")
+    assert "ghp_secret" not in token_fingerprint("ghp_secret")
+
+
+def test_scan_memo_serves_repeated_requests_once():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"size": 1})
+
+    async def scenario(client):
+        first = await client.get_repo("octo", "repo", token="t", scan_id="scan")
+        second = await client.get_repo("octo", "repo", token="t", scan_id="scan")
+        client.release_scan("scan")
+        third = await client.get_repo("octo", "repo", token="t", scan_id="scan")
+        return first, second, third
+
+    first, second, third = _run(GitHubClient(base_url="http://github.test"), handler, scenario)
+
+    assert first.payload == second.payload == third.payload == {"size": 1}
+    assert calls == ["/repos/octo/repo", "/repos/octo/repo"]
+
+
+def test_etag_revalidation_returns_cached_payload():
+    seen_etags = []
+
+    def handler(request):
+        seen_etags.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"login": "octo"}, headers={"etag": '"v1"'})
+
+    async def scenario(client):
+        first = await client.get_user(token="t")
+        second = await client.get_user(token="t")
+        return first, second
+
+    first, second = _run(GitHubClient(base_url="http://github.test"), handler, scenario)
+
+    assert seen_etags == [None, '"v1"']
+    assert first.from_cache is False
+    assert second.status_code == 200
+    assert second.payload == {"login": "octo"}
+    assert second.from_cache is True
+
+
+def test_short_retry_after_is_retried_once():
+    responses = [
+        httpx.Response(429, headers={"retry-after": "0"}),
+        httpx.Response(200, json={"ok": True}),
+    ]
+
+    def handler(request):
+        return responses.pop(0)
+
+    result = _run(
+        GitHubClient(base_url="http://github.test"),
+        handler,
+        lambda client: client.get("/rate", token=None),
+    )
+
+    assert result.status_code == 200
+    assert responses == []
+
+
+def test_long_retry_after_is_not_retried():
+    client = GitHubClient(base_url="http://github.test", max_backoff_seconds=5)
+
+    assert client._retry_delay(httpx.Response(429, headers={"retry-after": "60"})) is None
+    assert client._retry_delay(httpx.Response(429, headers={"retry-after": "2"})) == 2.0
+    assert client._retry_delay(httpx.Response(403)) is None
+
+
+def test_auth_failures_notify_listeners():
+    failed = []
+
+    def handler(request):
+        return httpx.Response(401, json={"message": "Bad credentials"})
+
+    client = GitHubClient(base_url="http://github.test")
+    client.add_auth_failure_listener(failed.append)
+    result = _run(client, handler, lambda client: client.get_user(token="revoked"))
+
+    assert result.status_code == 401
+    assert failed == [token_fingerprint("revoked")]
+
+
+def test_switching_loops_closes_the_previous_client_on_its_own_loop():
+    client = GitHubClient(base_url="http://github.test")
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+    thread.start()
+
+    async def acquire():
+        return client._get_client()
+
+    try:
+        previous = asyncio.run_coroutine_threadsafe(acquire(), other_loop).result(timeout=5)
+
+        async def main():
+            try:
+                return client._get_client()
+            finally:
+                await client.aclose()
+
+        current = asyncio.run(main())
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), other_loop).result(timeout=5)
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join(timeout=5)
+        other_loop.close()
+
+    assert current is not previous
+    assert previous.is_closed
+    assert current.is_closed
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from agentic_layer.runtime import image_warmup as image_warmup_module
+from agentic_layer.runtime.docker_engine import ContainerRunResult
+from agentic_layer.runtime.image_warmup import ImageStatus
+from agentic_layer.runtime.image_warmup import ImageWarmup
+from agentic_layer.runtime.image_warmup import RequiredImage
+
+
+class FakeEngine:
+    def __init__(self, present: set[str]) -> None:
+        self.present = set(present)
+        self.pulled: list[str] = []
+        self.pinned: dict[str, str] = {}
+        self.ran: list[str] = []
+
+    async def inspect_image(self, ref):
+        if ref not in self.present:
+            return None
+        return {"Id": f"id-{ref}", "RepoDigests": []}
+
+    async def pull_image(self, ref):
+        self.pulled.append(ref)
+        self.present.add(ref)
+
+    def pin_image(self, ref, image_id):
+        self.pinned[ref] = image_id
+
+    async def run_container(self, image, command, **kwargs):
+        self.ran.append(image)
+        return ContainerRunResult(exit_code=0, stdout="", stderr="")
+
+
+def _prepare(warmup: ImageWarmup, image: RequiredImage) -> ImageStatus:
+    status = ImageStatus(ref=image.ref, role=image.role)
+    asyncio.run(warmup._prepare(image, status))
+    return status
+
+
+def _engine(monkeypatch, present) -> FakeEngine:
+    fake = FakeEngine(present)
+    monkeypatch.setattr(image_warmup_module, "docker_engine", fake)
+    return fake
+
+
+def test_always_policy_pulls_registry_images(monkeypatch):
+    engine = _engine(monkeypatch, {"alpine"})
+    image = RequiredImage(ref="alpine", role="maintenance", warmup_command=("true",))
+
+    status = _prepare(ImageWarmup(pull_policy="always"), image)
+
+    assert engine.pulled == ["alpine"]
+    assert status.pulled
+    assert engine.pinned["alpine"] == status.image_id
+    assert engine.ran == ["alpine"]
+
+
+def test_always_policy_never_pulls_local_builds(monkeypatch):
+    engine = _engine(monkeypatch, {"deplai-scanners:1"})
+    image = RequiredImage(ref="deplai-scanners:1", role="scanner", warmup_command=("--version",), local_build=True)
+
+    status = _prepare(ImageWarmup(pull_policy="always"), image)
+
+    assert engine.pulled == []
+    assert not status.pulled
+    assert engine.ran == ["deplai-scanners:1"]
+
+
+def test_missing_local_build_fails_without_pulling(monkeypatch):
+    engine = _engine(monkeypatch, set())
+    image = RequiredImage(ref="deplai-scanners:1", role="scanner", warmup_command=("--version",), local_build=True)
+
+    with pytest.raises(RuntimeError, match="built locally"):
+        _prepare(ImageWarmup(pull_policy="missing"), image)
+    assert engine.pulled == []
+
+
+def test_missing_policy_pulls_only_absent_images(monkeypatch):
+    engine = _engine(monkeypatch, {"alpine"})
+    warmup = ImageWarmup(pull_policy="missing")
+
+    _prepare(warmup, RequiredImage(ref="alpine", role="maintenance", warmup_command=("true",)))
+    _prepare(warmup, RequiredImage(ref="alpine/git", role="clone", warmup_command=("--version",)))
+
+    assert engine.pulled == ["alpine/git"]
+
+
+def test_scanner_image_is_a_local_build_unless_configured(monkeypatch):
+    monkeypatch.delenv("DEPLAI_SCANNER_IMAGE", raising=False)
+    scanner = image_warmup_module.required_images()[0]
+    assert scanner.role == "scanner" and scanner.local_build
+
+    monkeypatch.setenv("DEPLAI_SCANNER_IMAGE", "registry.example/deplai-scanners:1")
+    scanner = image_warmup_module.required_images()[0]
+    assert scanner.ref == "registry.example/deplai-scanners:1"
+    assert not scanner.local_build
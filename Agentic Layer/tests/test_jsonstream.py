@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+
+from agentic_layer.scanners.jsonstream import iter_events
+
+
+DOCUMENT = {
+    "name": "demo",
+    "escaped": "quote \" backslash \\ unicode é \\u0041",
+    "numbers": [0, -12, 3.5, 1e3, -2.5E-2],
+    "flags": {"yes": True, "no": False, "nothing": None},
+    "nested": [{"a": [1, {"b": "c"}]}, [], {}],
+}
+
+
+def _build(events):
+    # Rebuilds the document from the event stream.
+    stack: list = []
+    keys: list = []
+    root = None
+
+    def add(value):
+        nonlocal root
+        if not stack:
+            root = value
+        elif isinstance(stack[-1], dict):
+            stack[-1][keys.pop()] = value
+        else:
+            stack[-1].append(value)
+
+    for event, value, _ in events:
+        if event == "map_key":
+            keys.append(value)
+        elif event in ("start_map", "start_array"):
+            container = {} if event == "start_map" else []
+            add(container)
+            stack.append(container)
+        elif event in ("end_map", "end_array"):
+            stack.pop()
+        else:
+            add(value)
+    return root
+
+
+@pytest.mark.parametrize("chunk_chars", [1, 2, 7, 64, 1 << 16])
+def test_events_rebuild_the_document_at_any_chunk_size(chunk_chars):
+    text = json.dumps(DOCUMENT, indent=2)
+    events = list(iter_events(io.StringIO(text), chunk_chars=chunk_chars))
+    assert _build(events) == DOCUMENT
+
+
+@pytest.mark.parametrize("chunk_chars", [1, 5, 1 << 16])
+def test_value_depth_yields_whole_subtrees(chunk_chars):
+    text = json.dumps({"packages": {"": {"version": "1"}, "node_modules/a": {"version": "2", "deps": [1, 2]}}})
+    events = list(iter_events(io.StringIO(text), value_depth=3, chunk_chars=chunk_chars))
+
+    values = [value for event, value, _ in events if event == "value"]
+    assert values == [{"version": "1"}, {"version": "2", "deps": [1, 2]}]
+    assert [event for event, _, _ in events].count("start_map") == 2
+
+
+def test_line_numbers_follow_the_token():
+    text = '{\n  "a": 1,\n  "b": {\n    "c": [\n      true\n    ]\n  }\n}\n'
+    lines = {(event, value): line for event, value, line in iter_events(io.StringIO(text), chunk_chars=3)}
+    assert lines[("map_key", "a")] == 2
+    assert lines[("map_key", "b")] == 3
+    assert lines[("scalar", True)] == 5
+
+    subtree = [line for event, _, line in iter_events(io.StringIO(text), value_depth=2, chunk_chars=3)]
+    # The value event carries the subtree's first line; the closing brace follows it.
+    assert subtree[-1] == 8
+
+
+@pytest.mark.parametrize("text", ['{"a": [1, 2', '{"a": tru}', '{"a": 1}}', '{"a": @}'])
+def test_truncated_or_invalid_documents_raise(text):
+    with pytest.raises(ValueError):
+        list(iter_events(io.StringIO(text), chunk_chars=4))
+
+
+def test_truncated_subtree_raises():
+    with pytest.raises(ValueError):
+        list(iter_events(io.StringIO('{"a": {"b": [1, 2'), value_depth=2, chunk_chars=4))
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+import os
+
+import pytest
+
+from agentic_layer.runtime import local_source
+from agentic_layer.runtime.local_source import SOURCE_MODE_BIND
+from agentic_layer.runtime.local_source import SOURCE_MODE_HARDLINK
+
+
+@pytest.fixture
+def projects(tmp_path, monkeypatch):
+    root = tmp_path / "local-projects"
+    project = root / "user-1" / "proj-1"
+    (project / "src").mkdir(parents=True)
+    (project / "src" / "app.py").write_text("print('hi')\n")
+    (project / "README.md").write_text("readme\n")
+    monkeypatch.setenv("DEPLAI_LOCAL_PROJECTS_ROOT", str(root))
+    return project
+
+
+def test_resolves_projects_under_the_root(projects):
+    url = local_source.local_source_url("user-1", "proj-1")
+
+    assert local_source.is_local_source(url)
+    assert local_source.resolve_local_source(url) == projects.resolve()
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "local://user-1/missing",
+        "local://user-1",
+        "local://user-1/proj-1/src",
+        "local://../proj-1",
+        "local://user-1/..",
+        "https://github.com/user-1/proj-1",
+    ],
+)
+def test_rejects_malformed_or_escaping_urls(projects, url):
+    assert local_source.resolve_local_source(url) is None
+
+
+def test_unknown_source_mode_falls_back_to_bind(monkeypatch):
+    monkeypatch.setenv("DEPLAI_LOCAL_SOURCE_MODE", "copy")
+    assert local_source.resolve_source_mode() == SOURCE_MODE_BIND
+    monkeypatch.setenv("DEPLAI_LOCAL_SOURCE_MODE", " HardLink ")
+    assert local_source.resolve_source_mode() == SOURCE_MODE_HARDLINK
+
+
+def test_bind_mode_uses_the_project_directory_and_leaves_it_in_place(projects):
+    async def scenario():
+        staged = await local_source.stage_local_source("scan-1", projects, SOURCE_MODE_BIND)
+        released = await local_source.release_local_source(staged.path, "scan-1", "test")
+        return staged, released
+
+    staged, released = asyncio.run(scenario())
+
+    assert staged.path == str(projects)
+    assert released == {"local_source_detached": True}
+    assert (projects / "README.md").exists()
+
+
+def test_hardlink_snapshot_is_isolated_from_reuploads_and_removed(projects):
+    async def stage():
+        return await local_source.stage_local_source("Scan/1", projects, SOURCE_MODE_HARDLINK)
+
+    staged = asyncio.run(stage())
+    snapshot = local_source._snapshot_root() / "scan_1"
+
+    assert staged.path == str(snapshot)
+    assert staged.files == 2
+    assert local_source.is_snapshot(staged.path)
+    assert os.path.samefile(snapshot / "src" / "app.py", projects / "src" / "app.py")
+
+    # A re-upload replaces files with new inodes; the snapshot keeps the old content.
+    (projects / "src" / "app.py").unlink()
+    (projects / "src" / "app.py").write_text("changed\n")
+    assert (snapshot / "src" / "app.py").read_text() == "print('hi')\n"
+
+    released = asyncio.run(local_source.release_local_source(staged.path, "scan-1", "test"))
+    assert released == {"local_snapshot_removed": True}
+    assert not snapshot.exists()
+    assert (projects / "src" / "app.py").exists()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+
+from agentic_layer.scanners import lockfiles
+
+
+def _pairs(dependencies):
+    return [(dependency.name, dependency.version, dependency.line) for dependency in dependencies]
+
+
+def test_package_lock_v3_reads_the_flat_packages_map(tmp_path):
+    path = tmp_path / "package-lock.json"
+    path.write_text(
+        json.dumps(
+            {
+                "name": "app",
+                "lockfileVersion": 3,
+                "packages": {
+                    "": {"name": "app", "version": "1.0.0"},
+                    "node_modules/lodash": {"version": "4.17.20"},
+                    "node_modules/a/node_modules/@scope/b": {"version": "2.0.0"},
+                    "node_modules/linked": {"link": True, "version": "9.9.9"},
+                },
+                # The legacy tree of a v2 lockfile repeats the packages and is skipped.
+                "dependencies": {"lodash": {"version": "4.17.20"}},
+            },
+            indent=2,
+        )
+    )
+
+    dependencies = list(lockfiles.parse_package_lock(path))
+
+    # The root project ("") is what is being scanned, not a dependency of it.
+    assert _pairs(dependencies) == [("lodash", "4.17.20", 9), ("@scope/b", "2.0.0", 12)]
+
+
+def test_package_lock_v1_walks_nested_dependencies(tmp_path):
+    path = tmp_path / "package-lock.json"
+    path.write_text(
+        json.dumps(
+            {
+                "lockfileVersion": 1,
+                "dependencies": {"a": {"version": "1.0.0", "dependencies": {"b": {"version": "0.1.0"}}}},
+            }
+        )
+    )
+
+    assert [(dependency.name, dependency.version) for dependency in lockfiles.parse_package_lock(path)] == [
+        ("a", "1.0.0"),
+        ("b", "0.1.0"),
+    ]
+
+
+def test_toml_lockfiles_skip_sub_tables_and_multiline_strings(tmp_path):
+    path = tmp_path / "poetry.lock"
+    path.write_text(
+        '[[package]]\nname = "requests"\nversion = "2.31.0"\ndescription = """\n[[package]]\nname = "fake"\n"""\n'
+        '\n[package.dependencies]\nname = "not-a-package"\n\n[[package]]\nname = "urllib3"\nversion = "2.0.0"\n'
+    )
+
+    assert _pairs(lockfiles.parse_poetry_lock(path)) == [("requests", "2.31.0", 1), ("urllib3", "2.0.0", 12)]
+
+
+def test_yarn_lock_classic_and_berry(tmp_path):
+    path = tmp_path / "yarn.lock"
+    path.write_text(
+        "# yarn lockfile v1\n\n"
+        '"@babel/core@^7.0.0", "@babel/core@^7.1.0":\n  version "7.1.2"\n\n'
+        '"left-pad@npm:^1.0.0":\n  version: 1.3.0\n\n'
+        '"app@workspace:.":\n  version: 0.0.0-use.local\n'
+    )
+
+    assert _pairs(lockfiles.parse_yarn_lock(path)) == [("@babel/core", "7.1.2", 3), ("left-pad", "1.3.0", 6)]
+
+
+def test_go_sum_counts_each_module_once(tmp_path):
+    path = tmp_path / "go.sum"
+    path.write_text(
+        "golang.org/x/net v0.17.0 h1:abc=\n"
+        "golang.org/x/net v0.17.0/go.mod h1:def=\n"
+    )
+
+    assert _pairs(lockfiles.parse_go_sum(path)) == [("golang.org/x/net", "v0.17.0", 1)]
+
+
+def test_requirements_keep_only_exact_pins(tmp_path):
+    path = tmp_path / "requirements-dev.txt"
+    path.write_text("-r base.txt\n# comment\nDjango==4.2.1  # pinned\nhttpx[http2]>=0.27\nflask===3.0.0\n")
+
+    assert _pairs(lockfiles.parse_requirements(path)) == [("Django", "4.2.1", 3), ("flask", "3.0.0", 5)]
+
+
+def test_lockfile_discovery_skips_vendored_trees(tmp_path):
+    (tmp_path / "node_modules" / "x").mkdir(parents=True)
+    (tmp_path / "node_modules" / "x" / "package-lock.json").write_text("{}")
+    (tmp_path / "requirements").mkdir()
+    (tmp_path / "requirements" / "prod.txt").write_text("")
+    (tmp_path / "Cargo.lock").write_text("")
+    (tmp_path / "notes.txt").write_text("")
+
+    found = sorted(path.relative_to(tmp_path).as_posix() for path in lockfiles.iter_lockfiles(tmp_path))
+
+    assert found == ["Cargo.lock", "requirements/prod.txt"]
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+
+from agentic_layer.runtime.output_stream import BoundedCapture
+from agentic_layer.runtime.output_stream import NdjsonCollector
+from agentic_layer.runtime.output_stream import StreamCaps
+from agentic_layer.runtime.output_stream import redact_text
+
+
+def _line(payload: dict) -> bytes:
+    return json.dumps(payload).encode() + b"\n"
+
+
+def _finding(index: int) -> bytes:
+    return _line({"event": "finding", "finding": {"file": f"f{index}.py", "line": index}})
+
+
+def _feed(collector: NdjsonCollector, data: bytes, chunk_size: int = 7) -> NdjsonCollector:
+    for start in range(0, len(data), chunk_size):
+        collector.feed(1, data[start : start + chunk_size])
+    collector.close()
+    return collector
+
+
+def _caps(**overrides) -> StreamCaps:
+    return StreamCaps(**{"max_findings": 100, "max_bytes": 1 << 20, "max_line_bytes": 4096, **overrides})
+
+
+def test_events_are_parsed_across_chunk_boundaries():
+    data = _finding(1) + _finding(2) + _line({"event": "summary", "summary": {"count": 2}})
+
+    collector = _feed(NdjsonCollector(_caps()), data)
+
+    assert [finding["line"] for finding in collector.findings] == [1, 2]
+    assert collector.summary == {"count": 2}
+    assert collector.has_protocol_output
+    assert not collector.stats.truncated
+
+
+def test_summary_survives_the_byte_cap():
+    findings = b"".join(_finding(index) for index in range(50))
+    data = findings + _line({"event": "summary", "summary": {"count": 50, "tool": "regex"}})
+
+    collector = _feed(NdjsonCollector(_caps(max_bytes=len(findings) // 2)), data)
+
+    assert 0 < len(collector.findings) < 50
+    assert collector.summary == {"count": 50, "tool": "regex"}
+    assert collector.summary_received
+    assert collector.stats.truncated
+    assert collector.stats.bytes_read + collector.stats.bytes_dropped == len(data)
+
+
+def test_output_cut_before_any_finding_is_truncated_not_invalid():
+    data = b"x" * 200 + b"\n" + _finding(1)
+
+    collector = _feed(NdjsonCollector(_caps(max_bytes=100)), data)
+
+    assert collector.findings == []
+    assert collector.has_protocol_output
+    assert collector.stats.truncated
+
+
+def test_checkpoints_past_the_cap_are_ignored():
+    head = _finding(1) + _line({"event": "checkpoint", "files_done": 1, "last_file": "f1.py"})
+    data = head + _finding(2) + _line({"event": "checkpoint", "files_done": 2, "last_file": "f2.py"})
+
+    collector = _feed(NdjsonCollector(_caps(max_bytes=len(head) + 5)), data)
+
+    assert collector.checkpoint["files_done"] == 1
+    assert collector.checkpointed_findings == collector.findings[:1]
+
+
+def test_finding_cap_and_oversized_lines_are_counted():
+    data = _finding(1) + _finding(2) + b'{"event": "finding", "finding": {"x": "' + b"y" * 5000 + b'"}}\n'
+
+    collector = _feed(NdjsonCollector(_caps(max_findings=1)), data)
+
+    assert len(collector.findings) == 1
+    assert collector.stats.findings_dropped == 1
+    assert collector.stats.oversized_lines == 1
+    assert collector.stats.truncated
+
+
+def test_checkpointed_findings_are_those_before_the_last_checkpoint():
+    data = _finding(1) + _line({"event": "checkpoint", "files_done": 1}) + _finding(2)
+
+    collector = _feed(NdjsonCollector(_caps()), data)
+
+    assert [finding["line"] for finding in collector.checkpointed_findings] == [1]
+    assert len(collector.findings) == 2
+
+
+def test_secrets_are_redacted_in_findings_and_stderr():
+    data = _line({"event": "finding", "finding": {"snippet": "token=ghp_abcdef123456"}})
+    collector = NdjsonCollector(_caps())
+    collector.feed(2, b"auth failed: Authorization: Bearer s3cr3t\n")
+    _feed(collector, data)
+
+    assert "ghp_abcdef123456" not in json.dumps(collector.findings)
+    assert "s3cr3t" not in collector.stderr_tail
+    assert redact_text("api_key=abc123") == "[REDACTED]"
+
+
+def test_legacy_document_is_accepted():
+    data = _line({"findings": [{"file": "a.py"}], "summary": {"count": 1}})
+
+    collector = _feed(NdjsonCollector(_caps()), data)
+
+    assert collector.findings == [{"file": "a.py"}]
+    assert collector.summary_received
+
+
+def test_bounded_capture_keeps_the_head():
+    capture = BoundedCapture(max_bytes=4)
+    capture.feed(1, b"abcdef")
+    capture.feed(2, b"xy")
+
+    assert capture.stdout == "abcd"
+    assert capture.stderr == "xy"
+    assert capture.bytes_dropped == 2
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import pytest
+
+from agentic_layer.scanners import parallel
+
+
+def _square(value: int) -> int:
+    return value * value
+
+
+def _files(contents: dict[str, str]):
+    return lambda path: contents.get(path)
+
+
+def test_cgroup_v2_quota(monkeypatch):
+    monkeypatch.setattr(parallel, "_read_first_line", _files({"/sys/fs/cgroup/cpu.max": "150000 100000"}))
+    assert parallel.cgroup_cpu_quota() == 1.5
+
+
+def test_cgroup_v2_unlimited(monkeypatch):
+    monkeypatch.setattr(parallel, "_read_first_line", _files({"/sys/fs/cgroup/cpu.max": "max 100000"}))
+    assert parallel.cgroup_cpu_quota() is None
+
+
+def test_cgroup_v1_quota(monkeypatch):
+    monkeypatch.setattr(
+        parallel,
+        "_read_first_line",
+        _files({"/sys/fs/cgroup/cpu/cpu.cfs_quota_us": "200000", "/sys/fs/cgroup/cpu/cpu.cfs_period_us": "100000"}),
+    )
+    assert parallel.cgroup_cpu_quota() == 2.0
+
+
+def test_cgroup_v1_unlimited(monkeypatch):
+    monkeypatch.setattr(
+        parallel,
+        "_read_first_line",
+        _files({"/sys/fs/cgroup/cpu/cpu.cfs_quota_us": "-1", "/sys/fs/cgroup/cpu/cpu.cfs_period_us": "100000"}),
+    )
+    assert parallel.cgroup_cpu_quota() is None
+
+
+@pytest.mark.parametrize(
+    ("quota", "env", "expected"),
+    [(None, "", 8), (2.5, "", 2), (0.5, "", 1), (None, "3", 3), (4.0, "6", 4)],
+)
+def test_available_cpus_takes_the_tightest_limit(monkeypatch, quota, env, expected):
+    monkeypatch.setattr(parallel.os, "sched_getaffinity", lambda pid: set(range(8)), raising=False)
+    monkeypatch.setattr(parallel, "cgroup_cpu_quota", lambda: quota)
+    monkeypatch.setenv("DEPLAI_SCANNER_CPUS", env)
+    assert parallel.available_cpus() == expected
+
+
+def test_small_inputs_stay_serial(monkeypatch):
+    monkeypatch.setattr(parallel, "available_cpus", lambda: 8)
+    assert parallel.worker_count(parallel.PARALLEL_MIN_ITEMS - 1) == 1
+    assert parallel.worker_count(parallel.PARALLEL_MIN_ITEMS) == 8
+
+
+def test_map_ordered_matches_a_serial_run():
+    items = list(range(200))
+    assert list(parallel.map_ordered(_square, items, workers=2)) == [_square(item) for item in items]
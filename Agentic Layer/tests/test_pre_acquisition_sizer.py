@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from agentic_layer.scan_graph import graph
+from agentic_layer.scan_graph.nodes import pre_acquisition_sizer
+from agentic_layer.scan_graph.nodes.size_checker import SIZE_THRESHOLD_BYTES
+from agentic_layer.scan_graph.state import PhaseStatus
+from agentic_layer.scan_graph.state import build_initial_state
+from agentic_layer.shared.github_client import GitHubResponse
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [("", 1.5), ("2.25", 2.25), ("abc", 1.5), ("0", 1.5), ("-3", 1.5)],
+)
+def test_size_ratio_from_env(monkeypatch, raw, expected):
+    monkeypatch.setenv("DEPLAI_PRESIZE_RATIO", raw)
+    assert pre_acquisition_sizer._resolve_size_ratio() == expected
+
+
+def _presize(monkeypatch, response):
+    async def get_repo(owner, repo, *, token, scan_id=None):
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(pre_acquisition_sizer.github_client, "get_repo", get_repo)
+    monkeypatch.delenv("DEPLAI_PRESIZE_RATIO", raising=False)
+    state = build_initial_state("https://github.com/octo/repo")
+    return asyncio.run(pre_acquisition_sizer.pre_acquisition_sizer_node(state))
+
+
+def test_oversized_repository_routes_to_hitl(monkeypatch):
+    size_kb = SIZE_THRESHOLD_BYTES // 1024
+    state = _presize(monkeypatch, GitHubResponse(200, {"size": size_kb}))
+
+    presize = state["repo_metadata"]["presize"]
+    assert presize["estimated_size_bytes"] == int(size_kb * 1024 * 1.5)
+    assert state["requires_hitl"] is True
+    assert pre_acquisition_sizer.route_after_pre_acquisition_sizer(state) == "hitl"
+
+
+def test_small_repository_routes_to_acquisition(monkeypatch):
+    state = _presize(monkeypatch, GitHubResponse(200, {"size": 10}))
+
+    assert state["requires_hitl"] is False
+    assert pre_acquisition_sizer.route_after_pre_acquisition_sizer(state) == "acquire"
+
+
+@pytest.mark.parametrize("response", [GitHubResponse(404, {}), RuntimeError("offline")])
+def test_unknown_size_defers_to_post_clone_check(monkeypatch, response):
+    state = _presize(monkeypatch, response)
+
+    assert state["repo_metadata"]["presize"]["source"] == "unavailable"
+    assert state["requires_hitl"] is False
+
+
+def test_acquisition_failure_marks_acquisition_phase(monkeypatch):
+    async def ainvoke(state, config=None):
+        raise RuntimeError("volume unavailable")
+
+    monkeypatch.setattr(graph.acquisition_subgraph, "ainvoke", ainvoke)
+    state = build_initial_state("https://github.com/octo/repo")
+
+    next_state = asyncio.run(graph.run_acquisition_phase_node(state))
+
+    assert next_state["acquisition_phase"] == PhaseStatus.FAILED.value
+    assert next_state["setup_phase"] == PhaseStatus.NOT_STARTED.value
+    assert next_state["phase"] == "error"
+    assert next_state["phase_timeline"][-1]["phase"] == "acquisition_phase"
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from agentic_layer.scanners import cache
+from agentic_layer.scanners import checkpoint
+from agentic_layer.scanners import files
+from agentic_layer.scanners import python_ast
+from agentic_layer.scanners.ast_rules import RULES
+from agentic_layer.scanners.protocol import Emitter
+
+
+pytestmark = pytest.mark.usefixtures("scanner_config")
+
+VIEWS = """\
+from flask import request
+from db import run_query
+
+def search():
+    eval("1")
+    return run_query(request.args.get("q"))
+"""
+DB = """\
+def run_query(sql):
+    cursor.execute(sql)
+"""
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    (root / "db.py").write_text(DB)
+    (root / "views.py").write_text(VIEWS)
+    (root / "broken.py").write_text("def (:\n")
+    return root
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    # Records which files are parsed rather than served from the cache.
+    parsed = []
+    parse = python_ast.ast.parse
+
+    def recording_parse(source, filename="<unknown>", **kwargs):
+        parsed.append(filename.rsplit("/", 1)[-1])
+        return parse(source, filename=filename, **kwargs)
+
+    monkeypatch.setattr(python_ast.ast, "parse", recording_parse)
+    monkeypatch.setattr(python_ast, "worker_count", lambda items: 1)
+    return parsed
+
+
+def _scan(root):
+    stream = io.StringIO()
+    hits = []
+    summary = python_ast.scan_tree(
+        root,
+        Emitter("ast", stream),
+        list(RULES.values()),
+        lambda rule, file, hit: hits.append((rule.id, file.rsplit("/", 1)[-1], hit["line"])),
+    )
+    return sorted(hits), summary
+
+
+def test_full_scan_reports_per_file_and_cross_file_hits(tree, parses):
+    hits, summary = _scan(tree)
+
+    assert hits == [("dynamic_execution", "views.py", 5), ("request_to_sink", "views.py", 6)]
+    assert summary["files_total"] == 3
+    assert summary["files_parsed"] == 2
+    assert summary["files_skipped"] == {"syntax_error": 1}
+    assert summary["context_files"] == {"total": 0, "facts_cached": 0, "facts_missing": 0}
+    assert sorted(parses) == ["broken.py", "db.py", "views.py"]
+
+
+def test_scoped_rescan_takes_context_facts_from_the_cache(tree, tmp_path, parses):
+    cache.configure(str(tmp_path / "cache"))
+    full_hits, _ = _scan(tree)
+    parses.clear()
+
+    files.configure_scope(tree, ["views.py"])
+    hits, summary = _scan(tree)
+
+    # Only the scoped file is looked at, from the cache; the cross-file flow through
+    # db.py is still found from db.py's cached facts.
+    assert parses == []
+    assert hits == full_hits
+    assert summary["context_files"] == {"total": 2, "facts_cached": 1, "facts_missing": 1}
+
+
+def test_scoped_rescan_never_parses_context_files(tree, parses):
+    files.configure_scope(tree, ["views.py"])
+    hits, summary = _scan(tree)
+
+    # Without cached facts for db.py the flow cannot be followed, and nothing outside the
+    # scope is parsed to find it.
+    assert parses == ["views.py"]
+    assert hits == [("dynamic_execution", "views.py", 5)]
+    assert summary["context_files"] == {"total": 2, "facts_cached": 0, "facts_missing": 2}
+
+
+def test_resumed_scan_skips_delivered_files(tree, tmp_path, parses):
+    cache.configure(str(tmp_path / "cache"))
+    _scan(tree)
+    (tree / "views.py").write_text(VIEWS + "\nexec('2')\n")
+    parses.clear()
+
+    # Walk order is broken.py, db.py, views.py: resume after the first two.
+    checkpoint.configure(2)
+    hits, summary = _scan(tree)
+
+    assert parses == ["views.py"]
+    assert hits == [
+        ("dynamic_execution", "views.py", 5),
+        ("dynamic_execution", "views.py", 8),
+        ("request_to_sink", "views.py", 6),
+    ]
+    assert summary["files_done"] == 3
+    assert summary["context_files"] == {"total": 2, "facts_cached": 1, "facts_missing": 1}
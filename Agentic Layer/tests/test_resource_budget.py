@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+
+from agentic_layer.runtime.resource_budget import MIB
+from agentic_layer.runtime.resource_budget import ResourceBudget
+from agentic_layer.runtime.resource_budget import ResourceRequest
+
+
+CAPACITY = ResourceRequest(cpus=2.0, memory_bytes=1024 * MIB, pids=256)
+ONE = ResourceRequest(cpus=1.0, memory_bytes=256 * MIB, pids=64)
+TWO = ResourceRequest(cpus=2.0, memory_bytes=256 * MIB, pids=64)
+
+
+def test_cgroup_parent_is_opt_in(monkeypatch):
+    monkeypatch.delenv("DEPLAI_CGROUP_PARENT", raising=False)
+    assert ResourceBudget(CAPACITY).cgroup_parent is None
+
+    monkeypatch.setenv("DEPLAI_CGROUP_PARENT", "deplai.slice")
+    budget = ResourceBudget(CAPACITY)
+
+    async def admitted():
+        async with budget.reserve("scan", ONE) as admission:
+            return admission.host_config()
+
+    config = asyncio.run(admitted())
+    assert config["CgroupParent"] == "deplai.slice"
+    assert config["NanoCpus"] == 1_000_000_000
+
+
+def test_host_config_without_cgroup_parent():
+    budget = ResourceBudget(CAPACITY, cgroup_parent="")
+
+    async def admitted():
+        async with budget.reserve("scan", ONE) as admission:
+            return admission.host_config()
+
+    assert "CgroupParent" not in asyncio.run(admitted())
+
+
+def test_oversized_requests_are_clamped_to_capacity():
+    budget = ResourceBudget(CAPACITY, cgroup_parent="")
+
+    async def admitted():
+        async with budget.reserve("scan", ResourceRequest(cpus=8.0, memory_bytes=8192 * MIB, pids=9999)) as admission:
+            return admission.request
+
+    assert asyncio.run(admitted()) == CAPACITY
+
+
+def test_admission_is_first_come_first_served():
+    budget = ResourceBudget(CAPACITY, cgroup_parent="")
+    order: list[str] = []
+
+    async def hold(name: str, request: ResourceRequest, release: asyncio.Event) -> None:
+        async with budget.reserve("scan", request):
+            order.append(name)
+            await release.wait()
+
+    async def scenario():
+        first_release, big_release, small_release = asyncio.Event(), asyncio.Event(), asyncio.Event()
+        first = asyncio.create_task(hold("first", ONE, first_release))
+        await asyncio.sleep(0)
+        big = asyncio.create_task(hold("big", TWO, big_release))
+        await asyncio.sleep(0)
+        small = asyncio.create_task(hold("small", ONE, small_release))
+        await asyncio.sleep(0.01)
+        # One CPU is free, but the small request queues behind the big one.
+        queued = (list(order), budget.snapshot()["queued"])
+        first_release.set()
+        await asyncio.sleep(0.01)
+        big_release.set()
+        small_release.set()
+        await asyncio.gather(first, big, small)
+        return queued
+
+    queued = asyncio.run(scenario())
+
+    assert queued == (["first"], 2)
+    assert order == ["first", "big", "small"]
+    assert budget.snapshot()["in_use"] == {"cpus": 0.0, "memory_bytes": 0, "pids": 0}
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    budget = ResourceBudget(CAPACITY, cgroup_parent="")
+
+    async def scenario():
+        async with budget.reserve("scan", TWO):
+            waiter = asyncio.create_task(budget.reserve("scan", ONE).__aenter__())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            return budget.snapshot()["queued"]
+
+    assert asyncio.run(scenario()) == 0
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from agentic_layer.runtime import resource_reaper as reaper_module
+from agentic_layer.runtime import volume_pool as volume_pool_module
+from agentic_layer.runtime.docker_engine import docker_labels
+from agentic_layer.runtime.resource_reaper import ResourceReaper
+from agentic_layer.runtime.volume_pool import VolumePool
+
+
+class FakeEngine:
+    def __init__(self) -> None:
+        self.volumes: list[dict] = []
+        self.containers: list[dict] = []
+        self.removed: list[str] = []
+
+    async def create_volume(self, name, labels=None):
+        self.volumes.append({"Name": name, "Labels": dict(labels or {})})
+        return name
+
+    async def list_volumes(self, labels=None):
+        return list(self.volumes)
+
+    async def list_containers(self, labels=None):
+        return list(self.containers)
+
+    async def remove_volume(self, name, force=True):
+        self.removed.append(name)
+        self.volumes = [volume for volume in self.volumes if volume["Name"] != name]
+        return True
+
+    async def remove_container(self, container_id, force=True):
+        self.removed.append(container_id)
+        self.containers = [container for container in self.containers if container["Id"] != container_id]
+        return True
+
+
+@pytest.fixture
+def engine(monkeypatch, tmp_path):
+    fake = FakeEngine()
+    monkeypatch.setattr(reaper_module, "docker_engine", fake)
+    monkeypatch.setattr(volume_pool_module, "docker_engine", fake)
+    monkeypatch.setenv("DEPLAI_SCAN_DB_PATH", str(tmp_path / "scans.sqlite3"))
+    return fake
+
+
+def _reaper() -> ResourceReaper:
+    return ResourceReaper(interval_seconds=60, grace_sweeps=2, removals_per_second=1000, heartbeat_seconds=10)
+
+
+def _sweeps(reaper: ResourceReaper, count: int) -> list[dict]:
+    async def run():
+        return [await reaper.sweep() for _ in range(count)]
+
+    return asyncio.run(run())
+
+
+def test_unknown_scan_resources_are_reaped_after_the_grace_period(engine):
+    engine.volumes = [{"Name": "vol-a", "Labels": docker_labels("scan-a")}]
+    engine.containers = [{"Id": "ctr-a", "Labels": docker_labels("scan-a"), "State": "running"}]
+
+    first, second = _sweeps(_reaper(), 2)
+
+    assert first["removed"] == 0
+    assert second["removed"] == 2
+    # Containers go first; the volume cannot be removed while one still mounts it.
+    assert engine.removed == ["ctr-a", "vol-a"]
+
+
+def test_running_infra_containers_are_never_reaped(engine):
+    engine.containers = [
+        {"Id": "scrub", "Labels": docker_labels(infra=True), "State": "running"},
+        {"Id": "warmup-done", "Labels": docker_labels(infra=True), "State": "exited"},
+    ]
+
+    _sweeps(_reaper(), 3)
+
+    assert engine.removed == ["warmup-done"]
+
+
+def test_scans_heartbeated_by_another_worker_are_live(engine):
+    engine.volumes = [{"Name": "vol-b", "Labels": docker_labels("scan-b")}]
+    other_worker = _reaper()
+    other_worker.mark_workflow_started("scan-b")
+
+    _sweeps(_reaper(), 3)
+    assert engine.removed == []
+
+    other_worker.mark_workflow_finished("scan-b")
+    _sweeps(_reaper(), 2)
+    assert engine.removed == ["vol-b"]
+
+
+def test_stale_heartbeats_do_not_keep_a_scan_alive(engine, tmp_path):
+    engine.volumes = [{"Name": "vol-c", "Labels": docker_labels("scan-c")}]
+    reaper_module._write_heartbeats(["scan-c"])
+    connection = sqlite3.connect(tmp_path / "scans.sqlite3")
+    with connection:
+        connection.execute("UPDATE scan_heartbeats SET heartbeat_at = ?", (time.time() - 3600,))
+    connection.close()
+
+    reaper = _reaper()
+    assert "scan-c" not in reaper.live_scan_ids()
+    _sweeps(reaper, 2)
+    assert engine.removed == ["vol-c"]
+
+
+def test_in_process_scans_and_probes_are_live(engine):
+    engine.volumes = [
+        {"Name": "vol-d", "Labels": docker_labels("scan-d")},
+        {"Name": "vol-e", "Labels": docker_labels("scan-e")},
+    ]
+    reaper = _reaper()
+    reaper.mark_workflow_started("scan-d")
+    reaper.add_live_scan_probe(lambda: {"scan-e"})
+
+    _sweeps(reaper, 3)
+
+    assert engine.removed == []
+    assert reaper.local_scan_ids() == {"scan-d", "scan-e"}
+
+
+def test_persisted_scans_are_reaped_on_the_first_sweep(engine, tmp_path):
+    engine.volumes = [{"Name": "vol-f", "Labels": docker_labels("scan-f")}]
+    connection = sqlite3.connect(tmp_path / "scans.sqlite3")
+    with connection:
+        connection.execute("CREATE TABLE scan_results (scan_id TEXT PRIMARY KEY)")
+        connection.execute("INSERT INTO scan_results (scan_id) VALUES ('scan-f')")
+    connection.close()
+
+    (summary,) = _sweeps(_reaper(), 1)
+
+    assert summary["removed"] == 1
+    assert engine.removed == ["vol-f"]
+
+
+def test_another_workers_pool_volumes_survive_until_its_pool_and_scan_are_gone(engine, tmp_path):
+    # Worker A runs the pool and scan-a; the reapers below belong to worker B, whose
+    # own pool owns none of these volumes.
+    worker_a = _reaper()
+
+    async def scenario():
+        pool = VolumePool(size=2, lease_ttl_seconds=60, maintenance_interval_seconds=3600)
+        await pool.start()
+        leased = pool.lease("scan-a")
+        while pool._background:
+            await asyncio.gather(*list(pool._background))
+        worker_a.mark_workflow_started("scan-a")
+
+        worker_b = _reaper()
+        for _ in range(3):
+            await worker_b.sweep()
+        removed_while_alive = list(engine.removed)
+
+        # Worker A's pool stops beating (the worker hung or crashed) while scan-a is still heartbeated.
+        connection = sqlite3.connect(tmp_path / "scans.sqlite3")
+        with connection:
+            connection.execute("UPDATE pool_heartbeats SET heartbeat_at = ?", (time.time() - 3600,))
+        connection.close()
+        worker_b = _reaper()
+        for _ in range(2):
+            await worker_b.sweep()
+        removed_after_pool_died = list(engine.removed)
+
+        worker_a.mark_workflow_finished("scan-a")
+        for _ in range(2):
+            await worker_b.sweep()
+        return leased, removed_while_alive, removed_after_pool_died
+
+    leased, removed_while_alive, removed_after_pool_died = asyncio.run(scenario())
+
+    assert removed_while_alive == []
+    # The idle volumes went with the pool; the leased one waited for its scan.
+    assert len(removed_after_pool_died) == 2
+    assert leased not in removed_after_pool_died
+    assert engine.removed[-1] == leased
+    assert engine.volumes == []
+    assert volume_pool_module.pool_lease_scan_ids() == {}
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import argparse
+import io
+import json
+
+import pytest
+
+from agentic_layer.scanners import SCANNER_VERSION
+from agentic_layer.scanners import cli
+from agentic_layer.scanners import files
+from agentic_layer.scanners.protocol import Emitter
+
+
+pytestmark = pytest.mark.usefixtures("scanner_config")
+
+
+def _events(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_shard_argument_parses_index_and_count():
+    assert cli._shard("0/3") == (0, 3)
+    assert cli._shard("2/3") == (2, 3)
+
+
+@pytest.mark.parametrize("value", ["3/3", "-1/2", "a/2", "1", ""])
+def test_shard_argument_rejects_bad_values(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        cli._shard(value)
+
+
+def test_emitter_counts_findings_into_checkpoint_and_summary():
+    stream = io.StringIO()
+    emitter = Emitter("regex", stream)
+    emitter.finding({"type": "x"})
+    emitter.checkpoint(files_done=1, last_file="a.py")
+    emitter.finding({"type": "y"})
+    emitter.summary(files_total=2)
+
+    events = _events(stream.getvalue())
+    assert [event["event"] for event in events] == ["finding", "checkpoint", "finding", "summary"]
+    assert events[1] == {"event": "checkpoint", "findings": 1, "files_done": 1, "last_file": "a.py"}
+    assert events[3]["summary"] == {
+        "tool": "regex",
+        "scanner_version": SCANNER_VERSION,
+        "count": 2,
+        "files_total": 2,
+    }
+
+
+def test_scope_limits_walk_to_listed_files(tmp_path):
+    (tmp_path / "pkg" / "sub").mkdir(parents=True)
+    (tmp_path / "other").mkdir()
+    for relative in ["top.py", "pkg/a.py", "pkg/sub/b.py", "other/c.py"]:
+        (tmp_path / relative).write_text("x = 1\n")
+
+    files.configure_scope(tmp_path, ["pkg/sub/b.py", str(tmp_path / "top.py")])
+
+    walked = [path.relative_to(tmp_path).as_posix() for path in files.iter_files(tmp_path)]
+    assert walked == ["top.py", "pkg/sub/b.py"]
+    assert files.in_scope(tmp_path / "pkg" / "sub" / "b.py", tmp_path)
+    assert not files.in_scope(tmp_path / "pkg" / "a.py", tmp_path)
+    unscoped = list(files.iter_files(tmp_path, scoped=False))
+    assert len(unscoped) == 4
+
+
+def test_scope_rejects_paths_outside_root(tmp_path):
+    with pytest.raises(ValueError):
+        files.configure_scope(tmp_path, ["../escape.py"])
+
+
+def test_main_refuses_offset_and_shard_for_other_tools(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        cli.main(["stats", "--root", str(tmp_path), "--start-offset", "3"])
+    assert "cannot resume" in capsys.readouterr().err
+
+    with pytest.raises(SystemExit):
+        cli.main(["ast", "--root", str(tmp_path), "--shard", "0/2"])
+    assert "cannot be sharded" in capsys.readouterr().err
+
+
+def test_main_emits_a_summary_for_the_tool(tmp_path, capsys):
+    (tmp_path / "a.txt").write_text("hello\n")
+
+    assert cli.main(["stats", "--root", str(tmp_path)]) == 0
+
+    events = _events(capsys.readouterr().out)
+    assert events[-1]["event"] == "summary"
+    assert events[-1]["summary"]["tool"] == "stats"
+    assert events[-1]["summary"]["total_files"] == 1
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import io
+import json
+import random
+
+import pytest
+
+from agentic_layer.scanners import entropy
+from agentic_layer.scanners import secret_scan
+from agentic_layer.scanners.protocol import Emitter
+
+
+pytestmark = pytest.mark.usefixtures("scanner_config")
+
+GITHUB_TOKEN = "ghp_" + "aB3dE5gH7jK9mN1pQ3sT5vW7yZ9bC2eF4hJ6"
+GENERIC_SECRET = "Zx8Qw2Er6Ty0Ui4Op9As3Df7Gh1Jk5Lz8Xc2Vb6Nm0"
+HEX_DIGEST = "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08"
+
+
+def _tokens(count: int) -> list[bytes]:
+    generator = random.Random(7)
+    alphabet = b"abcdefABCDEF0123456789+/_-xyzXYZ \x00\xff"
+    return [bytes(generator.choice(alphabet) for _ in range(generator.randint(1, 80))) for _ in range(count)] + [b""]
+
+
+def test_known_entropy_and_classes():
+    entropies, classes = entropy._analyze_python([b"aaaa", b"abcd", b"deadBEEF", b"a1_"])
+    assert entropies[:2] == [0.0, 2.0]
+    assert classes == [
+        entropy.HAS_LOWER,
+        entropy.HAS_LOWER,
+        entropy.HAS_LOWER | entropy.HAS_UPPER,
+        entropy.HAS_LOWER | entropy.HAS_DIGIT | entropy.NOT_HEX,
+    ]
+
+
+def test_numpy_backend_matches_the_python_backend(monkeypatch):
+    pytest.importorskip("numpy")
+    tokens = _tokens(500)
+    expected_entropies, expected_classes = entropy._analyze_python(tokens)
+
+    # Several batches, so batch boundaries are covered too.
+    monkeypatch.setattr(entropy, "BATCH_TOKENS", 64)
+    entropies, classes = entropy.analyze(tokens)
+
+    assert classes == expected_classes
+    assert entropies == pytest.approx(expected_entropies, abs=1e-9)
+
+
+def _scan(root):
+    stream = io.StringIO()
+    summary = secret_scan.scan_secrets(root, Emitter("secret_scan", stream))
+    return [json.loads(line)["finding"] for line in stream.getvalue().splitlines()], summary
+
+
+def test_scan_reports_secrets_by_file_and_line_only(tmp_path):
+    (tmp_path / "settings.py").write_text(
+        f'GITHUB = "{GITHUB_TOKEN}"\n'
+        'db_password = "Tr0ub4dor3xyz"\n'
+        'api_key = "settings.API_KEY"\n'
+        f'checksum = "{HEX_DIGEST}"\n'
+        f"blob = {GENERIC_SECRET}\n"
+    )
+    (tmp_path / "app.ini").write_text("secret = s3cr3tV4lu3Qx9\n")
+    (tmp_path / "yarn.lock").write_text(f'integrity "{GENERIC_SECRET}"\n')
+    (tmp_path / "cert.pem").write_text(f"-----BEGIN CERTIFICATE-----\n{GENERIC_SECRET}\n-----END CERTIFICATE-----\n")
+    (tmp_path / "image.bin").write_bytes(b"\0" + GITHUB_TOKEN.encode())
+
+    findings, summary = _scan(tmp_path)
+
+    found = sorted((finding["evidence"].rsplit("/", 1)[-1], finding["rule"]) for finding in findings)
+    assert found == [
+        ("app.ini:1", "secret_assignment"),
+        ("settings.py:1", "github_token"),
+        ("settings.py:2", "secret_assignment"),
+        ("settings.py:5", "high_entropy_string"),
+    ]
+    text = json.dumps(findings)
+    for secret in (GITHUB_TOKEN, GENERIC_SECRET, "Tr0ub4dor3xyz", "s3cr3tV4lu3Qx9"):
+        assert secret not in text
+    # The lockfile is never considered; the binary file is considered but not read.
+    assert summary["files_considered"] == 4
+    assert summary["files_read"] == 3
+    assert summary["entropy_backend"] == entropy.BACKEND
+
+
+def test_candidates_prefer_known_formats():
+    content = f"x = {GITHUB_TOKEN}\n".encode()
+    candidates = secret_scan._candidates(content, unquoted_values=False)
+    assert [(candidate.rule, candidate.token.decode()) for candidate in candidates] == [("github_token", GITHUB_TOKEN)]
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from agentic_layer.runtime.output_stream import NdjsonCollector
+from agentic_layer.scan_graph.nodes.analysis import sharding
+from agentic_layer.scan_graph.nodes.analysis.coverage import full_scope
+from agentic_layer.scan_graph.nodes.analysis.sharding import ShardRun
+from agentic_layer.scan_graph.nodes.analysis.sharding import merge_shards
+from agentic_layer.scan_graph.nodes.analysis.sharding import shard_scopes
+from agentic_layer.scan_graph.nodes.analysis.sharding import walk_order
+from agentic_layer.scanners import cli
+from agentic_layer.scanners import files
+
+
+pytestmark = pytest.mark.usefixtures("scanner_config")
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "repo"
+    layout = {
+        "a.py": 'password = "one"\n',
+        "b/c.py": "x = 'http://c'\n" * 40,
+        "b/d/e.py": 'password = "two"\nurl = "http://e"\n',
+        "b/z.py": "nothing\n" * 10,
+        "f/g.py": 'PASSWORD = "three"\n' * 3,
+        "f/h.txt": "http://h\n",
+        "zz.py": "",
+    }
+    for relative, content in layout.items():
+        (root / relative).parent.mkdir(parents=True, exist_ok=True)
+        (root / relative).write_text(content)
+    return root
+
+
+def _walk(root):
+    return [path.relative_to(root).as_posix() for path in files.iter_files(root)]
+
+
+def _shard_files(root, index, count):
+    files.configure_scope(root, None)
+    files.configure_shard(root, index, count)
+    shard = _walk(root)
+    files.configure_scope(root, None)
+    files._sharded = False
+    return shard
+
+
+@pytest.mark.parametrize("count", [2, 3, 7, 10])
+def test_shards_partition_the_tree(tree, count):
+    everything = _walk(tree)
+    shards = [_shard_files(tree, index, count) for index in range(count)]
+
+    assert sorted(path for shard in shards for path in shard) == sorted(everything)
+    assert sum(len(shard) for shard in shards) == len(everything)
+    # Each container computes the same partition.
+    assert shards == [_shard_files(tree, index, count) for index in range(count)]
+
+
+def test_walk_order_matches_the_scanners_walk(tree):
+    everything = _walk(tree)
+    assert sorted(everything, key=walk_order) == everything
+
+
+def _run(root, capsys, *arguments):
+    cli.main(["regex", "--root", str(root), *arguments])
+    collector = NdjsonCollector()
+    collector.feed(1, capsys.readouterr().out.encode())
+    collector.close()
+    return collector
+
+
+@pytest.mark.parametrize("count", [2, 3])
+def test_merged_shards_equal_one_run(tree, capsys, count):
+    single = _run(tree, capsys)
+    runs = []
+    for index in range(count):
+        shard = f"{index}/{count}"
+        runs.append(ShardRun(scope={**full_scope(), "shard": shard}, collector=_run(tree, capsys, "--shard", shard)))
+
+    merged = merge_shards(runs)
+
+    assert merged.findings == single.findings
+    assert merged.summary["count"] == single.summary["count"]
+    assert merged.summary["files_total"] == single.summary["files_total"]
+    assert merged.summary["tool"] == "regex"
+    assert not merged.partial
+
+
+def test_merge_keeps_checkpointed_shards_and_drops_failed_ones():
+    def collector(lines):
+        result = NdjsonCollector()
+        result.feed(1, "".join(line + "\n" for line in lines).encode())
+        result.close()
+        return result
+
+    finished = ShardRun(
+        scope={"shard": "0/3"},
+        collector=collector(['{"event":"finding","finding":{"file":"b/x.py"}}', '{"event":"summary","summary":{}}']),
+    )
+    timed_out = ShardRun(
+        scope={"shard": "1/3"},
+        collector=collector(
+            [
+                '{"event":"finding","finding":{"file":"a.py"}}',
+                '{"event":"checkpoint","files_done":1,"last_file":"a.py"}',
+                '{"event":"finding","finding":{"file":"c.py"}}',
+            ]
+        ),
+        error="timed out",
+    )
+    failed = ShardRun(scope={"shard": "2/3"}, collector=collector([]), error="exit 1")
+
+    merged = merge_shards([finished, timed_out, failed])
+
+    assert [finding["file"] for finding in merged.findings] == ["a.py", "b/x.py"]
+    assert merged.partial
+    assert merged.errors == ["timed out", "exit 1"]
+    assert [shard["checkpoint"] for shard in merged.shards] == [None, {"files_done": 1, "last_file": "a.py"}, None]
+    assert merge_shards([failed]) is None
+
+
+def test_only_whole_tree_runs_are_sharded():
+    assert shard_scopes(full_scope(), 1) == [full_scope()]
+    assert [scope["shard"] for scope in shard_scopes(full_scope(), 3)] == ["0/3", "1/3", "2/3"]
+    rescan = {**full_scope(), "start_offset": 4}
+    assert shard_scopes(rescan, 3) == [rescan]
+
+
+@pytest.mark.parametrize(
+    ("total_files", "total_bytes", "cpus", "expected"),
+    [
+        (100, 1024, 16, 1),
+        (60_000, 0, 16, 3),
+        (0, 2 * sharding.SHARD_TARGET_BYTES + 1, 16, 3),
+        (1_000_000, 0, 16, sharding.MAX_SHARDS),
+        (1_000_000, 0, 2.5, 2),
+    ],
+)
+def test_shard_count(monkeypatch, total_files, total_bytes, cpus, expected):
+    monkeypatch.setattr(sharding, "resource_budget", SimpleNamespace(capacity=SimpleNamespace(cpus=cpus)))
+    state = {"repo_metadata": {"stats": {"total_files": total_files, "total_size_bytes": total_bytes}}}
+
+    assert sharding.shard_count(state) == expected
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+from types import SimpleNamespace
+
+from agentic_layer.scan_graph.nodes import github_auth
+from agentic_layer.scan_graph.nodes import pre_acquisition_sizer
+from agentic_layer.scan_graph.state import build_initial_state
+from agentic_layer.shared.github_client import GitHubResponse
+from agentic_layer.shared.github_client import token_fingerprint
+from agentic_layer.shared.token_validation_cache import TokenValidation
+from agentic_layer.shared.token_validation_cache import TokenValidationCache
+
+
+# The package re-exports the cache instance under the module's name.
+cache_module = importlib.import_module("agentic_layer.shared.token_validation_cache")
+
+VALID = TokenValidation(token_valid=True, repo_access=True, token_type="user", authenticated_login="octo")
+
+
+def test_only_successful_validations_are_cached():
+    cache = TokenValidationCache(user_ttl_seconds=60, installation_ttl_seconds=60)
+    cache.put("t", "octo", "repo", TokenValidation(False, False, "none", None))
+    assert cache.get("t", "octo", "repo") is None
+
+    cache.put("t", "octo", "repo", VALID)
+    assert cache.get("t", "Octo", "Repo") == VALID
+    assert cache.get("t", "octo", "other") is None
+    assert cache.get("other", "octo", "repo") is None
+
+
+def test_entries_expire_and_zero_ttl_disables(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    cache = TokenValidationCache(user_ttl_seconds=30, installation_ttl_seconds=0)
+
+    cache.put("t", "octo", "repo", VALID)
+    cache.put("i", "octo", "repo", TokenValidation(True, True, "installation", None))
+    assert cache.get("i", "octo", "repo") is None
+    now[0] += 29
+    assert cache.get("t", "octo", "repo") == VALID
+    now[0] += 2
+    assert cache.get("t", "octo", "repo") is None
+
+
+def test_invalidation_drops_every_repository_of_a_token():
+    cache = TokenValidationCache(user_ttl_seconds=60)
+    cache.put("t", "octo", "a", VALID)
+    cache.put("t", "octo", "b", VALID)
+    cache.put("u", "octo", "a", VALID)
+
+    cache.invalidate_fingerprint(token_fingerprint("t"))
+
+    assert cache.get("t", "octo", "a") is None
+    assert cache.get("t", "octo", "b") is None
+    assert cache.get("u", "octo", "a") == VALID
+
+
+def test_lru_bound():
+    cache = TokenValidationCache(user_ttl_seconds=60, max_entries=2)
+    for repo in ("a", "b", "c"):
+        cache.put("t", "octo", repo, VALID)
+
+    assert cache.get("t", "octo", "a") is None
+    assert cache.get("t", "octo", "c") == VALID
+
+
+def test_cache_hit_skips_every_github_round_trip(monkeypatch):
+    calls = []
+
+    async def get_user(*, token, scan_id=None):
+        calls.append("/user")
+        return GitHubResponse(200, {"login": "octo"})
+
+    async def get_repo(owner, repo, *, token, scan_id=None):
+        calls.append(f"/repos/{owner}/{repo}")
+        return GitHubResponse(200, {"size": 42})
+
+    monkeypatch.setattr(github_auth.github_client, "get_user", get_user)
+    monkeypatch.setattr(github_auth.github_client, "get_repo", get_repo)
+    monkeypatch.setattr(github_auth, "token_validation_cache", TokenValidationCache(user_ttl_seconds=60))
+
+    async def scan():
+        state = build_initial_state("https://github.com/octo/repo")
+        state["github_token"] = "ghp_cached"
+        state = await github_auth.github_auth_node(state)
+        return await pre_acquisition_sizer.pre_acquisition_sizer_node(state)
+
+    first = asyncio.run(scan())
+    calls_after_first = len(calls)
+    second = asyncio.run(scan())
+
+    assert calls_after_first == 2
+    assert len(calls) == calls_after_first
+    assert second["repo_metadata"]["github_auth"]["cached"] is True
+    assert second["repo_metadata"]["presize"]["repo_size_kb"] == 42
+    assert first["repo_metadata"]["presize"] == second["repo_metadata"]["presize"]
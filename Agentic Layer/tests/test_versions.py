@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+
+import pytest
+
+from agentic_layer.scanners import vulndb
+from agentic_layer.scanners.versions import ECOSYSTEM_CARGO
+from agentic_layer.scanners.versions import ECOSYSTEM_GO
+from agentic_layer.scanners.versions import ECOSYSTEM_NPM
+from agentic_layer.scanners.versions import ECOSYSTEM_PYPI
+from agentic_layer.scanners.versions import in_range
+from agentic_layer.scanners.versions import normalize_package
+from agentic_layer.scanners.versions import version_key
+
+
+@pytest.mark.parametrize(
+    "ordered",
+    [
+        ["1.0.dev1", "1.0a1", "1.0b2", "1.0rc1", "1.0", "1.0.post1", "1.1", "2!0.1"],
+        ["0.9", "1.0", "1.0.0", "1.0.1"],
+    ],
+)
+def test_pep440_ordering(ordered):
+    keys = [version_key(ECOSYSTEM_PYPI, version) for version in ordered]
+    assert keys == sorted(keys)
+    assert version_key(ECOSYSTEM_PYPI, "1.0") == version_key(ECOSYSTEM_PYPI, "1.0.0")
+
+
+def test_semver_ordering():
+    ordered = ["1.0.0-alpha", "1.0.0-alpha.1", "1.0.0-beta.2", "1.0.0-beta.11", "1.0.0-rc.1", "1.0.0", "v1.2"]
+    keys = [version_key(ECOSYSTEM_NPM, version) for version in ordered]
+    assert keys == sorted(keys)
+    assert version_key(ECOSYSTEM_GO, "v1.2.3+incompatible") == version_key(ECOSYSTEM_GO, "1.2.3")
+
+
+def test_unparseable_versions_have_no_key():
+    assert version_key(ECOSYSTEM_NPM, "latest") is None
+    assert version_key(ECOSYSTEM_PYPI, "") is None
+
+
+@pytest.mark.parametrize(
+    ("version", "introduced", "fixed", "last_affected", "expected"),
+    [
+        ("1.5", "0", "2.0", None, True),
+        ("2.0", "0", "2.0", None, False),
+        ("0.9", "1.0", "2.0", None, False),
+        ("3.0", "1.0", None, "3.0", True),
+        ("3.1", "1.0", None, "3.0", False),
+        ("9.9", "1.0", None, None, True),
+        ("1.5", "1.0", "not-a-version!", None, None),
+    ],
+)
+def test_in_range(version, introduced, fixed, last_affected, expected):
+    key = version_key(ECOSYSTEM_PYPI, version)
+    assert in_range(key, ECOSYSTEM_PYPI, introduced, fixed, last_affected) is expected
+
+
+def test_package_names_are_normalised_per_ecosystem():
+    assert normalize_package(ECOSYSTEM_PYPI, "Zope.Interface_x") == "zope-interface-x"
+    assert normalize_package(ECOSYSTEM_CARGO, "Serde_JSON") == "serde-json"
+    assert normalize_package(ECOSYSTEM_NPM, "@Scope/Pkg") == "@scope/pkg"
+    assert normalize_package(ECOSYSTEM_GO, "github.com/Foo/Bar") == "github.com/Foo/Bar"
+
+
+def test_osv_intervals():
+    events = [
+        {"introduced": "0"},
+        {"fixed": "1.2"},
+        {"introduced": "2.0"},
+        {"last_affected": "2.3"},
+        {"introduced": "3.0"},
+    ]
+    assert list(vulndb._intervals(events)) == [("0", "1.2", None), ("2.0", None, "2.3"), ("3.0", None, None)]
+
+
+def test_compiled_database_lookup(tmp_path):
+    records = [
+        {
+            "id": "GHSA-1",
+            "summary": "bad thing",
+            "aliases": ["CVE-1"],
+            "database_specific": {"severity": "CRITICAL"},
+            "affected": [
+                {
+                    "package": {"ecosystem": "PyPI", "name": "Django_Pkg"},
+                    "ranges": [{"type": "ECOSYSTEM", "events": [{"introduced": "1.0"}, {"fixed": "1.4"}]}],
+                    "versions": ["0.5"],
+                }
+            ],
+        },
+        {"id": "GHSA-2", "withdrawn": "2024-01-01", "affected": []},
+    ]
+    source = tmp_path / "osv.json"
+    source.write_text(json.dumps(records))
+    output = tmp_path / "vulndb.sqlite"
+
+    meta = vulndb.build([source], output)
+    assert meta["advisories"] == "1"
+    assert meta["ranges"] == "2"
+
+    db = vulndb.VulnDB.open(output)
+    try:
+        ranges = db.ranges_for(ECOSYSTEM_PYPI, ["django-pkg", "absent"])
+        assert list(ranges) == ["django-pkg"]
+        assert ranges["django-pkg"][0] == vulndb.AffectedRange("GHSA-1", "1.0", "1.4", None, None)
+        assert ranges["django-pkg"][1].exact == "0.5"
+        advisories = db.advisories(["GHSA-1"])
+        assert advisories == {"GHSA-1": {"summary": "bad thing", "severity": "high", "aliases": ["CVE-1"]}}
+        with pytest.raises(sqlite3.OperationalError):
+            db.connection.execute("DELETE FROM ranges")
+    finally:
+        db.close()
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from agentic_layer.runtime import volume_pool as volume_pool_module
+from agentic_layer.runtime.docker_engine import ContainerRunResult
+from agentic_layer.runtime.docker_engine import POOL_ID_LABEL
+from agentic_layer.runtime.volume_pool import VolumePool
+
+
+class FakeEngine:
+    def __init__(self, scrub_exit_code: int = 0) -> None:
+        self.scrub_exit_code = scrub_exit_code
+        self.created: list[str] = []
+        self.labels: dict[str, dict] = {}
+        self.removed: list[str] = []
+        self.scrubbed: list[str] = []
+
+    async def create_volume(self, name, labels=None):
+        self.created.append(name)
+        self.labels[name] = dict(labels or {})
+        return name
+
+    async def remove_volume(self, name, force=True):
+        self.removed.append(name)
+        return True
+
+    async def run_container(self, image, command, **kwargs):
+        self.scrubbed.append(kwargs["binds"][0].split(":", 1)[0])
+        return ContainerRunResult(exit_code=self.scrub_exit_code, stdout="", stderr="scrub failed")
+
+
+@pytest.fixture
+def engine(monkeypatch, tmp_path):
+    fake = FakeEngine()
+    monkeypatch.setattr(volume_pool_module, "docker_engine", fake)
+    monkeypatch.setenv("DEPLAI_SCAN_DB_PATH", str(tmp_path / "scans.sqlite3"))
+    return fake
+
+
+async def _settle(pool: VolumePool) -> None:
+    while pool._background:
+        await asyncio.gather(*list(pool._background))
+
+
+def _pool(**kwargs) -> VolumePool:
+    return VolumePool(size=2, lease_ttl_seconds=60, maintenance_interval_seconds=3600, **kwargs)
+
+
+def test_lease_refills_and_release_scrubs(engine):
+    async def scenario():
+        pool = _pool()
+        await pool.start()
+        assert pool.snapshot()["ready"] == 2
+
+        volume = pool.lease("scan-1")
+        await _settle(pool)
+        assert pool.snapshot() == {"size": 2, "ready": 2, "leased": 1, "scrubbing": 0}
+        assert pool.owns(volume)
+
+        assert pool.release(volume) is True
+        assert pool.release(volume) is False
+        await _settle(pool)
+        snapshot = pool.snapshot()
+        await pool.stop()
+        return volume, snapshot
+
+    volume, snapshot = asyncio.run(scenario())
+
+    assert engine.scrubbed == [volume]
+    # The pool refilled while the volume was out, so the scrubbed volume is surplus.
+    assert snapshot == {"size": 2, "ready": 2, "leased": 0, "scrubbing": 0}
+    assert len(engine.created) == 3
+    assert volume in engine.removed
+
+
+def test_failed_scrub_discards_the_volume(engine):
+    engine.scrub_exit_code = 1
+
+    async def scenario():
+        pool = _pool()
+        await pool.start()
+        volume = pool.lease("scan-1")
+        pool.release(volume)
+        await _settle(pool)
+        ready = list(pool._ready)
+        await pool.stop()
+        return volume, ready
+
+    volume, ready = asyncio.run(scenario())
+
+    assert volume in engine.removed
+    assert volume not in ready
+
+
+def test_expired_lease_of_a_running_scan_is_kept(engine):
+    live = {"scan-1"}
+
+    async def scenario():
+        pool = _pool()
+        pool.add_live_scan_probe(lambda: live)
+        await pool.start()
+        volume = pool.lease("scan-1")
+        await _settle(pool)
+        pool._leases[volume].leased_at -= 3600
+
+        pool._detect_leaks()
+        kept = pool.snapshot()["leased"]
+
+        live.clear()
+        pool._detect_leaks()
+        await _settle(pool)
+        reclaimed = pool.snapshot()["leased"]
+        await pool.stop()
+        return kept, reclaimed
+
+    kept, reclaimed = asyncio.run(scenario())
+
+    assert kept == 1
+    assert reclaimed == 0
+
+
+def test_expired_lease_is_kept_when_liveness_is_unknown(engine):
+    def failing_probe():
+        raise RuntimeError("probe unavailable")
+
+    async def scenario():
+        pool = _pool()
+        pool.add_live_scan_probe(failing_probe)
+        await pool.start()
+        volume = pool.lease("scan-1")
+        await _settle(pool)
+        pool._leases[volume].leased_at -= 3600
+        pool._detect_leaks()
+        leased = pool.snapshot()["leased"]
+        await pool.stop()
+        return leased
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_reclaim_scan_releases_only_that_scans_leases(engine):
+    async def scenario():
+        pool = _pool()
+        await pool.start()
+        pool.lease("scan-1")
+        pool.lease("scan-2")
+        released = pool.reclaim_scan("scan-1")
+        await _settle(pool)
+        leases = {lease.scan_id for lease in pool._leases.values()}
+        await pool.stop()
+        return released, leases
+
+    released, leases = asyncio.run(scenario())
+
+    assert released == 1
+    assert leases == {"scan-2"}
+
+
+def test_ownership_and_leases_are_shared_through_the_scan_database(engine):
+    async def scenario():
+        pool = _pool()
+        await pool.start()
+        volume = pool.lease("scan-1")
+        await _settle(pool)
+        running = (volume_pool_module.live_pool_ids(60), volume_pool_module.pool_lease_scan_ids())
+        pool.release(volume)
+        await _settle(pool)
+        released = volume_pool_module.pool_lease_scan_ids()
+        await pool.stop()
+        return pool.pool_id, volume, running, released, volume_pool_module.live_pool_ids(60)
+
+    pool_id, volume, running, released, stopped = asyncio.run(scenario())
+
+    assert {labels[POOL_ID_LABEL] for labels in engine.labels.values()} == {pool_id}
+    assert running == ({pool_id}, {volume: "scan-1"})
+    assert released == {}
+    assert stopped == set()